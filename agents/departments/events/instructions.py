@@ -9,7 +9,8 @@ events_instructions = dedent("""
     **ANALYSIS WORKFLOW:**
     
     1. **Data Sources** (use tools or provided data):
-       - NSE/BSE corporate announcements
+       - NSE/BSE corporate announcements (search_announcements finds filings on a topic
+         or symbol from the local index, including PDF text, without refetching lists)
        - Earnings calendar (for next 5 days)
        - Dividend announcements
        - Buyback announcements
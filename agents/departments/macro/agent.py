@@ -13,8 +13,8 @@ fyers_tools = FyersToolkit(
 )
 # PublicMarketData provides FII/DII data, market holidays, etc.
 public_data_tools = PublicMarketDataToolkit()
-# YahooFinance provides global markets, commodities, forex
-yahoo_tools = YahooFinanceToolkit()
+# YahooFinance provides global markets, commodities, forex (bare tickers are global listings)
+yahoo_tools = YahooFinanceToolkit(default_exchange=None)
 # Groww provides global indices, Indian indices
 groww_tools = GrowwToolkit()
 
@@ -10,7 +10,8 @@ news_instructions = dedent("""
     
     1. **Data Sources** (use tools or provided data):
        - News APIs (Economic Times, Moneycontrol, Bloomberg, Reuters)
-       - Corporate announcements on NSE/BSE
+       - Corporate announcements on NSE/BSE (search_announcements returns ranked
+         snippets from the local filing index; use it before fetching full lists)
        - Social media sentiment (Twitter financial influencers)
        - Regulatory filings (SEBI announcements)
        - Broker research reports
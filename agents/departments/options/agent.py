@@ -9,7 +9,7 @@ from agents.departments.options.instructions import options_instructions
 # Initialize toolkits - options agent needs option chain, quotes, Greeks, and OI data
 fyers_tools = FyersToolkit(
     get_fyers_client(),
-    include_tools=["get_quotes", "get_option_chain", "get_option_greeks"]
+    include_tools=["get_quotes", "get_option_chain", "get_option_greeks", "get_new_contracts"]
 )
 # TradingToolkit provides options metrics computation
 trading_tools = TradingToolkit(include_tools=["compute_options_metrics"])
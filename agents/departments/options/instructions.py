@@ -12,6 +12,9 @@ options_instructions = dedent("""
        - **Fyers:** `get_option_chain(symbol, strike_count=10)` - Get ATM ±10 strikes
        - **Groww:** `get_option_chain(symbol)` - Get ATM ±10 strikes with full Greeks (Δ, Γ, Θ, V)
        - `get_quotes([symbol])` - Get underlying current price
+       - **Fyers:** `get_new_contracts(underlying="NIFTY")` - Contracts listed / delisted /
+         changed (e.g. lot size) since the previous day's symbol master; check it for new
+         weekly expiries or strikes before picking contracts
 
        **NSE India Tools (OI Flow Analysis):**
        - `scan_oi_spurts()` - **CRITICAL** Smart money OI categorization:
@@ -21,6 +24,9 @@ options_instructions = dedent("""
          * 🔴 LONG UNWINDING: OI ↓ + Price ↓ = Bearish (longs exiting)
        - `get_oi_spurts()` - Raw OI change data with values
        - Cross-reference option chain analysis with OI spurts for stronger signals
+       - `get_option_chain_changes(symbol, since="09:15")` - Intraday OI / IV change per
+         strike with buildup labels and the PCR trend, from locally recorded snapshots
+         (NIFTY, BANKNIFTY); use it for "how has OI built up since the open"
 
        **TIP:** Use both Fyers and Groww option chains for cross-verification. Groww provides detailed Greeks for all strikes. **Always check scan_oi_spurts() to see where smart money is positioned.**
     
@@ -11,6 +11,7 @@ import json
 
 # Import API routes
 from api.routes import trades_router, workflows_router
+from api.market_hub import MarketDataHub, DEFAULT_SYMBOLS
 
 settings = get_settings()
 SessionDep = Annotated[Session, Depends(get_session)]
@@ -40,10 +41,17 @@ def get_broker():
     """Get FyersClient instance for API endpoints."""
     return get_fyers_client()
 
+# Single upstream market data subscription shared by /ws/updates clients
+market_hub = MarketDataHub(get_broker)
+
 @app.on_event("startup")
 def on_startup():
     create_db_and_tables()
 
+@app.on_event("shutdown")
+async def on_shutdown():
+    await market_hub.close()
+
 @app.get("/")
 async def root():
     return {
@@ -246,23 +254,41 @@ async def websocket_analysis(websocket: WebSocket):
         print(f"Client disconnected from session {session_id}")
 
 @app.websocket("/ws/updates")
-async def websocket_updates(websocket: WebSocket):
-    """WebSocket for real-time market updates from broker"""
+async def websocket_updates(websocket: WebSocket, symbols: Optional[str] = None):
+    """
+    WebSocket for real-time market updates from broker.
+
+    All clients share one upstream subscription through the market data hub.
+    Initial symbols come from the `symbols` query param (comma separated,
+    defaults to NIFTY 50). Clients can change them at runtime by sending
+    {"action": "subscribe" | "unsubscribe", "symbols": [...]}.
+    """
     await websocket.accept()
-    broker = get_broker()
+    initial = [s.strip() for s in symbols.split(",") if s.strip()] if symbols else DEFAULT_SYMBOLS
+    client = await market_hub.connect(websocket, initial)
     try:
         while True:
-            await asyncio.sleep(5)
-            quotes = await broker.get_quotes(["NSE:NIFTY50-INDEX"])
-            quotes_data = [q.model_dump() for q in quotes.quotes] if quotes.quotes else []
-
-            await websocket.send_json({
-                "type": "market_update",
-                "timestamp": datetime.now().isoformat(),
-                "data": quotes_data
-            })
+            text = await websocket.receive_text()
+            try:
+                message = json.loads(text)
+            except ValueError:
+                message = None
+            if not isinstance(message, dict):
+                await websocket.send_json({
+                    "type": "error",
+                    "message": 'Expected a JSON object like {"action": "subscribe", "symbols": [...]}',
+                })
+                continue
+            await market_hub.handle_message(client, message)
     except WebSocketDisconnect:
         print("Client disconnected from updates")
+    finally:
+        await market_hub.disconnect(client)
+
+@app.get("/ws/updates/stats")
+async def websocket_updates_stats():
+    """Market data hub statistics (clients, upstream symbols, dropped updates)."""
+    return market_hub.stats
 
 # === ANALYSIS ENDPOINTS ===
 
@@ -290,14 +316,14 @@ async def analyze_stock(symbol: str):
 @app.get("/analysis/history")
 async def get_analysis_history(days: int = 7, session: SessionDep = None):
     """Get historical analysis and picks"""
-    history = []
-    for i in range(days):
-        day = (date.today() - timedelta(days=i)).isoformat()
-        statement = select(DailyPick).where(DailyPick.date == day)
-        pick = session.exec(statement).first()
-        if pick:
-            history.append(json.loads(pick.picks_json))
-    
+    start_date = (date.today() - timedelta(days=days - 1)).isoformat()
+    statement = (
+        select(DailyPick)
+        .where(DailyPick.date >= start_date, DailyPick.date <= date.today().isoformat())
+        .order_by(DailyPick.date.desc())
+    )
+    history = [json.loads(pick.picks_json) for pick in session.exec(statement).all()]
+
     return {
         "days": days,
         "history": history
@@ -0,0 +1,420 @@
+"""
+Market data hub for /ws/updates fan-out.
+
+Holds ONE upstream FyersDataWebSocket subscription for the union of
+symbols requested by all connected clients and broadcasts coalesced
+updates to every socket:
+
+- Latest value per symbol only - intermediate ticks are overwritten
+- Per-client throttle (at most one frame per `min_interval` seconds)
+- Backpressure: a slow client never queues frames; while it is sending,
+  newer ticks replace the pending ones and stale values are dropped
+- A client whose frame fails, or takes longer than `send_timeout`, is
+  closed and unregistered (a frame is never abandoned halfway)
+- Per-client subscribe/unsubscribe with reference counting upstream
+
+If the websocket cannot be opened (e.g. not authenticated yet) or drops
+mid-session, the hub falls back to a single shared REST poller for the
+same symbol union, so N clients still cost one upstream call per
+interval. A supervisor task reopens the websocket with exponential
+backoff, resubscribes the symbol union and stops the poller.
+"""
+
+import asyncio
+import logging
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, Optional, Set
+
+from fastapi import WebSocket
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SYMBOLS = ["NSE:NIFTY50-INDEX"]
+
+
+class HubClient:
+    """One connected websocket and its pending (coalesced) updates."""
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        min_interval: float,
+        send_timeout: float,
+        on_dead: Optional[Callable[["HubClient"], None]] = None,
+    ):
+        self.websocket = websocket
+        self.symbols: Set[str] = set()
+        self.min_interval = min_interval
+        self.send_timeout = send_timeout
+        self.sent_frames = 0
+        self.dropped_updates = 0
+        self.dead = False
+        self._on_dead = on_dead
+
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def offer(self, symbol: str, payload: Dict[str, Any]) -> None:
+        """Queue the latest value for a symbol, replacing any unsent one."""
+        if self.dead or symbol not in self.symbols:
+            return
+        if symbol in self._pending:
+            self.dropped_updates += 1
+        self._pending[symbol] = payload
+        self._wakeup.set()
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._sender())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._task = None
+
+    async def _sender(self) -> None:
+        """Send at most one coalesced frame per interval."""
+        loop = asyncio.get_running_loop()
+        last_sent = 0.0
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+
+            wait = self.min_interval - (loop.time() - last_sent)
+            if wait > 0:
+                await asyncio.sleep(wait)
+
+            batch, self._pending = self._pending, {}
+            if not batch:
+                continue
+
+            send = asyncio.ensure_future(self.websocket.send_json({
+                "type": "market_update",
+                "timestamp": datetime.now().isoformat(),
+                "data": list(batch.values()),
+            }))
+            try:
+                done, _ = await asyncio.wait({send}, timeout=self.send_timeout)
+                if not done:
+                    # Cancelling would cut the frame mid-write; a client this slow is dropped
+                    raise asyncio.TimeoutError(f"frame not sent within {self.send_timeout}s")
+                send.result()
+            except asyncio.CancelledError:
+                send.cancel()
+                raise
+            except Exception as e:
+                send.cancel()
+                self.dropped_updates += len(batch)
+                self._die(e)
+                return
+            self.sent_frames += 1
+            last_sent = loop.time()
+
+    def _die(self, error: BaseException) -> None:
+        self.dead = True
+        self._pending.clear()
+        logger.info(f"Dropping market data client: {type(error).__name__}: {error}")
+        if self._on_dead is not None:
+            self._on_dead(self)
+
+
+class MarketDataHub:
+    """Single upstream market-data subscription shared by all websocket clients."""
+
+    def __init__(
+        self,
+        broker_factory: Callable[[], Any],
+        min_interval: float = 1.0,
+        send_timeout: float = 2.0,
+        poll_interval: float = 5.0,
+        health_interval: float = 10.0,
+        reconnect_min_delay: float = 1.0,
+        reconnect_max_delay: float = 60.0,
+    ):
+        """
+        Initialize the hub.
+
+        Args:
+            broker_factory: Returns the shared FyersClient
+            min_interval: Minimum seconds between frames sent to one client
+            send_timeout: Seconds before a slow client's frame is dropped
+            poll_interval: REST polling interval used if the websocket is unavailable
+            health_interval: Seconds between upstream connection checks
+            reconnect_min_delay: First delay between failed reconnect attempts
+            reconnect_max_delay: Cap on the (doubling) reconnect delay
+        """
+        self._broker_factory = broker_factory
+        self.min_interval = min_interval
+        self.send_timeout = send_timeout
+        self.poll_interval = poll_interval
+        self.health_interval = health_interval
+        self.reconnect_min_delay = reconnect_min_delay
+        self.reconnect_max_delay = reconnect_max_delay
+        self.reconnects = 0
+        self.dropped_clients = 0
+
+        self._clients: Set[HubClient] = set()
+        self._drops: Set[asyncio.Task] = set()
+        self._refcounts: Dict[str, int] = {}
+        self._latest: Dict[str, Dict[str, Any]] = {}
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._socket = None
+        self._poller: Optional[asyncio.Task] = None
+        self._supervisor: Optional[asyncio.Task] = None
+        self._upstream_closed = asyncio.Event()
+        self._lock = asyncio.Lock()
+
+    # ==================== Upstream ====================
+
+    def _on_tick(self, update: Any) -> None:
+        """Called from the websocket thread for every tick."""
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._publish, update.model_dump())
+
+    def _publish(self, payload: Dict[str, Any]) -> None:
+        """Store the latest value for a symbol and offer it to subscribed clients."""
+        symbol = payload.get("symbol")
+        if not symbol:
+            return
+        self._latest[symbol] = payload
+        for client in self._clients:
+            client.offer(symbol, payload)
+
+    def _on_upstream_close(self, message: Any) -> None:
+        """Called from the websocket thread when the connection closes."""
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._upstream_closed.set)
+
+    async def _open_socket(self) -> None:
+        socket = self._broker_factory().create_data_websocket(
+            on_message=self._on_tick, on_close=self._on_upstream_close,
+        )
+        await socket.connect()
+        self._socket = socket
+        logger.info("Market data hub connected to Fyers data websocket")
+
+    def _start_poller(self) -> None:
+        if self._poller is None:
+            self._poller = asyncio.create_task(self._poll())
+
+    async def _ensure_upstream(self) -> None:
+        """Open the shared websocket once, falling back to a shared poller."""
+        if self._supervisor is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        try:
+            await self._open_socket()
+        except Exception as e:
+            logger.warning(f"Data websocket unavailable ({e}); falling back to shared REST polling")
+            self._start_poller()
+        self._supervisor = asyncio.create_task(self._supervise())
+
+    def _upstream_healthy(self) -> bool:
+        try:
+            return self._socket is not None and self._socket.is_connected()
+        except Exception:
+            return False
+
+    async def _supervise(self) -> None:
+        """Reopen the websocket with backoff whenever it is down; poll meanwhile."""
+        delay = self.reconnect_min_delay
+        misses = 0
+        while True:
+            try:
+                await asyncio.wait_for(self._upstream_closed.wait(), timeout=self.health_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._upstream_closed.clear()
+
+            if self._upstream_healthy():
+                misses, delay = 0, self.reconnect_min_delay
+                continue
+            misses += 1
+            if self._socket is not None and misses < 2:
+                continue  # Give the SDK's own reconnect one interval first
+
+            if await self._reconnect():
+                misses, delay = 0, self.reconnect_min_delay
+                continue
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.reconnect_max_delay)
+
+    async def _reconnect(self) -> bool:
+        """Replace the upstream websocket and resubscribe the symbol union."""
+        async with self._lock:
+            if self._socket is not None:
+                logger.warning("Market data hub lost the data websocket; reconnecting")
+                try:
+                    await self._socket.close()
+                except Exception as e:
+                    logger.debug(f"Error closing dropped data websocket: {e}")
+                self._socket = None
+            # Clients keep receiving (polled) updates while the socket is down
+            self._start_poller()
+            try:
+                await self._open_socket()
+                if self._refcounts:
+                    await self._socket.subscribe(list(self._refcounts))
+            except Exception as e:
+                logger.warning(f"Data websocket reconnect failed: {e}")
+                if self._socket is not None:
+                    try:
+                        await self._socket.close()
+                    except Exception:
+                        pass
+                    self._socket = None
+                return False
+            self.reconnects += 1
+            if self._poller is not None:
+                self._poller.cancel()
+                self._poller = None
+            return True
+
+    async def _poll(self) -> None:
+        """Shared REST fallback: one get_quotes call per interval for all clients."""
+        while True:
+            symbols = list(self._refcounts)
+            if symbols:
+                try:
+                    quotes = await self._broker_factory().get_quotes(symbols)
+                    for quote in quotes.quotes or []:
+                        payload = quote.model_dump()
+                        payload.setdefault("symbol", getattr(quote, "symbol", None))
+                        self._publish(payload)
+                except Exception as e:
+                    logger.warning(f"Market data poll failed: {e}")
+            await asyncio.sleep(self.poll_interval)
+
+    # ==================== Clients ====================
+
+    async def connect(self, websocket: WebSocket, symbols: Iterable[str] = DEFAULT_SYMBOLS) -> HubClient:
+        """Register a connected websocket and subscribe it to initial symbols."""
+        client = HubClient(websocket, self.min_interval, self.send_timeout, on_dead=self._on_client_dead)
+        self._clients.add(client)
+        client.start()
+        await self.subscribe(client, symbols)
+        return client
+
+    async def disconnect(self, client: HubClient) -> None:
+        """Unregister a websocket and release its symbols."""
+        self._clients.discard(client)
+        await client.stop()
+        await self.unsubscribe(client, list(client.symbols))
+
+    def _on_client_dead(self, client: HubClient) -> None:
+        """Called by a client's sender when a frame fails or times out."""
+        if client in self._clients:
+            self._clients.discard(client)
+            self.dropped_clients += 1
+            task = asyncio.create_task(self._drop(client))
+            self._drops.add(task)
+            task.add_done_callback(self._drops.discard)
+
+    async def _drop(self, client: HubClient) -> None:
+        await self.unsubscribe(client, list(client.symbols))
+        try:
+            await client.websocket.close(code=1013)  # Try again later
+        except Exception as e:
+            logger.debug(f"Error closing dropped client websocket: {e}")
+
+    async def subscribe(self, client: HubClient, symbols: Iterable[str]) -> None:
+        """Add symbols to a client, subscribing upstream only for new ones."""
+        if client.dead:
+            return
+        new_symbols = [s for s in dict.fromkeys(symbols) if s and s not in client.symbols]
+        if not new_symbols:
+            return
+
+        async with self._lock:
+            await self._ensure_upstream()
+            upstream_new = []
+            for symbol in new_symbols:
+                client.symbols.add(symbol)
+                if self._refcounts.get(symbol, 0) == 0:
+                    upstream_new.append(symbol)
+                self._refcounts[symbol] = self._refcounts.get(symbol, 0) + 1
+
+            if upstream_new and self._socket is not None:
+                await self._socket.subscribe(upstream_new)
+
+        # Send cached values right away so new clients don't wait for a tick
+        for symbol in new_symbols:
+            if symbol in self._latest:
+                client.offer(symbol, self._latest[symbol])
+
+    async def unsubscribe(self, client: HubClient, symbols: Iterable[str]) -> None:
+        """Remove symbols from a client, unsubscribing upstream when unused."""
+        async with self._lock:
+            released = []
+            for symbol in symbols:
+                if symbol not in client.symbols:
+                    continue
+                client.symbols.discard(symbol)
+                count = self._refcounts.get(symbol, 0) - 1
+                if count <= 0:
+                    self._refcounts.pop(symbol, None)
+                    self._latest.pop(symbol, None)
+                    released.append(symbol)
+                else:
+                    self._refcounts[symbol] = count
+
+            if released and self._socket is not None:
+                await self._socket.unsubscribe(released)
+
+    async def handle_message(self, client: HubClient, message: Dict[str, Any]) -> None:
+        """Apply a client control message ({"action": "subscribe"|"unsubscribe", "symbols": [...]})."""
+        action = message.get("action")
+        symbols = message.get("symbols") or []
+        if isinstance(symbols, str):
+            symbols = [symbols]
+
+        if action == "subscribe":
+            await self.subscribe(client, symbols)
+        elif action == "unsubscribe":
+            await self.unsubscribe(client, symbols)
+        else:
+            return
+
+        await client.websocket.send_json({
+            "type": "subscriptions",
+            "symbols": sorted(client.symbols),
+        })
+
+    # ==================== Lifecycle ====================
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """Hub statistics for diagnostics."""
+        return {
+            "clients": len(self._clients),
+            "upstream_symbols": sorted(self._refcounts),
+            "mode": "websocket" if self._socket is not None else ("polling" if self._poller else "idle"),
+            "sent_frames": sum(c.sent_frames for c in self._clients),
+            "dropped_updates": sum(c.dropped_updates for c in self._clients),
+            "reconnects": self.reconnects,
+            "dropped_clients": self.dropped_clients,
+        }
+
+    async def close(self) -> None:
+        """Close all clients and the upstream connection."""
+        for client in list(self._clients):
+            await client.stop()
+        self._clients.clear()
+        self._refcounts.clear()
+        if self._supervisor is not None:
+            self._supervisor.cancel()
+            self._supervisor = None
+        if self._poller is not None:
+            self._poller.cancel()
+            self._poller = None
+        if self._socket is not None:
+            try:
+                await self._socket.close()
+            except Exception as e:
+                logger.warning(f"Error closing data websocket: {e}")
+            self._socket = None
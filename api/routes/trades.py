@@ -13,6 +13,7 @@ from typing import Optional, List
 
 from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel
+from sqlalchemy import and_, case
 from sqlmodel import Session, select, func
 
 from core.models import Trade, engine
@@ -68,6 +69,123 @@ class DailyTradesResponse(BaseModel):
     summary: TradeSummary
 
 
+# ==============================================================================
+# Aggregate Queries
+# ==============================================================================
+
+def _summary_columns():
+    """SQL aggregate columns for a trade summary (computed in a single pass)."""
+    closed = Trade.status == "CLOSED"
+    pnl = func.coalesce(Trade.realized_pnl, 0.0)
+    won = and_(closed, pnl > 0)
+    lost = and_(closed, pnl < 0)
+    return (
+        func.count(Trade.id).label("total_trades"),
+        func.sum(case((Trade.status == "OPEN", 1), else_=0)).label("open_trades"),
+        func.sum(case((closed, 1), else_=0)).label("closed_trades"),
+        func.sum(case((won, 1), else_=0)).label("winners"),
+        func.sum(case((lost, 1), else_=0)).label("losers"),
+        func.sum(case((closed, pnl), else_=0.0)).label("total_pnl"),
+        func.sum(case((won, pnl), else_=0.0)).label("win_pnl"),
+        func.sum(case((lost, pnl), else_=0.0)).label("loss_pnl"),
+    )
+
+
+def query_daily_summary(db: Session, target_date: str) -> TradeSummary:
+    """
+    Build the summary for one trading day with SQL aggregates.
+
+    Args:
+        db: Database session
+        target_date: Date in YYYY-MM-DD format
+
+    Returns:
+        TradeSummary for the date
+    """
+    row = db.exec(select(*_summary_columns()).where(Trade.date == target_date)).one()
+
+    closed_today = and_(Trade.date == target_date, Trade.status == "CLOSED")
+    pnl = func.coalesce(Trade.realized_pnl, 0.0)
+    best = db.exec(
+        select(Trade.symbol).where(closed_today).order_by(pnl.desc()).limit(1)
+    ).first()
+    worst = db.exec(
+        select(Trade.symbol).where(closed_today).order_by(pnl.asc()).limit(1)
+    ).first()
+
+    closed = row.closed_trades or 0
+    winners = row.winners or 0
+    losers = row.losers or 0
+    total_pnl = row.total_pnl or 0.0
+
+    from core.config import get_settings
+    settings = get_settings()
+
+    return TradeSummary(
+        date=target_date,
+        total_trades=row.total_trades or 0,
+        open_trades=row.open_trades or 0,
+        closed_trades=closed,
+        winners=winners,
+        losers=losers,
+        win_rate=winners / max(closed, 1) * 100,
+        total_pnl=total_pnl,
+        pnl_percent=total_pnl / settings.BASE_CAPITAL * 100,
+        avg_win=(row.win_pnl or 0.0) / max(winners, 1),
+        avg_loss=abs(row.loss_pnl or 0.0) / max(losers, 1),
+        best_trade=best,
+        worst_trade=worst,
+    )
+
+
+def query_daily_breakdown(
+    db: Session,
+    start_date: str,
+    symbol: Optional[str] = None,
+    status: Optional[str] = None,
+    direction: Optional[str] = None,
+) -> List[dict]:
+    """
+    Per-day trade counts, winners and P&L since a date (one GROUP BY query).
+
+    Args:
+        db: Database session
+        start_date: First date (inclusive) in YYYY-MM-DD format
+        symbol: Optional symbol filter
+        status: Optional status filter
+        direction: Optional direction filter
+
+    Returns:
+        List of per-day dicts sorted by date
+    """
+    pnl = func.coalesce(Trade.realized_pnl, 0.0)
+    statement = select(
+        Trade.date,
+        func.count(Trade.id).label("trades"),
+        func.sum(case((pnl > 0, 1), else_=0)).label("winners"),
+        func.sum(pnl).label("pnl"),
+    ).where(Trade.date >= start_date)
+
+    if symbol:
+        statement = statement.where(Trade.symbol == symbol)
+    if status:
+        statement = statement.where(Trade.status == status)
+    if direction:
+        statement = statement.where(Trade.direction == direction)
+
+    rows = db.exec(statement.group_by(Trade.date).order_by(Trade.date)).all()
+    return [
+        {
+            "date": row.date,
+            "trades": row.trades,
+            "winners": row.winners or 0,
+            "win_rate": (row.winners or 0) / row.trades * 100,
+            "pnl": row.pnl or 0.0,
+        }
+        for row in rows
+    ]
+
+
 # ==============================================================================
 # Endpoints
 # ==============================================================================
@@ -86,46 +204,7 @@ async def get_daily_trades(
     with Session(engine) as db:
         statement = select(Trade).where(Trade.date == target_date)
         trades = db.exec(statement).all()
-
-    if not trades:
-        return DailyTradesResponse(
-            date=target_date,
-            trades=[],
-            summary=TradeSummary(
-                date=target_date,
-                total_trades=0,
-                open_trades=0,
-                closed_trades=0,
-                winners=0,
-                losers=0,
-                win_rate=0.0,
-                total_pnl=0.0,
-                pnl_percent=0.0,
-                avg_win=0.0,
-                avg_loss=0.0,
-                best_trade=None,
-                worst_trade=None,
-            )
-        )
-
-    # Calculate summary
-    closed = [t for t in trades if t.status == "CLOSED"]
-    open_trades = [t for t in trades if t.status == "OPEN"]
-    winners = [t for t in closed if (t.realized_pnl or 0) > 0]
-    losers = [t for t in closed if (t.realized_pnl or 0) < 0]
-
-    total_pnl = sum(t.realized_pnl or 0 for t in closed)
-    win_rate = len(winners) / max(len(closed), 1) * 100
-    avg_win = sum(t.realized_pnl or 0 for t in winners) / max(len(winners), 1)
-    avg_loss = abs(sum(t.realized_pnl or 0 for t in losers)) / max(len(losers), 1)
-
-    # Find best and worst trades
-    best = max(closed, key=lambda t: t.realized_pnl or 0, default=None)
-    worst = min(closed, key=lambda t: t.realized_pnl or 0, default=None)
-
-    from core.config import get_settings
-    settings = get_settings()
-    pnl_percent = total_pnl / settings.BASE_CAPITAL * 100
+        summary = query_daily_summary(db, target_date)
 
     trade_responses = [
         TradeResponse(
@@ -152,21 +231,7 @@ async def get_daily_trades(
     return DailyTradesResponse(
         date=target_date,
         trades=trade_responses,
-        summary=TradeSummary(
-            date=target_date,
-            total_trades=len(trades),
-            open_trades=len(open_trades),
-            closed_trades=len(closed),
-            winners=len(winners),
-            losers=len(losers),
-            win_rate=win_rate,
-            total_pnl=total_pnl,
-            pnl_percent=pnl_percent,
-            avg_win=avg_win,
-            avg_loss=avg_loss,
-            best_trade=best.symbol if best else None,
-            worst_trade=worst.symbol if worst else None,
-        )
+        summary=summary,
     )
 
 
@@ -196,6 +261,9 @@ async def get_trade_history(
 
         statement = statement.order_by(Trade.date.desc(), Trade.entry_time.desc())
         trades = db.exec(statement).all()
+        daily_breakdown = query_daily_breakdown(
+            db, start_date, symbol=symbol, status=status, direction=direction
+        )
 
     return {
         "start_date": start_date,
@@ -206,6 +274,7 @@ async def get_trade_history(
             "status": status,
             "direction": direction,
         },
+        "daily_breakdown": daily_breakdown,
         "trades": [
             {
                 "id": t.id,
@@ -265,13 +334,9 @@ async def get_weekly_summary():
     start_date = (date.today() - timedelta(days=7)).isoformat()
 
     with Session(engine) as db:
-        statement = select(Trade).where(
-            Trade.date >= start_date,
-            Trade.status == "CLOSED"
-        )
-        trades = db.exec(statement).all()
+        daily_breakdown = query_daily_breakdown(db, start_date, status="CLOSED")
 
-    if not trades:
+    if not daily_breakdown:
         return {
             "period": f"{start_date} to {date.today().isoformat()}",
             "trading_days": 0,
@@ -281,36 +346,18 @@ async def get_weekly_summary():
             "daily_breakdown": [],
         }
 
-    # Group by date
-    by_date = {}
-    for t in trades:
-        if t.date not in by_date:
-            by_date[t.date] = []
-        by_date[t.date].append(t)
-
-    daily_breakdown = []
-    for d, day_trades in sorted(by_date.items()):
-        winners = [t for t in day_trades if (t.realized_pnl or 0) > 0]
-        pnl = sum(t.realized_pnl or 0 for t in day_trades)
-        daily_breakdown.append({
-            "date": d,
-            "trades": len(day_trades),
-            "winners": len(winners),
-            "win_rate": len(winners) / len(day_trades) * 100,
-            "pnl": pnl,
-        })
-
-    winners = [t for t in trades if (t.realized_pnl or 0) > 0]
-    total_pnl = sum(t.realized_pnl or 0 for t in trades)
+    total_trades = sum(d["trades"] for d in daily_breakdown)
+    winners = sum(d["winners"] for d in daily_breakdown)
+    total_pnl = sum(d["pnl"] for d in daily_breakdown)
 
     return {
         "period": f"{start_date} to {date.today().isoformat()}",
-        "trading_days": len(by_date),
-        "total_trades": len(trades),
-        "winners": len(winners),
-        "losers": len(trades) - len(winners),
-        "win_rate": len(winners) / len(trades) * 100 if trades else 0,
+        "trading_days": len(daily_breakdown),
+        "total_trades": total_trades,
+        "winners": winners,
+        "losers": total_trades - winners,
+        "win_rate": winners / total_trades * 100,
         "total_pnl": total_pnl,
-        "avg_daily_pnl": total_pnl / len(by_date) if by_date else 0,
+        "avg_daily_pnl": total_pnl / len(daily_breakdown),
         "daily_breakdown": daily_breakdown,
     }
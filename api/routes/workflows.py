@@ -4,6 +4,7 @@ Workflow Sessions API Routes
 Provides endpoints for:
 - GET /api/workflows/sessions - Get workflow sessions
 - GET /api/workflows/runs/{workflow_name}/{session_id} - Get run details
+- GET /api/workflows/profile/{workflow_name}/{session_id} - Get run latency profile
 - GET /api/workflows/analysis/daily - Get daily analysis summary
 - GET /api/workflows/picks/today - Get today's picks
 """
@@ -174,6 +175,56 @@ async def get_workflow_run(workflow_name: str, session_id: str):
     }
 
 
+@router.get("/profile/{workflow_name}/{session_id}")
+async def get_workflow_profile(
+    workflow_name: str,
+    session_id: str,
+    run_id: Optional[str] = Query(None, description="Specific run (defaults to the latest run of the session)"),
+):
+    """
+    Get the latency profile of a workflow run.
+
+    Returns per-step durations, top tools by total time, p50/p95 latency
+    per HTTP endpoint, cache hits and rate-limiter waits, plus the other
+    profiled runs of the session.
+    """
+    workflow = get_workflow_by_name(workflow_name)
+
+    if not workflow:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Workflow '{workflow_name}' not found"
+        )
+
+    from core.profiling import profile_store
+
+    try:
+        profile = (
+            profile_store.get(run_id)
+            if run_id
+            else profile_store.latest(workflow.name, session_id=session_id)
+        )
+        runs = profile_store.list_runs(workflow.name, session_id=session_id)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error retrieving profile: {str(e)}"
+        )
+
+    if not profile:
+        raise HTTPException(
+            status_code=404,
+            detail=f"No profiled run found for {workflow_name} on {session_id}"
+        )
+
+    return {
+        "workflow": workflow_name,
+        "session_id": session_id,
+        "profile": profile,
+        "runs": runs,
+    }
+
+
 @router.get("/analysis/daily")
 async def get_daily_analysis(
     target_date: Optional[str] = Query(None, description="Date in YYYY-MM-DD format")
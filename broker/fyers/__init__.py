@@ -107,6 +107,8 @@ from broker.fyers.data.symbol_master import (
     SymbolMaster,
     Symbol,
     ExchangeSegment,
+    SymbolChange,
+    SymbolMasterDiff,
 )
 from broker.fyers.webhooks.postback import (
     PostbackPayload,
@@ -227,6 +229,8 @@ __all__ = [
     "SymbolMaster",
     "Symbol",
     "ExchangeSegment",
+    "SymbolChange",
+    "SymbolMasterDiff",
     
     # Webhooks
     "PostbackPayload",
@@ -20,6 +20,8 @@ from broker.fyers.core.logger import get_logger
 from broker.fyers.core.rate_limiter import RateLimiter
 from broker.fyers.models.config import FyersConfig
 from broker.fyers.models.rate_limit import RateLimitConfig
+from core.http_replay import default_transport
+from core.profiling import span
 
 logger = get_logger("fyers.http_client")
 
@@ -45,6 +47,7 @@ class HTTPClient:
         config: FyersConfig,
         rate_limiter: Optional[RateLimiter] = None,
         timeout: float = 30.0,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
     ):
         """
         Initialize the HTTP client.
@@ -53,9 +56,12 @@ class HTTPClient:
             config: Fyers configuration
             rate_limiter: Optional rate limiter (creates one if not provided)
             timeout: Request timeout in seconds
+            transport: Optional httpx transport (e.g. a replay transport from
+                core.http_replay); defaults to the process-wide record/replay mode
         """
         self.config = config
         self.timeout = timeout
+        self._transport = transport
         
         # Initialize rate limiter
         if rate_limiter:
@@ -235,120 +241,129 @@ class HTTPClient:
             FyersAPIError: If API returns an error
             FyersNetworkError: If network error occurs
         """
-        url = self._build_url(endpoint, base_url)
-        request_headers = self._get_headers(headers)
+        with span("http", f"fyers:{endpoint}", method=method.upper(), cache__hit=False) as s:
+            url = self._build_url(endpoint, base_url)
+            request_headers = self._get_headers(headers)
 
-        last_error: Optional[Exception] = None
+            last_error: Optional[Exception] = None
+            rate_limit_wait = 0.0
 
-        for attempt in range(max_retries + 1):
-            # Check rate limit with automatic retry
-            if not skip_rate_limit:
-                try:
-                    await self.rate_limiter.acquire()
-                except FyersRateLimitError as e:
-                    # Check if it's a daily limit (can't retry)
-                    if e.limit_type == "day":
-                        logger.error(f"Daily rate limit reached. Cannot retry.")
-                        raise
-
-                    # For second/minute limits, wait and retry
-                    retry_after = e.retry_after or BASE_BACKOFF
-                    # Apply exponential backoff
-                    backoff = min(retry_after * (1.5 ** attempt), MAX_BACKOFF)
+            for attempt in range(max_retries + 1):
+                s.set("attempts", attempt + 1)
+                # Check rate limit with automatic retry
+                if not skip_rate_limit:
+                    try:
+                        await self.rate_limiter.acquire()
+                    except FyersRateLimitError as e:
+                        # Check if it's a daily limit (can't retry)
+                        if e.limit_type == "day":
+                            logger.error(f"Daily rate limit reached. Cannot retry.")
+                            raise
+
+                        # For second/minute limits, wait and retry
+                        retry_after = e.retry_after or BASE_BACKOFF
+                        # Apply exponential backoff
+                        backoff = min(retry_after * (1.5 ** attempt), MAX_BACKOFF)
+
+                        if attempt < max_retries:
+                            logger.info(
+                                f"Rate limit hit for {endpoint}. "
+                                f"Waiting {backoff:.2f}s before retry {attempt + 1}/{max_retries}"
+                            )
+                            await asyncio.sleep(backoff)
+                            rate_limit_wait += backoff
+                            s.set("rate_limit.wait_s", round(rate_limit_wait, 3))
+                            continue
+                        else:
+                            logger.error(
+                                f"Rate limit exceeded after {max_retries} retries for {endpoint}"
+                            )
+                            raise
+
+                start_time = time.time()
 
-                    if attempt < max_retries:
-                        logger.info(
-                            f"Rate limit hit for {endpoint}. "
-                            f"Waiting {backoff:.2f}s before retry {attempt + 1}/{max_retries}"
-                        )
-                        await asyncio.sleep(backoff)
-                        continue
-                    else:
-                        logger.error(
-                            f"Rate limit exceeded after {max_retries} retries for {endpoint}"
+                try:
+                    logger.debug(f"Making {method} request to {url} (attempt {attempt + 1})")
+
+                    async with httpx.AsyncClient(
+                        transport=self._transport or default_transport(is_async=True)
+                    ) as client:
+                        response = await client.request(
+                            method=method.upper(),
+                            url=url,
+                            params=params,
+                            json=json_data,
+                            headers=request_headers,
+                            timeout=self.timeout,
                         )
-                        raise
 
-            start_time = time.time()
+                    elapsed_ms = (time.time() - start_time) * 1000
 
-            try:
-                logger.debug(f"Making {method} request to {url} (attempt {attempt + 1})")
+                    # Record the request
+                    if not skip_rate_limit:
+                        await self.rate_limiter.record(endpoint=endpoint, success=True)
 
-                async with httpx.AsyncClient() as client:
-                    response = await client.request(
-                        method=method.upper(),
-                        url=url,
-                        params=params,
-                        json=json_data,
-                        headers=request_headers,
-                        timeout=self.timeout,
-                    )
+                    logger.debug(f"{method} {endpoint} completed in {elapsed_ms:.0f}ms")
 
-                elapsed_ms = (time.time() - start_time) * 1000
+                    return await self._handle_response(response, endpoint)
 
-                # Record the request
-                if not skip_rate_limit:
-                    await self.rate_limiter.record(endpoint=endpoint, success=True)
-
-                logger.debug(f"{method} {endpoint} completed in {elapsed_ms:.0f}ms")
+                except httpx.RequestError as e:
+                    elapsed_ms = (time.time() - start_time) * 1000
+                    last_error = e
 
-                return await self._handle_response(response, endpoint)
+                    # Record failed request
+                    if not skip_rate_limit:
+                        await self.rate_limiter.record(endpoint=endpoint, success=False)
 
-            except httpx.RequestError as e:
-                elapsed_ms = (time.time() - start_time) * 1000
-                last_error = e
-
-                # Record failed request
-                if not skip_rate_limit:
-                    await self.rate_limiter.record(endpoint=endpoint, success=False)
-
-                # Retry on network errors with backoff
-                if attempt < max_retries:
-                    backoff = min(BASE_BACKOFF * (2 ** attempt), MAX_BACKOFF)
-                    logger.warning(
-                        f"Network error for {method} {endpoint}: {e}. "
-                        f"Retrying in {backoff:.2f}s ({attempt + 1}/{max_retries})"
-                    )
-                    await asyncio.sleep(backoff)
-                    continue
+                    # Retry on network errors with backoff
+                    if attempt < max_retries:
+                        backoff = min(BASE_BACKOFF * (2 ** attempt), MAX_BACKOFF)
+                        logger.warning(
+                            f"Network error for {method} {endpoint}: {e}. "
+                            f"Retrying in {backoff:.2f}s ({attempt + 1}/{max_retries})"
+                        )
+                        await asyncio.sleep(backoff)
+                        continue
 
-                logger.error(f"Network error for {method} {endpoint} after {max_retries} retries: {e}")
-                raise FyersNetworkError(f"Network error: {e}")
+                    logger.error(f"Network error for {method} {endpoint} after {max_retries} retries: {e}")
+                    raise FyersNetworkError(f"Network error: {e}")
 
-            except FyersRateLimitError as e:
-                # HTTP 429 response - wait and retry
-                if not skip_rate_limit:
-                    await self.rate_limiter.record(endpoint=endpoint, success=False)
+                except FyersRateLimitError as e:
+                    # HTTP 429 response - wait and retry
+                    if not skip_rate_limit:
+                        await self.rate_limiter.record(endpoint=endpoint, success=False)
 
-                retry_after = e.retry_after or BASE_BACKOFF
-                backoff = min(retry_after * (1.5 ** attempt), MAX_BACKOFF)
+                    retry_after = e.retry_after or BASE_BACKOFF
+                    backoff = min(retry_after * (1.5 ** attempt), MAX_BACKOFF)
 
-                if attempt < max_retries:
-                    logger.info(
-                        f"HTTP 429 for {endpoint}. "
-                        f"Waiting {backoff:.2f}s before retry {attempt + 1}/{max_retries}"
-                    )
-                    await asyncio.sleep(backoff)
-                    continue
+                    if attempt < max_retries:
+                        logger.info(
+                            f"HTTP 429 for {endpoint}. "
+                            f"Waiting {backoff:.2f}s before retry {attempt + 1}/{max_retries}"
+                        )
+                        await asyncio.sleep(backoff)
+                        rate_limit_wait += backoff
+                        s.set("rate_limit.wait_s", round(rate_limit_wait, 3))
+                        continue
 
-                logger.error(f"Rate limit exceeded after {max_retries} retries for {endpoint}")
-                raise
+                    logger.error(f"Rate limit exceeded after {max_retries} retries for {endpoint}")
+                    raise
 
-            except (FyersAPIError, FyersAuthenticationError):
-                # Re-raise known exceptions without retry
-                if not skip_rate_limit:
-                    await self.rate_limiter.record(endpoint=endpoint, success=False)
-                raise
+                except (FyersAPIError, FyersAuthenticationError):
+                    # Re-raise known exceptions without retry
+                    if not skip_rate_limit:
+                        await self.rate_limiter.record(endpoint=endpoint, success=False)
+                    raise
 
-            except Exception as e:
-                if not skip_rate_limit:
-                    await self.rate_limiter.record(endpoint=endpoint, success=False)
-                logger.error(f"Unexpected error for {method} {endpoint}: {e}")
-                raise FyersAPIError(f"Unexpected error: {e}")
+                except Exception as e:
+                    if not skip_rate_limit:
+                        await self.rate_limiter.record(endpoint=endpoint, success=False)
+                    logger.error(f"Unexpected error for {method} {endpoint}: {e}")
+                    raise FyersAPIError(f"Unexpected error: {e}")
 
-        # Should not reach here, but just in case
-        if last_error:
-            raise FyersNetworkError(f"Request failed after {max_retries} retries: {last_error}")
+            # Should not reach here, but just in case
+            if last_error:
+                raise FyersNetworkError(f"Request failed after {max_retries} retries: {last_error}")
     
     async def get(
         self,
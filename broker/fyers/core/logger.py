@@ -3,10 +3,15 @@ Logging configuration for the Fyers SDK.
 """
 
 import logging
+import logging.handlers
 import sys
 from typing import Optional
 
 
+def _root_queue_installed() -> bool:
+    return any(isinstance(h, logging.handlers.QueueHandler) for h in logging.getLogger().handlers)
+
+
 def get_logger(
     name: str = "fyers",
     level: int = logging.INFO,
@@ -29,6 +34,14 @@ def get_logger(
     
     logger = logging.getLogger(name)
     
+    # An application queue pipeline on the root logger (hagrid's
+    # setup_logging) does the I/O; propagate to it instead of writing here
+    if _root_queue_installed():
+        logger.setLevel(level)
+        logger.handlers.clear()
+        logger.propagate = True
+        return logger
+    
     # Only configure if no handlers exist
     if not logger.handlers:
         logger.setLevel(level)
@@ -10,6 +10,8 @@ from broker.fyers.data.symbol_master import (
     Exchange,
     Segment,
     ExchangeSegment,
+    SymbolChange,
+    SymbolMasterDiff,
 )
 
 __all__ = [
@@ -18,4 +20,6 @@ __all__ = [
     "Exchange",
     "Segment",
     "ExchangeSegment",
+    "SymbolChange",
+    "SymbolMasterDiff",
 ]
\ No newline at end of file
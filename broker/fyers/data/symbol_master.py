@@ -2,19 +2,28 @@
 Symbol Master module for the Fyers SDK.
 
 Provides functionality to download and query symbol master files.
+
+Segment files are kept as daily snapshots ({segment}_{YYYY-MM-DD}.json)
+under the cache directory. A new day's file is downloaded conditionally
+(ETag / Last-Modified, then content hash), diffed against the previous
+snapshot, and the diff is applied to already loaded indexes in place.
 """
 
 import csv
+import hashlib
 import io
 import json
+import os
+import re
 from datetime import datetime, date
 from pathlib import Path
-from typing import Optional, Dict, List, Any, Iterator, Union
+from typing import Optional, Dict, List, Any, Iterator, Tuple, Union
 from pydantic import BaseModel, Field
 
 import httpx
 
 from broker.fyers.core.logger import get_logger
+from core.http_replay import default_transport
 from broker.fyers.models.enums import Exchange, Segment
 
 logger = get_logger("fyers.symbol_master")
@@ -22,6 +31,19 @@ logger = get_logger("fyers.symbol_master")
 # Default cache directory for all Fyers SDK data
 DEFAULT_CACHE_DIR = Path.home() / ".cache" / "fyers"
 
+# Daily snapshots kept per segment
+DEFAULT_RETENTION_DAYS = 3
+
+# Raw fields that move every session (prices, OI, circuit limits). They are
+# refreshed in place and not reported as contract changes.
+VOLATILE_FIELDS = {
+    "previousClose": "previous_close",
+    "previousOi": "previous_oi",
+    "upperPrice": "upper_price",
+    "lowerPrice": "lower_price",
+    "lastUpdate": "last_update",
+}
+
 
 class ExchangeSegment:
     """Exchange and segment combinations with URLs."""
@@ -134,6 +156,95 @@ class Symbol(BaseModel):
             return None
 
 
+class SymbolChange(BaseModel):
+    """A contract added, removed or changed between two symbol master snapshots."""
+    
+    ticker: str
+    underlying: Optional[str] = None
+    expiry: Optional[str] = Field(None, description="Expiry date (YYYY-MM-DD)")
+    strike: Optional[float] = None
+    option_type: Optional[str] = None
+    lot_size: Optional[int] = None
+    fields: List[str] = Field(default_factory=list, description="Changed raw fields (changes only)")
+    
+    @classmethod
+    def from_raw(cls, ticker: str, raw: Dict[str, Any], fields: Optional[List[str]] = None) -> "SymbolChange":
+        """Build from a raw symbol master JSON entry."""
+        expiry = None
+        try:
+            if raw.get("expiryDate"):
+                expiry = datetime.fromtimestamp(int(raw["expiryDate"])).date().isoformat()
+        except (ValueError, TypeError, OSError):
+            pass
+        return cls(
+            ticker=ticker,
+            underlying=raw.get("underSym") or None,
+            expiry=expiry,
+            strike=raw.get("strikePrice") if raw.get("strikePrice") not in (None, -1, -1.0) else None,
+            option_type=raw.get("optType") if raw.get("optType") in ("CE", "PE") else None,
+            lot_size=raw.get("minLotSize"),
+            fields=fields or [],
+        )
+
+
+class SymbolMasterDiff(BaseModel):
+    """Added / removed / changed contracts of one segment between two daily snapshots."""
+    
+    segment: str
+    from_day: Optional[str] = Field(None, description="Previous snapshot day (None on first download)")
+    to_day: str
+    not_modified: bool = Field(False, description="Upstream file unchanged (304 or same hash)")
+    added: List[SymbolChange] = Field(default_factory=list)
+    removed: List[SymbolChange] = Field(default_factory=list)
+    changed: List[SymbolChange] = Field(default_factory=list)
+    
+    @property
+    def is_empty(self) -> bool:
+        """True when no contract was added, removed or changed."""
+        return not (self.added or self.removed or self.changed)
+    
+    def for_underlying(self, underlying: str) -> "SymbolMasterDiff":
+        """The same diff restricted to one underlying (e.g. "NIFTY")."""
+        key = underlying.upper()
+        keep = lambda items: [c for c in items if (c.underlying or "").upper() == key]
+        return self.model_copy(update={
+            "added": keep(self.added),
+            "removed": keep(self.removed),
+            "changed": keep(self.changed),
+        })
+
+
+def diff_symbol_data(
+    old: Dict[str, Dict[str, Any]],
+    new: Dict[str, Dict[str, Any]],
+    segment: str,
+    from_day: Optional[str],
+    to_day: str,
+) -> SymbolMasterDiff:
+    """
+    Compare two raw symbol master payloads (ticker -> raw entry).
+    
+    Entries whose only differences are VOLATILE_FIELDS are not reported.
+    """
+    added = [SymbolChange.from_raw(t, new[t]) for t in sorted(new.keys() - old.keys())]
+    removed = [SymbolChange.from_raw(t, old[t]) for t in sorted(old.keys() - new.keys())]
+    changed = []
+    for ticker in sorted(new.keys() & old.keys()):
+        before, after = old[ticker], new[ticker]
+        if before == after:
+            continue
+        fields = sorted(
+            k for k in before.keys() | after.keys()
+            if k not in VOLATILE_FIELDS and before.get(k) != after.get(k)
+        )
+        if fields:
+            changed.append(SymbolChange.from_raw(ticker, after, fields))
+    return SymbolMasterDiff(
+        segment=segment, from_day=from_day, to_day=to_day,
+        added=added, removed=removed, changed=changed,
+    )
+
+
 class SymbolMaster:
     """
     Symbol Master manager for downloading and querying symbol data.
@@ -156,21 +267,29 @@ class SymbolMaster:
         ```
     """
     
-    def __init__(self, cache_dir: Optional[str] = None, enable_cache: bool = True):
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        enable_cache: bool = True,
+        retention_days: int = DEFAULT_RETENTION_DAYS,
+    ):
         """
         Initialize Symbol Master with automatic daily caching.
         
         Args:
             cache_dir: Directory to cache downloaded files (default: ~/.cache/fyers)
             enable_cache: Enable daily caching to avoid re-downloads (default: True)
+            retention_days: Daily snapshots (and diffs) kept per segment
         """
         self.cache_dir = Path(cache_dir) if cache_dir else DEFAULT_CACHE_DIR
         self.enable_cache = enable_cache
+        self.retention_days = retention_days
         self._symbols: Dict[str, Symbol] = {}
         self._by_fytoken: Dict[str, Symbol] = {}
         self._by_isin: Dict[str, List[Symbol]] = {}
         self._by_underlying: Dict[str, List[Symbol]] = {}
         self._loaded_segments: set = set()
+        self._diffs: Dict[str, SymbolMasterDiff] = {}
         
         # Create cache directory if it doesn't exist
         if self.enable_cache:
@@ -200,7 +319,7 @@ class SymbolMaster:
         
         logger.info(f"Downloading symbol master CSV: {exchange_segment}")
         
-        async with httpx.AsyncClient() as client:
+        async with httpx.AsyncClient(transport=default_transport(is_async=True)) as client:
             response = await client.get(url, timeout=timeout)
             response.raise_for_status()
             return response.text
@@ -226,49 +345,88 @@ class SymbolMaster:
         
         logger.info(f"Downloading symbol master JSON: {exchange_segment}")
         
-        async with httpx.AsyncClient() as client:
+        async with httpx.AsyncClient(transport=default_transport(is_async=True)) as client:
             response = await client.get(url, timeout=timeout)
             response.raise_for_status()
             return response.json()
     
-    def _get_cache_path(self, exchange_segment: str) -> Path:
-        """Get cache file path for a segment."""
-        today = date.today().isoformat()
-        return self.cache_dir / f"{exchange_segment}_{today}.json"
+    async def download_json_conditional(
+        self,
+        exchange_segment: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        timeout: float = 30.0,
+    ) -> Optional[Tuple[bytes, Dict[str, str]]]:
+        """
+        Download the symbol master JSON unless it is unchanged upstream.
+        
+        Args:
+            exchange_segment: One of ExchangeSegment values
+            etag: ETag of the last download (If-None-Match)
+            last_modified: Last-Modified of the last download (If-Modified-Since)
+            timeout: Request timeout
+            
+        Returns:
+            (raw body, validator headers), or None if upstream answered 304
+        """
+        url = ExchangeSegment.JSON_URLS.get(exchange_segment)
+        if not url:
+            raise ValueError(f"Invalid exchange segment: {exchange_segment}")
+        
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        
+        logger.info(f"Downloading symbol master JSON: {exchange_segment} (conditional={bool(headers)})")
+        
+        async with httpx.AsyncClient(transport=default_transport(is_async=True)) as client:
+            response = await client.get(url, headers=headers, timeout=timeout)
+            if response.status_code == 304:
+                return None
+            response.raise_for_status()
+            validators = {
+                "etag": response.headers.get("etag"),
+                "last_modified": response.headers.get("last-modified"),
+            }
+            return response.content, validators
+    
+    def _get_cache_path(self, exchange_segment: str, day: Optional[str] = None) -> Path:
+        """Get cache file path for a segment's daily snapshot (default: today)."""
+        day = day or date.today().isoformat()
+        return self.cache_dir / f"{exchange_segment}_{day}.json"
+    
+    def _meta_path(self, exchange_segment: str) -> Path:
+        return self.cache_dir / f"{exchange_segment}.meta.json"
+    
+    def _diff_path(self, exchange_segment: str, day: str) -> Path:
+        return self.cache_dir / f"{exchange_segment}_{day}.diff.json"
+    
+    def _snapshot_days(self, exchange_segment: str) -> List[str]:
+        """Days with a stored snapshot of the segment (oldest first)."""
+        pattern = re.compile(rf"^{re.escape(exchange_segment)}_(\d{{4}}-\d{{2}}-\d{{2}})\.json$")
+        days = []
+        for path in self.cache_dir.glob(f"{exchange_segment}_*.json"):
+            match = pattern.match(path.name)
+            if match:
+                days.append(match.group(1))
+        return sorted(days)
     
     def _is_cache_valid(self, exchange_segment: str) -> bool:
         """Check if cached data exists and is from today."""
         if not self.enable_cache:
             return False
         
-        cache_path = self._get_cache_path(exchange_segment)
-        if not cache_path.exists():
-            return False
-        
-        # Check if it's from today
-        today = date.today().isoformat()
-        return today in cache_path.name
-    
-    def _save_to_cache(self, exchange_segment: str, data: Dict[str, Any]) -> None:
-        """Save symbol data to cache."""
-        if not self.enable_cache:
-            return
-        
-        try:
-            cache_path = self._get_cache_path(exchange_segment)
-            with open(cache_path, 'w') as f:
-                json.dump(data, f)
-            logger.debug(f"Cached {exchange_segment} data to {cache_path}")
-        except Exception as e:
-            logger.warning(f"Failed to cache {exchange_segment}: {e}")
+        return self._get_cache_path(exchange_segment).exists()
     
-    def _load_from_cache(self, exchange_segment: str) -> Optional[Dict[str, Any]]:
-        """Load symbol data from cache."""
+    def _load_from_cache(self, exchange_segment: str, day: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Load a segment's raw symbol data from its daily snapshot (default: today)."""
         if not self.enable_cache:
             return None
         
         try:
-            cache_path = self._get_cache_path(exchange_segment)
+            cache_path = self._get_cache_path(exchange_segment, day)
             if cache_path.exists():
                 with open(cache_path, 'r') as f:
                     data = json.load(f)
@@ -279,6 +437,196 @@ class SymbolMaster:
         
         return None
     
+    def _read_json(self, path: Path) -> Optional[Dict[str, Any]]:
+        try:
+            with open(path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+    
+    def _write_atomic(self, path: Path, content: bytes) -> None:
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_bytes(content)
+        os.replace(tmp, path)
+    
+    def _prune_snapshots(self, exchange_segment: str) -> int:
+        """Delete snapshots and diffs older than the retention window. Returns files removed."""
+        days = self._snapshot_days(exchange_segment)
+        stale = days[:-self.retention_days] if self.retention_days > 0 else []
+        removed = 0
+        for day in stale:
+            for path in (self._get_cache_path(exchange_segment, day), self._diff_path(exchange_segment, day)):
+                if path.exists():
+                    path.unlink()
+                    removed += 1
+        if stale:
+            logger.info(f"Pruned {len(stale)} old {exchange_segment} snapshots")
+        return removed
+    
+    async def _refresh(self, exchange_segment: str) -> Tuple[SymbolMasterDiff, Optional[Dict[str, Any]]]:
+        """Conditionally download today's snapshot and diff it against the previous one."""
+        today = date.today().isoformat()
+        days = self._snapshot_days(exchange_segment)
+        previous = days[-1] if days else None
+        meta = self._read_json(self._meta_path(exchange_segment)) or {}
+        if meta.get("day") != previous:
+            meta = {}  # Validators belong to a snapshot that is gone
+        
+        result = await self.download_json_conditional(
+            exchange_segment, etag=meta.get("etag"), last_modified=meta.get("last_modified"),
+        )
+        digest = hashlib.sha256(result[0]).hexdigest() if result else meta.get("sha256")
+        
+        new_data = None
+        if previous and (result is None or digest == meta.get("sha256")):
+            # Unchanged upstream: the previous snapshot becomes today's
+            if previous != today:
+                os.replace(self._get_cache_path(exchange_segment, previous), self._get_cache_path(exchange_segment))
+                diff = SymbolMasterDiff(segment=exchange_segment, from_day=previous, to_day=today, not_modified=True)
+            else:
+                # Already refreshed today: keep today's diff rather than blanking it
+                stored = self._read_json(self._diff_path(exchange_segment, today))
+                diff = SymbolMasterDiff(**stored) if stored else SymbolMasterDiff(
+                    segment=exchange_segment, from_day=today, to_day=today, not_modified=True,
+                )
+        else:
+            if result is None:
+                raise ValueError(f"Got 304 for {exchange_segment} without a stored snapshot")
+            new_data = json.loads(result[0])
+            old_data = self._read_json(self._get_cache_path(exchange_segment, previous)) if previous else None
+            if old_data is None:
+                diff = SymbolMasterDiff(segment=exchange_segment, from_day=None, to_day=today)
+            else:
+                diff = diff_symbol_data(old_data, new_data, exchange_segment, previous, today)
+            self._write_atomic(self._get_cache_path(exchange_segment), result[0])
+            meta = {"sha256": digest, **result[1]}
+        
+        meta["day"] = today
+        self._write_atomic(self._meta_path(exchange_segment), json.dumps(meta).encode())
+        self._write_atomic(self._diff_path(exchange_segment, today), diff.model_dump_json().encode())
+        self._diffs[exchange_segment] = diff
+        self._prune_snapshots(exchange_segment)
+        
+        logger.info(
+            f"{exchange_segment} refreshed: "
+            + ("not modified" if diff.not_modified else
+               f"+{len(diff.added)} / -{len(diff.removed)} / ~{len(diff.changed)} contracts")
+        )
+        return diff, new_data
+    
+    async def refresh_segment(self, exchange_segment: str) -> SymbolMasterDiff:
+        """
+        Bring a segment's daily snapshot up to date and return what changed.
+        
+        Downloads conditionally (ETag / Last-Modified, then content hash).
+        If the segment is loaded in memory, the diff is applied to the
+        indexes in place: removed contracts are dropped, added and changed
+        ones parsed and indexed, and session fields (previous close / OI,
+        circuit limits) refreshed - without re-parsing the whole segment.
+        
+        Args:
+            exchange_segment: One of ExchangeSegment values
+            
+        Returns:
+            SymbolMasterDiff against the previous snapshot
+        """
+        if not self.enable_cache:
+            raise ValueError("refresh_segment needs the snapshot cache (enable_cache=True)")
+        diff, new_data = await self._refresh(exchange_segment)
+        if new_data is not None and exchange_segment in self._loaded_segments:
+            self._apply_diff(diff, new_data)
+        return diff
+    
+    def _apply_diff(self, diff: SymbolMasterDiff, new_data: Dict[str, Any]) -> None:
+        """Apply a snapshot diff to the in-memory indexes."""
+        replaced = [c.ticker for c in diff.changed]
+        self._remove_symbols([c.ticker for c in diff.removed] + replaced)
+        
+        for change in diff.added + diff.changed:
+            try:
+                self._add_symbol(Symbol(**new_data[change.ticker]))
+            except Exception as e:
+                logger.warning(f"Failed to parse symbol {change.ticker}: {e}")
+        
+        # Session fields move for every contract; update them without re-validation
+        for ticker, raw in new_data.items():
+            symbol = self._symbols.get(ticker)
+            if symbol is None:
+                continue
+            for key, name in VOLATILE_FIELDS.items():
+                if key in raw:
+                    symbol.__dict__[name] = raw[key]
+    
+    def _remove_symbols(self, tickers: List[str]) -> None:
+        """Drop symbols from every index."""
+        gone = []
+        for ticker in tickers:
+            symbol = self._symbols.pop(ticker, None)
+            if symbol is None:
+                continue
+            gone.append(symbol)
+            if self._by_fytoken.get(symbol.fytoken) is symbol:
+                del self._by_fytoken[symbol.fytoken]
+        if not gone:
+            return
+        
+        gone_ids = {id(s) for s in gone}
+        for index, key in [(self._by_isin, "isin"), (self._by_underlying, "underlying_symbol")]:
+            for value in {getattr(s, key) for s in gone if getattr(s, key)}:
+                remaining = [s for s in index.get(value, []) if id(s) not in gone_ids]
+                if remaining:
+                    index[value] = remaining
+                else:
+                    index.pop(value, None)
+    
+    def last_diff(self, exchange_segment: str = ExchangeSegment.NSE_FO) -> Optional[SymbolMasterDiff]:
+        """
+        Most recent snapshot diff of a segment.
+        
+        Reads the latest stored diff if this instance has not refreshed the
+        segment itself (e.g. the diff was computed by the pre-market job).
+        """
+        if exchange_segment in self._diffs:
+            return self._diffs[exchange_segment]
+        diff_files = sorted(self.cache_dir.glob(f"{exchange_segment}_*.diff.json"))
+        if not diff_files:
+            return None
+        data = self._read_json(diff_files[-1])
+        return SymbolMasterDiff(**data) if data else None
+    
+    def get_new_contracts(
+        self,
+        underlying: Optional[str] = None,
+        exchange_segment: str = ExchangeSegment.NSE_FO,
+    ) -> List[SymbolChange]:
+        """
+        Contracts newly listed in the latest snapshot (e.g. new weekly expiries).
+        
+        Args:
+            underlying: Only this underlying (e.g. "NIFTY")
+            exchange_segment: Segment to check (default: NSE_FO)
+            
+        Returns:
+            Added contracts, or [] if no diff is available
+        """
+        diff = self.last_diff(exchange_segment)
+        if diff is None:
+            return []
+        if underlying:
+            diff = diff.for_underlying(underlying)
+        return diff.added
+    
+    def _add_raw_symbols(self, data: Dict[str, Any], source: str = "") -> int:
+        count = 0
+        for ticker, symbol_data in data.items():
+            try:
+                symbol = Symbol(**symbol_data)
+                self._add_symbol(symbol)
+                count += 1
+            except Exception as e:
+                logger.warning(f"Failed to parse {source}symbol {ticker}: {e}")
+        return count
+    
     async def load_segment(
         self,
         exchange_segment: str,
@@ -289,7 +637,9 @@ class SymbolMaster:
         Load symbols for a specific exchange segment with daily caching.
         
         Symbol master is cached daily. If cache exists from today, it's loaded
-        instantly without downloading. Cache automatically expires next day.
+        instantly without downloading. On a new day the file is downloaded
+        only if it changed upstream, and the diff against the previous day's
+        snapshot is kept (see refresh_segment / last_diff).
         
         Args:
             exchange_segment: One of ExchangeSegment values
@@ -309,33 +659,20 @@ class SymbolMaster:
         if not force_download and self._is_cache_valid(exchange_segment):
             cached_data = self._load_from_cache(exchange_segment)
             if cached_data:
-                for ticker, symbol_data in cached_data.items():
-                    try:
-                        symbol = Symbol(**symbol_data)
-                        self._add_symbol(symbol)
-                        count += 1
-                    except Exception as e:
-                        logger.warning(f"Failed to parse cached symbol {ticker}: {e}")
-                
+                count = self._add_raw_symbols(cached_data, "cached ")
                 self._loaded_segments.add(exchange_segment)
                 logger.info(f"Loaded {count} symbols from cache ({exchange_segment})")
                 return count
         
         # Download if no cache or force_download
         if use_json:
-            data = await self.download_json(exchange_segment)
-            
-            # Save to cache
             if self.enable_cache:
-                self._save_to_cache(exchange_segment, data)
-            
-            for ticker, symbol_data in data.items():
-                try:
-                    symbol = Symbol(**symbol_data)
-                    self._add_symbol(symbol)
-                    count += 1
-                except Exception as e:
-                    logger.warning(f"Failed to parse symbol {ticker}: {e}")
+                _, data = await self._refresh(exchange_segment)
+                if data is None:
+                    data = self._load_from_cache(exchange_segment) or {}
+            else:
+                data = await self.download_json(exchange_segment)
+            count = self._add_raw_symbols(data)
         else:
             csv_content = await self.download_csv(exchange_segment)
             count = self._parse_csv(csv_content)
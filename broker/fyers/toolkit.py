@@ -15,7 +15,9 @@ Features:
 from typing import List, Dict, Any, Optional, Callable
 from agno.tools import Toolkit
 from broker.fyers.client import FyersClient
+from broker.fyers.data.symbol_master import SymbolMaster
 from broker.fyers.models.config import FyersConfig
+from core.output_format import DEFAULT_MAX_TOKENS, budget_tools, compact_json, format_table, shape_csv
 from datetime import datetime, timedelta
 from pathlib import Path
 import hashlib
@@ -280,6 +282,7 @@ class FyersToolkit(Toolkit):
         "get_option_chain",
         "get_option_greeks",
         "get_market_status",
+        "get_new_contracts",
     ]
 
     POSITION_TOOLS = [
@@ -310,6 +313,30 @@ class FyersToolkit(Toolkit):
         "get_correlation_matrix",
     ]
 
+    # Output columns: (CSV header, source key or candle index)
+    QUOTE_COLUMNS = [
+        ("SYMBOL", "symbol"), ("LTP", "lp"), ("CHANGE", "ch"), ("CHANGE_PCT", "chp"),
+        ("VOLUME", "volume"), ("OPEN", "open_price"), ("HIGH", "high_price"),
+        ("LOW", "low_price"), ("PREV_CLOSE", "prev_close_price"), ("BID", "bid"), ("ASK", "ask"),
+    ]
+    HISTORY_COLUMNS = [
+        ("TIMESTAMP", 0), ("OPEN", 1), ("HIGH", 2), ("LOW", 3), ("CLOSE", 4), ("VOLUME", 5),
+    ]
+    OPTION_CHAIN_COLUMNS = [
+        ("SYMBOL", "symbol"), ("STRIKE", "strike_price"), ("TYPE", "option_type"), ("LTP", "ltp"),
+        ("OI", "oi"), ("VOLUME", "volume"), ("IV", "iv"), ("CHANGE", "ch"), ("CHANGE_PCT", "chp"),
+    ]
+    OPTION_GREEKS_COLUMNS = [
+        ("SYMBOL", "symbol"), ("STRIKE", "strike"), ("TYPE", "option_type"),
+        ("EXPIRY_DAYS", "time_to_expiry_days"), ("LTP", "ltp"), ("IV", "iv"), ("DELTA", "delta"),
+        ("GAMMA", "gamma"), ("THETA", "theta"), ("VEGA", "vega"), ("RHO", "rho"),
+        ("OI", "oi"), ("VOLUME", "volume"),
+    ]
+    CONTRACT_CHANGE_COLUMNS = [
+        ("CHANGE", "change"), ("SYMBOL", "ticker"), ("UNDERLYING", "underlying"), ("EXPIRY", "expiry"),
+        ("STRIKE", "strike"), ("TYPE", "option_type"), ("LOT_SIZE", "lot_size"), ("FIELDS", "fields"),
+    ]
+
     def __init__(
         self,
         client: FyersClient,
@@ -318,6 +345,8 @@ class FyersToolkit(Toolkit):
         cache_enabled: bool = True,
         cache_persist: bool = True,
         cache_ttl: Optional[Dict[str, int]] = None,
+        max_output_tokens: Optional[int] = DEFAULT_MAX_TOKENS,
+        history_max_rows: int = 100,
         **kwargs
     ):
         """
@@ -330,6 +359,9 @@ class FyersToolkit(Toolkit):
             cache_enabled: Enable request caching (default: True)
             cache_persist: Persist cache to disk (default: True)
             cache_ttl: Custom TTL values in seconds, e.g., {"quotes": 60, "historical": 7200}
+            max_output_tokens: Hard token budget per tool result (None disables)
+            history_max_rows: Candles returned by get_historical_data before
+                older bars are sampled (0 = no limit)
             **kwargs: Additional arguments for Toolkit base class
 
         Example:
@@ -345,6 +377,8 @@ class FyersToolkit(Toolkit):
             ```
         """
         self.client = client
+        self.max_output_tokens = max_output_tokens
+        self.history_max_rows = history_max_rows
         self.cache = FyersCache(
             enabled=cache_enabled,
             persist_to_file=cache_persist,
@@ -360,6 +394,7 @@ class FyersToolkit(Toolkit):
             "get_option_chain": self.get_option_chain,
             "get_option_greeks": self.get_option_greeks,
             "get_market_status": self.get_market_status,
+            "get_new_contracts": self.get_new_contracts,
             # Positions
             "get_positions": self.get_positions,
             "exit_position": self.exit_position,
@@ -387,10 +422,13 @@ class FyersToolkit(Toolkit):
             exclude_set = set(exclude_tools)
             tools = [t for t in tools if t.__name__ not in exclude_set]
 
+        tools = budget_tools(tools, max_output_tokens)
+
         instructions = """Use these tools for Fyers broker operations:
 - Real-time quotes and market depth
 - Historical OHLCV data for technical analysis
 - Option chains with Greeks (IV, Delta, Gamma, Theta, Vega)
+- Newly listed / delisted / changed F&O contracts (symbol master diff)
 - Positions, orders, holdings, and funds
 - Technical indicators (SMA, EMA, RSI, MACD, Bollinger Bands)
 - Correlation matrix for portfolio analysis
@@ -404,13 +442,14 @@ For order operations: side=1 for BUY, side=-1 for SELL."""
 
     # ==================== Market Data Tools ====================
 
-    async def get_quotes(self, symbols: List[str]) -> str:
+    async def get_quotes(self, symbols: List[str], columns: Optional[List[str]] = None) -> str:
         """
         Get real-time market quotes for multiple symbols.
 
         Args:
             symbols: List of symbols in Fyers format (e.g., ["NSE:SBIN-EQ", "NSE:TCS-EQ"])
                 Maximum 50 symbols per request.
+            columns: Only return these columns (e.g., ["SYMBOL", "LTP", "CHANGE_PCT"])
 
         Returns:
             str: Quote data in CSV format with columns:
@@ -424,23 +463,14 @@ For order operations: side=1 for BUY, side=-1 for SELL."""
         # Check cache
         cached = self.cache.get("quotes", sorted_symbols)
         if cached:
-            return cached
+            return shape_csv(cached, include=columns)
 
         response = await self.client.get_quotes(symbols)
 
-        lines = ["SYMBOL,LTP,CHANGE,CHANGE_PCT,VOLUME,OPEN,HIGH,LOW,PREV_CLOSE,BID,ASK"]
-        for quote in response.d or []:
-            v = quote.v
-            if v:
-                lines.append(
-                    f"{quote.n},{v.get('lp')},{v.get('ch')},{v.get('chp')},{v.get('volume')},"
-                    f"{v.get('open_price')},{v.get('high_price')},{v.get('low_price')},{v.get('prev_close_price')},"
-                    f"{v.get('bid')},{v.get('ask')}"
-                )
-
-        result = "\n".join(lines)
+        rows = [{**quote.v, "symbol": quote.n} for quote in response.d or [] if quote.v]
+        result = format_table(rows, self.QUOTE_COLUMNS)
         self.cache.set("quotes", result, sorted_symbols)
-        return result
+        return shape_csv(result, include=columns)
 
     async def get_market_depth(self, symbol: str) -> str:
         """
@@ -488,7 +518,9 @@ For order operations: side=1 for BUY, side=-1 for SELL."""
         self,
         symbol: str,
         resolution: str = "D",
-        days: int = 100
+        days: int = 100,
+        max_rows: Optional[int] = None,
+        columns: Optional[List[str]] = None,
     ) -> str:
         """
         Get historical OHLCV candle data for technical analysis.
@@ -499,6 +531,10 @@ For order operations: side=1 for BUY, side=-1 for SELL."""
                 - Minutes: "1", "5", "15", "30", "60"
                 - Day: "D" or "1D"
             days: Number of days of history (max 100 for intraday, 366 for daily)
+            max_rows: Maximum candles to return (default: toolkit setting, 0 = all).
+                Longer series keep the latest half in full, sample the older
+                bars evenly and end with a CLOSE summary over all bars.
+            columns: Only return these columns (e.g., ["TIMESTAMP", "CLOSE"])
 
         Returns:
             str: Historical candles in CSV format:
@@ -506,6 +542,16 @@ For order operations: side=1 for BUY, side=-1 for SELL."""
 
         Note: Results are cached for 1 hour.
         """
+        result = await self._historical_csv(symbol, resolution, days)
+        return shape_csv(
+            result,
+            include=columns,
+            max_rows=self.history_max_rows if max_rows is None else max_rows,
+            summary_column="CLOSE",
+        )
+
+    async def _historical_csv(self, symbol: str, resolution: str = "D", days: int = 100) -> str:
+        """Full (unsampled) candle CSV, shared by the analysis tools."""
         # Check cache
         cached = self.cache.get("historical", symbol, resolution=resolution, days=days)
         if cached:
@@ -522,21 +568,23 @@ For order operations: side=1 for BUY, side=-1 for SELL."""
             range_to=range_to
         )
 
-        lines = ["TIMESTAMP,OPEN,HIGH,LOW,CLOSE,VOLUME"]
-        for candle in response.candles or []:
-            lines.append(f"{candle[0]},{candle[1]},{candle[2]},{candle[3]},{candle[4]},{candle[5]}")
-
-        result = "\n".join(lines)
+        result = format_table(response.candles or [], self.HISTORY_COLUMNS)
         self.cache.set("historical", result, symbol, resolution=resolution, days=days)
         return result
 
-    async def get_option_chain(self, symbol: str, strike_count: int = 5) -> str:
+    async def get_option_chain(
+        self,
+        symbol: str,
+        strike_count: int = 5,
+        columns: Optional[List[str]] = None,
+    ) -> str:
         """
         Get option chain data for derivatives analysis.
 
         Args:
             symbol: Underlying symbol (e.g., "NSE:NIFTY50-INDEX", "NSE:SBIN-EQ")
             strike_count: Number of strikes above/below ATM (max 50)
+            columns: Only return these columns (e.g., ["STRIKE", "TYPE", "LTP", "OI"])
 
         Returns:
             str: Option chain in CSV format:
@@ -547,28 +595,21 @@ For order operations: side=1 for BUY, side=-1 for SELL."""
         # Check cache
         cached = self.cache.get("options", symbol, strike_count=strike_count)
         if cached:
-            return cached
+            return shape_csv(cached, include=columns)
 
         response = await self.client.get_option_chain(symbol, strike_count=strike_count)
 
-        lines = ["SYMBOL,STRIKE,TYPE,LTP,OI,VOLUME,IV,CHANGE,CHANGE_PCT"]
-        # Use helper method to get options chain (data is a dict)
-        options_chain = response.get_options_chain()
-
-        for option in options_chain:
-            # options are dicts, not pydantic models
-            lines.append(
-                f"{option.get('symbol', '')},{option.get('strike_price', '')},"
-                f"{option.get('option_type', '')},{option.get('ltp', '')},"
-                f"{option.get('oi', '')},{option.get('volume', '')},"
-                f"{option.get('iv', '')},{option.get('ch', '')},{option.get('chp', '')}"
-            )
-
-        result = "\n".join(lines)
+        # Use helper method to get options chain (options are dicts, not pydantic models)
+        result = format_table(response.get_options_chain(), self.OPTION_CHAIN_COLUMNS)
         self.cache.set("options", result, symbol, strike_count=strike_count)
-        return result
+        return shape_csv(result, include=columns)
 
-    async def get_option_greeks(self, symbol: str, strike_count: int = 5) -> str:
+    async def get_option_greeks(
+        self,
+        symbol: str,
+        strike_count: int = 5,
+        columns: Optional[List[str]] = None,
+    ) -> str:
         """
         Get option chain with computed Greeks (IV, Delta, Gamma, Theta, Vega, Rho).
 
@@ -577,6 +618,7 @@ For order operations: side=1 for BUY, side=-1 for SELL."""
         Args:
             symbol: Underlying symbol (e.g., "NSE:NIFTY50-INDEX", "NSE:SBIN-EQ")
             strike_count: Number of strikes above/below ATM (max 50)
+            columns: Only return these columns (e.g., ["STRIKE", "TYPE", "IV", "DELTA"])
 
         Returns:
             str: Option chain with Greeks in CSV format:
@@ -593,30 +635,14 @@ For order operations: side=1 for BUY, side=-1 for SELL."""
         # Check cache
         cached = self.cache.get("options", symbol, strike_count=strike_count, greeks=True)
         if cached:
-            return cached
+            return shape_csv(cached, include=columns)
 
         try:
             greeks_data = await self.client.get_option_greeks(symbol, strike_count=strike_count)
 
-            lines = ["SYMBOL,STRIKE,TYPE,EXPIRY_DAYS,LTP,IV,DELTA,GAMMA,THETA,VEGA,RHO,OI,VOLUME"]
-            for opt in greeks_data:
-                iv = opt.get("iv") or ""
-                delta = opt.get("delta") or ""
-                gamma = opt.get("gamma") or ""
-                theta = opt.get("theta") or ""
-                vega = opt.get("vega") or ""
-                rho = opt.get("rho") or ""
-
-                lines.append(
-                    f"{opt.get('symbol', '')},{opt.get('strike', '')},"
-                    f"{opt.get('option_type', '')},{opt.get('time_to_expiry_days', '')},"
-                    f"{opt.get('ltp', '')},{iv},{delta},{gamma},{theta},{vega},{rho},"
-                    f"{opt.get('oi', '')},{opt.get('volume', '')}"
-                )
-
-            result = "\n".join(lines)
+            result = format_table(greeks_data, self.OPTION_GREEKS_COLUMNS)
             self.cache.set("options", result, symbol, strike_count=strike_count, greeks=True)
-            return result
+            return shape_csv(result, include=columns)
         except Exception as e:
             return f"ERROR: {str(e)}"
 
@@ -639,6 +665,45 @@ For order operations: side=1 for BUY, side=-1 for SELL."""
 
         return "\n".join(lines)
 
+    async def get_new_contracts(self, underlying: str = "", segment: str = "NSE_FO") -> str:
+        """
+        Get contracts listed, delisted or changed in today's symbol master.
+
+        Compares today's symbol master snapshot with the previous day's, e.g.
+        to spot newly listed weekly expiries or strikes and lot-size changes.
+
+        Args:
+            underlying: Only this underlying (e.g., "NIFTY", "BANKNIFTY"); empty for all
+            segment: Exchange segment (NSE_FO, BSE_FO, MCX_COM, NSE_CD, NSE_CM, BSE_CM)
+
+        Returns:
+            str: Header line with the compared days, then CSV:
+                CHANGE,SYMBOL,UNDERLYING,EXPIRY,STRIKE,TYPE,LOT_SIZE,FIELDS
+                CHANGE is ADDED, REMOVED or CHANGED; FIELDS lists changed fields
+        """
+        master = SymbolMaster()
+        diff = master.last_diff(segment)
+        if diff is None or diff.to_day != datetime.now().date().isoformat():
+            try:
+                diff = await master.refresh_segment(segment)
+            except Exception as e:
+                return f"ERROR: {str(e)}"
+        if underlying:
+            diff = diff.for_underlying(underlying)
+
+        if diff.from_day is None:
+            return f"{segment}: first snapshot ({diff.to_day}), no previous day to compare"
+        header = f"{segment} {diff.from_day} -> {diff.to_day}"
+        if diff.is_empty:
+            return f"{header}: no contracts added, removed or changed"
+
+        rows = [
+            {**change.model_dump(), "change": kind, "fields": "|".join(change.fields)}
+            for kind, changes in (("ADDED", diff.added), ("REMOVED", diff.removed), ("CHANGED", diff.changed))
+            for change in changes
+        ]
+        return f"{header}\n" + format_table(rows, self.CONTRACT_CHANGE_COLUMNS)
+
     # ==================== Position Tools ====================
 
     async def get_positions(self) -> str:
@@ -930,7 +995,7 @@ For order operations: side=1 for BUY, side=-1 for SELL."""
             return cached
 
         try:
-            csv_data = await self.get_historical_data(symbol, resolution, days)
+            csv_data = await self._historical_csv(symbol, resolution, days)
             lines = csv_data.split("\n")
 
             if len(lines) <= 1:
@@ -959,7 +1024,7 @@ For order operations: side=1 for BUY, side=-1 for SELL."""
             indicators = self._compute_indicators(df)
             indicators['symbol'] = symbol
 
-            result = json.dumps(indicators, indent=2)
+            result = compact_json(indicators)
             self.cache.set("indicators", result, symbol, resolution=resolution, days=days)
             return result
 
@@ -1058,7 +1123,7 @@ For order operations: side=1 for BUY, side=-1 for SELL."""
         try:
             data = {}
             for symbol in symbols:
-                csv_data = await self.get_historical_data(symbol, days=days)
+                csv_data = await self._historical_csv(symbol, days=days)
                 lines = csv_data.split("\n")
 
                 if len(lines) > 1:
@@ -1086,11 +1151,11 @@ For order operations: side=1 for BUY, side=-1 for SELL."""
             returns = df.pct_change().dropna()
             corr_matrix = returns.corr()
 
-            result = json.dumps({
+            result = compact_json({
                 "correlation_matrix": corr_matrix.to_dict(),
                 "symbols": list(corr_matrix.columns),
                 "data_points": len(returns)
-            }, indent=2)
+            })
 
             self.cache.set("correlation", result, sorted_symbols, days=days)
             return result
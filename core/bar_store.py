@@ -0,0 +1,338 @@
+"""
+Append-only local OHLCV series for slow-moving reference instruments.
+
+The overnight / global cues step asks for GIFT NIFTY history and the
+global index board several times a run. The upstream endpoints have no
+notion of "what changed": every call re-pulled a full year of candles
+(or every index quote). This store keeps one compressed ``.npz`` per
+(source, symbol, resolution) and only asks upstream for bars after the
+last stored one:
+
+- First sync for a series fetches ``depth`` bars in full
+- Later syncs fetch from the last stored bar onwards (re-fetching it,
+  since the latest candle is usually still forming) and merge by
+  timestamp, newer values winning
+- A sync within ``refresh_after`` seconds of the previous one makes no
+  upstream request at all
+- If an incremental fetch fails, the stored series is served as is
+
+Usage:
+    store = get_bar_store()
+    series = store.sync("moneycontrol", "in;gsx", "1D", fetch, depth=300)
+    df = series.tail(30).to_frame()
+"""
+
+import logging
+import math
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import Any, Callable, Dict, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Bar length in seconds per resolution (MoneyControl/TradingView and yfinance spellings)
+RESOLUTION_SECONDS: Dict[str, int] = {
+    "1": 60, "1m": 60,
+    "5": 300, "5m": 300,
+    "15": 900, "15m": 900,
+    "30": 1800, "30m": 1800,
+    "60": 3600, "1h": 3600,
+    "240": 14400,
+    "1D": 86400, "1d": 86400,
+    "1W": 7 * 86400, "1wk": 7 * 86400,
+    "1M": 31 * 86400, "1mo": 31 * 86400,
+}
+
+# Seconds after a sync during which the stored series is served without asking upstream
+DEFAULT_REFRESH_AFTER_S = 60.0
+
+FIELDS = ("open", "high", "low", "close", "volume")
+
+# UDF-style payload keys ({"s": "ok", "t": [...], "o": [...], ...}) per field
+_UDF_KEYS = {"t": "t", "open": "o", "high": "h", "low": "l", "close": "c", "volume": "v"}
+
+# Fetches bars for a series: (since epoch seconds or None for a full fetch, bar count)
+# -> UDF-style dict, or None when upstream has nothing
+BarFetcher = Callable[[Optional[int], int], Optional[Mapping[str, Sequence[Any]]]]
+
+
+def resolution_seconds(resolution: str) -> int:
+    """Bar length of a resolution in seconds (daily if unknown)."""
+    return RESOLUTION_SECONDS.get(resolution, 86400)
+
+
+def _column(values: Optional[Sequence[Any]], n: int) -> np.ndarray:
+    if values is None or len(values) != n:
+        return np.full(n, np.nan)
+    return np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+
+
+@dataclass
+class BarSeries:
+    """OHLCV bars of one instrument at one resolution, sorted by time."""
+
+    source: str
+    symbol: str
+    resolution: str
+    t: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.int64))
+    open: np.ndarray = field(default_factory=lambda: np.empty(0))
+    high: np.ndarray = field(default_factory=lambda: np.empty(0))
+    low: np.ndarray = field(default_factory=lambda: np.empty(0))
+    close: np.ndarray = field(default_factory=lambda: np.empty(0))
+    volume: np.ndarray = field(default_factory=lambda: np.empty(0))
+    synced_at: float = 0.0  # Epoch seconds of the last upstream sync
+    depth: int = 0  # Bar count of the deepest full fetch
+
+    def __len__(self) -> int:
+        return len(self.t)
+
+    @property
+    def last_time(self) -> Optional[int]:
+        """Epoch seconds of the latest bar (None if empty)."""
+        return int(self.t[-1]) if len(self.t) else None
+
+    @classmethod
+    def from_udf(
+        cls, source: str, symbol: str, resolution: str, data: Optional[Mapping[str, Sequence[Any]]]
+    ) -> "BarSeries":
+        """Build a series from a UDF-style payload ("t", "o", "h", "l", "c", "v" lists)."""
+        series = cls(source, symbol, resolution)
+        if not data or data.get("s", "ok") != "ok" or not data.get("t"):
+            return series
+        t = np.asarray(data["t"], dtype=np.int64)
+        n = len(t)
+        columns = {name: _column(data.get(key), n) for name, key in _UDF_KEYS.items() if name != "t"}
+        order = np.argsort(t, kind="stable")
+        return replace(series, t=t[order], **{name: col[order] for name, col in columns.items()})
+
+    def merge(self, other: "BarSeries") -> "BarSeries":
+        """Union of two series by timestamp; bars in ``other`` replace stored ones."""
+        if not len(other):
+            return self
+        t = np.concatenate([other.t, self.t])
+        # np.unique keeps the first occurrence, so ``other`` wins on equal timestamps
+        t, first = np.unique(t, return_index=True)
+        merged = {name: np.concatenate([getattr(other, name), getattr(self, name)])[first] for name in FIELDS}
+        return replace(self, t=t, **merged)
+
+    def tail(self, n: int) -> "BarSeries":
+        """The latest ``n`` bars."""
+        if n <= 0 or n >= len(self):
+            return self
+        return replace(self, t=self.t[-n:], **{name: getattr(self, name)[-n:] for name in FIELDS})
+
+    def to_udf(self) -> Dict[str, Any]:
+        """UDF-style dict: {"s": "ok", "t": [...], "o": [...], "h", "l", "c", "v"}."""
+        if not len(self):
+            return {"s": "no_data", "t": [], "o": [], "h": [], "l": [], "c": [], "v": []}
+        out: Dict[str, Any] = {"s": "ok", "t": self.t.tolist()}
+        for name in FIELDS:
+            out[_UDF_KEYS[name]] = [None if math.isnan(v) else v for v in getattr(self, name).tolist()]
+        return out
+
+    def to_frame(self) -> Any:
+        """pandas DataFrame indexed by datetime with open/high/low/close/volume columns."""
+        import pandas as pd
+
+        df = pd.DataFrame(
+            {name: getattr(self, name) for name in FIELDS},
+            index=pd.to_datetime(self.t, unit="s"),
+        )
+        df.index.name = "datetime"
+        return df
+
+
+class BarSeriesStore:
+    """
+    One ``{source}_{symbol}_{resolution}.npz`` per series under a directory.
+
+    Loaded series are kept in memory, so repeated reads in a process
+    touch the disk once. Thread-safe.
+    """
+
+    def __init__(self, store_dir: str | Path, refresh_after: float = DEFAULT_REFRESH_AFTER_S):
+        """
+        Initialize the store.
+
+        Args:
+            store_dir: Directory holding the series files
+            refresh_after: Default seconds a sync stays fresh
+        """
+        self.store_dir = Path(store_dir)
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+        self.refresh_after = refresh_after
+        self._lock = threading.RLock()
+        self._series: Dict[Tuple[str, str, str], BarSeries] = {}
+
+    def _path(self, source: str, symbol: str, resolution: str) -> Path:
+        safe = re.sub(r"[^A-Za-z0-9.]+", "-", symbol).strip("-") or "symbol"
+        return self.store_dir / f"{source}_{safe}_{resolution}.npz"
+
+    # ==================== Persistence ====================
+
+    def load(self, source: str, symbol: str, resolution: str) -> Optional[BarSeries]:
+        """Stored series, or None if never synced."""
+        key = (source, symbol, resolution)
+        with self._lock:
+            if key in self._series:
+                return self._series[key]
+            path = self._path(*key)
+            if not path.exists():
+                return None
+            try:
+                with np.load(path, allow_pickle=False) as arrays:
+                    series = BarSeries(
+                        source, symbol, resolution,
+                        t=arrays["t"],
+                        synced_at=float(arrays["synced_at"]),
+                        depth=int(arrays["depth"]),
+                        **{name: arrays[name] for name in FIELDS},
+                    )
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning(f"Ignoring unreadable bar series {path}: {e}")
+                return None
+            self._series[key] = series
+            return series
+
+    def save(self, series: BarSeries) -> Path:
+        """Write a series atomically and keep it in memory."""
+        path = self._path(series.source, series.symbol, series.resolution)
+        tmp = path.with_name(path.stem + ".tmp.npz")
+        with self._lock:
+            np.savez_compressed(
+                tmp,
+                t=series.t,
+                synced_at=np.float64(series.synced_at),
+                depth=np.int64(series.depth),
+                **{name: getattr(series, name) for name in FIELDS},
+            )
+            os.replace(tmp, path)
+            self._series[(series.source, series.symbol, series.resolution)] = series
+        return path
+
+    # ==================== Sync ====================
+
+    def plan(
+        self,
+        series: Optional[BarSeries],
+        resolution: str,
+        depth: int,
+        refresh_after: Optional[float] = None,
+        now: Optional[float] = None,
+    ) -> Optional[Tuple[Optional[int], int]]:
+        """
+        What to ask upstream for, given the stored series.
+
+        Returns:
+            None if the stored series is fresh, else (since, count): since is
+            None for a full fetch of ``depth`` bars, or the last stored bar's
+            time with count covering the bars since then (plus slack)
+        """
+        now = time.time() if now is None else now
+        refresh_after = self.refresh_after if refresh_after is None else refresh_after
+        if series is not None and series.depth >= depth and now - series.synced_at < refresh_after:
+            return None
+        if series is None or not len(series) or series.depth < depth:
+            return None, max(depth, 1)
+        since = series.last_time
+        count = int((now - since) // resolution_seconds(resolution)) + 2
+        return since, min(max(count, 2), depth)
+
+    def update(
+        self,
+        source: str,
+        symbol: str,
+        resolution: str,
+        bars: BarSeries,
+        depth: int = 0,
+        now: Optional[float] = None,
+    ) -> BarSeries:
+        """
+        Merge freshly fetched bars into the stored series and save it.
+
+        Args:
+            bars: Fetched bars (may be empty)
+            depth: Bar count requested if this was a full fetch (0 if incremental)
+            now: Sync time (default now)
+        """
+        with self._lock:
+            stored = self.load(source, symbol, resolution) or BarSeries(source, symbol, resolution)
+            merged = replace(
+                stored.merge(bars),
+                synced_at=time.time() if now is None else now,
+                depth=max(stored.depth, depth),
+            )
+            self.save(merged)
+            return merged
+
+    def sync(
+        self,
+        source: str,
+        symbol: str,
+        resolution: str,
+        fetch: BarFetcher,
+        depth: int,
+        refresh_after: Optional[float] = None,
+    ) -> BarSeries:
+        """
+        Bring one series up to date and return it.
+
+        Args:
+            source: Data source name (part of the file name)
+            symbol: Upstream symbol
+            resolution: Bar resolution ("1D", "15", "1d", ...)
+            fetch: Called as fetch(since, count) only when the series is stale
+            depth: Bars the caller needs; a deeper request than ever stored
+                triggers a full fetch
+            refresh_after: Seconds a sync stays fresh (default: store setting)
+
+        Returns:
+            The stored series (all bars, not just ``depth``)
+        """
+        series = self.load(source, symbol, resolution)
+        now = time.time()
+        plan = self.plan(series, resolution, depth, refresh_after, now)
+        if plan is None:
+            return series or BarSeries(source, symbol, resolution)
+        since, count = plan
+        try:
+            data = fetch(since, count)
+        except Exception as e:
+            if series is None or not len(series):
+                raise
+            logger.warning(f"Bar sync failed for {source} {symbol} {resolution}, serving stored bars: {e}")
+            return series
+        bars = BarSeries.from_udf(source, symbol, resolution, data)
+        return self.update(source, symbol, resolution, bars, depth=depth if since is None else 0, now=now)
+
+
+_store: Optional[BarSeriesStore] = None
+_store_lock = threading.Lock()
+
+
+def get_bar_store() -> BarSeriesStore:
+    """Shared store under the data directory."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = BarSeriesStore(get_settings().BARS_DIR)
+    return _store
+
+
+__all__ = [
+    "BarFetcher",
+    "BarSeries",
+    "BarSeriesStore",
+    "RESOLUTION_SECONDS",
+    "get_bar_store",
+    "resolution_seconds",
+]
@@ -27,16 +27,24 @@ class Settings(BaseSettings):
     DEBUG: bool = True
 
     # Debug & Logging
-    AGNO_DEBUG: bool = True  # Enable Agno framework debug mode
+    AGNO_DEBUG: bool = False  # Enable Agno framework debug mode (verbose, per agent turn)
     AGNO_DEBUG_LEVEL: int = 1  # 1=normal, 2=verbose
     LOG_LEVEL: str = "INFO"  # DEBUG, INFO, WARNING, ERROR
     LOG_TO_FILE: bool = True  # Write logs to file
+    LOG_JSON: bool = True  # Log file as JSON lines (console stays human-readable)
+    LOG_MAX_BYTES: int = 20 * 1024 * 1024  # Rotate the log file at this size
+    LOG_BACKUP_COUNT: int = 5  # Rotated log files kept
+    LOG_ROTATE_WHEN: str = ""  # Time-based rotation instead ("midnight", "H"); empty = by size
 
     # Tracing (OpenTelemetry)
     TRACING_ENABLED: bool = True  # Enable OpenTelemetry tracing
     TRACING_BATCH_SIZE: int = 256  # Spans per batch export
     TRACING_QUEUE_SIZE: int = 1024  # Max spans in queue
 
+    # Run profiling (local span exporters, see core/profiling.py)
+    PROFILING_ENABLED: bool = True  # Per-step / per-tool / per-endpoint spans
+    PROFILING_EXPORT_SPANS: bool = False  # Also append spans to .hagrid/profiles/*.jsonl
+
     # Market Data Config
     MARKET_DATA_PROVIDER: str = "mock"  # mock, zerodha, etc.
 
@@ -60,9 +68,45 @@ class Settings(BaseSettings):
 
     # Scheduler settings
     SCHEDULER_ENABLED: bool = True
+    SCHEDULER_MAX_WORKERS: int = 3  # Shared worker threads (monitoring has its own reserved slot)
     MARKET_OPEN_TIME: str = "09:15"
     MARKET_CLOSE_TIME: str = "15:30"
 
+    # Pre-market snapshot (warmed at 8:45 for the 9:00 intraday run)
+    SNAPSHOT_PREWARM_TIMEOUT: float = 780.0  # Finish by ~8:58
+    SNAPSHOT_FYERS_CONCURRENCY: int = 4  # Also paced by the Fyers rate limiter
+    SNAPSHOT_NSE_CONCURRENCY: int = 3
+    SNAPSHOT_KEEP: int = 5  # Bundles retained on disk
+
+    # Pre-open session recorder (IEP / order imbalance time series)
+    PRE_OPEN_RECORD_ENABLED: bool = True
+    PRE_OPEN_START_TIME: str = "09:00"
+    PRE_OPEN_END_TIME: str = "09:08"  # Order entry closes at 9:08; matching follows
+    PRE_OPEN_CADENCE_S: float = 20.0  # Seconds between polls of the NIFTY/BANKNIFTY/FO feeds
+    PRE_OPEN_KEEP_DAYS: int = 30  # Daily series retained on disk
+
+    # Intraday option-chain recorder (OI / IV snapshots for change analytics)
+    OPTION_CHAIN_RECORD_ENABLED: bool = True
+    OPTION_CHAIN_UNDERLYINGS: str = "NIFTY,BANKNIFTY"  # Comma-separated NSE option underlyings
+    OPTION_CHAIN_EXPIRIES: int = 2  # Nearest expiries recorded per underlying
+    OPTION_CHAIN_CADENCE_MIN: int = 5  # Minutes between snapshots (divides 60)
+    OPTION_CHAIN_START_TIME: str = "09:15"
+    OPTION_CHAIN_END_TIME: str = "15:30"
+    OPTION_CHAIN_KEEP_DAYS: int = 20  # Recorded days retained on disk
+
+    # Tick-driven position monitor (replaces the 20-minute monitoring cron)
+    TICK_MONITOR_ENABLED: bool = True  # False = fall back to the :10/:30/:50 cron
+    MONITOR_START_TIME: str = "09:20"
+    MONITOR_END_TIME: str = "15:20"
+    MONITOR_TRAIL_PERCENT: float = 1.0  # Trailing stop distance from the best price
+    MONITOR_TRAIL_ACTIVATION_R: float = 1.0  # Trail once the move in favour reaches this many R
+    MONITOR_MATERIAL_MOVE_PERCENT: float = 1.5  # Move since the last report that wakes the workflow
+    MONITOR_TRIGGER_COOLDOWN_S: float = 300.0  # Min gap between material-move runs
+    MONITOR_REFRESH_S: float = 30.0  # Re-read open trades and resubscribe
+    MONITOR_RECORD_TICKS: bool = True  # Keep a tick tape for rule replay
+    MONITOR_DISCONNECT_LIMIT_S: float = 120.0  # Websocket down this long ends the run (watchdog restarts it)
+    MONITOR_WATCHDOG_CADENCE_MIN: int = 10  # Watchdog checks; a dead monitor gets a cron monitoring pass
+
     @property
     def DATA_DIR(self) -> Path:
         """Data directory for all Hagrid files."""
@@ -98,6 +142,51 @@ class Settings(BaseSettings):
         """Path to tracing database file."""
         return str(self.DATA_DIR / "hagrid_traces.db")
 
+    @property
+    def SCHEDULER_METRICS_FILE(self) -> str:
+        """Path to scheduler job run metrics file."""
+        return str(self.DATA_DIR / "scheduler_metrics.json")
+
+    @property
+    def INSTRUMENT_MAP_FILE(self) -> str:
+        """Path to the cross-provider instrument identity map."""
+        return str(self.DATA_DIR / "instruments.json")
+
+    @property
+    def SNAPSHOT_DIR(self) -> Path:
+        """Directory for versioned pre-market snapshot bundles."""
+        return self.DATA_DIR / "snapshots"
+
+    @property
+    def PROFILE_DIR(self) -> Path:
+        """Directory for exported profiling spans."""
+        return self.DATA_DIR / "profiles"
+
+    @property
+    def PRE_OPEN_DIR(self) -> Path:
+        """Directory for recorded pre-open session series."""
+        return self.DATA_DIR / "pre_open"
+
+    @property
+    def OPTION_CHAIN_DIR(self) -> Path:
+        """Directory for recorded intraday option-chain series."""
+        return self.DATA_DIR / "option_chains"
+
+    @property
+    def SECURITIES_DIR(self) -> Path:
+        """Directory for the daily parsed NSE securities master."""
+        return self.DATA_DIR / "securities"
+
+    @property
+    def BARS_DIR(self) -> Path:
+        """Directory for incrementally synced OHLCV series (GIFT NIFTY, global indexes)."""
+        return self.DATA_DIR / "bars"
+
+    @property
+    def TICK_DIR(self) -> Path:
+        """Directory for recorded position-monitor tick tapes."""
+        return self.DATA_DIR / "ticks"
+
     @property
     def OUTPUT_DIR(self) -> Path:
         """Directory for workflow output files."""
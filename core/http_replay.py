@@ -0,0 +1,488 @@
+"""
+Record and replay HTTP traffic for offline runs and benchmarks.
+
+NSE India and Fyers calls go through httpx. This module provides httpx
+transports that either record every request/response pair to a cassette
+file, or serve a cassette back without touching the network:
+
+- ``RecordingTransport`` / ``AsyncRecordingTransport`` wrap the real
+  transport and store each response (status, content type, body,
+  observed latency). Request headers - cookies, Fyers auth tokens - are
+  never stored.
+- ``ReplayTransport`` / ``AsyncReplayTransport`` answer from the cassette
+  with configurable latency (fixed, or scaled from the recorded latency)
+  and error injection (HTTP status or connection errors), seeded so runs
+  are reproducible.
+
+``NSEIndiaHTTPClient``, ``AsyncNSEIndiaHTTPClient``, the Fyers
+``HTTPClient`` and ``SymbolMaster`` use ``default_transport()`` when no
+transport is passed, so a whole workflow can be switched over with
+``replaying(...)`` / ``recording(...)`` or with the environment variables
+``HAGRID_HTTP_MODE=record|replay`` and ``HAGRID_HTTP_CASSETTE=<path>``
+(a cassette recorded that way is written when the process exits).
+
+Usage:
+    with recording("cassettes/intraday.json"):
+        await run_multi_sector_analysis()
+
+    with replaying("cassettes/intraday.json", ReplayConfig(latency_ms=50, error_rate=0.02)):
+        await run_multi_sector_analysis()
+"""
+
+import asyncio
+import atexit
+import base64
+import hashlib
+import json
+import logging
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+CASSETTE_VERSION = 1
+
+# Query parameters that change on every call (cache busters) and never
+# take part in matching
+DEFAULT_IGNORE_PARAMS = ("_", "t", "timestamp")
+
+# Response headers worth keeping; everything else (cookies, server
+# fingerprints, transfer/content encodings) is dropped
+KEPT_RESPONSE_HEADERS = ("content-type", "retry-after")
+
+
+def interaction_key(request: httpx.Request, ignore_params: Tuple[str, ...] = DEFAULT_IGNORE_PARAMS) -> str:
+    """Match key for a request: method, host, path, sorted query, body hash."""
+    url = request.url
+    params = sorted(
+        (k, v) for k, v in parse_qsl(url.query.decode("ascii", "ignore"), keep_blank_values=True)
+        if k not in ignore_params
+    )
+    key = f"{request.method} {url.host}{url.path}"
+    if params:
+        key += "?" + urlencode(params)
+    body = request.content
+    if body:
+        key += " #" + hashlib.sha1(body).hexdigest()[:12]
+    return key
+
+
+def _query_items(key: str) -> List[Tuple[str, str]]:
+    query = key.split(" #", 1)[0].partition("?")[2]
+    return parse_qsl(query, keep_blank_values=True)
+
+
+def path_key(key: str) -> str:
+    """Loose form of a key: method, host and path only."""
+    return key.split("?", 1)[0].split(" #", 1)[0]
+
+
+# ==================== Cassette ====================
+
+
+class Cassette:
+    """Recorded interactions, stored as one JSON file."""
+
+    def __init__(self, path: str | Path, ignore_params: Tuple[str, ...] = DEFAULT_IGNORE_PARAMS):
+        """
+        Initialize a cassette (loads the file if it exists).
+
+        Args:
+            path: Cassette JSON file
+            ignore_params: Query parameters excluded from matching
+        """
+        self.path = Path(path)
+        self.ignore_params = tuple(ignore_params)
+        self._lock = threading.Lock()
+        self.interactions: Dict[str, List[Dict[str, Any]]] = {}
+        self._by_path: Dict[str, List[str]] = {}
+        self._cursor: Dict[str, int] = {}
+        self.recorded_at: Optional[str] = None
+        if self.path.exists():
+            self.load()
+
+    def __len__(self) -> int:
+        return sum(len(v) for v in self.interactions.values())
+
+    def load(self) -> None:
+        with open(self.path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("version") != CASSETTE_VERSION:
+            raise ValueError(f"Unsupported cassette version in {self.path}: {data.get('version')}")
+        with self._lock:
+            self.interactions = data.get("interactions", {})
+            self.recorded_at = data.get("recorded_at")
+            self._by_path = {}
+            for key in self.interactions:
+                self._by_path.setdefault(path_key(key), []).append(key)
+            self._cursor.clear()
+
+    def save(self) -> None:
+        """Write the cassette atomically."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            payload = {
+                "version": CASSETTE_VERSION,
+                "recorded_at": self.recorded_at or datetime.now().isoformat(),
+                "interactions": self.interactions,
+            }
+            tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(payload, f, separators=(",", ":"))
+            os.replace(tmp, self.path)
+
+    def add(self, key: str, status: int, headers: Dict[str, str], body: bytes, elapsed_ms: float) -> None:
+        entry: Dict[str, Any] = {"status": status, "headers": headers, "elapsed_ms": round(elapsed_ms, 1)}
+        try:
+            entry["body"] = body.decode("utf-8")
+        except UnicodeDecodeError:
+            entry["body_b64"] = base64.b64encode(body).decode("ascii")
+        with self._lock:
+            if key not in self.interactions:
+                self._by_path.setdefault(path_key(key), []).append(key)
+            self.interactions.setdefault(key, []).append(entry)
+            self.recorded_at = self.recorded_at or datetime.now().isoformat()
+
+    def add_json(self, method: str, url: str, data: Any, status: int = 200, elapsed_ms: float = 0.0,
+                 body: Optional[bytes] = None) -> None:
+        """Add a synthetic JSON (or raw) response - used to build fixture cassettes."""
+        request = httpx.Request(method, url, content=body)
+        content = data.encode("utf-8") if isinstance(data, str) else json.dumps(data).encode("utf-8")
+        content_type = "text/plain" if isinstance(data, str) else "application/json"
+        self.add(interaction_key(request, self.ignore_params), status, {"content-type": content_type},
+                 content, elapsed_ms)
+
+    def match(self, request: httpx.Request, loose: bool = True) -> Optional[Dict[str, Any]]:
+        """
+        Next recorded response for a request.
+
+        Repeated identical requests walk through the recorded responses in
+        order and then keep returning the last one. With ``loose`` a
+        request whose query differs (e.g. a date range) falls back to the
+        recording of the same method + path sharing the most query
+        parameters (so a history call still gets its own symbol).
+        """
+        key = interaction_key(request, self.ignore_params)
+        with self._lock:
+            if key not in self.interactions and loose:
+                candidates = self._by_path.get(path_key(key))
+                if not candidates:
+                    return None
+                wanted = set(_query_items(key))
+                key = max(candidates, key=lambda c: len(wanted.intersection(_query_items(c))))
+            entries = self.interactions.get(key)
+            if not entries:
+                return None
+            i = self._cursor.get(key, 0)
+            self._cursor[key] = i + 1
+            return entries[min(i, len(entries) - 1)]
+
+
+def _entry_response(entry: Dict[str, Any], request: httpx.Request) -> httpx.Response:
+    if "body_b64" in entry:
+        content = base64.b64decode(entry["body_b64"])
+    else:
+        content = entry.get("body", "").encode("utf-8")
+    return httpx.Response(entry["status"], headers=entry.get("headers") or {}, content=content, request=request)
+
+
+def _kept_headers(response: httpx.Response) -> Dict[str, str]:
+    return {k: response.headers[k] for k in KEPT_RESPONSE_HEADERS if k in response.headers}
+
+
+# ==================== Recording ====================
+
+
+class RecordingTransport(httpx.BaseTransport):
+    """Pass requests to the network and record each response."""
+
+    def __init__(self, cassette: Cassette, transport: Optional[httpx.BaseTransport] = None):
+        self.cassette = cassette
+        self._transport = transport
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        if self._transport is None:
+            self._transport = httpx.HTTPTransport()
+        started = time.perf_counter()
+        response = self._transport.handle_request(request)
+        try:
+            body = response.read()  # decoded (gzip/br already removed)
+        finally:
+            response.close()
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        headers = _kept_headers(response)
+        self.cassette.add(interaction_key(request, self.cassette.ignore_params),
+                          response.status_code, headers, body, elapsed_ms)
+        return httpx.Response(response.status_code, headers=headers, content=body, request=request)
+
+    def close(self) -> None:
+        # Clients are often created per request; keep the cassette, drop the pool
+        if self._transport is not None:
+            self._transport.close()
+            self._transport = None
+
+
+class AsyncRecordingTransport(httpx.AsyncBaseTransport):
+    """Async counterpart of RecordingTransport."""
+
+    def __init__(self, cassette: Cassette, transport: Optional[httpx.AsyncBaseTransport] = None):
+        self.cassette = cassette
+        self._transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if self._transport is None:
+            self._transport = httpx.AsyncHTTPTransport()
+        started = time.perf_counter()
+        response = await self._transport.handle_async_request(request)
+        try:
+            body = await response.aread()
+        finally:
+            await response.aclose()
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        headers = _kept_headers(response)
+        self.cassette.add(interaction_key(request, self.cassette.ignore_params),
+                          response.status_code, headers, body, elapsed_ms)
+        return httpx.Response(response.status_code, headers=headers, content=body, request=request)
+
+    async def aclose(self) -> None:
+        if self._transport is not None:
+            await self._transport.aclose()
+            self._transport = None
+
+
+# ==================== Replay ====================
+
+
+@dataclass
+class ReplayConfig:
+    """Latency and error injection for replayed responses."""
+
+    latency_ms: float = 0.0  # Fixed latency added to every response
+    latency_scale: Optional[float] = None  # If set, use recorded latency * scale instead
+    jitter_ms: float = 0.0  # Uniform +/- jitter
+    error_rate: float = 0.0  # Fraction of requests that fail
+    error_status: int = 503  # Status returned for injected errors (0 = connection error)
+    loose_match: bool = True  # Fall back to method + path when the query differs
+    missing_status: int = 404  # Status for requests not in the cassette
+    seed: Optional[int] = 7
+
+    stats: Dict[str, int] = field(default_factory=lambda: {"served": 0, "missing": 0, "injected_errors": 0})
+
+    # One seeded stream per config: clients that open a transport per
+    # request (Fyers) must not restart the sequence every time
+    _rng: random.Random = field(init=False, repr=False, compare=False)
+    _lock: threading.Lock = field(init=False, repr=False, compare=False, default_factory=threading.Lock)
+
+    def __post_init__(self):
+        self._rng = random.Random(self.seed)
+
+    def draw(self) -> float:
+        with self._lock:
+            return self._rng.random()
+
+    def uniform(self, a: float, b: float) -> float:
+        with self._lock:
+            return self._rng.uniform(a, b)
+
+
+class _ReplayCore:
+    """Shared replay logic for the sync and async transports."""
+
+    def __init__(self, cassette: Cassette, config: Optional[ReplayConfig] = None):
+        self.cassette = cassette
+        self.config = config or ReplayConfig()
+
+    def _delay_s(self, entry: Optional[Dict[str, Any]]) -> float:
+        cfg = self.config
+        if cfg.latency_scale is not None and entry is not None:
+            delay = entry.get("elapsed_ms", 0.0) * cfg.latency_scale
+        else:
+            delay = cfg.latency_ms
+        if cfg.jitter_ms:
+            delay += cfg.uniform(-cfg.jitter_ms, cfg.jitter_ms)
+        return max(delay, 0.0) / 1000
+
+    def _inject_error(self) -> bool:
+        if self.config.error_rate <= 0:
+            return False
+        return self.config.draw() < self.config.error_rate
+
+    def respond(self, request: httpx.Request) -> Tuple[Optional[httpx.Response], float]:
+        """Response for a request (None = raise a connection error) and its delay."""
+        stats = self.config.stats
+        if self._inject_error():
+            stats["injected_errors"] += 1
+            if not self.config.error_status:
+                return None, self._delay_s(None)
+            return httpx.Response(self.config.error_status, content=b"injected error", request=request), self._delay_s(None)
+
+        entry = self.cassette.match(request, loose=self.config.loose_match)
+        if entry is None:
+            stats["missing"] += 1
+            logger.debug(f"Replay miss: {interaction_key(request, self.cassette.ignore_params)}")
+            return httpx.Response(
+                self.config.missing_status,
+                json={"error": "not in cassette", "request": interaction_key(request, self.cassette.ignore_params)},
+                request=request,
+            ), 0.0
+        stats["served"] += 1
+        return _entry_response(entry, request), self._delay_s(entry)
+
+
+class ReplayTransport(httpx.BaseTransport):
+    """Serve requests from a cassette, without network access."""
+
+    def __init__(self, cassette: Cassette, config: Optional[ReplayConfig] = None):
+        self._core = _ReplayCore(cassette, config)
+
+    @property
+    def config(self) -> ReplayConfig:
+        return self._core.config
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        response, delay = self._core.respond(request)
+        if delay:
+            time.sleep(delay)
+        if response is None:
+            raise httpx.ConnectError("Injected connection error", request=request)
+        return response
+
+
+class AsyncReplayTransport(httpx.AsyncBaseTransport):
+    """Async counterpart of ReplayTransport."""
+
+    def __init__(self, cassette: Cassette, config: Optional[ReplayConfig] = None):
+        self._core = _ReplayCore(cassette, config)
+
+    @property
+    def config(self) -> ReplayConfig:
+        return self._core.config
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        response, delay = self._core.respond(request)
+        if delay:
+            await asyncio.sleep(delay)
+        if response is None:
+            raise httpx.ConnectError("Injected connection error", request=request)
+        return response
+
+
+# ==================== Process-wide mode ====================
+
+
+@dataclass
+class _HttpMode:
+    mode: Optional[str] = None  # None, "record" or "replay"
+    cassette: Optional[Cassette] = None
+    config: Optional[ReplayConfig] = None
+
+
+_mode = _HttpMode()
+_env_checked = False
+
+
+def _check_env() -> None:
+    global _env_checked
+    if _env_checked:
+        return
+    _env_checked = True
+    mode = os.environ.get("HAGRID_HTTP_MODE", "").strip().lower()
+    path = os.environ.get("HAGRID_HTTP_CASSETTE", "").strip()
+    if mode in ("record", "replay") and path:
+        cassette = Cassette(path)
+        set_http_mode(mode, cassette)
+        if mode == "record":
+            # No block to close as with recording(): write what was recorded at exit
+            atexit.register(cassette.save)
+        logger.info(f"HTTP {mode} mode from environment: {path}")
+
+
+def set_http_mode(mode: Optional[str], cassette: Optional[Cassette] = None, config: Optional[ReplayConfig] = None) -> None:
+    """
+    Switch every client that uses ``default_transport()``.
+
+    Args:
+        mode: "record", "replay" or None (live)
+        cassette: Cassette to record into / replay from
+        config: Replay latency / error injection
+    """
+    if mode not in (None, "record", "replay"):
+        raise ValueError(f"Unknown HTTP mode: {mode}")
+    if mode and cassette is None:
+        raise ValueError(f"HTTP mode '{mode}' needs a cassette")
+    _mode.mode, _mode.cassette, _mode.config = mode, cassette, config or ReplayConfig()
+
+
+def http_mode() -> Optional[str]:
+    _check_env()
+    return _mode.mode
+
+
+def default_transport(is_async: bool = False) -> Optional[Any]:
+    """
+    Transport for a new httpx client under the current mode.
+
+    Returns None in live mode, so callers keep httpx's default transport.
+    """
+    _check_env()
+    if _mode.mode == "record":
+        return AsyncRecordingTransport(_mode.cassette) if is_async else RecordingTransport(_mode.cassette)
+    if _mode.mode == "replay":
+        return AsyncReplayTransport(_mode.cassette, _mode.config) if is_async else ReplayTransport(_mode.cassette, _mode.config)
+    return None
+
+
+@contextmanager
+def recording(path: str | Path) -> Iterator[Cassette]:
+    """Record all client traffic in this block into a cassette file."""
+    previous = (_mode.mode, _mode.cassette, _mode.config)
+    cassette = Cassette(path)
+    set_http_mode("record", cassette)
+    try:
+        yield cassette
+    finally:
+        cassette.save()
+        _mode.mode, _mode.cassette, _mode.config = previous
+        logger.info(f"Recorded {len(cassette)} responses to {cassette.path}")
+
+
+@contextmanager
+def replaying(cassette: str | Path | Cassette, config: Optional[ReplayConfig] = None) -> Iterator[Cassette]:
+    """Serve all client traffic in this block from a cassette."""
+    previous = (_mode.mode, _mode.cassette, _mode.config)
+    if not isinstance(cassette, Cassette):
+        cassette = Cassette(cassette)
+        if not len(cassette):
+            raise FileNotFoundError(f"Cassette {cassette.path} is missing or empty")
+    set_http_mode("replay", cassette, config)
+    try:
+        yield cassette
+    finally:
+        _mode.mode, _mode.cassette, _mode.config = previous
+
+
+__all__ = [
+    "CASSETTE_VERSION",
+    "Cassette",
+    "RecordingTransport",
+    "AsyncRecordingTransport",
+    "ReplayConfig",
+    "ReplayTransport",
+    "AsyncReplayTransport",
+    "interaction_key",
+    "set_http_mode",
+    "http_mode",
+    "default_transport",
+    "recording",
+    "replaying",
+]
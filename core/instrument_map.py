@@ -0,0 +1,378 @@
+"""
+Cross-provider instrument identity map.
+
+One on-disk table (.hagrid/instruments.json) keyed by NSE symbol and
+ISIN that maps each stock to every provider's identifier:
+
+    provider      fields
+    fyers         fyers_ticker ("NSE:SBIN-EQ"), fytoken
+    yahoo         yahoo ("SBIN.NS")
+    nse_chart     nse_chart_symbol ("SBIN-EQ"), nse_scripcode
+    screener      screener_id, screener_url, screener_name
+    groww         groww_search_id ("state-bank-of-india")
+    tradingview   tradingview (the search result fields needed to rebuild it)
+
+Base rows (symbol, ISIN, name, Fyers and Yahoo tickers) are rebuilt once
+a day from the Fyers NSE_CM symbol master; ids resolved on earlier days
+are carried over. Ids that need a provider search are resolved lazily
+by the provider clients on first use and written back, so after the
+first day a sweep over the same universe makes no search calls:
+
+    imap = get_instrument_map()
+    imap.get("RELIANCE").fytoken
+    imap.get("INE002A01018").symbol
+    ids = imap.lookup("RELIANCE", "screener")   # dict of fields, or None
+    imap.record("RELIANCE", "screener", screener_id=2726, ...)
+
+Searches that find nothing are remembered for the rest of the day
+(record_miss / is_miss) so a bad symbol is not searched on every call.
+"""
+
+import atexit
+import json
+import logging
+import re
+import threading
+import time
+from dataclasses import asdict, dataclass, field, fields
+from datetime import date
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+from core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Identifier fields per provider; lookup() treats the first as required
+PROVIDER_FIELDS: Dict[str, tuple] = {
+    "fyers": ("fyers_ticker", "fytoken"),
+    "yahoo": ("yahoo",),
+    "nse_chart": ("nse_chart_symbol", "nse_scripcode"),
+    "screener": ("screener_id", "screener_url", "screener_name"),
+    "groww": ("groww_search_id",),
+    "tradingview": ("tradingview",),
+}
+
+_ISIN = re.compile(r"^[A-Z]{2}[A-Z0-9]{9}[0-9]$")
+_SYMBOL = re.compile(r"^[A-Z0-9][A-Z0-9&_-]{0,19}$")
+
+
+def normalize_key(key: str) -> str:
+    """Bare upper-case NSE symbol or ISIN ("NSE:SBIN-EQ", "sbin.ns" -> "SBIN")."""
+    key = key.strip().upper()
+    if ":" in key:
+        key = key.split(":", 1)[1]
+    for suffix in ("-EQ", "-BE", ".NS"):
+        if key.endswith(suffix):
+            return key[: -len(suffix)]
+    return key
+
+
+def is_isin(key: str) -> bool:
+    return bool(_ISIN.match(key))
+
+
+def is_symbol_like(key: str) -> bool:
+    """True for NSE-symbol-shaped keys ("SBIN", "M&M", "BAJAJ-AUTO"), not free text."""
+    return bool(_SYMBOL.match(normalize_key(key)))
+
+
+@dataclass
+class Instrument:
+    """One stock and its identifier at every provider (None = not resolved yet)."""
+
+    symbol: str
+    isin: Optional[str] = None
+    name: Optional[str] = None
+    fyers_ticker: Optional[str] = None
+    fytoken: Optional[str] = None
+    yahoo: Optional[str] = None
+    nse_chart_symbol: Optional[str] = None
+    nse_scripcode: Optional[str] = None
+    screener_id: Optional[int] = None
+    screener_url: Optional[str] = None
+    screener_name: Optional[str] = None
+    groww_search_id: Optional[str] = None
+    tradingview: Optional[Dict[str, Any]] = None
+    misses: Dict[str, str] = field(default_factory=dict)  # provider -> day a search found nothing
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {k: v for k, v in asdict(self).items() if v not in (None, {})}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Instrument":
+        known = {f.name for f in fields(cls)}
+        return cls(**{k: v for k, v in data.items() if k in known})
+
+
+class InstrumentMap:
+    """
+    Identity table with O(1) lookups by NSE symbol and by ISIN.
+
+    Thread-safe. Writes are coalesced: record() marks the table dirty and
+    it is saved at most every ``save_interval`` seconds (and at exit), so
+    a sweep that resolves many symbols rewrites the file a few times, not
+    once per symbol.
+    """
+
+    def __init__(self, path: str | Path, save_interval: float = 5.0):
+        """
+        Initialize the map, loading the file if it exists.
+
+        Args:
+            path: JSON file backing the map
+            save_interval: Min seconds between writes triggered by record()
+        """
+        self.path = Path(path)
+        self.save_interval = save_interval
+        self._lock = threading.RLock()
+        self._by_symbol: Dict[str, Instrument] = {}
+        self._by_isin: Dict[str, Instrument] = {}
+        self.built: Optional[str] = None  # Day of the last symbol-master rebuild
+        self._dirty = False
+        self._last_save = 0.0
+        self._load()
+        atexit.register(self.flush)
+
+    # ==================== Persistence ====================
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            return
+        try:
+            data = json.loads(self.path.read_text())
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable instrument map {self.path}: {e}")
+            return
+        self.built = data.get("built")
+        for row in data.get("instruments", []):
+            try:
+                self._index(Instrument.from_dict(row))
+            except TypeError:
+                continue
+
+    def _index(self, inst: Instrument) -> None:
+        self._by_symbol[inst.symbol] = inst
+        if inst.isin:
+            self._by_isin[inst.isin] = inst
+
+    def flush(self) -> None:
+        """Write pending changes now."""
+        with self._lock:
+            if not self._dirty:
+                return
+            payload = {
+                "built": self.built,
+                "instruments": [inst.to_dict() for inst in self._by_symbol.values()],
+            }
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+            try:
+                tmp.write_text(json.dumps(payload, separators=(",", ":")))
+                tmp.replace(self.path)
+            except OSError as e:
+                logger.warning(f"Failed to save instrument map: {e}")
+                return
+            self._dirty = False
+            self._last_save = time.monotonic()
+
+    def _changed(self) -> None:
+        self._dirty = True
+        if time.monotonic() - self._last_save >= self.save_interval:
+            self.flush()
+
+    # ==================== Lookups ====================
+
+    def __len__(self) -> int:
+        return len(self._by_symbol)
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
+
+    def get(self, key: str) -> Optional[Instrument]:
+        """Instrument by NSE symbol (any common form) or ISIN."""
+        key = normalize_key(key)
+        return self._by_symbol.get(key) or self._by_isin.get(key)
+
+    def lookup(self, key: str, provider: str) -> Optional[Dict[str, Any]]:
+        """A provider's identifier fields for an instrument, if resolved."""
+        inst = self.get(key)
+        if inst is None:
+            return None
+        names = PROVIDER_FIELDS[provider]
+        if getattr(inst, names[0]) is None:
+            return None
+        return {name: getattr(inst, name) for name in names}
+
+    def is_miss(self, key: str, provider: str) -> bool:
+        """True if a search for this instrument at the provider found nothing today."""
+        inst = self.get(key)
+        return inst is not None and inst.misses.get(provider) == date.today().isoformat()
+
+    # ==================== Write-back ====================
+
+    def record(self, key: str, provider: str, isin: Optional[str] = None, **ids: Any) -> Instrument:
+        """
+        Store identifiers resolved from a provider.
+
+        Args:
+            key: NSE symbol or ISIN
+            provider: Key of PROVIDER_FIELDS
+            isin: ISIN learned from the provider, if any
+            **ids: The provider's identifier fields
+
+        Returns:
+            The updated instrument
+        """
+        unknown = set(ids) - set(PROVIDER_FIELDS[provider])
+        if unknown:
+            raise ValueError(f"Unknown {provider} fields: {sorted(unknown)}")
+        with self._lock:
+            inst = self._get_or_create(key)
+            if isin and not inst.isin:
+                inst.isin = isin
+                self._by_isin[isin] = inst
+            for name, value in ids.items():
+                setattr(inst, name, value)
+            inst.misses.pop(provider, None)
+            self._changed()
+            return inst
+
+    def record_miss(self, key: str, provider: str) -> None:
+        """Remember that a provider search found nothing (retried tomorrow)."""
+        with self._lock:
+            inst = self._get_or_create(key)
+            inst.misses[provider] = date.today().isoformat()
+            self._changed()
+
+    def _get_or_create(self, key: str) -> Instrument:
+        inst = self.get(key)
+        if inst is None:
+            key = normalize_key(key)
+            inst = Instrument(symbol=key, isin=key if is_isin(key) else None)
+            self._index(inst)
+        return inst
+
+    # ==================== Daily build ====================
+
+    def rebuild(self, rows: Iterable[Dict[str, Any]], day: Optional[str] = None) -> int:
+        """
+        Replace the base rows, keeping every provider id resolved so far.
+
+        Ids are carried over by ISIN first (survives symbol changes), then
+        by symbol. Instruments not in ``rows`` but with resolved ids are
+        kept as well.
+
+        Args:
+            rows: Dicts with symbol, isin, name, fyers_ticker, fytoken
+            day: Build day (default: today)
+
+        Returns:
+            Number of instruments in the rebuilt map
+        """
+        lazy = [n for p, names in PROVIDER_FIELDS.items() if p not in ("fyers", "yahoo") for n in names]
+        with self._lock:
+            by_symbol: Dict[str, Instrument] = {}
+            by_isin: Dict[str, Instrument] = {}
+            for row in rows:
+                symbol = normalize_key(row["symbol"])
+                isin = row.get("isin") or None
+                inst = Instrument(
+                    symbol=symbol,
+                    isin=isin,
+                    name=row.get("name"),
+                    fyers_ticker=row.get("fyers_ticker"),
+                    fytoken=row.get("fytoken"),
+                    yahoo=f"{symbol}.NS",
+                )
+                previous = (isin and self._by_isin.get(isin)) or self._by_symbol.get(symbol)
+                if previous is not None:
+                    for name in lazy:
+                        setattr(inst, name, getattr(previous, name))
+                    inst.misses = dict(previous.misses)
+                by_symbol[symbol] = inst
+                if isin:
+                    by_isin[isin] = inst
+            for symbol, previous in self._by_symbol.items():
+                if symbol not in by_symbol and any(getattr(previous, n) is not None for n in lazy):
+                    by_symbol[symbol] = previous
+                    if previous.isin and previous.isin not in by_isin:
+                        by_isin[previous.isin] = previous
+            self._by_symbol, self._by_isin = by_symbol, by_isin
+            self.built = day or date.today().isoformat()
+            self._dirty = True
+            self.flush()
+            return len(by_symbol)
+
+    async def refresh(self, symbol_master: Any = None, force: bool = False) -> int:
+        """
+        Rebuild the base rows from the Fyers NSE_CM symbol master, once a day.
+
+        Args:
+            symbol_master: Loaded or empty SymbolMaster (default: a new one,
+                which uses its own daily file cache)
+            force: Rebuild even if the map was already built today
+
+        Returns:
+            Number of instruments, or 0 if the map was already current
+        """
+        if not force and self.built == date.today().isoformat():
+            return 0
+        from broker.fyers.data.symbol_master import ExchangeSegment, SymbolMaster
+
+        sm = symbol_master or SymbolMaster()
+        await sm.load_segment(ExchangeSegment.NSE_CM)
+
+        rows: Dict[str, Dict[str, Any]] = {}
+        for sym in sm.get_equity_symbols():
+            ticker = sym.symbol_ticker
+            if not ticker.startswith("NSE:"):
+                continue
+            series = (sym.ex_series or ticker.rsplit("-", 1)[-1]).upper()
+            if series not in ("EQ", "BE"):
+                continue
+            symbol = normalize_key(sym.exchange_symbol or ticker)
+            if symbol in rows and series != "EQ":
+                continue  # Prefer the EQ series ticker
+            rows[symbol] = {
+                "symbol": symbol,
+                "isin": sym.isin,
+                "name": sym.symbol_details,
+                "fyers_ticker": ticker,
+                "fytoken": sym.fytoken,
+            }
+        count = self.rebuild(rows.values())
+        logger.info(f"Instrument map rebuilt: {count} instruments")
+        return count
+
+    def stats(self) -> Dict[str, Any]:
+        """Instrument count and resolved ids per provider."""
+        resolved: Dict[str, int] = {}
+        for provider, names in PROVIDER_FIELDS.items():
+            resolved[provider] = sum(getattr(i, names[0]) is not None for i in self._by_symbol.values())
+        return {"built": self.built, "instruments": len(self), "resolved": resolved}
+
+
+_map: Optional[InstrumentMap] = None
+_map_lock = threading.Lock()
+
+
+def get_instrument_map() -> InstrumentMap:
+    """Shared map under the data directory."""
+    global _map
+    if _map is None:
+        with _map_lock:
+            if _map is None:
+                _map = InstrumentMap(get_settings().INSTRUMENT_MAP_FILE)
+    return _map
+
+
+__all__ = [
+    "Instrument",
+    "InstrumentMap",
+    "PROVIDER_FIELDS",
+    "get_instrument_map",
+    "normalize_key",
+    "is_isin",
+    "is_symbol_like",
+]
@@ -1,25 +1,220 @@
-"""Centralized logging configuration for Hagrid AI."""
+"""
+Centralized logging configuration for Hagrid AI.
 
-import os
+Log calls on agent, HTTP and websocket tick paths must not do console or
+disk I/O on the calling thread. ``setup_logging`` therefore installs a
+queue pipeline:
+
+- The ``hagrid`` logger and the root logger get a ``QueueHandler``; the
+  calling thread only interpolates the message and enqueues the record
+  (tracebacks are formatted by the listener)
+- A ``QueueListener`` thread writes to the console (human-readable) and
+  to a rotating log file (JSON lines by default)
+- High-frequency sources (websocket ticks and depth, per-request HTTP
+  debug, cache and replay chatter) are rate limited and sampled before
+  enqueueing; WARNING and above always pass, and the next record that
+  passes carries the count of records dropped in between
+
+Usage:
+    logger = setup_logging(log_level="INFO", log_file=settings.LOG_FILE)
+    get_logger("scheduler").info("started")
+    shutdown_logging()  # flush (also runs at exit)
+"""
+
+import atexit
+import json
 import logging
+import logging.handlers
+import os
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional, Sequence
+
+CONSOLE_FORMAT = "%(asctime)s | %(name)s | %(levelname)s | %(filename)s:%(lineno)d | %(message)s"
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Logger trees that configure their own blocking handlers (Fyers SDK) and are
+# re-routed through the queue by setup_logging. Fyers loggers created later
+# see the root queue handler and add no handler of their own
+ADOPTED_LOGGERS = ("fyers",)
+
+
+@dataclass(frozen=True)
+class Throttle:
+    """Limits for one logger tree (records below WARNING only)."""
+
+    per_second: float = 0.0  # Token-bucket rate; 0 = unlimited
+    burst: int = 20  # Bucket size
+    sample_every: int = 1  # Keep 1 of every N records; 1 = keep all
+
+
+# Logger name prefix -> throttle for the sources that log per tick / per request
+DEFAULT_THROTTLES: Dict[str, Throttle] = {
+    "fyers.websocket": Throttle(per_second=20, sample_every=10),
+    "workflows.tick_monitor": Throttle(per_second=10),
+    "api.market_hub": Throttle(per_second=10),
+    "fyers.http_client": Throttle(per_second=20),
+    "fyers.rate_limiter": Throttle(per_second=5),
+    "tools.nse_india.core.cache": Throttle(per_second=5, sample_every=10),
+    "core.http_replay": Throttle(per_second=10),
+    "core.tool_memo": Throttle(per_second=10),
+}
+
+
+class ThrottleFilter(logging.Filter):
+    """
+    Rate limits and samples records per logger tree, on the calling thread.
+
+    The most specific matching prefix in ``throttles`` applies. Dropped
+    records are counted and reported as ``record.suppressed`` on the next
+    record of that tree that passes.
+    """
+
+    def __init__(self, throttles: Dict[str, Throttle]):
+        super().__init__()
+        self.throttles = dict(throttles)
+        self._lock = threading.Lock()
+        self._rules: Dict[str, Optional[str]] = {}  # logger name -> matching prefix (memo)
+        self._tokens: Dict[str, float] = {}
+        self._stamp: Dict[str, float] = {}
+        self._seen: Dict[str, int] = {}
+        self._dropped: Dict[str, int] = {}
+
+    def _rule(self, name: str) -> Optional[str]:
+        if name not in self._rules:
+            matches = [p for p in self.throttles if name == p or name.startswith(p + ".")]
+            self._rules[name] = max(matches, key=len) if matches else None
+        return self._rules[name]
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        prefix = self._rule(record.name)
+        if prefix is None:
+            return True
+        if record.levelno >= logging.WARNING:
+            return self._release(prefix, record)
+        rule = self.throttles[prefix]
+        with self._lock:
+            seen = self._seen.get(prefix, 0)
+            self._seen[prefix] = seen + 1
+            keep = seen % rule.sample_every == 0 if rule.sample_every > 1 else True
+            if keep and rule.per_second > 0:
+                now = time.monotonic()
+                tokens = min(
+                    rule.burst,
+                    self._tokens.get(prefix, rule.burst) + (now - self._stamp.get(prefix, now)) * rule.per_second,
+                )
+                self._stamp[prefix] = now
+                keep = tokens >= 1
+                self._tokens[prefix] = tokens - 1 if keep else tokens
+            if not keep:
+                self._dropped[prefix] = self._dropped.get(prefix, 0) + 1
+                return False
+        return self._release(prefix, record)
+
+    def _release(self, prefix: str, record: logging.LogRecord) -> bool:
+        if self._dropped.get(prefix):
+            with self._lock:
+                record.suppressed = self._dropped.pop(prefix, 0)
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line; ``extra=`` fields are included."""
+
+    _STANDARD = frozenset(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "ts": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "src": f"{record.filename}:{record.lineno}",
+            "thread": record.threadName,
+            "msg": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in self._STANDARD and not key.startswith("_"):
+                payload[key] = value
+        if record.exc_info:
+            payload["exc"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            payload["exc"] = record.exc_text
+        return json.dumps(payload, default=str, ensure_ascii=False)
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """
+    Enqueues records with the least work on the calling thread.
+
+    The stock handler formats the full line, copies the record and renders
+    tracebacks before enqueueing (needed for pickling to other processes).
+    The queue here is in-process, so only the message is interpolated (args
+    may be mutated after the call) and the traceback is formatted by the
+    listener. The queue handler is the last to see a record, so it is
+    updated in place.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.msg = record.message = record.getMessage()
+        record.args = None
+        return record
+
+
+class _ConsoleFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        text = super().format(record)
+        suppressed = getattr(record, "suppressed", 0)
+        return f"{text} [+{suppressed} suppressed]" if suppressed else text
+
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_queue_handler: Optional[logging.handlers.QueueHandler] = None
+
+
+def _file_handler(
+    log_path: Path, max_bytes: int, backup_count: int, rotate_when: Optional[str]
+) -> logging.Handler:
+    log_path.parent.mkdir(parents=True, exist_ok=True)
+    if rotate_when:
+        return logging.handlers.TimedRotatingFileHandler(
+            log_path, when=rotate_when, backupCount=backup_count, encoding="utf-8"
+        )
+    if max_bytes > 0:
+        return logging.handlers.RotatingFileHandler(
+            log_path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8"
+        )
+    return logging.FileHandler(log_path, encoding="utf-8")
 
 
 def setup_logging(
     log_level: str = "INFO",
     log_to_file: bool = True,
     log_file: Optional[str] = None,
-    agno_debug: bool = True,
+    agno_debug: bool = False,
     agno_debug_level: int = 1,
+    json_file: bool = True,
+    max_bytes: int = 20 * 1024 * 1024,
+    backup_count: int = 5,
+    rotate_when: Optional[str] = None,
+    throttles: Optional[Dict[str, Throttle]] = None,
+    adopt: Sequence[str] = ADOPTED_LOGGERS,
 ) -> logging.Logger:
     """
     Configure centralized logging for Hagrid AI.
 
-    - Sets up console handler with source identification
-    - Sets up file handler (optional)
+    - Routes the ``hagrid`` logger, the root logger and the adopted logger
+      trees through a queue; a listener thread does all console/file I/O
+    - Console output is human-readable; the file is JSON lines (optional)
+      and rotates by size, or by time when ``rotate_when`` is set
+    - Rate limits and samples high-frequency loggers before enqueueing
     - Configures Agno framework logging
-    - Sets AGNO_DEBUG environment variable
+    - Sets AGNO_DEBUG environment variable (off by default)
+
+    Calling it again replaces the previous pipeline.
 
     Args:
         log_level: Logging level (DEBUG, INFO, WARNING, ERROR)
@@ -27,37 +222,53 @@ def setup_logging(
         log_file: Path to log file
         agno_debug: Whether to enable Agno debug mode
         agno_debug_level: Agno debug level (1=normal, 2=verbose)
+        json_file: Write the log file as JSON lines (else console format)
+        max_bytes: Rotate the file at this size (0 = never, by size)
+        backup_count: Rotated files to keep
+        rotate_when: Time-based rotation instead ("midnight", "H", ...)
+        throttles: Logger prefix -> Throttle (default: DEFAULT_THROTTLES)
+        adopt: Logger trees whose own handlers are replaced by the queue
 
     Returns:
         Configured logger instance
     """
+    global _listener, _queue_handler
+    shutdown_logging()
+
+    formatter = _ConsoleFormatter(CONSOLE_FORMAT, datefmt=DATE_FORMAT)
+    console_handler = logging.StreamHandler()
+    console_handler.setFormatter(formatter)
+    handlers: list = [console_handler]
+
+    if log_to_file and log_file:
+        file_handler = _file_handler(Path(log_file), max_bytes, backup_count, rotate_when)
+        file_handler.setFormatter(JsonFormatter() if json_file else formatter)
+        handlers.append(file_handler)
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    _queue_handler = _QueueHandler(log_queue)
+    _queue_handler.addFilter(ThrottleFilter(DEFAULT_THROTTLES if throttles is None else throttles))
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+
     # Create main logger
     logger = logging.getLogger("hagrid")
     logger.setLevel(getattr(logging, log_level.upper()))
     logger.propagate = False
-
-    # Clear existing handlers to avoid duplicates
     logger.handlers.clear()
+    logger.addHandler(_queue_handler)
 
-    # Formatter with source file identification
-    formatter = logging.Formatter(
-        "%(asctime)s | %(name)s | %(levelname)s | %(filename)s:%(lineno)d | %(message)s",
-        datefmt="%Y-%m-%d %H:%M:%S",
-    )
-
-    # Console handler
-    console_handler = logging.StreamHandler()
-    console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
-
-    # File handler (optional)
-    if log_to_file and log_file:
-        log_path = Path(log_file)
-        log_path.parent.mkdir(parents=True, exist_ok=True)
+    # Module loggers (logging.getLogger(__name__)) propagate to root; its level is left as is
+    root = logging.getLogger()
+    root.handlers = [h for h in root.handlers if not isinstance(h, logging.handlers.QueueHandler)]
+    root.addHandler(_queue_handler)
 
-        file_handler = logging.FileHandler(log_path, encoding="utf-8")
-        file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
+    for prefix in adopt:
+        for name in list(logging.root.manager.loggerDict):
+            if name == prefix or name.startswith(prefix + "."):
+                adopted = logging.getLogger(name)
+                adopted.handlers.clear()
+                adopted.propagate = True
 
     # Configure Agno logging to use our logger
     try:
@@ -81,6 +292,23 @@ def setup_logging(
     return logger
 
 
+def shutdown_logging() -> None:
+    """Flush queued records and stop the listener thread."""
+    global _listener, _queue_handler
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+    if _queue_handler is not None:
+        for name in ("hagrid", ""):
+            logging.getLogger(name or None).removeHandler(_queue_handler)
+        _queue_handler = None
+
+
+atexit.register(shutdown_logging)
+
+
 def get_logger(name: str = "hagrid") -> logging.Logger:
     """
     Get a child logger with the given name.
@@ -0,0 +1,492 @@
+"""
+Pre-market universe snapshot.
+
+The 9:00 intraday run used to cold-start every fetch (VIX, indices, OI
+spurts, sector constituents, quotes, option chains) while the LLM teams
+were already waiting on tools. A scheduled pre-warm job (8:45) now:
+
+- Fetches a defined universe concurrently, under the Fyers rate limiter
+  and a bounded NSE worker pool, through the same toolkits the agents use
+  (so FyersCache / the NSE response cache are warm as well)
+- Stores quotes per symbol and whole tool results keyed by
+  (tool name, arguments with defaults) in a versioned on-disk bundle
+- Exposes the bundle as a tool memo source, so workflow tools read the
+  snapshot first while it is fresh and fall through to live calls after
+- Rebuilds the cross-provider instrument identity map once a day
+- Refreshes the F&O symbol master and its diff (new / delisted contracts)
+
+Usage:
+    snapshot = await prewarm_snapshot()          # scheduler job
+    install_snapshot_source(tool_memo)           # workflow module
+    snapshot_status()                            # run summary freshness
+"""
+
+import asyncio
+import inspect
+import json
+import logging
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from core.config import get_settings
+from core.tool_memo import ToolResultMemo
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_VERSION = 2
+
+# Seconds a snapshot entry may be served in place of a live call
+DEFAULT_MAX_AGE_S = 900.0
+TOOL_MAX_AGE_S: Dict[str, float] = {
+    "get_quotes": 900,
+    "get_option_chain": 900,
+    "get_oi_spurts": 900,
+    "scan_oi_spurts": 900,
+    "get_historical_data": 3600,
+    "get_index_constituents": 1800,
+    "fetch_sector_constituents": 6 * 3600,
+}
+
+# Pre-open values of these are wrong once trading starts (they carry LTP,
+# change %, OI or advances/declines): an entry fetched before the market
+# open is never served after it, whatever its age
+LIVE_AFTER_OPEN = frozenset({
+    "get_quotes",
+    "get_option_chain",
+    "get_option_greeks",
+    "get_oi_spurts",
+    "scan_oi_spurts",
+    "get_historical_data",  # Misses today's forming bar
+    "get_index_constituents",
+    "get_index_summary",
+    "get_gift_nifty",
+    "fetch_sector_constituents",
+})
+
+QUOTE_BATCH_SIZE = 50  # Fyers quotes API limit
+QUOTES_TOOLKIT = "FyersToolkit"  # Stored quotes are rendered as its get_quotes output
+
+
+@dataclass
+class SnapshotUniverse:
+    """What the pre-warm job fetches."""
+
+    index_symbols: List[str] = field(default_factory=lambda: [
+        "NSE:NIFTY50-INDEX",
+        "NSE:NIFTYBANK-INDEX",
+        "NSE:FINNIFTY-INDEX",
+        "NSE:INDIAVIX-INDEX",
+    ])
+    # Quotes are fetched for every constituent of this index
+    constituents_index: str = "NIFTY 100"
+    history_symbols: List[str] = field(default_factory=lambda: [
+        "NSE:NIFTY50-INDEX",
+        "NSE:INDIAVIX-INDEX",
+    ])
+    option_chain_symbols: List[str] = field(default_factory=lambda: [
+        "NSE:NIFTY50-INDEX",
+        "NSE:NIFTYBANK-INDEX",
+    ])
+    summary_indices: List[str] = field(default_factory=lambda: ["NIFTY 50", "NIFTY BANK"])
+    sectors: List[str] = field(default_factory=lambda: [
+        "banking", "it", "pharma", "auto", "fmcg", "metal", "energy", "realty",
+    ])
+
+
+def market_open_ts(now: Optional[float] = None) -> float:
+    """Epoch seconds of the market open (settings.MARKET_OPEN_TIME, IST) on the day of ``now``."""
+    import pytz
+
+    ist = pytz.timezone("Asia/Kolkata")
+    hour, minute = (int(p) for p in get_settings().MARKET_OPEN_TIME.split(":"))
+    day = datetime.fromtimestamp(time.time() if now is None else now, ist)
+    return day.replace(hour=hour, minute=minute, second=0, microsecond=0).timestamp()
+
+
+def tool_owner(func: Callable) -> Optional[str]:
+    """Class name of the toolkit a tool method belongs to (None for plain functions)."""
+    owner = getattr(inspect.unwrap(func), "__self__", None)
+    return type(owner).__name__ if owner is not None else None
+
+
+def bind_arguments(func: Callable, arguments: Dict[str, Any]) -> Dict[str, Any]:
+    """Arguments with the function's defaults filled in (for stable keys)."""
+    try:
+        bound = inspect.signature(func).bind_partial(**(arguments or {}))
+    except (TypeError, ValueError):
+        return dict(arguments or {})
+    bound.apply_defaults()
+    return {k: v for k, v in bound.arguments.items() if k not in ("args", "kwargs")}
+
+
+@dataclass
+class MarketSnapshot:
+    """One versioned pre-market bundle."""
+
+    version: str
+    created_at: float
+    duration_s: float = 0.0
+    quotes: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    quotes_fetched_at: float = 0.0
+    tools: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    errors: List[str] = field(default_factory=list)
+    universe: Dict[str, Any] = field(default_factory=dict)
+    schema: int = SCHEMA_VERSION
+
+    @classmethod
+    def new(cls, universe: SnapshotUniverse) -> "MarketSnapshot":
+        now = time.time()
+        return cls(
+            version=datetime.fromtimestamp(now).strftime("%Y%m%d-%H%M%S"),
+            created_at=now,
+            universe=asdict(universe),
+        )
+
+    @property
+    def age_s(self) -> float:
+        return time.time() - self.created_at
+
+    @staticmethod
+    def tool_key(tool_name: str, arguments: Dict[str, Any]) -> str:
+        return f"{tool_name}|{ToolResultMemo.normalize_args(arguments)}"
+
+    # ==================== Reads ====================
+
+    def _fresh(self, fetched_at: float, tool_name: str, max_age: Optional[float]) -> bool:
+        now = time.time()
+        if tool_name in LIVE_AFTER_OPEN and fetched_at < market_open_ts(now) <= now:
+            return False
+        limit = max_age if max_age is not None else TOOL_MAX_AGE_S.get(tool_name, DEFAULT_MAX_AGE_S)
+        return now - fetched_at <= limit
+
+    def tool_result(
+        self,
+        tool_name: str,
+        arguments: Dict[str, Any],
+        max_age: Optional[float] = None,
+        toolkit: Optional[str] = None,
+    ) -> Optional[str]:
+        """Stored result of a tool call, if present, fresh and (if given) from the same toolkit."""
+        entry = self.tools.get(self.tool_key(tool_name, arguments))
+        if entry is None or not self._fresh(entry["fetched_at"], tool_name, max_age):
+            return None
+        if toolkit is not None and entry.get("toolkit") != toolkit:
+            return None
+        return entry["result"]
+
+    def quotes_csv(
+        self,
+        symbols: Optional[List[str]],
+        columns: Optional[List[str]] = None,
+        max_age: Optional[float] = None,
+    ) -> Optional[str]:
+        """FyersToolkit.get_quotes output built from stored quotes (all symbols must be present)."""
+        if not symbols or not self._fresh(self.quotes_fetched_at, "get_quotes", max_age):
+            return None
+        rows = []
+        for symbol in symbols:
+            quote = self.quotes.get(symbol)
+            if quote is None:
+                return None
+            rows.append({**quote, "symbol": symbol})
+
+        from broker.fyers.toolkit import FyersToolkit
+        from core.output_format import format_table, shape_csv
+
+        return shape_csv(format_table(rows, FyersToolkit.QUOTE_COLUMNS), include=columns)
+
+    def lookup(self, tool_name: str, function_call: Callable, arguments: Dict[str, Any]) -> Optional[str]:
+        """
+        Tool memo source: serve a tool call from the snapshot when possible.
+
+        ``function_call`` must be the tool's own method (see
+        tool_memo.resolve_tool): arguments are bound against its signature,
+        as they were when the snapshot was written, and its toolkit must be
+        the one that produced the entry (Fyers and Groww share tool names).
+        """
+        toolkit = tool_owner(function_call)
+        if toolkit is None:
+            return None
+        args = bind_arguments(function_call, arguments)
+        if tool_name == "get_quotes":
+            if toolkit != QUOTES_TOOLKIT or not isinstance(args.get("symbols"), (list, tuple)):
+                return None
+            return self.quotes_csv(list(args["symbols"]), args.get("columns"))
+        return self.tool_result(tool_name, args, toolkit=toolkit)
+
+    def status(self) -> Dict[str, Any]:
+        """Freshness summary for run logs."""
+        return {
+            "version": self.version,
+            "created_at": datetime.fromtimestamp(self.created_at).isoformat(timespec="seconds"),
+            "age_s": round(self.age_s, 1),
+            "fresh": self.age_s <= DEFAULT_MAX_AGE_S,
+            "duration_s": round(self.duration_s, 2),
+            "quotes": len(self.quotes),
+            "tool_results": len(self.tools),
+            "errors": len(self.errors),
+        }
+
+    # ==================== Writes ====================
+
+    def add_tool_result(
+        self, tool_name: str, arguments: Dict[str, Any], result: str, toolkit: Optional[str] = None
+    ) -> None:
+        self.tools[self.tool_key(tool_name, arguments)] = {
+            "tool": tool_name,
+            "toolkit": toolkit,
+            "args": arguments,
+            "result": result,
+            "fetched_at": time.time(),
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "MarketSnapshot":
+        return cls(**{k: v for k, v in data.items() if k in cls.__dataclass_fields__})
+
+
+class SnapshotStore:
+    """
+    Versioned snapshot bundles on disk.
+
+    Each bundle is ``<version>.json``; ``LATEST`` names the current one.
+    Both are written atomically so a run never reads a half-written
+    bundle. Only the newest ``keep`` bundles are retained.
+    """
+
+    LATEST = "LATEST"
+
+    def __init__(self, directory: Path | str, keep: int = 5):
+        self.directory = Path(directory)
+        self.keep = keep
+        self._lock = threading.Lock()
+        self._loaded: Optional[Tuple[str, MarketSnapshot]] = None
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _write(self, path: Path, text: str) -> None:
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        tmp.write_text(text)
+        tmp.replace(path)
+
+    def save(self, snapshot: MarketSnapshot) -> Path:
+        """Write a bundle and point LATEST at it."""
+        path = self.directory / f"{snapshot.version}.json"
+        with self._lock:
+            self._write(path, json.dumps(snapshot.to_dict(), default=str))
+            self._write(self.directory / self.LATEST, snapshot.version)
+            self._loaded = (snapshot.version, snapshot)
+            for old in sorted(self.directory.glob("*.json"))[:-self.keep]:
+                try:
+                    old.unlink()
+                except OSError:
+                    pass
+        return path
+
+    def load_latest(self) -> Optional[MarketSnapshot]:
+        """The bundle LATEST points at (parsed once per version)."""
+        pointer = self.directory / self.LATEST
+        try:
+            version = pointer.read_text().strip()
+        except OSError:
+            return None
+        with self._lock:
+            if self._loaded and self._loaded[0] == version:
+                return self._loaded[1]
+            try:
+                data = json.loads((self.directory / f"{version}.json").read_text())
+            except (OSError, json.JSONDecodeError) as e:
+                logger.warning(f"Could not read snapshot bundle {version}: {e}")
+                return None
+            if data.get("schema") != SCHEMA_VERSION:
+                logger.info(f"Ignoring snapshot {version} with schema {data.get('schema')}")
+                return None
+            snapshot = MarketSnapshot.from_dict(data)
+            self._loaded = (version, snapshot)
+            return snapshot
+
+
+_store: Optional[SnapshotStore] = None
+
+
+def get_snapshot_store() -> SnapshotStore:
+    """Shared store under the data directory."""
+    global _store
+    if _store is None:
+        settings = get_settings()
+        _store = SnapshotStore(settings.SNAPSHOT_DIR, keep=settings.SNAPSHOT_KEEP)
+    return _store
+
+
+def get_active_snapshot() -> Optional[MarketSnapshot]:
+    """Latest bundle, if it was built today."""
+    snapshot = get_snapshot_store().load_latest()
+    if snapshot is None:
+        return None
+    if datetime.fromtimestamp(snapshot.created_at).date() != datetime.now().date():
+        return None
+    return snapshot
+
+
+def snapshot_status() -> Dict[str, Any]:
+    """Freshness of the active snapshot (``{"version": None}`` if there is none)."""
+    snapshot = get_active_snapshot()
+    return snapshot.status() if snapshot else {"version": None, "fresh": False}
+
+
+def snapshot_source(tool_name: str, function_call: Callable, arguments: Dict[str, Any]) -> Optional[Any]:
+    """Tool memo source reading from the active snapshot."""
+    snapshot = get_active_snapshot()
+    if snapshot is None:
+        return None
+    return snapshot.lookup(tool_name, function_call, arguments)
+
+
+def install_snapshot_source(memo: ToolResultMemo) -> None:
+    """Make a memo consult the pre-market snapshot before running tools."""
+    memo.add_source(snapshot_source)
+
+
+# ==================== Pre-warm ====================
+
+
+async def prewarm_snapshot(
+    universe: Optional[SnapshotUniverse] = None,
+    fyers_concurrency: Optional[int] = None,
+    nse_concurrency: Optional[int] = None,
+    timeout: Optional[float] = None,
+    store: Optional[SnapshotStore] = None,
+) -> MarketSnapshot:
+    """
+    Fetch the universe into a new snapshot bundle.
+
+    Fyers calls run concurrently and are paced by the client's rate
+    limiter; NSE calls (sync client) run on a bounded thread pool. Calls
+    still running at ``timeout`` are cancelled and the partial snapshot
+    is saved.
+
+    Args:
+        universe: What to fetch (defaults to SnapshotUniverse())
+        fyers_concurrency: Concurrent Fyers calls
+        nse_concurrency: Concurrent NSE calls
+        timeout: Overall deadline in seconds
+        store: Bundle store (defaults to the shared one)
+
+    Returns:
+        The saved snapshot
+    """
+    from broker.fyers import FyersToolkit
+    from core.fyers_client import ensure_authenticated
+    from core.instrument_map import get_instrument_map
+    from core.output_format import budget_tool
+    from tools.nse_india import NSEIndiaToolkit
+
+    settings = get_settings()
+    universe = universe or SnapshotUniverse()
+    store = store or get_snapshot_store()
+    timeout = timeout or settings.SNAPSHOT_PREWARM_TIMEOUT
+    fyers_sem = asyncio.Semaphore(fyers_concurrency or settings.SNAPSHOT_FYERS_CONCURRENCY)
+    nse_sem = asyncio.Semaphore(nse_concurrency or settings.SNAPSHOT_NSE_CONCURRENCY)
+
+    snapshot = MarketSnapshot.new(universe)
+    started = time.monotonic()
+
+    client = await ensure_authenticated()
+    fyers = FyersToolkit(client)
+    nse = NSEIndiaToolkit()
+
+    async def run_tool(toolkit: Any, tool_name: str, arguments: Dict[str, Any]) -> None:
+        method = getattr(toolkit, tool_name)
+        args = bind_arguments(method, arguments)
+        # Same budget the agents' registered tools apply
+        func = budget_tool(method, getattr(toolkit, "max_output_tokens", None))
+        try:
+            if inspect.iscoroutinefunction(method):
+                async with fyers_sem:
+                    result = await func(**args)
+            else:
+                async with nse_sem:
+                    result = await asyncio.to_thread(func, **args)
+        except Exception as e:
+            snapshot.errors.append(f"{tool_name}({args}): {e}")
+            return
+        if isinstance(result, str) and not result.lower().startswith("error"):
+            snapshot.add_tool_result(tool_name, args, result, toolkit=type(toolkit).__name__)
+        else:
+            snapshot.errors.append(f"{tool_name}({args}): {str(result)[:200]}")
+
+    async def fetch_quotes() -> None:
+        symbols = list(universe.index_symbols)
+        try:
+            async with nse_sem:
+                response = await asyncio.to_thread(
+                    nse.client.get_index_constituents, universe.constituents_index
+                )
+            symbols += [
+                f"NSE:{c.symbol}-EQ"
+                for c in response.data
+                if c.symbol and c.symbol != response.name and c.priority != 1
+            ]
+        except Exception as e:
+            snapshot.errors.append(f"constituents({universe.constituents_index}): {e}")
+
+        async def batch(chunk: List[str]) -> None:
+            try:
+                async with fyers_sem:
+                    response = await client.get_quotes(chunk)
+            except Exception as e:
+                snapshot.errors.append(f"quotes({len(chunk)} symbols): {e}")
+                return
+            for quote in response.d or []:
+                if quote.v:
+                    snapshot.quotes[quote.n] = quote.v
+
+        await asyncio.gather(*(
+            batch(symbols[i:i + QUOTE_BATCH_SIZE])
+            for i in range(0, len(symbols), QUOTE_BATCH_SIZE)
+        ))
+        snapshot.quotes_fetched_at = time.time()
+
+    async def refresh_instruments() -> None:
+        # Daily rebuild of the identity map; keeps resolved provider ids
+        try:
+            await get_instrument_map().refresh()
+        except Exception as e:
+            snapshot.errors.append(f"instrument_map: {e}")
+
+    calls = [fetch_quotes(), refresh_instruments()]
+    calls += [run_tool(fyers, "get_historical_data", {"symbol": s}) for s in universe.history_symbols]
+    calls += [run_tool(fyers, "get_option_chain", {"symbol": s}) for s in universe.option_chain_symbols]
+    calls += [
+        run_tool(fyers, "get_new_contracts", {}),
+        run_tool(nse, "get_oi_spurts", {}),
+        run_tool(nse, "scan_oi_spurts", {}),
+        run_tool(nse, "get_gift_nifty", {}),
+        run_tool(nse, "get_index_constituents", {"index_name": universe.constituents_index}),
+    ]
+    calls += [run_tool(nse, "get_index_summary", {"index_name": i}) for i in universe.summary_indices]
+    calls += [run_tool(nse, "fetch_sector_constituents", {"sector": s}) for s in universe.sectors]
+
+    tasks = [asyncio.ensure_future(c) for c in calls]
+    done, pending = await asyncio.wait(tasks, timeout=timeout)
+    for task in pending:
+        task.cancel()
+    if pending:
+        snapshot.errors.append(f"{len(pending)} fetches cancelled at the {timeout:.0f}s deadline")
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    snapshot.duration_s = time.monotonic() - started
+    path = store.save(snapshot)
+    status = snapshot.status()
+    logger.info(
+        f"Pre-market snapshot {snapshot.version}: {status['quotes']} quotes, "
+        f"{status['tool_results']} tool results, {status['errors']} errors "
+        f"in {status['duration_s']}s -> {path}"
+    )
+    return snapshot
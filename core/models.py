@@ -1,3 +1,4 @@
+from sqlalchemy import Index, event
 from sqlmodel import SQLModel, Field, create_engine, Session
 from typing import Optional
 from datetime import datetime
@@ -52,12 +53,44 @@ class Trade(SQLModel, table=True):
     sl_order_id: Optional[str] = None
     exit_reason: Optional[str] = None  # TAKE_PROFIT, STOP_LOSS, MANUAL, TRAILING_STOP
 
+    __table_args__ = (
+        # Range + status filters used by the daily/weekly summaries
+        Index("ix_trade_date_status", "date", "status"),
+        # Per-symbol history lookups
+        Index("ix_trade_symbol_date", "symbol", "date"),
+    )
+
 # Database engine and session management
 sqlite_url = "sqlite:///hagrid_ai.db"
 engine = create_engine(sqlite_url, echo=False)
 
-def create_db_and_tables():
-    SQLModel.metadata.create_all(engine)
+
+def enable_sqlite_wal(target_engine):
+    """
+    Put every SQLite connection of an engine in WAL mode.
+
+    WAL lets the API read while the scheduler's workflows write trades,
+    instead of readers blocking on the writer's lock.
+    """
+    @event.listens_for(target_engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.close()
+
+    return target_engine
+
+
+enable_sqlite_wal(engine)
+
+
+def create_db_and_tables(target_engine=None):
+    target_engine = target_engine or engine
+    SQLModel.metadata.create_all(target_engine)
+    # create_all skips indexes on tables that already exist
+    for index in Trade.__table__.indexes:
+        index.create(target_engine, checkfirst=True)
 
 def get_session():
     with Session(engine) as session:
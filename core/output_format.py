@@ -0,0 +1,347 @@
+"""
+Compact, token-budgeted serialization of toolkit outputs.
+
+Toolkits hand their results to the LLM as CSV, markdown or JSON strings.
+Full float precision, unused columns and 200-bar series make those
+strings far larger than the model needs. This module provides:
+
+- Numeric rounding rules per field type (prices, percents, Greeks,
+  correlations, counts), inferred from the column / key name
+- CSV tables with column projection
+- Row sampling of long series (recent rows in full, older rows evenly
+  sampled) with a one-line summary of what was dropped
+- Compact JSON (no indentation, rounded floats)
+- A hard per-call token budget, enforced by wrapping a toolkit's tools
+
+Usage:
+    text = format_table(candles, HISTORY_COLUMNS)
+    text = shape_csv(text, include=["TIMESTAMP", "CLOSE"], max_rows=60, summary_column="CLOSE")
+    tools = budget_tools(tools, max_tokens=4000)
+"""
+
+import csv
+import functools
+import inspect
+import json
+import logging
+import math
+import numbers
+import re
+from io import StringIO
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# Rough chars-per-token for English / CSV text (tokenizer-free estimate)
+CHARS_PER_TOKEN = 4
+
+# Default per-call budget for a tool result
+DEFAULT_MAX_TOKENS = 4000
+
+# Decimal places per field type (None = leave as is, 0 = integer)
+ROUNDING: Dict[str, Optional[int]] = {
+    "price": 2,
+    "percent": 2,
+    "greek": 4,
+    "correlation": 3,
+    "count": 0,
+}
+
+# Checked in order; the first match decides the field type
+_KIND_PATTERNS: List[Tuple[str, re.Pattern]] = [
+    ("count", re.compile(
+        r"(volume|qty|quantity|^oi$|_oi$|open_?interest|timestamp|count$|^ord$|orders$|data_points|total_symbols)",
+        re.I,
+    )),
+    ("greek", re.compile(r"^(delta|gamma|theta|vega|rho)$", re.I)),
+    ("correlation", re.compile(r"(corr|beta)", re.I)),
+    ("percent", re.compile(r"(pct|percent|^chp$|^iv$|_iv$)", re.I)),
+]
+
+Column = Union[str, Tuple[str, Union[str, int]]]
+
+
+def field_kind(name: Any) -> Optional[str]:
+    """Infer the rounding type of a field from its name (None if unknown)."""
+    if not isinstance(name, str):
+        return None
+    for kind, pattern in _KIND_PATTERNS:
+        if pattern.search(name):
+            return kind
+    return None
+
+
+def round_value(value: Any, kind: Optional[str] = "price", rules: Optional[Dict[str, Optional[int]]] = None) -> Any:
+    """
+    Round a numeric value by field type.
+
+    Non-numeric values pass through; NaN / inf become None. Floats that
+    round to a whole number are returned as int (``2500`` not ``2500.0``).
+    """
+    if value is None or isinstance(value, bool) or not isinstance(value, numbers.Real):
+        return value
+    value = float(value)
+    if not math.isfinite(value):
+        return None
+    decimals = (rules or ROUNDING).get(kind or "price")
+    if decimals is None:
+        return value
+    if decimals == 0:
+        return int(round(value))
+    rounded = round(value, decimals)
+    return int(rounded) if rounded.is_integer() else rounded
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate token count of a string."""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+# ==================== CSV ====================
+
+
+def _normalize_columns(columns: Sequence[Column]) -> List[Tuple[str, Union[str, int]]]:
+    return [(c, c) if isinstance(c, str) else (c[0], c[1]) for c in columns]
+
+
+def _write_csv(header: Sequence[str], rows: Iterable[Sequence[Any]]) -> str:
+    output = StringIO()
+    writer = csv.writer(output, lineterminator="\n")
+    writer.writerow(header)
+    writer.writerows(rows)
+    return output.getvalue().rstrip("\n")
+
+
+def format_table(
+    rows: Iterable[Any],
+    columns: Sequence[Column],
+    rules: Optional[Dict[str, Optional[int]]] = None,
+    kinds: Optional[Dict[str, str]] = None,
+    max_text: Optional[int] = None,
+) -> str:
+    """
+    Render rows as compact CSV.
+
+    Args:
+        rows: Dicts, or sequences indexed by position
+        columns: Header names, or (header, key) pairs where key is a dict key
+            or a sequence index
+        rules: Rounding overrides per field type
+        kinds: Field type per header, overriding name inference
+        max_text: Clip string cells longer than this
+
+    Returns:
+        CSV string with a header row
+    """
+    spec = _normalize_columns(columns)
+    kinds = kinds or {}
+    header = [h for h, _ in spec]
+    col_kinds = [kinds.get(h) or field_kind(h) or "price" for h in header]
+
+    def cells(row: Any) -> List[Any]:
+        out = []
+        for (_, key), kind in zip(spec, col_kinds):
+            if isinstance(row, dict):
+                value = row.get(key)
+            else:
+                value = row[key] if isinstance(key, int) and key < len(row) else getattr(row, str(key), None)
+            value = round_value(value, kind, rules)
+            if isinstance(value, str) and max_text and len(value) > max_text:
+                value = value[:max_text] + "..."
+            out.append("" if value is None else value)
+        return out
+
+    return _write_csv(header, (cells(r) for r in rows))
+
+
+def sample_rows(rows: Sequence[Any], max_rows: int, recent: Optional[int] = None) -> Tuple[List[Any], int]:
+    """
+    Reduce a chronological series to ``max_rows`` rows.
+
+    The most recent ``recent`` rows (default: half of ``max_rows``) are kept
+    in full; the older rows are evenly sampled to fill the remainder.
+
+    Returns:
+        (kept rows in original order, number of rows dropped)
+    """
+    n = len(rows)
+    if max_rows <= 0 or n <= max_rows:
+        return list(rows), 0
+    recent = min(max_rows // 2 if recent is None else recent, max_rows)
+    older = rows[: n - recent]
+    keep_older = max_rows - recent
+    step = len(older) / keep_older if keep_older else 0
+    sampled = [older[int(i * step)] for i in range(keep_older)]
+    return sampled + list(rows[n - recent:]), n - max_rows
+
+
+def summarize_series(values: Iterable[Any], kind: str = "price") -> Dict[str, Any]:
+    """First / last / min / max / mean of a numeric series."""
+    vals = []
+    for v in values:
+        try:
+            f = float(v)
+        except (TypeError, ValueError):
+            continue
+        if math.isfinite(f):
+            vals.append(f)
+    if not vals:
+        return {}
+    summary = {
+        "first": vals[0],
+        "last": vals[-1],
+        "min": min(vals),
+        "max": max(vals),
+        "mean": sum(vals) / len(vals),
+    }
+    summary = {k: round_value(v, kind) for k, v in summary.items()}
+    if vals[0]:
+        summary["change_pct"] = round_value((vals[-1] / vals[0] - 1) * 100, "percent")
+    return summary
+
+
+def shape_csv(
+    text: str,
+    include: Optional[Sequence[str]] = None,
+    max_rows: int = 0,
+    recent_rows: Optional[int] = None,
+    summary_column: Optional[str] = None,
+) -> str:
+    """
+    Project and sample a CSV string produced by ``format_table``.
+
+    Args:
+        text: CSV with a header row
+        include: Header names to keep (case-insensitive); None keeps all
+        max_rows: Sample the data rows down to this many (0 = no limit)
+        recent_rows: Most recent rows kept in full when sampling
+        summary_column: Column summarized over ALL rows when rows are dropped
+
+    Returns:
+        CSV string, followed by a ``#`` note line if rows were dropped
+    """
+    if not text or (not include and not max_rows):
+        return text
+    parsed = list(csv.reader(StringIO(text)))
+    if not parsed:
+        return text
+    header, rows = parsed[0], parsed[1:]
+    upper = [h.upper() for h in header]
+
+    summary_values: List[str] = []
+    if summary_column and summary_column.upper() in upper:
+        idx = upper.index(summary_column.upper())
+        summary_values = [r[idx] for r in rows if idx < len(r)]
+
+    if include:
+        wanted = {c.strip().upper() for c in include}
+        keep = [i for i, h in enumerate(upper) if h in wanted]
+        if keep:
+            header = [header[i] for i in keep]
+            rows = [[r[i] if i < len(r) else "" for i in keep] for r in rows]
+
+    kept, dropped = sample_rows(rows, max_rows, recent_rows)
+    result = _write_csv(header, kept)
+    if dropped:
+        recent = max_rows // 2 if recent_rows is None else min(recent_rows, max_rows)
+        note = f"# {dropped} of {len(rows)} rows sampled out (latest {recent} kept in full)"
+        summary = summarize_series(summary_values, field_kind(summary_column) or "price") if summary_column else {}
+        if summary:
+            note += f"; {summary_column} over all rows: " + " ".join(f"{k}={v}" for k, v in summary.items())
+        result += "\n" + note
+    return result
+
+
+# ==================== JSON ====================
+
+
+def round_data(data: Any, rules: Optional[Dict[str, Optional[int]]] = None, default_kind: str = "price", _kind: Optional[str] = None) -> Any:
+    """Recursively round floats in dicts / lists, using each key's field type."""
+    if isinstance(data, dict):
+        return {
+            k: round_data(v, rules, default_kind, field_kind(k) or _kind)
+            for k, v in data.items()
+        }
+    if isinstance(data, (list, tuple)):
+        return [round_data(v, rules, default_kind, _kind) for v in data]
+    if isinstance(data, numbers.Integral) and not isinstance(data, bool):
+        return int(data)
+    if isinstance(data, numbers.Real) and not isinstance(data, bool):
+        return round_value(data, _kind or default_kind, rules)
+    return data
+
+
+def compact_json(data: Any, rules: Optional[Dict[str, Optional[int]]] = None, default_kind: str = "price") -> str:
+    """Serialize to JSON without whitespace, rounding floats by field type."""
+    return json.dumps(round_data(data, rules, default_kind), separators=(",", ":"), default=str)
+
+
+# ==================== Budget ====================
+
+
+def enforce_budget(text: Any, max_tokens: Optional[int]) -> Any:
+    """
+    Cut a tool result down to ``max_tokens``.
+
+    Line-oriented output (CSV, markdown) keeps its leading lines (headers,
+    structure) and its trailing lines (latest rows, notes) and replaces the
+    middle with a marker. Single-line output (compact JSON) is cut at the
+    budget with a marker.
+    """
+    if not max_tokens or not isinstance(text, str):
+        return text
+    limit = max_tokens * CHARS_PER_TOKEN
+    if len(text) <= limit:
+        return text
+
+    budget = max(limit - 120, limit // 2)
+    lines = text.split("\n")
+    if len(lines) > 2:
+        head_budget = budget * 2 // 3
+        used = 0
+        i = 0
+        while i < len(lines) and used + len(lines[i]) + 1 <= head_budget:
+            used += len(lines[i]) + 1
+            i += 1
+        j = len(lines)
+        while j > i and used + len(lines[j - 1]) + 1 <= budget:
+            used += len(lines[j - 1]) + 1
+            j -= 1
+        if i > 0:
+            marker = f"... [{j - i} lines omitted: output exceeded the {max_tokens}-token budget] ..."
+            logger.debug(f"Tool output cut from {len(lines)} to {len(lines) - (j - i)} lines")
+            return "\n".join(lines[:i] + [marker] + lines[j:])
+
+    logger.debug(f"Tool output cut from {len(text)} to {budget} chars")
+    return (
+        text[:budget]
+        + f"... [truncated {len(text) - budget} chars: output exceeded the {max_tokens}-token budget]"
+    )
+
+
+def budget_tool(func: Callable, max_tokens: Optional[int]) -> Callable:
+    """Wrap a tool so its string result never exceeds ``max_tokens``."""
+    if not max_tokens:
+        return func
+
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            return enforce_budget(await func(*args, **kwargs), max_tokens)
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        return enforce_budget(func(*args, **kwargs), max_tokens)
+    return wrapper
+
+
+def budget_tools(tools: Iterable[Callable], max_tokens: Optional[int]) -> List[Callable]:
+    """
+    Apply the per-call token budget to a toolkit's tools.
+
+    The wrappers keep each tool's name, signature and docstring, so agno
+    registers them exactly like the originals. Internal calls between a
+    toolkit's own methods are not affected.
+    """
+    return [budget_tool(t, max_tokens) for t in tools]
@@ -0,0 +1,324 @@
+"""
+Tick-level position rules.
+
+Pure, network-free rule evaluation for open trades: stop-loss, target,
+trailing stop and "material move" checks, each O(1) per position per
+tick. The live monitor (workflows/tick_monitor.py) feeds websocket ticks
+into a PositionRuleEngine; the same engine replays recorded tick tapes,
+so rule behaviour can be checked offline:
+
+    engine = PositionRuleEngine()
+    engine.sync([{"id": 1, "symbol": "NSE:SBIN-EQ", "direction": "LONG",
+                  "entry_price": 800, "quantity": 10,
+                  "stop_loss": 790, "take_profit": 830}])
+    events = replay_ticks(engine, TickTape.read("ticks-2025-01-02.jsonl"))
+"""
+
+import json
+import logging
+import time
+from dataclasses import asdict, dataclass, field
+from enum import Enum
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class RuleEventType(str, Enum):
+    """What a tick triggered for a position."""
+
+    STOP_LOSS = "STOP_LOSS"
+    TRAILING_STOP = "TRAILING_STOP"
+    TAKE_PROFIT = "TAKE_PROFIT"
+    MATERIAL_MOVE = "MATERIAL_MOVE"
+
+
+# Events that end the position's rule checks (the trade should be exited)
+EXIT_EVENTS = frozenset({RuleEventType.STOP_LOSS, RuleEventType.TRAILING_STOP, RuleEventType.TAKE_PROFIT})
+
+
+@dataclass
+class RuleEvent:
+    """A rule firing on a tick."""
+
+    trade_id: int
+    symbol: str
+    event: RuleEventType
+    price: float  # Tick price that fired the rule
+    level: float  # Stop / trail / target level, or the previous reported price
+    unrealized_pnl: float
+    ts: float
+
+    @property
+    def is_exit(self) -> bool:
+        return self.event in EXIT_EVENTS
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["event"] = self.event.value
+        return data
+
+
+@dataclass
+class PositionState:
+    """
+    Rule state for one open trade.
+
+    Everything needed per tick is kept as plain floats so evaluate() does
+    a fixed handful of comparisons regardless of how long the position
+    has been open.
+    """
+
+    trade_id: int
+    symbol: str
+    direction: str  # LONG or SHORT
+    entry_price: float
+    quantity: int
+    stop_loss: float
+    take_profit: float
+    trail_percent: float = 1.0
+    trail_activation_r: float = 1.0
+    material_move_percent: float = 1.5
+
+    best_price: Optional[float] = None  # High-water mark (low-water for shorts)
+    trail_stop: Optional[float] = None  # Set once the trail activates
+    last_reported: Optional[float] = None  # Baseline for material-move checks
+    last_price: Optional[float] = None
+    done: bool = False  # An exit rule fired; wait for the trade to close
+    _side: int = field(default=1, init=False, repr=False)
+    _risk: float = field(default=0.0, init=False, repr=False)
+
+    def __post_init__(self):
+        self._side = -1 if self.direction.upper() == "SHORT" else 1
+        self._risk = abs(self.entry_price - self.stop_loss)
+
+    def update_levels(self, stop_loss: float, take_profit: float) -> None:
+        """Apply stop/target changes from the trade record (re-arms the rules)."""
+        if stop_loss == self.stop_loss and take_profit == self.take_profit:
+            return
+        self.stop_loss = stop_loss
+        self.take_profit = take_profit
+        self._risk = abs(self.entry_price - stop_loss)
+        self.done = False
+
+    def unrealized_pnl(self, price: float) -> float:
+        return self._side * (price - self.entry_price) * self.quantity
+
+    def evaluate(self, price: float, ts: Optional[float] = None) -> Optional[RuleEvent]:
+        """
+        Check every rule against one tick.
+
+        Args:
+            price: Last traded price
+            ts: Tick timestamp (epoch seconds)
+
+        Returns:
+            The rule event fired by this tick, if any
+        """
+        if self.done:
+            return None
+        s = self._side
+        self.last_price = price
+        if self.last_reported is None:
+            self.last_reported = price
+
+        # Ratchet the high-water mark and the trailing stop
+        if self.best_price is None or s * (price - self.best_price) > 0:
+            self.best_price = price
+            if self._risk > 0 and s * (price - self.entry_price) >= self.trail_activation_r * self._risk:
+                trail = price * (1 - s * self.trail_percent / 100)
+                if self.trail_stop is None or s * (trail - self.trail_stop) > 0:
+                    self.trail_stop = trail
+
+        event, level = None, None
+        if s * (price - self.stop_loss) <= 0:
+            event, level = RuleEventType.STOP_LOSS, self.stop_loss
+        elif self.trail_stop is not None and s * (price - self.trail_stop) <= 0:
+            event, level = RuleEventType.TRAILING_STOP, self.trail_stop
+        elif s * (price - self.take_profit) >= 0:
+            event, level = RuleEventType.TAKE_PROFIT, self.take_profit
+        elif abs(price - self.last_reported) * 100 >= self.material_move_percent * self.entry_price:
+            event, level = RuleEventType.MATERIAL_MOVE, self.last_reported
+            self.last_reported = price
+
+        if event is None:
+            return None
+        if event in EXIT_EVENTS:
+            self.done = True
+        return RuleEvent(
+            trade_id=self.trade_id,
+            symbol=self.symbol,
+            event=event,
+            price=price,
+            level=round(level, 2),
+            unrealized_pnl=round(self.unrealized_pnl(price), 2),
+            ts=ts if ts is not None else time.time(),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trade_id": self.trade_id,
+            "symbol": self.symbol,
+            "direction": self.direction,
+            "entry_price": self.entry_price,
+            "stop_loss": self.stop_loss,
+            "take_profit": self.take_profit,
+            "trail_stop": round(self.trail_stop, 2) if self.trail_stop is not None else None,
+            "best_price": self.best_price,
+            "last_price": self.last_price,
+            "unrealized_pnl": round(self.unrealized_pnl(self.last_price), 2) if self.last_price else None,
+            "done": self.done,
+        }
+
+
+class PositionRuleEngine:
+    """
+    Rule state for all open trades, indexed by symbol.
+
+    on_tick() touches only the positions of the ticking symbol, so the
+    cost per tick is independent of how many trades are open.
+    """
+
+    def __init__(
+        self,
+        trail_percent: float = 1.0,
+        trail_activation_r: float = 1.0,
+        material_move_percent: float = 1.5,
+    ):
+        self.trail_percent = trail_percent
+        self.trail_activation_r = trail_activation_r
+        self.material_move_percent = material_move_percent
+        self._by_symbol: Dict[str, Dict[int, PositionState]] = {}
+        self.ticks = 0
+
+    @property
+    def symbols(self) -> Set[str]:
+        return set(self._by_symbol)
+
+    def __len__(self) -> int:
+        return sum(len(p) for p in self._by_symbol.values())
+
+    def sync(self, trades: Iterable[Dict[str, Any]]) -> Tuple[Set[str], Set[str]]:
+        """
+        Reconcile with the current open trades.
+
+        Existing positions keep their trailing state; stop/target edits
+        from the trade record are applied. Trades no longer open are
+        dropped.
+
+        Args:
+            trades: Open trade dicts (id, symbol, direction, entry_price,
+                quantity, stop_loss, take_profit)
+
+        Returns:
+            (symbols added, symbols removed) - for (un)subscribing
+        """
+        before = self.symbols
+        current: Dict[str, Dict[int, PositionState]] = {}
+        for t in trades:
+            symbol, trade_id = t["symbol"], t["id"]
+            state = self._by_symbol.get(symbol, {}).get(trade_id)
+            if state is None:
+                state = PositionState(
+                    trade_id=trade_id,
+                    symbol=symbol,
+                    direction=t["direction"],
+                    entry_price=float(t["entry_price"]),
+                    quantity=int(t["quantity"]),
+                    stop_loss=float(t["stop_loss"]),
+                    take_profit=float(t["take_profit"]),
+                    trail_percent=self.trail_percent,
+                    trail_activation_r=self.trail_activation_r,
+                    material_move_percent=self.material_move_percent,
+                )
+            else:
+                state.update_levels(float(t["stop_loss"]), float(t["take_profit"]))
+            current.setdefault(symbol, {})[trade_id] = state
+        self._by_symbol = current
+        after = self.symbols
+        return after - before, before - after
+
+    def on_tick(self, symbol: str, price: float, ts: Optional[float] = None) -> List[RuleEvent]:
+        """Evaluate one tick; returns the events it fired (usually none)."""
+        self.ticks += 1
+        positions = self._by_symbol.get(symbol)
+        if not positions:
+            return []
+        events = []
+        for state in positions.values():
+            event = state.evaluate(price, ts)
+            if event is not None:
+                events.append(event)
+        return events
+
+    def positions(self) -> List[Dict[str, Any]]:
+        return [state.to_dict() for p in self._by_symbol.values() for state in p.values()]
+
+
+# ==================== Recorded ticks ====================
+
+
+class TickTape:
+    """
+    Append-only JSONL tick recording ({"symbol", "ltp", "ts"} per line).
+
+    Writes are buffered and flushed every ``flush_every`` ticks so the
+    tick path never waits on disk for long.
+    """
+
+    def __init__(self, path: str | Path, flush_every: int = 500):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.flush_every = flush_every
+        self._buffer: List[str] = []
+        self.count = 0
+
+    def append(self, symbol: str, price: float, ts: float) -> None:
+        self._buffer.append(json.dumps({"symbol": symbol, "ltp": price, "ts": ts}, separators=(",", ":")))
+        self.count += 1
+        if len(self._buffer) >= self.flush_every:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._buffer:
+            return
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write("\n".join(self._buffer) + "\n")
+        self._buffer.clear()
+
+    def close(self) -> None:
+        self.flush()
+
+    @staticmethod
+    def read(path: str | Path) -> Iterator[Tuple[str, float, float]]:
+        """Yield (symbol, ltp, ts) from a recorded tape."""
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    tick = json.loads(line)
+                    yield tick["symbol"], float(tick["ltp"]), float(tick["ts"])
+                except (ValueError, KeyError) as e:
+                    logger.warning(f"Skipping bad tick line in {path}: {e}")
+
+
+def replay_ticks(engine: PositionRuleEngine, ticks: Iterable[Tuple[str, float, float]]) -> List[RuleEvent]:
+    """Run recorded (symbol, ltp, ts) ticks through an engine; returns all fired events."""
+    events: List[RuleEvent] = []
+    for symbol, price, ts in ticks:
+        events.extend(engine.on_tick(symbol, price, ts))
+    return events
+
+
+__all__ = [
+    "RuleEventType",
+    "RuleEvent",
+    "PositionState",
+    "PositionRuleEngine",
+    "TickTape",
+    "replay_ticks",
+    "EXIT_EVENTS",
+]
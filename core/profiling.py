@@ -0,0 +1,526 @@
+"""
+Per-run latency profiling with OpenTelemetry spans.
+
+A 15-minute intraday run spends its time in LLM turns, tool calls, HTTP
+requests, rate-limiter waits and cache misses. This module gives every
+one of those a span and aggregates the spans of a run into a profile:
+
+- ``span(kind, name, **attributes)`` opens an OpenTelemetry span (kinds:
+  ``step``, ``tool``, ``http``) tagged with the current run id
+- Spans are exported locally - to an in-process collector that builds the
+  run profile, and optionally to a JSONL file - so nothing needs a
+  network collector
+- ``profile_run(...)`` scopes a workflow run; on exit the profile (top
+  tools by total time, p50/p95 per endpoint, per-step durations, cache
+  hits and rate-limit waits) is stored in the workflow database
+
+If the OpenTelemetry SDK is not installed, spans fall back to plain timers
+feeding the same collector, so profiles still work.
+
+Usage:
+    with profile_run("Intraday Trading Cycle", session_id=today) as run:
+        await workflow.arun(...)
+    print(run.profile["top_tools"])
+
+    with span("http", "nse:/api/option-chain-indices", method="GET") as s:
+        s.set("cache.hit", False)
+"""
+
+import contextvars
+import json
+import logging
+import math
+import sqlite3
+import threading
+import time
+import uuid
+from collections import defaultdict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+try:
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import SimpleSpanProcessor, SpanExporter, SpanExportResult
+
+    OTEL_AVAILABLE = True
+except ImportError:  # pragma: no cover - optional dependency
+    OTEL_AVAILABLE = False
+    SpanExporter = object  # type: ignore[assignment,misc]
+
+# Attribute namespace for our spans
+ATTR_PREFIX = "hagrid."
+SPAN_KINDS = ("step", "tool", "http")
+
+# Rows kept in the "top tools" / "endpoints" sections of a profile
+TOP_N = 15
+
+_current_run: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar(
+    "profile_run_id", default=None
+)
+
+
+def percentile(values: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile of a sequence (0 for an empty one)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+# ==================== Collector ====================
+
+
+@dataclass
+class SpanRecord:
+    """A finished span, reduced to what a profile needs."""
+
+    kind: str
+    name: str
+    duration_s: float
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    started_at: float = 0.0
+
+
+class RunProfileCollector(SpanExporter):
+    """
+    Local span exporter that aggregates spans per run id.
+
+    Works as an OpenTelemetry ``SpanExporter`` and also accepts records
+    directly (the no-SDK fallback).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._records: Dict[str, List[SpanRecord]] = defaultdict(list)
+
+    # ---- OpenTelemetry exporter interface ----
+
+    def export(self, spans) -> "SpanExportResult":
+        for s in spans:
+            attrs = dict(s.attributes or {})
+            run_id = attrs.get(ATTR_PREFIX + "run_id")
+            kind = attrs.get(ATTR_PREFIX + "kind")
+            if not run_id or kind not in SPAN_KINDS:
+                continue
+            duration = ((s.end_time or 0) - (s.start_time or 0)) / 1e9
+            self.record(run_id, SpanRecord(
+                kind=kind,
+                name=attrs.get(ATTR_PREFIX + "name", s.name),
+                duration_s=max(duration, 0.0),
+                attributes={k[len(ATTR_PREFIX):]: v for k, v in attrs.items() if k.startswith(ATTR_PREFIX)},
+                started_at=(s.start_time or 0) / 1e9,
+            ))
+        return SpanExportResult.SUCCESS
+
+    def shutdown(self) -> None:
+        pass
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        return True
+
+    # ---- Aggregation ----
+
+    def record(self, run_id: str, record: SpanRecord) -> None:
+        with self._lock:
+            self._records[run_id].append(record)
+
+    def pop(self, run_id: str) -> List[SpanRecord]:
+        with self._lock:
+            return self._records.pop(run_id, [])
+
+    def peek(self, run_id: str) -> List[SpanRecord]:
+        with self._lock:
+            return list(self._records.get(run_id, []))
+
+
+def build_profile(records: Sequence[SpanRecord], top_n: int = TOP_N) -> Dict[str, Any]:
+    """
+    Aggregate a run's span records.
+
+    Returns:
+        Dict with per-step durations, top tools by total time and
+        per-endpoint latency percentiles, cache hits and rate-limit waits
+    """
+    steps = sorted((r for r in records if r.kind == "step"), key=lambda r: r.started_at)
+
+    tools: Dict[str, List[SpanRecord]] = defaultdict(list)
+    endpoints: Dict[str, List[SpanRecord]] = defaultdict(list)
+    for r in records:
+        if r.kind == "tool":
+            tools[r.name].append(r)
+        elif r.kind == "http":
+            endpoints[r.name].append(r)
+
+    def cache_hits(rs: List[SpanRecord]) -> int:
+        return sum(1 for r in rs if r.attributes.get("cache.hit"))
+
+    top_tools = sorted(
+        (
+            {
+                "tool": name,
+                "calls": len(rs),
+                "cache_hits": cache_hits(rs),
+                "total_s": round(sum(r.duration_s for r in rs), 3),
+                "p50_ms": round(percentile([r.duration_s for r in rs], 50) * 1000, 1),
+                "p95_ms": round(percentile([r.duration_s for r in rs], 95) * 1000, 1),
+            }
+            for name, rs in tools.items()
+        ),
+        key=lambda t: t["total_s"],
+        reverse=True,
+    )
+
+    endpoint_rows = []
+    for name, rs in endpoints.items():
+        # Latency percentiles over real requests only - cache hits would mask them
+        live = [r.duration_s for r in rs if not r.attributes.get("cache.hit")]
+        endpoint_rows.append({
+            "endpoint": name,
+            "calls": len(rs),
+            "cache_hits": cache_hits(rs),
+            "errors": sum(1 for r in rs if r.attributes.get("error")),
+            "total_s": round(sum(r.duration_s for r in rs), 3),
+            "p50_ms": round(percentile(live, 50) * 1000, 1),
+            "p95_ms": round(percentile(live, 95) * 1000, 1),
+            "rate_limit_wait_s": round(sum(float(r.attributes.get("rate_limit.wait_s", 0)) for r in rs), 3),
+        })
+    endpoint_rows.sort(key=lambda e: e["total_s"], reverse=True)
+
+    tool_records = [r for rs in tools.values() for r in rs]
+    http_records = [r for rs in endpoints.values() for r in rs]
+    return {
+        "spans": len(records),
+        "steps": [
+            {
+                "step": r.name,
+                "duration_s": round(r.duration_s, 3),
+                "resumed": bool(r.attributes.get("resumed")),
+            }
+            for r in steps
+        ],
+        "tools": {
+            "calls": len(tool_records),
+            "total_s": round(sum(r.duration_s for r in tool_records), 3),
+            "cache_hits": cache_hits(tool_records),
+        },
+        "http": {
+            "requests": len(http_records),
+            "total_s": round(sum(r.duration_s for r in http_records), 3),
+            "cache_hits": cache_hits(http_records),
+            "rate_limit_wait_s": round(sum(e["rate_limit_wait_s"] for e in endpoint_rows), 3),
+        },
+        "top_tools": top_tools[:top_n],
+        "endpoints": endpoint_rows[:top_n],
+    }
+
+
+# ==================== File exporter ====================
+
+
+class JsonlSpanExporter(SpanExporter):
+    """Append finished spans to a daily JSONL file (offline span archive)."""
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def export(self, spans) -> "SpanExportResult":
+        path = self.directory / f"spans-{datetime.now().strftime('%Y-%m-%d')}.jsonl"
+        lines = []
+        for s in spans:
+            ctx = s.get_span_context()
+            lines.append(json.dumps({
+                "name": s.name,
+                "trace_id": f"{ctx.trace_id:032x}",
+                "span_id": f"{ctx.span_id:016x}",
+                "parent_id": f"{s.parent.span_id:016x}" if s.parent else None,
+                "start": (s.start_time or 0) / 1e9,
+                "duration_ms": ((s.end_time or 0) - (s.start_time or 0)) / 1e6,
+                "attributes": dict(s.attributes or {}),
+            }, default=str))
+        try:
+            with self._lock, open(path, "a", encoding="utf-8") as f:
+                f.write("\n".join(lines) + "\n")
+        except OSError as e:
+            logger.debug(f"Span export to {path} failed: {e}")
+            return SpanExportResult.FAILURE
+        return SpanExportResult.SUCCESS
+
+    def shutdown(self) -> None:
+        pass
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        return True
+
+
+# ==================== Tracer ====================
+
+collector = RunProfileCollector()
+
+_tracer = None
+_tracer_lock = threading.Lock()
+
+
+def _settings():
+    from core.config import get_settings
+    return get_settings()
+
+
+def get_tracer():
+    """
+    Tracer on a private provider with local exporters only.
+
+    A private provider leaves the global one to agno's tracing setup;
+    spans still nest under agno's spans through the shared OTel context.
+    """
+    global _tracer
+    if _tracer is not None or not OTEL_AVAILABLE:
+        return _tracer
+    with _tracer_lock:
+        if _tracer is None:
+            provider = TracerProvider(resource=Resource.create({"service.name": "hagrid-ai"}))
+            provider.add_span_processor(SimpleSpanProcessor(collector))
+            try:
+                settings = _settings()
+                if settings.PROFILING_EXPORT_SPANS:
+                    provider.add_span_processor(SimpleSpanProcessor(JsonlSpanExporter(settings.PROFILE_DIR)))
+            except Exception as e:
+                logger.debug(f"Span file export disabled: {e}")
+            _tracer = provider.get_tracer("hagrid.profiling")
+    return _tracer
+
+
+class _SpanHandle:
+    """Attribute setter shared by real and fallback spans."""
+
+    __slots__ = ("_span", "attributes")
+
+    def __init__(self, otel_span: Any = None):
+        self._span = otel_span
+        self.attributes: Dict[str, Any] = {}
+
+    def set(self, key: str, value: Any) -> None:
+        if value is None:
+            return
+        if not isinstance(value, (str, bool, int, float)):
+            value = str(value)
+        self.attributes[key] = value
+        if self._span is not None:
+            self._span.set_attribute(ATTR_PREFIX + key, value)
+
+
+def _enabled() -> bool:
+    try:
+        return bool(_settings().PROFILING_ENABLED)
+    except Exception:
+        return True
+
+
+@contextmanager
+def span(kind: str, name: str, **attributes: Any) -> Iterator[_SpanHandle]:
+    """
+    Time a step, tool call or HTTP request.
+
+    Outside a profiled run the span is still emitted (for the JSONL
+    archive) but not aggregated.
+
+    Args:
+        kind: "step", "tool" or "http"
+        name: Step name, tool name or endpoint (e.g. "fyers:/data/history")
+        **attributes: Initial attributes; ``__`` in a keyword becomes ``.``
+            (``cache__hit=True`` sets ``cache.hit``)
+    """
+    run_id = _current_run.get()
+    tracer = get_tracer() if _enabled() else None
+    if tracer is None:
+        handle = _SpanHandle()
+        for k, v in attributes.items():
+            handle.set(k.replace("__", "."), v)
+        started, started_at = time.monotonic(), time.time()
+        try:
+            yield handle
+        except BaseException as e:
+            handle.set("error", type(e).__name__)
+            raise
+        finally:
+            if run_id and _enabled():
+                collector.record(run_id, SpanRecord(
+                    kind=kind, name=name, duration_s=time.monotonic() - started,
+                    attributes=handle.attributes, started_at=started_at,
+                ))
+        return
+
+    with tracer.start_as_current_span(f"{kind} {name}", record_exception=True) as otel_span:
+        handle = _SpanHandle(otel_span)
+        handle.set("kind", kind)
+        handle.set("name", name)
+        if run_id:
+            handle.set("run_id", run_id)
+        for k, v in attributes.items():
+            handle.set(k.replace("__", "."), v)
+        try:
+            yield handle
+        except BaseException as e:
+            handle.set("error", type(e).__name__)
+            raise
+
+
+# ==================== Run scope & storage ====================
+
+
+class RunProfileStore:
+    """Run profiles stored in a table of the workflow SQLite database."""
+
+    TABLE = "workflow_run_profiles"
+
+    def __init__(self, db_file: Optional[str] = None):
+        self.db_file = db_file
+        self._lock = threading.Lock()
+        self._initialized = False
+
+    @contextmanager
+    def _conn(self) -> Iterator[sqlite3.Connection]:
+        with self._lock:
+            conn = sqlite3.connect(self.db_file or _settings().WORKFLOW_DB_FILE, timeout=30)
+            try:
+                if not self._initialized:
+                    conn.execute(
+                        f"""
+                        CREATE TABLE IF NOT EXISTS {self.TABLE} (
+                            run_id TEXT PRIMARY KEY,
+                            workflow TEXT NOT NULL,
+                            session_id TEXT,
+                            wall_s REAL,
+                            profile TEXT NOT NULL,
+                            created_at TEXT NOT NULL
+                        )
+                        """
+                    )
+                    conn.execute(
+                        f"CREATE INDEX IF NOT EXISTS idx_{self.TABLE}_session "
+                        f"ON {self.TABLE} (workflow, session_id, created_at)"
+                    )
+                    self._initialized = True
+                with conn:
+                    yield conn
+            finally:
+                conn.close()
+
+    def save(self, run_id: str, workflow: str, session_id: Optional[str], profile: Dict[str, Any]) -> None:
+        with self._conn() as conn:
+            conn.execute(
+                f"INSERT OR REPLACE INTO {self.TABLE} "
+                f"(run_id, workflow, session_id, wall_s, profile, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (run_id, workflow, session_id, profile.get("wall_s"),
+                 json.dumps(profile, default=str), datetime.now().isoformat()),
+            )
+
+    def get(self, run_id: str) -> Optional[Dict[str, Any]]:
+        with self._conn() as conn:
+            row = conn.execute(f"SELECT profile FROM {self.TABLE} WHERE run_id = ?", (run_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def latest(self, workflow: str, session_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Most recent profile of a workflow (optionally for one session)."""
+        query = f"SELECT profile FROM {self.TABLE} WHERE workflow = ?"
+        params: tuple = (workflow,)
+        if session_id is not None:
+            query += " AND session_id = ?"
+            params += (session_id,)
+        with self._conn() as conn:
+            row = conn.execute(query + " ORDER BY created_at DESC LIMIT 1", params).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def list_runs(self, workflow: str, session_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        query = f"SELECT run_id, session_id, wall_s, created_at FROM {self.TABLE} WHERE workflow = ?"
+        params: tuple = (workflow,)
+        if session_id is not None:
+            query += " AND session_id = ?"
+            params += (session_id,)
+        with self._conn() as conn:
+            rows = conn.execute(query + " ORDER BY created_at DESC", params).fetchall()
+        return [dict(zip(("run_id", "session_id", "wall_s", "created_at"), r)) for r in rows]
+
+
+# Shared store in the workflow database
+profile_store = RunProfileStore()
+
+
+@dataclass
+class ProfiledRun:
+    """Handle for a profiled run; ``profile`` is filled in when the scope exits."""
+
+    run_id: str
+    workflow: str
+    session_id: Optional[str]
+    profile: Dict[str, Any] = field(default_factory=dict)
+
+
+@contextmanager
+def profile_run(
+    workflow: str,
+    session_id: Optional[str] = None,
+    run_id: Optional[str] = None,
+    store: Optional[RunProfileStore] = None,
+) -> Iterator[ProfiledRun]:
+    """
+    Profile the spans of a workflow run and store the result with the run.
+
+    Args:
+        workflow: Workflow name
+        session_id: Workflow session id (e.g. the trading date)
+        run_id: Run id (e.g. the checkpoint run id); generated if omitted
+        store: Profile store (defaults to the workflow database)
+    """
+    run = ProfiledRun(run_id=run_id or uuid.uuid4().hex[:12], workflow=workflow, session_id=session_id)
+    token = _current_run.set(run.run_id)
+    started_at = datetime.now()
+    started = time.monotonic()
+    try:
+        yield run
+    finally:
+        _current_run.reset(token)
+        run.profile = {
+            "run_id": run.run_id,
+            "workflow": workflow,
+            "session_id": session_id,
+            "started_at": started_at.isoformat(),
+            "wall_s": round(time.monotonic() - started, 3),
+            **build_profile(collector.pop(run.run_id)),
+        }
+        try:
+            (store or profile_store).save(run.run_id, workflow, session_id, run.profile)
+        except sqlite3.Error as e:
+            logger.warning(f"Could not store profile for run {run.run_id}: {e}")
+        top = ", ".join(f"{t['tool']} {t['total_s']:.1f}s" for t in run.profile["top_tools"][:3])
+        logger.info(f"Run {run.run_id} profile: {run.profile['wall_s']:.1f}s wall, top tools: {top or 'none'}")
+
+
+def current_profile_run() -> Optional[str]:
+    return _current_run.get()
+
+
+__all__ = [
+    "OTEL_AVAILABLE",
+    "SpanRecord",
+    "RunProfileCollector",
+    "JsonlSpanExporter",
+    "RunProfileStore",
+    "ProfiledRun",
+    "collector",
+    "profile_store",
+    "span",
+    "get_tracer",
+    "build_profile",
+    "percentile",
+    "profile_run",
+    "current_profile_run",
+]
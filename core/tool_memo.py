@@ -0,0 +1,416 @@
+"""
+Run-scoped memoization of agent tool results.
+
+In one workflow run, several departments call the same read-only tools
+with identical arguments (get_oi_spurts, get_all_indices, get_quotes for
+the same symbols, get_option_chain for NIFTY). This module installs an
+agno tool hook on every agent of a workflow so that, within a run:
+
+- Results are memoized by (run id, tool name, normalized arguments)
+- Only allowlisted tools are memoized, each with its own TTL; everything
+  else (orders, positions, funds, any tool not listed) always runs
+- Concurrent identical calls wait on ONE execution (single-flight)
+- Hits, misses and the execution time saved are counted per run
+- Optional sources (e.g. the pre-market snapshot) are consulted before
+  a tool runs; a source hit skips the tool entirely. Sources get the
+  tool's real callable (resolved on the calling agent by name), since
+  agno hands hooks a ``next_func(**kwargs)`` wrapper
+- Every call is timed as a "tool" profiling span with its cache outcome
+
+Outside a run scope the hook is a pass-through, so agents used on their
+own behave exactly as before.
+
+Usage:
+    install_tool_memo([research_council, regime_agent, risk_agent])
+
+    with tool_memo.run_scope() as run_id:
+        await workflow.arun(...)
+        stats = tool_memo.run_stats()
+"""
+
+import asyncio
+import contextvars
+import inspect
+import json
+import logging
+import threading
+import time
+import uuid
+from concurrent.futures import Future
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from core.profiling import span
+
+logger = logging.getLogger(__name__)
+
+# Tools that may be memoized, with their TTLs in seconds. Anything not
+# listed (orders, positions, funds, market status, new tools) always runs.
+DEFAULT_TOOL_TTLS: Dict[str, float] = {
+    # Live prices - short window, still collapses fan-out across departments
+    "get_quotes": 15,
+    "get_market_depth": 10,
+    "get_live_price": 15,
+    "get_stock_price": 15,
+    # Derivatives / breadth snapshots
+    "get_option_chain": 60,
+    "get_option_greeks": 60,
+    "get_oi_spurts": 120,
+    "scan_oi_spurts": 120,
+    "get_all_indices": 60,
+    "get_index_summary": 60,
+    "get_gift_nifty": 60,
+    "get_most_active": 60,
+    "get_market_movers": 60,
+    "fetch_sector_constituents": 60,  # Carries LTP and change %
+    "get_index_constituents": 3600,
+    "get_index_symbols": 3600,
+    "get_new_contracts": 3600,
+    # History / indicators (bar-close granularity)
+    "get_historical_data": 300,
+    "get_historical_prices": 300,
+    "get_technical_indicators": 300,
+    # Filings and fundamentals (change at most a few times a day)
+    "get_symbol_announcements": 300,
+    "get_annual_reports": 3600,
+    "get_shareholding_patterns": 3600,
+    "get_detailed_shareholding": 3600,
+    "get_financial_results_comparison": 3600,
+    "get_company_fundamentals": 3600,
+    "get_financials": 3600,
+}
+
+def resolve_tool(owner: Any, tool_name: str) -> Optional[Callable]:
+    """
+    The callable registered as ``tool_name`` on an agent or team.
+
+    Looks through the owner's toolkits, agno Functions and plain callables.
+    Returns None if the tool is not found.
+    """
+    for tool in getattr(owner, "tools", None) or []:
+        functions = getattr(tool, "functions", None)
+        if isinstance(functions, dict):
+            function = functions.get(tool_name)
+            if function is not None and getattr(function, "entrypoint", None) is not None:
+                return function.entrypoint
+        elif getattr(tool, "entrypoint", None) is not None:
+            if getattr(tool, "name", None) == tool_name:
+                return tool.entrypoint
+        elif callable(tool) and getattr(tool, "__name__", None) == tool_name:
+            return tool
+    return None
+
+
+_current_run: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar(
+    "tool_memo_run_id", default=None
+)
+
+
+@dataclass
+class ToolMemoStats:
+    """Memo counters for one run."""
+
+    calls: int = 0
+    hits: int = 0
+    misses: int = 0
+    inflight_waits: int = 0  # Hits that waited on a concurrent execution
+    source_hits: int = 0  # Calls answered by a source (snapshot) without running
+    time_saved_s: float = 0.0
+    per_tool: Dict[str, Dict[str, float]] = field(default_factory=dict)
+
+    def _tool(self, name: str) -> Dict[str, float]:
+        return self.per_tool.setdefault(name, {"calls": 0, "hits": 0, "source_hits": 0, "time_saved_s": 0.0})
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "hits": self.hits,
+            "misses": self.misses,
+            "inflight_waits": self.inflight_waits,
+            "source_hits": self.source_hits,
+            "hit_rate": round((self.hits + self.source_hits) / self.calls, 3) if self.calls else 0.0,
+            "time_saved_s": round(self.time_saved_s, 3),
+            "per_tool": {
+                name: {**counts, "time_saved_s": round(counts["time_saved_s"], 3)}
+                for name, counts in sorted(self.per_tool.items())
+            },
+        }
+
+
+@dataclass
+class _Entry:
+    future: Future
+    started: float
+    expires_at: float = float("inf")
+    duration_s: float = 0.0
+
+
+class ToolResultMemo:
+    """Run-scoped, single-flight memo for tool results."""
+
+    def __init__(self, ttls: Optional[Dict[str, float]] = None):
+        """
+        Initialize the memo.
+
+        Args:
+            ttls: Per-tool TTL overrides (seconds, 0 disables memoization)
+        """
+        self.ttls = {**DEFAULT_TOOL_TTLS, **(ttls or {})}
+        self._lock = threading.Lock()
+        self._entries: Dict[Tuple[str, str, str], _Entry] = {}
+        self._stats: Dict[str, ToolMemoStats] = {}
+        self._sources: List[Callable[[str, Callable, Dict[str, Any]], Any]] = []
+
+    def add_source(self, source: Callable[[str, Callable, Dict[str, Any]], Any]) -> None:
+        """
+        Register a source consulted before a memoized tool runs.
+
+        A source is called as ``source(tool_name, function_call, arguments)``
+        and returns the tool result, or None to fall through.
+        ``function_call`` is the tool's own callable when the calling agent
+        is known (signature, owning toolkit via ``__self__``), else agno's
+        chain wrapper.
+        """
+        if source not in self._sources:
+            self._sources.append(source)
+
+    # ==================== Run scope ====================
+
+    @contextmanager
+    def run_scope(self, run_id: Optional[str] = None) -> Iterator[str]:
+        """Memoize tool calls made inside this block under one run id."""
+        run_id = run_id or uuid.uuid4().hex[:12]
+        with self._lock:
+            self._stats.setdefault(run_id, ToolMemoStats())
+        token = _current_run.set(run_id)
+        try:
+            yield run_id
+        finally:
+            _current_run.reset(token)
+            self.end_run(run_id)
+
+    @staticmethod
+    def current_run() -> Optional[str]:
+        return _current_run.get()
+
+    def run_stats(self, run_id: Optional[str] = None) -> Dict[str, Any]:
+        """Hit rate and time saved for a run (defaults to the current run)."""
+        run_id = run_id or self.current_run()
+        with self._lock:
+            stats = self._stats.get(run_id) if run_id else None
+            return {"run_id": run_id, **(stats or ToolMemoStats()).to_dict()}
+
+    def end_run(self, run_id: str) -> None:
+        """Drop a run's memoized results and counters."""
+        with self._lock:
+            self._entries = {k: v for k, v in self._entries.items() if k[0] != run_id}
+            stats = self._stats.pop(run_id, None)
+        if stats and stats.calls:
+            logger.info(
+                f"Tool memo run {run_id}: {stats.hits}/{stats.calls} hits, "
+                f"{stats.source_hits} from snapshot, {stats.time_saved_s:.1f}s saved"
+            )
+
+    # ==================== Keys ====================
+
+    def ttl_for(self, tool_name: str) -> float:
+        return self.ttls.get(tool_name, 0.0)
+
+    @staticmethod
+    def normalize_args(arguments: Dict[str, Any]) -> str:
+        """Canonical JSON of the arguments (sorted keys, trimmed strings)."""
+        def norm(value: Any) -> Any:
+            if isinstance(value, str):
+                return value.strip()
+            if isinstance(value, dict):
+                return {str(k): norm(v) for k, v in value.items()}
+            if isinstance(value, (list, tuple)):
+                return [norm(v) for v in value]
+            return value
+
+        return json.dumps(
+            {k: norm(v) for k, v in (arguments or {}).items() if v is not None},
+            sort_keys=True,
+            default=str,
+        )
+
+    # ==================== Lookup ====================
+
+    def _claim(self, run_id: str, tool_name: str, arguments: Dict[str, Any]) -> Tuple[_Entry, bool]:
+        """Get the entry for a call, creating it if this caller must execute."""
+        key = (run_id, tool_name, self.normalize_args(arguments))
+        now = time.monotonic()
+        with self._lock:
+            stats = self._stats.setdefault(run_id, ToolMemoStats())
+            tool_stats = stats._tool(tool_name)
+            stats.calls += 1
+            tool_stats["calls"] += 1
+
+            entry = self._entries.get(key)
+            if entry is not None and (not entry.future.done() or entry.expires_at > now):
+                stats.hits += 1
+                tool_stats["hits"] += 1
+                if not entry.future.done():
+                    stats.inflight_waits += 1
+                return entry, False
+
+            stats.misses += 1
+            entry = _Entry(future=Future(), started=now)
+            self._entries[key] = entry
+            return entry, True
+
+    def _complete(self, run_id: str, tool_name: str, entry: _Entry, result: Any, error: Optional[BaseException]) -> None:
+        entry.duration_s = time.monotonic() - entry.started
+        if error is not None:
+            # Don't memoize failures - waiters get the error, the next call retries
+            entry.expires_at = 0.0
+            entry.future.set_exception(error)
+            return
+        entry.expires_at = time.monotonic() + self.ttl_for(tool_name)
+        entry.future.set_result(result)
+
+    def _record_saved(self, run_id: str, tool_name: str, entry: _Entry) -> None:
+        with self._lock:
+            stats = self._stats.get(run_id)
+            if stats is not None:
+                stats.time_saved_s += entry.duration_s
+                stats._tool(tool_name)["time_saved_s"] += entry.duration_s
+
+    def _from_sources(self, run_id: str, tool_name: str, function_call: Callable, arguments: Dict[str, Any]) -> Any:
+        for source in self._sources:
+            try:
+                result = source(tool_name, function_call, arguments)
+            except Exception as e:
+                logger.debug(f"Tool memo source failed for {tool_name}: {e}")
+                continue
+            if result is not None:
+                with self._lock:
+                    stats = self._stats.setdefault(run_id, ToolMemoStats())
+                    tool_stats = stats._tool(tool_name)
+                    stats.calls += 1
+                    stats.source_hits += 1
+                    tool_stats["calls"] += 1
+                    tool_stats["source_hits"] += 1
+                return result
+        return None
+
+    # ==================== Hooks ====================
+
+    def _should_memoize(self, tool_name: str) -> Optional[str]:
+        run_id = self.current_run()
+        if run_id is None or self.ttl_for(tool_name) <= 0:
+            return None
+        return run_id
+
+    async def async_hook(
+        self,
+        function_name: str,
+        function_call: Callable,
+        arguments: Dict[str, Any],
+        agent: Any = None,
+        team: Any = None,
+    ) -> Any:
+        """agno tool hook for async agent runs."""
+        with span("tool", function_name) as s:
+            run_id = self._should_memoize(function_name)
+            if run_id is None:
+                s.set("cache.hit", False)
+                result = function_call(**arguments)
+                return await result if inspect.isawaitable(result) else result
+
+            tool = resolve_tool(agent or team, function_name) or function_call
+            result = self._from_sources(run_id, function_name, tool, arguments)
+            if result is not None:
+                s.set("cache.hit", True)
+                s.set("cache.source", "snapshot")
+                return result
+
+            entry, owner = self._claim(run_id, function_name, arguments)
+            s.set("cache.hit", not owner)
+            if not owner:
+                s.set("cache.source", "memo")
+                result = await asyncio.wrap_future(entry.future)
+                self._record_saved(run_id, function_name, entry)
+                return result
+
+            try:
+                result = function_call(**arguments)
+                if inspect.isawaitable(result):
+                    result = await result
+            except BaseException as e:
+                self._complete(run_id, function_name, entry, None, e)
+                raise
+            self._complete(run_id, function_name, entry, result, None)
+            return result
+
+    def sync_hook(
+        self,
+        function_name: str,
+        function_call: Callable,
+        arguments: Dict[str, Any],
+        agent: Any = None,
+        team: Any = None,
+    ) -> Any:
+        """agno tool hook for sync agent runs."""
+        with span("tool", function_name) as s:
+            run_id = self._should_memoize(function_name)
+            if run_id is None:
+                s.set("cache.hit", False)
+                return function_call(**arguments)
+
+            tool = resolve_tool(agent or team, function_name) or function_call
+            result = self._from_sources(run_id, function_name, tool, arguments)
+            if result is not None:
+                s.set("cache.hit", True)
+                s.set("cache.source", "snapshot")
+                return result
+
+            entry, owner = self._claim(run_id, function_name, arguments)
+            s.set("cache.hit", not owner)
+            if not owner:
+                s.set("cache.source", "memo")
+                result = entry.future.result()
+                self._record_saved(run_id, function_name, entry)
+                return result
+
+            try:
+                result = function_call(**arguments)
+            except BaseException as e:
+                self._complete(run_id, function_name, entry, None, e)
+                raise
+            self._complete(run_id, function_name, entry, result, None)
+            return result
+
+
+# Shared instance used by all workflows
+tool_memo = ToolResultMemo()
+
+
+def install_tool_memo(
+    members: Iterable[Any],
+    memo: ToolResultMemo = tool_memo,
+    use_async: bool = True,
+) -> None:
+    """
+    Attach the memo hook to agents and (recursively) to team members.
+
+    Safe to call repeatedly - agents shared by several workflows get the
+    hook once.
+
+    Args:
+        members: Agents and/or Teams
+        memo: Memo instance (defaults to the shared one)
+        use_async: Install the async hook (for arun); False for sync runs
+    """
+    hook = memo.async_hook if use_async else memo.sync_hook
+    for member in members:
+        nested = getattr(member, "members", None)
+        if nested:
+            install_tool_memo(nested, memo, use_async)
+        if not getattr(member, "tools", None):
+            continue
+        hooks = list(getattr(member, "tool_hooks", None) or [])
+        if hook not in hooks:
+            hooks.append(hook)
+            member.tool_hooks = hooks
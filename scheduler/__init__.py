@@ -2,9 +2,12 @@
 Hagrid Trading Scheduler Package
 
 This package provides scheduled execution of trading workflows:
+- Pre-Market Snapshot: 8:45 AM (Mon-Fri)
+- Pre-Open Recorder: 9:00 - 9:08 AM (Mon-Fri)
 - Intraday Analysis: 9:00 AM (Mon-Fri)
 - Order Execution: 9:15 AM (Mon-Fri)
-- Position Monitoring: Every 20 min during market hours
+- Option Chain Recorder: every few minutes, 9:15 AM - 3:30 PM (Mon-Fri)
+- Tick Monitor: 9:20 AM - 3:20 PM (or Position Monitoring every 20 min)
 - News Summary: Hourly during market hours
 - Post-Trade Analysis: 4:00 PM (Mon-Fri)
 
@@ -14,19 +17,30 @@ Usage:
 """
 
 from scheduler.scheduler import TradingScheduler
+from scheduler.worker_pool import JobMetricsStore, JobWorkerPool
 from scheduler.jobs import (
+    run_prewarm_job,
+    run_pre_open_job,
+    run_option_chain_job,
     run_intraday_job,
     run_executor_job,
     run_monitoring_job,
+    run_tick_monitor_job,
     run_news_job,
     run_post_trade_job,
 )
 
 __all__ = [
     "TradingScheduler",
+    "JobWorkerPool",
+    "JobMetricsStore",
+    "run_prewarm_job",
+    "run_pre_open_job",
+    "run_option_chain_job",
     "run_intraday_job",
     "run_executor_job",
     "run_monitoring_job",
+    "run_tick_monitor_job",
     "run_news_job",
     "run_post_trade_job",
 ]
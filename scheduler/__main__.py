@@ -16,9 +16,13 @@ from typing import Optional
 
 from scheduler.scheduler import TradingScheduler
 from scheduler.jobs import (
+    run_prewarm_job,
+    run_pre_open_job,
+    run_option_chain_job,
     run_intraday_job,
     run_executor_job,
     run_monitoring_job,
+    run_tick_monitor_job,
     run_news_job,
     run_post_trade_job,
 )
@@ -34,7 +38,7 @@ console = Console()
 @app.command()
 def start(
     once: bool = typer.Option(False, "--once", "-o", help="Run all jobs once and exit"),
-    job: Optional[str] = typer.Option(None, "--job", "-j", help="Run specific job once (intraday/executor/monitoring/news/post_trade)"),
+    job: Optional[str] = typer.Option(None, "--job", "-j", help="Run specific job once (prewarm/pre_open/option_chain/intraday/executor/monitoring/tick_monitor/news/post_trade)"),
 ):
     """Start the trading scheduler."""
 
@@ -57,9 +61,12 @@ def start(
     console.print(Panel(
         "[bold green]Starting Hagrid Trading Scheduler[/bold green]\n\n"
         "The scheduler will run the following jobs:\n"
+        "• Pre-Market Snapshot: 8:45 AM (Mon-Fri)\n"
+        "• Pre-Open Recorder: 9:00 - 9:08 AM (Mon-Fri)\n"
         "• Intraday Analysis: 9:00 AM (Mon-Fri)\n"
         "• Order Execution: 9:15 AM (Mon-Fri)\n"
-        "• Position Monitoring: Every 20 min (9:30 AM - 3:20 PM)\n"
+        "• Option Chain Recorder: every few minutes, 9:15 AM - 3:30 PM\n"
+        "• Tick Monitor: 9:20 AM - 3:20 PM (rule events trigger Position Monitoring)\n"
         "• News Summary: Hourly (9 AM - 4 PM)\n"
         "• Post-Trade Analysis: 4:00 PM (Mon-Fri)\n\n"
         "[dim]Press Ctrl+C to stop[/dim]",
@@ -86,22 +93,68 @@ def status():
     table.add_column("Next Run", style="green")
     table.add_column("Schedule", style="yellow")
 
+    table.add_column("Max Inst.", style="magenta")
+    table.add_column("Misfire Grace", style="magenta")
+
     for job in jobs:
         table.add_row(
-            job["id"],
+            job["id"] + (" ★" if job["priority"] else ""),
             job["next_run"],
-            job["schedule"]
+            job["schedule"],
+            str(job["max_instances"]),
+            f"{job['misfire_grace_time']}s" if job["misfire_grace_time"] is not None else "∞",
         )
 
     console.print(table)
+    console.print("[dim]★ = reserved worker slot[/dim]")
+
+    metrics = scheduler.get_job_metrics()
+    if not metrics:
+        console.print("[dim]No job runs recorded yet[/dim]")
+        return
+
+    metrics_table = Table(title="Job Run Metrics")
+    metrics_table.add_column("Job ID", style="cyan")
+    metrics_table.add_column("Runs", justify="right")
+    metrics_table.add_column("Failed", justify="right", style="red")
+    metrics_table.add_column("Missed", justify="right", style="yellow")
+    metrics_table.add_column("Last Run", style="green")
+    metrics_table.add_column("Last Status")
+    metrics_table.add_column("Last Duration", justify="right")
+    metrics_table.add_column("Avg Duration", justify="right")
+    metrics_table.add_column("Last Queue Wait", justify="right")
+    metrics_table.add_column("Max Queue Wait", justify="right")
+
+    def fmt_secs(value):
+        return f"{value:.1f}s" if value is not None else "-"
+
+    for job_id, m in sorted(metrics.items()):
+        metrics_table.add_row(
+            job_id,
+            str(m["runs"]),
+            str(m["failures"]),
+            str(m["misses"]),
+            m["last_run_at"] or "-",
+            m["last_status"] or "-",
+            fmt_secs(m["last_duration_s"]),
+            fmt_secs(m["avg_duration_s"]),
+            fmt_secs(m["last_queue_wait_s"]),
+            fmt_secs(m["max_queue_wait_s"]),
+        )
+
+    console.print(metrics_table)
 
 
 def run_single_job(job_name: str):
     """Run a single job by name."""
     jobs = {
+        "prewarm": run_prewarm_job,
+        "pre_open": run_pre_open_job,
+        "option_chain": run_option_chain_job,
         "intraday": run_intraday_job,
         "executor": run_executor_job,
         "monitoring": run_monitoring_job,
+        "tick_monitor": run_tick_monitor_job,
         "news": run_news_job,
         "post_trade": run_post_trade_job,
     }
@@ -122,6 +175,7 @@ def run_single_job(job_name: str):
 def run_all_jobs_once():
     """Run all jobs once for testing."""
     jobs = [
+        ("Pre-Market Snapshot", run_prewarm_job),
         ("News Summary", run_news_job),
         ("Intraday Analysis", run_intraday_job),
         ("Order Execution", run_executor_job),
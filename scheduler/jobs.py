@@ -2,8 +2,11 @@
 Job implementations for the trading scheduler.
 
 Each job wraps a workflow's run function and handles logging/errors.
+Jobs are synchronous: the scheduler runs them on worker threads, where
+each async workflow gets its own event loop via asyncio.run().
 """
 
+import asyncio
 from datetime import datetime
 from typing import Dict, Any, Optional
 
@@ -12,12 +15,129 @@ from rich.console import Console
 console = Console()
 
 
-def run_intraday_job() -> Dict[str, Any]:
+def run_prewarm_job() -> Dict[str, Any]:
+    """
+    Warm the pre-market universe snapshot.
+
+    Schedule: 8:45 AM Monday-Friday (deadline ~8:58)
+    Purpose: Fetch VIX, indices, OI spurts, sectors, quotes and option
+    chains before the 9:00 intraday run so its tools start warm
+    """
+    console.print(f"\n[bold white]{'='*50}[/bold white]")
+    console.print(f"[bold white]PRE-MARKET SNAPSHOT - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}[/bold white]")
+    console.print(f"[bold white]{'='*50}[/bold white]\n")
+
+    try:
+        from core.market_snapshot import prewarm_snapshot
+
+        snapshot = asyncio.run(prewarm_snapshot())
+        status = snapshot.status()
+
+        console.print(f"[green]✓ Snapshot {status['version']} saved[/green]")
+        console.print(f"  Quotes: {status['quotes']}")
+        console.print(f"  Tool results: {status['tool_results']}")
+        console.print(f"  Errors: {status['errors']}")
+        console.print(f"  Duration: {status['duration_s']}s")
+
+        return status
+
+    except Exception as e:
+        console.print(f"[red]✗ Pre-market snapshot failed: {e}[/red]")
+        raise
+
+
+def run_pre_open_job() -> Dict[str, Any]:
+    """
+    Record the pre-open session.
+
+    Schedule: 9:00 AM Monday-Friday, runs until PRE_OPEN_END_TIME (9:08 AM)
+    Purpose: Poll the NIFTY/BANKNIFTY/FO pre-open feeds every few seconds
+    into a columnar series so agents can read IEP drift and order
+    imbalance trends with one local query
+    """
+    console.print(f"\n[bold white]{'='*50}[/bold white]")
+    console.print(f"[bold white]PRE-OPEN RECORDER - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}[/bold white]")
+    console.print(f"[bold white]{'='*50}[/bold white]\n")
+
+    try:
+        from core.config import get_settings
+        from tools.nse_india import NSEIndiaClient
+        from tools.nse_india.storage import PreOpenSeriesStore
+
+        settings = get_settings()
+        hour, minute = (int(x) for x in settings.PRE_OPEN_END_TIME.split(":"))
+        until = datetime.now().replace(hour=hour, minute=minute, second=0, microsecond=0)
+        store = PreOpenSeriesStore(settings.PRE_OPEN_DIR, retention_days=settings.PRE_OPEN_KEEP_DAYS)
+
+        async def record():
+            client = NSEIndiaClient()
+            try:
+                return await client.arecord_pre_open_session(store, until=until, cadence_s=settings.PRE_OPEN_CADENCE_S)
+            finally:
+                await client.aclose()
+
+        series = asyncio.run(record())
+        result = {"date": series.day, "snapshots": len(series), "symbols": len(series.symbols)}
+
+        console.print(f"[green]✓ Pre-open session recorded[/green]")
+        console.print(f"  Snapshots: {result['snapshots']}")
+        console.print(f"  Symbols: {result['symbols']}")
+
+        return result
+
+    except Exception as e:
+        console.print(f"[red]✗ Pre-open recorder failed: {e}[/red]")
+        raise
+
+
+def run_option_chain_job() -> Dict[str, Any]:
+    """
+    Record one intraday option-chain snapshot.
+
+    Schedule: Every OPTION_CHAIN_CADENCE_MIN minutes, 9:15 AM - 3:30 PM Monday-Friday
+    Purpose: Append OI / IV / LTP per strike for the configured underlyings
+    and nearest expiries, so OI buildup, IV change and PCR trends since
+    the open are answered locally
+    """
+    from core.config import get_settings
+    from tools.nse_india import NSEIndiaClient
+    from tools.nse_india.storage import OptionChainSeriesStore
+
+    settings = get_settings()
+    now = datetime.now().strftime("%H:%M")
+    if not (settings.OPTION_CHAIN_START_TIME <= now <= settings.OPTION_CHAIN_END_TIME):
+        return {"skipped": f"outside {settings.OPTION_CHAIN_START_TIME}-{settings.OPTION_CHAIN_END_TIME}"}
+
+    store = OptionChainSeriesStore(settings.OPTION_CHAIN_DIR, retention_days=settings.OPTION_CHAIN_KEEP_DAYS)
+
+    async def record():
+        client = NSEIndiaClient()
+        try:
+            return await client.arecord_option_chain_snapshot(
+                store,
+                underlyings=settings.OPTION_CHAIN_UNDERLYINGS.split(","),
+                expiries=settings.OPTION_CHAIN_EXPIRIES,
+            )
+        finally:
+            await client.aclose()
+
+    recorded = asyncio.run(record())
+    if now >= settings.OPTION_CHAIN_END_TIME:
+        store.prune()
+
+    console.print(f"[green]✓ Option chain snapshot {now}: {len(recorded)} chains[/green]")
+    return {"time": now, "recorded": recorded}
+
+
+def run_intraday_job(resume: bool = False) -> Dict[str, Any]:
     """
     Run the intraday analysis workflow.
 
     Schedule: 9:00 AM Monday-Friday
     Purpose: Analyze NIFTY 100 stocks and generate 10-15 picks
+
+    Args:
+        resume: Resume today's last run from its step checkpoints
     """
     console.print(f"\n[bold blue]{'='*50}[/bold blue]")
     console.print(f"[bold blue]INTRADAY ANALYSIS - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}[/bold blue]")
@@ -26,12 +146,17 @@ def run_intraday_job() -> Dict[str, Any]:
     try:
         from workflows.intraday_cycle import run_intraday_analysis
 
-        result = run_intraday_analysis()
+        result = asyncio.run(run_intraday_analysis(resume=resume))
 
         console.print(f"[green]✓ Analysis complete[/green]")
         console.print(f"  Date: {result.get('date')}")
         console.print(f"  Regime: {result.get('regime')}")
         console.print(f"  Picks: {len(result.get('picks', [])) if isinstance(result.get('picks'), list) else 'Generated'}")
+        snapshot = result.get("snapshot") or {}
+        if snapshot.get("version"):
+            console.print(f"  Snapshot: {snapshot['version']} (age {snapshot['age_s']:.0f}s at start)")
+        else:
+            console.print("  Snapshot: none (cold start)")
 
         return result
 
@@ -54,7 +179,7 @@ def run_executor_job() -> Dict[str, Any]:
     try:
         from workflows.executor import run_executor
 
-        result = run_executor()
+        result = asyncio.run(run_executor())
 
         console.print(f"[green]✓ Execution complete[/green]")
         console.print(f"  Date: {result.get('date')}")
@@ -71,7 +196,9 @@ def run_monitoring_job() -> Dict[str, Any]:
     """
     Run the position monitoring workflow.
 
-    Schedule: Every 20 minutes from 9:30 AM to 3:20 PM
+    Schedule: Every 20 minutes from 9:30 AM to 3:20 PM when
+    TICK_MONITOR_ENABLED is off; otherwise the tick monitor triggers it and
+    the watchdog runs it while the monitor is down
     Purpose: Monitor open positions, adjust stops, close losers
     """
     console.print(f"\n[bold yellow]{'='*50}[/bold yellow]")
@@ -81,7 +208,7 @@ def run_monitoring_job() -> Dict[str, Any]:
     try:
         from workflows.monitoring import run_monitoring
 
-        result = run_monitoring()
+        result = asyncio.run(run_monitoring())
 
         console.print(f"[green]✓ Monitoring complete[/green]")
         console.print(f"  Date: {result.get('date')}")
@@ -95,6 +222,35 @@ def run_monitoring_job() -> Dict[str, Any]:
         raise
 
 
+def run_tick_monitor_job() -> Dict[str, Any]:
+    """
+    Run the tick-driven position monitor for the rest of the session.
+
+    Schedule: 9:20 AM Monday-Friday, runs until MONITOR_END_TIME (3:20 PM)
+    Purpose: Check stop/target/trailing rules on every tick and run the
+    monitoring workflow only when a rule fires or a position moves materially
+    """
+    console.print(f"\n[bold yellow]{'='*50}[/bold yellow]")
+    console.print(f"[bold yellow]TICK MONITOR - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}[/bold yellow]")
+    console.print(f"[bold yellow]{'='*50}[/bold yellow]\n")
+
+    try:
+        from workflows.tick_monitor import run_position_monitor
+
+        result = asyncio.run(run_position_monitor())
+
+        console.print(f"[green]✓ Tick monitor stopped[/green]")
+        console.print(f"  Ticks: {result.get('ticks')}")
+        console.print(f"  Rule events: {len(result.get('events', []))}")
+        console.print(f"  Workflow runs: {len(result.get('workflow_runs', []))}")
+
+        return result
+
+    except Exception as e:
+        console.print(f"[red]✗ Tick monitor failed: {e}[/red]")
+        raise
+
+
 def run_news_job() -> Dict[str, Any]:
     """
     Run the news summarization workflow.
@@ -109,7 +265,7 @@ def run_news_job() -> Dict[str, Any]:
     try:
         from workflows.news_workflow import run_news_summary
 
-        result = run_news_summary()
+        result = asyncio.run(run_news_summary())
 
         console.print(f"[green]✓ News summary complete[/green]")
         console.print(f"  Date: {result.get('date')}")
@@ -138,7 +294,7 @@ def run_post_trade_job() -> Dict[str, Any]:
     try:
         from workflows.post_trade import run_post_trade_analysis
 
-        result = run_post_trade_analysis()
+        result = asyncio.run(run_post_trade_analysis())
 
         metrics = result.get("metrics", {})
         console.print(f"[green]✓ Post-trade analysis complete[/green]")
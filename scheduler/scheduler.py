@@ -6,41 +6,85 @@ during Indian market hours (9 AM - 4 PM, Monday-Friday).
 """
 
 import asyncio
-from datetime import datetime
-from typing import List, Dict, Any
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
-from apscheduler.events import EVENT_JOB_ERROR, EVENT_JOB_EXECUTED
+from apscheduler.events import (
+    EVENT_JOB_ERROR,
+    EVENT_JOB_EXECUTED,
+    EVENT_JOB_MAX_INSTANCES,
+    EVENT_JOB_MISSED,
+    EVENT_JOB_SUBMITTED,
+)
 
 from rich.console import Console
 
 from core.config import get_settings
 from scheduler.jobs import (
+    run_prewarm_job,
+    run_pre_open_job,
+    run_option_chain_job,
     run_intraday_job,
     run_executor_job,
     run_monitoring_job,
+    run_tick_monitor_job,
     run_news_job,
     run_post_trade_job,
 )
+from scheduler.worker_pool import JobMetricsStore, JobWorkerPool
 
 settings = get_settings()
 console = Console()
 
+# Per-job dispatch policy.
+# - max_instances: concurrent runs allowed for the job
+# - misfire_grace_time: seconds a late run may still start (None = always)
+# - priority: run in the reserved lane so the job always gets a worker
+# - long_running: run in the session-long lane (holds no shared or priority worker)
+JOB_POLICIES: Dict[str, Dict[str, Any]] = {
+    "market_prewarm": {"max_instances": 1, "misfire_grace_time": 300, "priority": False},
+    # Must start on time; the session only lasts until 9:08
+    "pre_open_recorder": {"max_instances": 1, "misfire_grace_time": 240, "priority": True},
+    # Short run every few minutes; a late snapshot is superseded by the next one
+    "option_chain_recorder": {"max_instances": 1, "misfire_grace_time": 60, "priority": False},
+    "intraday_analysis": {"max_instances": 1, "misfire_grace_time": 600, "priority": False},
+    "order_execution": {"max_instances": 1, "misfire_grace_time": 300, "priority": False},
+    "position_monitoring": {"max_instances": 1, "misfire_grace_time": 120, "priority": True},
+    # Long-running; a late start (e.g. scheduler restart) still joins the session
+    "tick_monitor": {"max_instances": 1, "misfire_grace_time": 6 * 3600, "priority": False, "long_running": True},
+    "news_summary": {"max_instances": 1, "misfire_grace_time": 900, "priority": False},
+    "post_trade_analysis": {"max_instances": 1, "misfire_grace_time": 3600, "priority": False},
+}
+
 
 class TradingScheduler:
     """
     Manages scheduled execution of trading workflows.
 
     Schedule:
+    - 8:45 AM: Pre-market snapshot (warm caches for the 9:00 run)
+    - 9:00 - 9:08 AM: Pre-Open Recorder (IEP / imbalance series)
     - 9:00 AM: Intraday Analysis (generate picks)
     - 9:15 AM: Order Execution (place orders)
-    - 9:30 AM - 3:20 PM: Position Monitoring (every 20 min)
+    - 9:15 AM - 3:30 PM: Option Chain Recorder (OI / IV snapshot every few minutes)
+    - 9:20 AM - 3:20 PM: Tick Monitor (always on; runs the monitoring
+      workflow on stop/target/trail events), checked by a watchdog every
+      MONITOR_WATCHDOG_CADENCE_MIN minutes that runs Position Monitoring
+      and restarts the monitor whenever it is down. With
+      TICK_MONITOR_ENABLED off: Position Monitoring every 20 min from
+      9:30 AM instead
     - 9 AM - 4 PM: News Summary (hourly)
     - 4:00 PM: Post-Trade Analysis
+
+    Jobs are dispatched to a bounded worker pool so a long-running
+    workflow never blocks the event loop that fires the other jobs.
+    Monitoring runs in a reserved lane and always gets a worker; the
+    session-long tick monitor has a lane of its own.
     """
 
-    def __init__(self):
+    def __init__(self, max_workers: Optional[int] = None):
         self.scheduler = AsyncIOScheduler(
             timezone="Asia/Kolkata",
             job_defaults={
@@ -49,9 +93,46 @@ class TradingScheduler:
                 "misfire_grace_time": 300,  # 5 min grace for missed jobs
             }
         )
+        self.metrics = JobMetricsStore(settings.SCHEDULER_METRICS_FILE)
+        self.pool = JobWorkerPool(
+            max_workers=max_workers or settings.SCHEDULER_MAX_WORKERS,
+            priority_workers=1,
+            metrics=self.metrics,
+        )
+        self._scheduled_times: Dict[str, datetime] = {}
         self._configure_jobs()
         self._configure_listeners()
 
+    def _dispatcher(self, job_id: str, func: Callable[[], Any]) -> Callable:
+        """Wrap a sync job so the scheduler awaits it on the worker pool."""
+        policy = JOB_POLICIES.get(job_id, {})
+
+        async def dispatch():
+            return await self.pool.run(
+                job_id,
+                func,
+                priority=policy.get("priority", False),
+                scheduled_at=self._scheduled_times.pop(job_id, None),
+                long_running=policy.get("long_running", False),
+            )
+
+        dispatch.__name__ = f"dispatch_{func.__name__}"
+        return dispatch
+
+    def _add_job(self, func: Callable[[], Any], trigger: CronTrigger, job_id: str, name: str):
+        """Register a job with its dispatch policy."""
+        policy = JOB_POLICIES.get(job_id, {})
+        self.scheduler.add_job(
+            self._dispatcher(job_id, func),
+            trigger,
+            id=job_id,
+            name=name,
+            replace_existing=True,
+            max_instances=policy.get("max_instances", 1),
+            misfire_grace_time=policy.get("misfire_grace_time", 300),
+            coalesce=True,
+        )
+
     def _configure_jobs(self):
         """Configure all scheduled jobs."""
 
@@ -59,61 +140,139 @@ class TradingScheduler:
             console.print("[yellow]Scheduler is disabled in config[/yellow]")
             return
 
+        # Pre-market snapshot - 8:45 AM Monday-Friday (done by ~8:58)
+        self._add_job(
+            run_prewarm_job,
+            CronTrigger(hour=8, minute=45, day_of_week="mon-fri"),
+            job_id="market_prewarm",
+            name="Pre-Market Snapshot",
+        )
+
+        if settings.PRE_OPEN_RECORD_ENABLED:
+            # Pre-Open Recorder - 9:00 AM until PRE_OPEN_END_TIME
+            start_hour, start_minute = (int(x) for x in settings.PRE_OPEN_START_TIME.split(":"))
+            self._add_job(
+                run_pre_open_job,
+                CronTrigger(hour=start_hour, minute=start_minute, day_of_week="mon-fri"),
+                job_id="pre_open_recorder",
+                name="Pre-Open Recorder",
+            )
+
         # Intraday Analysis - 9:00 AM Monday-Friday
-        self.scheduler.add_job(
+        self._add_job(
             run_intraday_job,
             CronTrigger(hour=9, minute=0, day_of_week="mon-fri"),
-            id="intraday_analysis",
+            job_id="intraday_analysis",
             name="Intraday Analysis",
-            replace_existing=True,
         )
 
+        if settings.OPTION_CHAIN_RECORD_ENABLED:
+            # Option Chain Recorder - every OPTION_CHAIN_CADENCE_MIN minutes in market hours
+            start_hour = int(settings.OPTION_CHAIN_START_TIME.split(":")[0])
+            end_hour = int(settings.OPTION_CHAIN_END_TIME.split(":")[0])
+            self._add_job(
+                run_option_chain_job,
+                CronTrigger(
+                    minute=f"*/{settings.OPTION_CHAIN_CADENCE_MIN}",
+                    hour=f"{start_hour}-{end_hour}",
+                    day_of_week="mon-fri",
+                ),
+                job_id="option_chain_recorder",
+                name="Option Chain Recorder",
+            )
+
         # Order Execution - 9:15 AM Monday-Friday
-        self.scheduler.add_job(
+        self._add_job(
             run_executor_job,
             CronTrigger(hour=9, minute=15, day_of_week="mon-fri"),
-            id="order_execution",
+            job_id="order_execution",
             name="Order Execution",
-            replace_existing=True,
         )
 
-        # Position Monitoring - Every 20 minutes from 9:30 AM to 3:20 PM
-        self.scheduler.add_job(
-            run_monitoring_job,
-            CronTrigger(
-                minute="10,30,50",  # At 10, 30, 50 past the hour
-                hour="9-15",  # 9 AM to 3 PM
-                day_of_week="mon-fri"
-            ),
-            id="position_monitoring",
-            name="Position Monitoring",
-            replace_existing=True,
-        )
+        if settings.TICK_MONITOR_ENABLED:
+            # Tick Monitor - from 9:20 AM until MONITOR_END_TIME
+            start_hour, start_minute = (int(x) for x in settings.MONITOR_START_TIME.split(":"))
+            self._add_job(
+                run_tick_monitor_job,
+                CronTrigger(hour=start_hour, minute=start_minute, day_of_week="mon-fri"),
+                job_id="tick_monitor",
+                name="Tick Monitor",
+            )
+            # Watchdog - covers a failed start or a dropped socket for the rest of the day
+            self.scheduler.add_job(
+                self._tick_monitor_watchdog,
+                CronTrigger(
+                    minute=f"*/{settings.MONITOR_WATCHDOG_CADENCE_MIN}",
+                    hour="9-15",
+                    day_of_week="mon-fri",
+                ),
+                id="tick_monitor_watchdog",
+                name="Tick Monitor Watchdog",
+                replace_existing=True,
+                max_instances=1,
+                misfire_grace_time=60,
+                coalesce=True,
+            )
+        else:
+            # Position Monitoring - Every 20 minutes from 9:30 AM to 3:20 PM
+            self._add_job(
+                run_monitoring_job,
+                CronTrigger(
+                    minute="10,30,50",  # At 10, 30, 50 past the hour
+                    hour="9-15",  # 9 AM to 3 PM
+                    day_of_week="mon-fri"
+                ),
+                job_id="position_monitoring",
+                name="Position Monitoring",
+            )
 
         # News Summary - Hourly from 9 AM to 4 PM
-        self.scheduler.add_job(
+        self._add_job(
             run_news_job,
             CronTrigger(
                 minute=0,  # At the top of each hour
                 hour="9-16",  # 9 AM to 4 PM
                 day_of_week="mon-fri"
             ),
-            id="news_summary",
+            job_id="news_summary",
             name="News Summary",
-            replace_existing=True,
         )
 
         # Post-Trade Analysis - 4:00 PM Monday-Friday
-        self.scheduler.add_job(
+        self._add_job(
             run_post_trade_job,
             CronTrigger(hour=16, minute=0, day_of_week="mon-fri"),
-            id="post_trade_analysis",
+            job_id="post_trade_analysis",
             name="Post-Trade Analysis",
-            replace_existing=True,
         )
 
         console.print("[green]✓ All jobs configured[/green]")
 
+    async def _tick_monitor_watchdog(self):
+        """
+        Restart a dead tick monitor and cover the gap with a monitoring pass.
+
+        The monitor counts as dead inside its session window when its
+        heartbeat is stale or its socket is down - a failed 9:20 start, a
+        crash, or a websocket that never came back.
+        """
+        from workflows.tick_monitor import monitor_alive
+
+        now = datetime.now(self.scheduler.timezone)
+        start = settings.MONITOR_START_TIME.split(":")
+        end = settings.MONITOR_END_TIME.split(":")
+        session_start = now.replace(hour=int(start[0]), minute=int(start[1]), second=0, microsecond=0)
+        session_end = now.replace(hour=int(end[0]), minute=int(end[1]), second=0, microsecond=0)
+        # Give a fresh run time to connect before judging it
+        if not (session_start + timedelta(minutes=2) <= now < session_end) or monitor_alive():
+            return
+
+        console.print("[yellow]⚠ Tick monitor is down - running fallback monitoring[/yellow]")
+        if "tick_monitor" not in self.pool.active_jobs:
+            self.run_job_now("tick_monitor")
+        if "position_monitoring" not in self.pool.active_jobs:
+            await self._dispatcher("position_monitoring", run_monitoring_job)()
+
     def _configure_listeners(self):
         """Configure event listeners for job execution."""
 
@@ -128,8 +287,25 @@ class TradingScheduler:
             exception = event.exception
             console.print(f"[red]✗ Job failed: {job_id} - {exception}[/red]")
 
+        def job_submitted(event):
+            """Remember when the run was due so the pool can report lag."""
+            if event.scheduled_run_times:
+                self._scheduled_times[event.job_id] = event.scheduled_run_times[-1]
+
+        def job_missed(event):
+            """Handle runs skipped by misfire or max-instances limits."""
+            job_id = event.job_id
+            reason = "max instances reached" if event.code == EVENT_JOB_MAX_INSTANCES else "misfired"
+            console.print(f"[yellow]⚠ Job skipped ({reason}): {job_id}[/yellow]")
+            scheduled_at = getattr(event, "scheduled_run_time", None)
+            if scheduled_at is None and getattr(event, "scheduled_run_times", None):
+                scheduled_at = event.scheduled_run_times[-1]
+            self.pool.record_missed(job_id, scheduled_at)
+
         self.scheduler.add_listener(job_executed, EVENT_JOB_EXECUTED)
         self.scheduler.add_listener(job_error, EVENT_JOB_ERROR)
+        self.scheduler.add_listener(job_submitted, EVENT_JOB_SUBMITTED)
+        self.scheduler.add_listener(job_missed, EVENT_JOB_MISSED | EVENT_JOB_MAX_INSTANCES)
 
     async def start(self):
         """Start the scheduler and run forever."""
@@ -146,6 +322,7 @@ class TradingScheduler:
         except (KeyboardInterrupt, SystemExit):
             console.print("[yellow]Shutting down scheduler...[/yellow]")
             self.scheduler.shutdown(wait=True)
+            self.pool.shutdown(wait=True)
 
     def _print_next_runs(self):
         """Print upcoming job run times."""
@@ -164,9 +341,16 @@ class TradingScheduler:
                 "name": job.name,
                 "next_run": job.next_run_time.strftime("%Y-%m-%d %H:%M:%S") if job.next_run_time else "Not scheduled",
                 "schedule": str(job.trigger),
+                "max_instances": job.max_instances,
+                "misfire_grace_time": job.misfire_grace_time,
+                "priority": JOB_POLICIES.get(job.id, {}).get("priority", False),
             })
         return jobs
 
+    def get_job_metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Get recorded run metrics (duration, queue wait, misses) per job."""
+        return self.metrics.summary()
+
     def pause_job(self, job_id: str):
         """Pause a specific job."""
         self.scheduler.pause_job(job_id)
@@ -178,10 +362,14 @@ class TradingScheduler:
         console.print(f"[green]Resumed job: {job_id}[/green]")
 
     def run_job_now(self, job_id: str):
-        """Trigger immediate execution of a job."""
+        """Trigger immediate execution of a job on the worker pool.
+
+        The run goes through the scheduler, so the job's max-instances
+        limit and metrics still apply.
+        """
         job = self.scheduler.get_job(job_id)
         if job:
-            job.func()
+            job.modify(next_run_time=datetime.now(self.scheduler.timezone))
             console.print(f"[green]Triggered job: {job_id}[/green]")
         else:
             console.print(f"[red]Job not found: {job_id}[/red]")
@@ -0,0 +1,250 @@
+"""
+Bounded worker pool and run metrics for scheduled jobs.
+
+Job functions in scheduler/jobs.py are synchronous and can run for many
+minutes (an intraday or multi-sector workflow). Running them directly on
+the AsyncIOScheduler loop would block the 9:15 executor and the
+monitoring jobs, so every job is dispatched to a worker thread instead:
+
+- A shared, bounded pool for regular jobs
+- A reserved lane for priority jobs (monitoring) so they always get a
+  slot even when the shared pool is saturated
+- A separate lane for session-long jobs (the tick monitor) so they hold
+  neither a shared worker nor the priority slot
+- Per-run metrics (queue wait, duration, scheduling lag, outcome)
+  persisted to disk so `python -m scheduler status` can show them
+"""
+
+import asyncio
+import json
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+from rich.console import Console
+
+console = Console()
+
+
+@dataclass
+class JobRun:
+    """Metrics for a single job run."""
+
+    job_id: str
+    submitted_at: str
+    queue_wait_s: float = 0.0
+    duration_s: float = 0.0
+    lag_s: Optional[float] = None  # Delay between scheduled and submitted time
+    status: str = "running"  # running, success, error, missed
+    error: Optional[str] = None
+
+
+@dataclass
+class JobStats:
+    """Aggregated metrics for one job id."""
+
+    runs: int = 0
+    failures: int = 0
+    misses: int = 0
+    last_status: Optional[str] = None
+    last_run_at: Optional[str] = None
+    last_duration_s: Optional[float] = None
+    last_queue_wait_s: Optional[float] = None
+    avg_duration_s: float = 0.0
+    max_queue_wait_s: float = 0.0
+    recent: List[Dict[str, Any]] = field(default_factory=list)
+
+
+class JobMetricsStore:
+    """Thread-safe store of job run metrics, persisted as JSON."""
+
+    def __init__(self, path: str | Path, history_size: int = 20):
+        """
+        Initialize the metrics store.
+
+        Args:
+            path: JSON file to persist metrics to
+            history_size: Number of recent runs kept per job
+        """
+        self.path = Path(path)
+        self.history_size = history_size
+        self._lock = threading.Lock()
+        self._stats: Dict[str, JobStats] = {}
+        self._recent: Dict[str, Deque[Dict[str, Any]]] = {}
+        self._load()
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            return
+        try:
+            data = json.loads(self.path.read_text())
+        except (json.JSONDecodeError, OSError):
+            return
+        for job_id, raw in data.items():
+            recent = raw.pop("recent", [])
+            self._stats[job_id] = JobStats(**raw)
+            self._recent[job_id] = deque(recent, maxlen=self.history_size)
+
+    def _save(self) -> None:
+        data = {}
+        for job_id, stats in self._stats.items():
+            entry = asdict(stats)
+            entry["recent"] = list(self._recent.get(job_id, []))
+            data[job_id] = entry
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(".tmp")
+            tmp_path.write_text(json.dumps(data, indent=2))
+            tmp_path.replace(self.path)
+        except OSError as e:
+            console.print(f"[yellow]Could not persist job metrics: {e}[/yellow]")
+
+    def record(self, run: JobRun) -> None:
+        """Record a finished (or missed) run."""
+        with self._lock:
+            stats = self._stats.setdefault(run.job_id, JobStats())
+            recent = self._recent.setdefault(run.job_id, deque(maxlen=self.history_size))
+
+            if run.status == "missed":
+                stats.misses += 1
+            else:
+                stats.runs += 1
+                if run.status == "error":
+                    stats.failures += 1
+                stats.avg_duration_s = round(
+                    stats.avg_duration_s + (run.duration_s - stats.avg_duration_s) / stats.runs, 3
+                )
+                stats.max_queue_wait_s = round(max(stats.max_queue_wait_s, run.queue_wait_s), 3)
+                stats.last_duration_s = round(run.duration_s, 3)
+                stats.last_queue_wait_s = round(run.queue_wait_s, 3)
+
+            stats.last_status = run.status
+            stats.last_run_at = run.submitted_at
+            recent.append(asdict(run))
+            self._save()
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """Get aggregated metrics per job id."""
+        with self._lock:
+            return {job_id: asdict(stats) for job_id, stats in self._stats.items()}
+
+
+class JobWorkerPool:
+    """
+    Dispatches synchronous job functions off the event loop.
+
+    Regular jobs share a bounded thread pool. Jobs marked as priority run
+    in a separate reserved lane, so a long intraday workflow occupying the
+    shared pool can never starve position monitoring. Long-running jobs
+    get their own lane so a session-long run never holds either of them.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 3,
+        priority_workers: int = 1,
+        long_running_workers: int = 1,
+        metrics: Optional[JobMetricsStore] = None,
+    ):
+        """
+        Initialize the worker pool.
+
+        Args:
+            max_workers: Size of the shared pool for regular jobs
+            priority_workers: Size of the reserved pool for priority jobs
+            long_running_workers: Size of the pool for session-long jobs
+            metrics: Metrics store to record runs into
+        """
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+        self._priority_pool = ThreadPoolExecutor(
+            max_workers=priority_workers, thread_name_prefix="priority-job"
+        )
+        self._long_pool = ThreadPoolExecutor(
+            max_workers=long_running_workers, thread_name_prefix="session-job"
+        )
+        self.metrics = metrics
+        self._active: Dict[str, int] = {}
+        self._active_lock = threading.Lock()
+
+    @property
+    def active_jobs(self) -> Dict[str, int]:
+        """Number of running instances per job id."""
+        with self._active_lock:
+            return {job_id: n for job_id, n in self._active.items() if n}
+
+    def _execute(self, job_id: str, func: Callable[[], Any], run: JobRun, submitted: float) -> Any:
+        """Run a job in a worker thread, recording queue wait and duration."""
+        started = time.monotonic()
+        run.queue_wait_s = started - submitted
+        with self._active_lock:
+            self._active[job_id] = self._active.get(job_id, 0) + 1
+        try:
+            result = func()
+            run.status = "success"
+            return result
+        except Exception as e:
+            run.status = "error"
+            run.error = str(e)
+            raise
+        finally:
+            run.duration_s = time.monotonic() - started
+            with self._active_lock:
+                self._active[job_id] -= 1
+            if self.metrics:
+                self.metrics.record(run)
+
+    async def run(
+        self,
+        job_id: str,
+        func: Callable[[], Any],
+        priority: bool = False,
+        scheduled_at: Optional[datetime] = None,
+        long_running: bool = False,
+    ) -> Any:
+        """
+        Run a job in the pool and await its result without blocking the loop.
+
+        Args:
+            job_id: Job identifier (used for metrics)
+            func: Synchronous job function
+            priority: Use the reserved priority lane
+            scheduled_at: Time the scheduler intended to run the job
+            long_running: Use the session-long lane (takes precedence over priority)
+
+        Returns:
+            The job function's return value
+        """
+        now = datetime.now(scheduled_at.tzinfo) if scheduled_at else datetime.now()
+        run = JobRun(
+            job_id=job_id,
+            submitted_at=now.isoformat(timespec="seconds"),
+            lag_s=round((now - scheduled_at).total_seconds(), 3) if scheduled_at else None,
+        )
+        if long_running:
+            pool = self._long_pool
+        else:
+            pool = self._priority_pool if priority else self._pool
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            pool, self._execute, job_id, func, run, time.monotonic()
+        )
+
+    def record_missed(self, job_id: str, scheduled_at: Optional[datetime] = None) -> None:
+        """Record a run that the scheduler skipped (misfire or max-instances)."""
+        if self.metrics:
+            self.metrics.record(JobRun(
+                job_id=job_id,
+                submitted_at=(scheduled_at or datetime.now()).isoformat(timespec="seconds"),
+                status="missed",
+            ))
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Shut down all pools."""
+        self._pool.shutdown(wait=wait)
+        self._priority_pool.shutdown(wait=wait)
+        self._long_pool.shutdown(wait=wait)
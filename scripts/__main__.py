@@ -8,10 +8,12 @@ Usage:
     python -m scripts run multi-sector  # Run multi-sector analysis workflow (10 sectors parallel)
     python -m scripts run executor      # Run order execution workflow
     python -m scripts run monitoring    # Run position monitoring workflow
+    python -m scripts run tick-monitor  # Run the tick-driven position monitor (or --replay a tick tape)
     python -m scripts run news          # Run news summarization workflow
     python -m scripts run post-trade    # Run post-trade analysis workflow
     python -m scripts run all           # Run all workflows in sequence
     python -m scripts status            # Show system status
+    python -m scripts instruments       # Show the instrument identity map (--refresh, SYMBOL)
 """
 
 # Load environment variables first
@@ -84,7 +86,9 @@ app.add_typer(run_app, name="run")
 
 
 @run_app.command("intraday")
-def run_intraday():
+def run_intraday(
+    resume: bool = typer.Option(False, "--resume", help="Resume today's last run from its checkpoints"),
+):
     """
     Run the intraday analysis workflow.
 
@@ -111,11 +115,14 @@ def run_intraday():
         from workflows.intraday_cycle import run_intraday_analysis
 
         with console.status("[bold green]Running analysis..."):
-            result = asyncio.run(run_intraday_analysis())
+            result = asyncio.run(run_intraday_analysis(resume=resume))
 
         console.print("\n[bold green]✓ Analysis Complete[/bold green]")
         console.print(f"  Date: {result.get('date')}")
         console.print(f"  Regime: {result.get('regime')}")
+        resumed = (result.get("checkpoints") or {}).get("resumed_steps")
+        if resumed:
+            console.print(f"  Resumed from checkpoint: {', '.join(resumed)}")
 
         picks = result.get('picks', [])
         if picks:
@@ -258,6 +265,69 @@ def run_monitoring():
         raise typer.Exit(1)
 
 
+@run_app.command("tick-monitor")
+def run_tick_monitor(
+    replay: Optional[str] = typer.Option(None, "--replay", help="Replay a recorded tick tape instead of going live"),
+    day: Optional[str] = typer.Option(None, "--date", help="Trades date for --replay (YYYY-MM-DD, default today)"),
+):
+    """
+    Run the tick-driven position monitor.
+
+    Live: checks stop/target/trailing rules on every websocket tick until
+    the monitor end time. With --replay, runs a recorded tick tape through
+    the same rules for the day's open trades (no network, no workflow runs).
+    """
+    if replay:
+        from core.config import get_settings
+        from core.position_rules import PositionRuleEngine, TickTape, replay_ticks
+        from workflows.monitoring import load_open_trades
+        from workflows.tick_monitor import to_fyers_symbol
+
+        settings = get_settings()
+        engine = PositionRuleEngine(
+            trail_percent=settings.MONITOR_TRAIL_PERCENT,
+            trail_activation_r=settings.MONITOR_TRAIL_ACTIVATION_R,
+            material_move_percent=settings.MONITOR_MATERIAL_MOVE_PERCENT,
+        )
+        trades = load_open_trades(day)
+        for t in trades:
+            t["symbol"] = to_fyers_symbol(t["symbol"])
+        engine.sync(trades)
+        events = replay_ticks(engine, TickTape.read(replay))
+
+        table = Table(title=f"Rule events - {engine.ticks:,} ticks, {len(engine)} positions")
+        table.add_column("Time", style="dim")
+        table.add_column("Trade", justify="right")
+        table.add_column("Symbol", style="cyan")
+        table.add_column("Event", style="yellow")
+        table.add_column("Price", justify="right")
+        table.add_column("Level", justify="right")
+        table.add_column("P&L", justify="right")
+        for e in events:
+            table.add_row(
+                datetime.fromtimestamp(e.ts).strftime("%H:%M:%S"), str(e.trade_id), e.symbol,
+                e.event.value, f"{e.price:.2f}", f"{e.level:.2f}", f"{e.unrealized_pnl:,.0f}",
+            )
+        console.print(table)
+        return
+
+    console.print("[bold yellow]Running Tick Monitor[/bold yellow]\n")
+
+    try:
+        from workflows.tick_monitor import run_position_monitor
+
+        result = asyncio.run(run_position_monitor())
+
+        console.print("[green]✓ Tick Monitor Stopped[/green]")
+        console.print(f"  Ticks: {result.get('ticks')}")
+        console.print(f"  Rule Events: {len(result.get('events', []))}")
+        console.print(f"  Workflow Runs: {len(result.get('workflow_runs', []))}")
+
+    except Exception as e:
+        console.print(f"[red]✗ Error: {e}[/red]")
+        raise typer.Exit(1)
+
+
 @run_app.command("news")
 def run_news():
     """
@@ -341,7 +411,7 @@ def run_all(
 
     workflows = [
         ("News Summary", run_news),
-        ("Intraday Analysis", run_intraday),
+        ("Intraday Analysis", lambda: run_intraday(resume=False)),
     ]
 
     if not skip_execution:
@@ -403,6 +473,7 @@ def status():
         ("Workflow DB", settings.WORKFLOW_DB_FILE),
         ("Agent DB", settings.AGENT_DB_FILE),
         ("Trade DB", settings.TRADE_DB_FILE),
+        ("Instrument Map", settings.INSTRUMENT_MAP_FILE),
     ]
     for name, file_path in files_to_check:
         if Path(file_path).exists():
@@ -422,6 +493,45 @@ def status():
         console.print("  [red]✗ Could not check Fyers status[/red]")
 
 
+# ==============================================================================
+# INSTRUMENTS COMMAND
+# ==============================================================================
+
+@app.command("instruments")
+def instruments(
+    symbol: Optional[str] = typer.Argument(None, help="NSE symbol or ISIN to look up"),
+    refresh: bool = typer.Option(False, "--refresh", help="Rebuild from the Fyers symbol master now"),
+):
+    """Show the cross-provider instrument identity map."""
+    from core.instrument_map import get_instrument_map
+
+    imap = get_instrument_map()
+    if refresh:
+        count = asyncio.run(imap.refresh(force=True))
+        console.print(f"[green]✓ Rebuilt instrument map: {count} instruments[/green]")
+
+    if symbol:
+        instrument = imap.get(symbol)
+        if instrument is None:
+            console.print(f"[yellow]{symbol} is not in the instrument map[/yellow]")
+            raise typer.Exit(1)
+        table = Table(title=f"{instrument.symbol} identifiers")
+        table.add_column("Field", style="cyan")
+        table.add_column("Value", style="green")
+        for key, value in instrument.to_dict().items():
+            table.add_row(key, str(value))
+        console.print(table)
+        return
+
+    stats = imap.stats()
+    table = Table(title=f"Instrument map (built {stats['built'] or 'never'})")
+    table.add_column("Provider", style="cyan")
+    table.add_column("Resolved", justify="right", style="green")
+    for provider, count in stats["resolved"].items():
+        table.add_row(provider, f"{count} / {stats['instruments']}")
+    console.print(table)
+
+
 # ==============================================================================
 # MAIN
 # ==============================================================================
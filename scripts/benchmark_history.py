@@ -0,0 +1,149 @@
+"""
+Benchmark the trade/pick history queries over a synthetic year.
+
+Seeds a temporary SQLite database (WAL + composite indexes, same schema as
+hagrid_ai.db) with a year of trades and daily picks, then times:
+
+- Daily summary (SQL aggregates) for a single day
+- Daily breakdown (GROUP BY date) over 7 / 30 / 365 days
+- Pick history as one range query vs. the old one-query-per-day loop
+
+Latency of the single-day and per-window queries should stay flat as the
+table grows, since every query is served from the (date, status) and
+(symbol, date) indexes.
+
+Usage:
+    python -m scripts.benchmark_history
+    python -m scripts.benchmark_history --trades-per-day 40 --repeat 50
+"""
+
+import json
+import random
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+import typer
+from rich.console import Console
+from rich.table import Table
+from sqlmodel import Session, create_engine, select
+
+from core.models import DailyPick, Trade, create_db_and_tables, enable_sqlite_wal
+from api.routes.trades import query_daily_breakdown, query_daily_summary
+
+console = Console()
+
+SYMBOLS = [
+    "NSE:RELIANCE-EQ", "NSE:TCS-EQ", "NSE:HDFCBANK-EQ", "NSE:INFY-EQ",
+    "NSE:ICICIBANK-EQ", "NSE:SBIN-EQ", "NSE:ITC-EQ", "NSE:LT-EQ",
+    "NSE:AXISBANK-EQ", "NSE:MARUTI-EQ",
+]
+
+
+def seed(engine, days: int, trades_per_day: int) -> None:
+    """Insert a synthetic history of trades and daily picks."""
+    rng = random.Random(42)
+    today = date.today()
+    with Session(engine) as db:
+        for i in range(days):
+            day = (today - timedelta(days=i)).isoformat()
+            db.add(DailyPick(
+                date=day,
+                picks_json=json.dumps({"date": day, "picks": rng.sample(SYMBOLS, 5)}),
+                timestamp=f"{day}T09:00:00",
+            ))
+            for _ in range(trades_per_day):
+                entry = rng.uniform(100, 3000)
+                pnl = rng.gauss(50, 500)
+                db.add(Trade(
+                    date=day,
+                    symbol=rng.choice(SYMBOLS),
+                    direction=rng.choice(["LONG", "SHORT"]),
+                    entry_price=entry,
+                    exit_price=entry + pnl / 10,
+                    quantity=10,
+                    entry_time=f"{day}T09:20:00",
+                    exit_time=f"{day}T15:10:00",
+                    stop_loss=entry * 0.99,
+                    take_profit=entry * 1.02,
+                    realized_pnl=pnl,
+                    status=rng.choice(["CLOSED", "CLOSED", "CLOSED", "STOPPED_OUT", "OPEN"]),
+                ))
+        db.commit()
+
+
+def timed(func, repeat: int) -> float:
+    """Median wall time of a callable in milliseconds."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return samples[len(samples) // 2]
+
+
+def main(
+    days: int = typer.Option(365, help="Days of synthetic history"),
+    trades_per_day: int = typer.Option(20, help="Trades per day"),
+    repeat: int = typer.Option(20, help="Repetitions per measurement"),
+):
+    """Seed a synthetic year and time the history queries."""
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = enable_sqlite_wal(create_engine(f"sqlite:///{Path(tmp) / 'bench.db'}"))
+        create_db_and_tables(engine)
+
+        start = time.perf_counter()
+        seed(engine, days, trades_per_day)
+        console.print(
+            f"Seeded {days * trades_per_day:,} trades over {days} days "
+            f"in {time.perf_counter() - start:.1f}s"
+        )
+
+        today = date.today()
+        table = Table(title="History query latency (median)")
+        table.add_column("Query", style="cyan")
+        table.add_column("ms", justify="right", style="green")
+
+        with Session(engine) as db:
+            table.add_row(
+                "daily summary (1 day)",
+                f"{timed(lambda: query_daily_summary(db, today.isoformat()), repeat):.2f}",
+            )
+            for window in (7, 30, days):
+                start_date = (today - timedelta(days=window)).isoformat()
+                table.add_row(
+                    f"daily breakdown ({window}d)",
+                    f"{timed(lambda: query_daily_breakdown(db, start_date), repeat):.2f}",
+                )
+            table.add_row(
+                "symbol breakdown (30d)",
+                f"{timed(lambda: query_daily_breakdown(db, (today - timedelta(days=30)).isoformat(), symbol=SYMBOLS[0]), repeat):.2f}",
+            )
+
+            for window in (7, 30):
+                start_date = (today - timedelta(days=window - 1)).isoformat()
+
+                def range_query():
+                    statement = select(DailyPick).where(DailyPick.date >= start_date)
+                    return [json.loads(p.picks_json) for p in db.exec(statement).all()]
+
+                def per_day_loop():
+                    history = []
+                    for i in range(window):
+                        day = (today - timedelta(days=i)).isoformat()
+                        pick = db.exec(select(DailyPick).where(DailyPick.date == day)).first()
+                        if pick:
+                            history.append(json.loads(pick.picks_json))
+                    return history
+
+                table.add_row(f"pick history range ({window}d)", f"{timed(range_query, repeat):.2f}")
+                table.add_row(f"pick history per-day loop ({window}d)", f"{timed(per_day_loop, repeat):.2f}")
+
+        console.print(table)
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    typer.run(main)
@@ -0,0 +1,141 @@
+"""
+Measure the per-log-call cost on the calling thread.
+
+Compares the previous synchronous setup (StreamHandler + FileHandler on
+the ``hagrid`` logger) with the queue pipeline from core.logging_setup:
+
+- info: one INFO record from the ``hagrid`` logger
+- tick: one INFO record from the throttled websocket logger
+  (``fyers.websocket.data``), as emitted per tick
+- exception: one ERROR record with a traceback
+
+The console stream goes to os.devnull and the file to a temp directory,
+so the numbers are handler cost, not terminal rendering. Calls run in
+bursts with the queue drained in between; queue numbers exclude the
+listener thread's writes, which happen off the hot path.
+
+Usage:
+    python -m scripts.benchmark_logging
+    python -m scripts.benchmark_logging --calls 50000
+"""
+
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict
+
+import typer
+from rich.console import Console
+from rich.table import Table
+
+from core.logging_setup import CONSOLE_FORMAT, DATE_FORMAT, setup_logging, shutdown_logging
+
+console = Console()
+
+
+def sync_setup(log_file: Path) -> logging.Logger:
+    """The previous setup_logging handlers: console + plain file, on the calling thread."""
+    logger = logging.getLogger("hagrid")
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    logger.handlers.clear()
+    formatter = logging.Formatter(CONSOLE_FORMAT, datefmt=DATE_FORMAT)
+    for handler in (logging.StreamHandler(), logging.FileHandler(log_file, encoding="utf-8")):
+        handler.setFormatter(formatter)
+        logger.addHandler(handler)
+    tick = logging.getLogger("fyers.websocket.data")
+    tick.setLevel(logging.INFO)
+    tick.propagate = False
+    tick.handlers = list(logger.handlers)
+    return logger
+
+
+def calls(logger: logging.Logger) -> Dict[str, Callable[[int], None]]:
+    tick = logging.getLogger("fyers.websocket.data")
+
+    def info(i: int) -> None:
+        logger.info("Step %s finished in %.1f ms", "market_scan", i * 0.1)
+
+    def tick_update(i: int) -> None:
+        tick.info("Data update: %s LTP=%s", "NSE:RELIANCE-EQ", 2500 + i % 50)
+
+    def exception(i: int) -> None:
+        try:
+            raise ValueError(f"bad payload {i}")
+        except ValueError:
+            logger.exception("Tool call failed")
+
+    return {"info": info, "tick": tick_update, "exception": exception}
+
+
+def measure(fn: Callable[[int], None], logger: logging.Logger, n: int, burst: int = 100) -> Dict[str, float]:
+    """
+    Per-call microseconds on the calling thread, in bursts.
+
+    Agents and tick handlers log in bursts between I/O waits; between
+    bursts the queue is left to drain, so the listener's writes are not
+    counted against (or contending with) the calling thread.
+    """
+    log_queue = next((h.queue for h in logging.getLogger().handlers + logger.handlers if hasattr(h, "queue")), None)
+    per_call = []
+    for start in range(0, n, burst):
+        t0 = time.perf_counter()
+        for i in range(start, start + burst):
+            fn(i)
+        per_call.append((time.perf_counter() - t0) / burst * 1e6)
+        while log_queue is not None and not log_queue.empty():
+            time.sleep(0.0005)
+    per_call.sort()
+    return {
+        "median_us": statistics.median(per_call),
+        "p95_us": per_call[int(len(per_call) * 0.95) - 1],
+    }
+
+
+def main(
+    calls_per_case: int = typer.Option(20000, "--calls", help="Log calls per case"),
+    burst: int = typer.Option(100, help="Calls per burst"),
+):
+    """Benchmark per-call logging cost: synchronous handlers vs the queue pipeline."""
+    results: Dict[str, Dict[str, Dict[str, float]]] = {}
+    stderr = sys.stderr
+    with tempfile.TemporaryDirectory() as tmp, open(os.devnull, "w") as devnull:
+        sys.stderr = devnull  # StreamHandler() binds sys.stderr at creation
+        try:
+            logger = sync_setup(Path(tmp) / "sync.log")
+            results["sync"] = {name: measure(fn, logger, calls_per_case, burst) for name, fn in calls(logger).items()}
+            for handler in logger.handlers:
+                handler.close()
+
+            logger = setup_logging(log_level="INFO", log_file=str(Path(tmp) / "queue.log"))
+            results["queue"] = {name: measure(fn, logger, calls_per_case, burst) for name, fn in calls(logger).items()}
+            shutdown_logging()
+        finally:
+            sys.stderr = stderr
+
+    table = Table(title=f"Per-call cost on the calling thread ({calls_per_case:,} calls, bursts of {burst})")
+    table.add_column("Call", style="cyan")
+    table.add_column("sync median (us)", justify="right")
+    table.add_column("sync p95 (us)", justify="right")
+    table.add_column("queue median (us)", justify="right", style="green")
+    table.add_column("queue p95 (us)", justify="right")
+    table.add_column("Speedup", justify="right")
+    for name in results["sync"]:
+        before, after = results["sync"][name], results["queue"][name]
+        table.add_row(
+            name,
+            f"{before['median_us']:.2f}",
+            f"{before['p95_us']:.2f}",
+            f"{after['median_us']:.2f}",
+            f"{after['p95_us']:.2f}",
+            f"{before['median_us'] / after['median_us']:.1f}x",
+        )
+    console.print(table)
+
+
+if __name__ == "__main__":
+    typer.run(main)
@@ -0,0 +1,285 @@
+"""
+Offline benchmark of the NSE / Fyers hot paths.
+
+Runs the real clients against a replay transport (core.http_replay), so
+no network access or Fyers login is needed - suitable for CI:
+
+- option chain parse: NSE contract info + option-chain-v3 -> OptionChainResponse
+- history sweep: Fyers daily history for every NIFTY 100 symbol (concurrent)
+- correlation build: CorrelationToolkit's full NIFTY 100 matrix computation
+- symbol master load: Fyers NSE_CM symbol master JSON -> indexed SymbolMaster
+
+By default a seeded synthetic cassette is generated. To benchmark real
+payloads, record a cassette once with network access and a Fyers token
+(``--record``), then replay it anywhere with ``--cassette``. Replay latency
+and error injection are configurable; with ``--latency-scale`` the recorded
+per-request latency is replayed.
+
+Usage:
+    python -m scripts.benchmark_offline
+    python -m scripts.benchmark_offline --latency-ms 40 --error-rate 0.02
+    python -m scripts.benchmark_offline --record .hagrid/cassettes/hot_paths.json
+    python -m scripts.benchmark_offline --cassette .hagrid/cassettes/hot_paths.json --latency-scale 1.0
+"""
+
+import asyncio
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Awaitable, Callable, List, Optional
+
+import numpy as np
+import typer
+from rich.console import Console
+from rich.table import Table
+
+from broker.fyers.client import FyersClient
+from broker.fyers.core.rate_limiter import RateLimiter
+from broker.fyers.data.symbol_master import ExchangeSegment, SymbolMaster
+from broker.fyers.models.config import FyersConfig
+from broker.fyers.models.rate_limit import RateLimitConfig
+from core.http_replay import Cassette, ReplayConfig, recording, replaying
+from tools.nse_india.client import NSEIndiaClient
+
+console = Console()
+
+SEED = 11
+NSE = "https://www.nseindia.com"
+FYERS_DATA = "https://api-t1.fyers.in/data"
+OPTION_SYMBOL = "NIFTY"
+INDEX_NAME = "NIFTY 100"
+
+
+# ==================== Synthetic cassette ====================
+
+
+def build_cassette(path: Path, symbols: int = 100, strikes: int = 80, bars: int = 130,
+                   master_size: int = 2500) -> Cassette:
+    """Seeded cassette with realistic payload shapes and sizes."""
+    rng = np.random.default_rng(SEED)
+    cassette = Cassette(path)
+    names = [f"STOCK{i:03d}" for i in range(symbols)]
+    expiry = "30-Jan-2025"
+
+    cassette.add_json("GET", f"{NSE}/", "<html>nse</html>", elapsed_ms=120)
+
+    cassette.add_json(
+        "GET", f"{NSE}/api/option-chain-contract-info?symbol={OPTION_SYMBOL}",
+        {"expiryDates": [expiry, "06-Feb-2025", "27-Feb-2025"],
+         "strikePrice": [str(22000 + 50 * k) for k in range(strikes)]},
+        elapsed_ms=180,
+    )
+    spot = 24000.0
+    rows = []
+    for k in range(strikes):
+        strike = 22000 + 50 * k
+        row = {"expiryDates": expiry, "strikePrice": strike}
+        for side in ("CE", "PE"):
+            row[side] = {
+                "strikePrice": strike, "expiryDate": expiry, "underlying": OPTION_SYMBOL,
+                "identifier": f"OPTIDX{OPTION_SYMBOL}{expiry}{side}{strike}.00",
+                "openInterest": int(rng.integers(100, 200_000)),
+                "changeinOpenInterest": int(rng.integers(-20_000, 20_000)),
+                "pchangeinOpenInterest": float(rng.normal(0, 15)),
+                "totalTradedVolume": int(rng.integers(0, 5_000_000)),
+                "impliedVolatility": float(rng.uniform(8, 30)),
+                "lastPrice": float(max(0.05, (spot - strike if side == "CE" else strike - spot) + rng.normal(120, 40))),
+                "change": float(rng.normal(0, 20)), "pchange": float(rng.normal(0, 10)),
+                "totalBuyQuantity": int(rng.integers(0, 1_000_000)),
+                "totalSellQuantity": int(rng.integers(0, 1_000_000)),
+                "buyPrice1": 0, "buyQuantity1": 75, "sellPrice1": 0, "sellQuantity1": 75,
+                "underlyingValue": spot,
+            }
+        rows.append(row)
+    cassette.add_json(
+        "GET", f"{NSE}/api/option-chain-v3?type=Index&symbol={OPTION_SYMBOL}&expiry={expiry}",
+        {"records": {"timestamp": "02-Jan-2025 15:30:00", "underlyingValue": spot, "data": rows}},
+        elapsed_ms=450,
+    )
+
+    cassette.add_json(
+        "GET", f"{NSE}/api/equity-stockIndices?index={INDEX_NAME.replace(' ', '%20')}",
+        {"name": INDEX_NAME, "timestamp": "02-Jan-2025 15:30:00", "advance": {"advances": "60", "declines": "40"},
+         "data": [{"priority": 0, "symbol": n, "identifier": f"{n}EQN", "series": "EQ",
+                   "lastPrice": float(rng.uniform(100, 5000))} for n in names]},
+        elapsed_ms=300,
+    )
+
+    market = rng.normal(0, 0.009, bars)
+    start = 1_725_000_000
+    for n in names:
+        close = rng.uniform(100, 5000) * np.exp(np.cumsum(market + rng.normal(0, 0.012, bars)))
+        candles = [
+            [start + d * 86400, round(float(c * 0.998), 2), round(float(c * 1.01), 2),
+             round(float(c * 0.99), 2), round(float(c), 2), int(rng.integers(10_000, 5_000_000))]
+            for d, c in enumerate(close)
+        ]
+        # Other date ranges fall back to the same symbol via loose matching
+        cassette.add_json(
+            "GET", f"{FYERS_DATA}/history?symbol=NSE:{n}-EQ&resolution=D&date_format=1&cont_flag=0"
+                   f"&range_from=2024-09-01&range_to=2025-01-02",
+            {"s": "ok", "candles": candles}, elapsed_ms=float(rng.uniform(80, 250)),
+        )
+
+    master = {}
+    for i in range(master_size):
+        ticker = f"NSE:SYM{i:05d}-EQ"
+        master[ticker] = {
+            "fyToken": f"1010000000{i:05d}", "symTicker": ticker, "symDetails": f"Symbol {i} Ltd",
+            "exchange": 10, "segment": 10, "exSymbol": f"SYM{i:05d}", "exToken": i,
+            "isin": f"INE{i:06d}01", "minLotSize": 1, "tickSize": 0.05,
+            "tradingSession": "0915-1530|1815-1915:", "lastUpdate": "2025-01-02",
+        }
+    cassette.add_json("GET", ExchangeSegment.JSON_URLS[ExchangeSegment.NSE_CM], master, elapsed_ms=900)
+    return cassette
+
+
+# ==================== Hot paths ====================
+
+
+def make_fyers_client() -> FyersClient:
+    """Fyers client with an effectively unlimited local rate limiter (replay only)."""
+    limiter = RateLimiter(config=RateLimitConfig(
+        requests_per_second=100_000, requests_per_minute=10_000_000, requests_per_day=100_000_000,
+    ))
+    return FyersClient(FyersConfig(client_id="REPLAY-100", secret_key="replay"), rate_limiter=limiter)
+
+
+class HotPaths:
+    """The benchmarked operations, using the real clients."""
+
+    def __init__(self, workdir: Path, fyers: FyersClient):
+        self.nse = NSEIndiaClient(
+            cache_enabled=False,
+            db_path=workdir / "announcements.db",
+            attachments_dir=workdir / "attachments",
+        )
+        self.fyers = fyers
+        self.symbols: List[str] = []
+
+    async def option_chain_parse(self) -> int:
+        info = self.nse.get_option_contract_info(OPTION_SYMBOL)
+        chain = self.nse.get_option_chain(OPTION_SYMBOL, info.expiry_dates[0], "Index")
+        return len(chain.data)
+
+    async def history_sweep(self) -> int:
+        if not self.symbols:
+            self.symbols = [f"NSE:{s.symbol}-EQ" for s in self.nse.get_index_constituents(INDEX_NAME).data]
+        responses = await asyncio.gather(*[
+            self.fyers.get_history(symbol=s, resolution="D", date_format=1,
+                                   range_from="2024-09-01", range_to="2025-01-02")
+            for s in self.symbols
+        ], return_exceptions=True)
+        # Per-symbol failures (e.g. injected errors) are tolerated, as in the real sweeps
+        return sum(len(r.candles or []) for r in responses if not isinstance(r, BaseException))
+
+    async def correlation_build(self) -> int:
+        from tools.correlation.toolkit import CorrelationToolkit
+
+        toolkit = CorrelationToolkit(fyers_client=self.fyers, nse_client=self.nse)
+        result = await toolkit._compute_correlation_matrix()
+        if "error" in result:
+            raise RuntimeError(result["error"])
+        return result["total_symbols"]
+
+    async def symbol_master_load(self) -> int:
+        master = SymbolMaster(enable_cache=False)
+        return await master.load_segment(ExchangeSegment.NSE_CM, use_json=True)
+
+
+async def time_path(fn: Callable[[], Awaitable[int]], repeat: int) -> dict:
+    durations, items, errors = [], 0, 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        try:
+            items = await fn()
+        except Exception as e:
+            errors += 1
+            console.print(f"[yellow]{fn.__name__}: {type(e).__name__}: {e}[/yellow]")
+            continue
+        durations.append(time.perf_counter() - started)
+    durations.sort()
+    return {
+        "runs": len(durations),
+        "errors": errors,
+        "items": items,
+        "p50_ms": statistics.median(durations) * 1000 if durations else 0.0,
+        "p95_ms": durations[min(len(durations) - 1, int(0.95 * len(durations)))] * 1000 if durations else 0.0,
+        "min_ms": durations[0] * 1000 if durations else 0.0,
+    }
+
+
+async def run_paths(paths: HotPaths, repeat: int, only: Optional[List[str]]) -> dict:
+    await paths.fyers.set_access_token("replay-token")
+    selected = [
+        paths.option_chain_parse,
+        paths.history_sweep,
+        paths.correlation_build,
+        paths.symbol_master_load,
+    ]
+    results = {}
+    for fn in selected:
+        if only and fn.__name__ not in only:
+            continue
+        results[fn.__name__] = await time_path(fn, repeat)
+    return results
+
+
+def main(
+    cassette: Optional[Path] = typer.Option(None, help="Replay this cassette instead of the synthetic one"),
+    record: Optional[Path] = typer.Option(None, help="Run the hot paths live and record them to this cassette"),
+    repeat: int = typer.Option(5, help="Runs per hot path"),
+    latency_ms: float = typer.Option(0.0, help="Fixed replay latency per request"),
+    latency_scale: Optional[float] = typer.Option(None, help="Replay recorded latency x this factor"),
+    jitter_ms: float = typer.Option(0.0, help="Uniform latency jitter"),
+    error_rate: float = typer.Option(0.0, help="Fraction of replayed requests that fail"),
+    error_status: int = typer.Option(503, help="Status for injected errors (0 = connection error)"),
+    only: Optional[List[str]] = typer.Option(None, help="Run only these hot paths"),
+):
+    """Benchmark the NSE / Fyers hot paths against recorded or synthetic traffic."""
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+
+        if record:
+            from core.fyers_client import ensure_authenticated
+
+            with recording(record):
+                fyers = asyncio.run(ensure_authenticated())
+                results = asyncio.run(run_paths(HotPaths(workdir, fyers), 1, only))
+            console.print(f"[green]Recorded cassette: {record}[/green]")
+            mode = "live (recording)"
+        else:
+            source = Cassette(cassette) if cassette else build_cassette(workdir / "synthetic.json")
+            if not len(source):
+                raise typer.BadParameter(f"Cassette {cassette} is missing or empty")
+            config = ReplayConfig(
+                latency_ms=latency_ms, latency_scale=latency_scale, jitter_ms=jitter_ms,
+                error_rate=error_rate, error_status=error_status,
+            )
+            with replaying(source, config):
+                results = asyncio.run(run_paths(HotPaths(workdir, make_fyers_client()), repeat, only))
+            mode = f"replay ({cassette or 'synthetic'}), served={config.stats['served']}, " \
+                   f"missing={config.stats['missing']}, injected={config.stats['injected_errors']}"
+
+    table = Table(title=f"Hot paths - {mode}")
+    table.add_column("Hot path", style="cyan")
+    table.add_column("Items", justify="right")
+    table.add_column("Runs", justify="right")
+    table.add_column("Errors", justify="right")
+    table.add_column("p50 (ms)", justify="right", style="green")
+    table.add_column("p95 (ms)", justify="right")
+    table.add_column("min (ms)", justify="right")
+    for name, r in results.items():
+        table.add_row(
+            name, f"{r['items']:,}", str(r["runs"]), str(r["errors"]),
+            f"{r['p50_ms']:.1f}", f"{r['p95_ms']:.1f}", f"{r['min_ms']:.1f}",
+        )
+    console.print(table)
+
+    if any(r["runs"] == 0 for r in results.values()) and not error_rate:
+        raise typer.Exit(1)
+
+
+if __name__ == "__main__":
+    typer.run(main)
@@ -0,0 +1,210 @@
+"""
+Benchmark NSE option chain parsing and analytics on a 200-strike NIFTY chain.
+
+"Before" reproduces the previous OptionChainResponse: every strike
+validated into a pydantic OptionChainStrike up front, and totals, PCR,
+max OI strikes and ATM recomputed by walking the list on every access,
+with linear strike lookups. "After" is the columnar OptionChainResponse
+(numpy columns, aggregates computed once, binary-search lookups, strike
+models validated on demand).
+
+The workload mirrors a typical analysis pass: parse, then read PCR,
+totals, max OI strikes, ATM data, strikes near ATM and a handful of
+strike lookups.
+
+Usage:
+    python -m scripts.benchmark_option_chain
+    python -m scripts.benchmark_option_chain --strikes 400 --repeat 500
+"""
+
+import statistics
+import time
+
+import numpy as np
+import typer
+from rich.console import Console
+from rich.table import Table
+
+from tools.nse_india.models.option_chain import OptionChainResponse, OptionChainStrike
+
+console = Console()
+
+SEED = 7
+EXPIRY = "30-Jan-2025"
+
+
+# ==================== Fixture ====================
+
+
+def fixture_chain(strikes: int) -> dict:
+    """Raw option-chain-v3 payload for NIFTY with ``strikes`` strikes."""
+    rng = np.random.default_rng(SEED)
+    spot = 24013.35
+    first = 24000 - 50 * (strikes // 2)
+    rows = []
+    for k in range(strikes):
+        strike = first + 50 * k
+        row = {"expiryDates": EXPIRY, "strikePrice": strike}
+        for side in ("CE", "PE"):
+            intrinsic = max(0.0, spot - strike) if side == "CE" else max(0.0, strike - spot)
+            row[side] = {
+                "strikePrice": strike, "expiryDate": EXPIRY, "underlying": "NIFTY",
+                "identifier": f"OPTIDXNIFTY{EXPIRY}{side}{strike}.00",
+                "openInterest": int(rng.integers(0, 200_000)),
+                "changeinOpenInterest": int(rng.integers(-20_000, 20_000)),
+                "pchangeinOpenInterest": float(rng.normal(0, 15)),
+                "totalTradedVolume": int(rng.integers(0, 5_000_000)),
+                "impliedVolatility": float(rng.uniform(8, 30)),
+                "lastPrice": round(intrinsic + float(rng.uniform(1, 150)), 2),
+                "change": float(rng.normal(0, 20)), "pchange": float(rng.normal(0, 10)),
+                "totalBuyQuantity": int(rng.integers(0, 1_000_000)),
+                "totalSellQuantity": int(rng.integers(0, 1_000_000)),
+                "buyPrice1": 0, "buyQuantity1": 75, "sellPrice1": 0, "sellQuantity1": 75,
+                "underlyingValue": spot,
+            }
+        rows.append(row)
+    return {"records": {"timestamp": "02-Jan-2025 15:30:00", "underlyingValue": spot, "data": rows}}
+
+
+# ==================== Before: per-strike pydantic, recomputed aggregates ====================
+
+
+class LegacyChain:
+    """The previous OptionChainResponse behaviour."""
+
+    def __init__(self, payload: dict):
+        records = payload["records"]
+        self.underlying_value = records["underlyingValue"]
+        self.data = []
+        for item in records["data"]:
+            try:
+                self.data.append(OptionChainStrike.model_validate(item))
+            except Exception:
+                continue
+
+    @property
+    def total_ce_oi(self) -> int:
+        return sum(s.ce_oi for s in self.data)
+
+    @property
+    def total_pe_oi(self) -> int:
+        return sum(s.pe_oi for s in self.data)
+
+    @property
+    def pcr(self) -> float:
+        if self.total_ce_oi > 0:
+            return self.total_pe_oi / self.total_ce_oi
+        return 0
+
+    def _max_oi(self, attr: str) -> tuple:
+        max_oi, max_strike = 0, 0
+        for s in self.data:
+            if getattr(s, attr) > max_oi:
+                max_oi, max_strike = getattr(s, attr), s.strike_price
+        return (max_strike, max_oi)
+
+    @property
+    def max_ce_oi_strike(self) -> tuple:
+        return self._max_oi("ce_oi")
+
+    @property
+    def max_pe_oi_strike(self) -> tuple:
+        return self._max_oi("pe_oi")
+
+    @property
+    def atm_strike(self) -> float:
+        valid = [s.strike_price for s in self.data if s.strike_price > 0]
+        return min(valid, key=lambda x: abs(x - self.underlying_value)) if valid else 0
+
+    def get_strike_data(self, strike: float):
+        for s in self.data:
+            if s.strike_price == strike:
+                return s
+        return None
+
+    def get_atm_data(self):
+        return self.get_strike_data(self.atm_strike)
+
+    def get_strikes_near_atm(self, num_strikes: int = 5) -> list:
+        atm = self.atm_strike
+        sorted_data = sorted(self.data, key=lambda x: x.strike_price)
+        atm_idx = next(i for i, s in enumerate(sorted_data) if s.strike_price == atm)
+        return sorted_data[max(0, atm_idx - num_strikes):atm_idx + num_strikes + 1]
+
+
+def columnar_chain(payload: dict) -> OptionChainResponse:
+    records = payload["records"]
+    return OptionChainResponse.from_records(records["timestamp"], records["underlyingValue"], records["data"])
+
+
+# ==================== Workload ====================
+
+
+def analysis_pass(chain, lookups: list) -> tuple:
+    """The reads an options analysis makes after fetching a chain."""
+    atm = chain.get_atm_data()
+    near = chain.get_strikes_near_atm(10)
+    found = sum(chain.get_strike_data(s) is not None for s in lookups)
+    return (
+        round(chain.pcr, 6), chain.total_ce_oi, chain.total_pe_oi,
+        chain.max_ce_oi_strike, chain.max_pe_oi_strike, chain.atm_strike,
+        atm.ce.last_price if atm and atm.ce else 0, len(near), found,
+    )
+
+
+def time_it(fn, repeat: int) -> list:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1e6)
+    return samples
+
+
+def main(
+    strikes: int = typer.Option(200, help="Strikes in the chain"),
+    repeat: int = typer.Option(200, help="Timed repetitions per case"),
+    lookups: int = typer.Option(20, help="Strike lookups per analysis pass"),
+):
+    """Compare the previous and columnar option chain models."""
+    payload = fixture_chain(strikes)
+    rng = np.random.default_rng(SEED + 1)
+    strike_list = [row["strikePrice"] for row in payload["records"]["data"]]
+    lookup_strikes = [float(s) for s in rng.choice(strike_list, size=lookups)]
+
+    legacy, columnar = LegacyChain(payload), columnar_chain(payload)
+    if analysis_pass(legacy, lookup_strikes) != analysis_pass(columnar, lookup_strikes):
+        console.print("[red]Results differ between the legacy and columnar chains[/red]")
+        raise typer.Exit(1)
+
+    cases = [
+        ("parse", lambda: LegacyChain(payload), lambda: columnar_chain(payload)),
+        ("analysis pass (parsed)", lambda: analysis_pass(legacy, lookup_strikes),
+         lambda: analysis_pass(columnar, lookup_strikes)),
+        ("parse + analysis", lambda: analysis_pass(LegacyChain(payload), lookup_strikes),
+         lambda: analysis_pass(columnar_chain(payload), lookup_strikes)),
+    ]
+
+    table = Table(title=f"NIFTY option chain - {strikes} strikes, {lookups} lookups, {repeat} runs")
+    table.add_column("Case", style="cyan")
+    table.add_column("Before p50 (µs)", justify="right")
+    table.add_column("After p50 (µs)", justify="right", style="green")
+    table.add_column("Before p95 (µs)", justify="right")
+    table.add_column("After p95 (µs)", justify="right", style="green")
+    table.add_column("Speedup", justify="right", style="bold")
+
+    for name, before_fn, after_fn in cases:
+        before = sorted(time_it(before_fn, repeat))
+        after = sorted(time_it(after_fn, repeat))
+        p95 = min(repeat - 1, int(0.95 * repeat))
+        b50, a50 = statistics.median(before), statistics.median(after)
+        table.add_row(
+            name, f"{b50:,.0f}", f"{a50:,.0f}", f"{before[p95]:,.0f}", f"{after[p95]:,.0f}",
+            f"{b50 / a50:.1f}x" if a50 else "-",
+        )
+
+    console.print(table)
+
+
+if __name__ == "__main__":
+    typer.run(main)
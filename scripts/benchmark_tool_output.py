@@ -0,0 +1,269 @@
+"""
+Measure toolkit output size before and after compact serialization.
+
+Uses a fixed, seeded fixture set shaped like real tool results:
+- Fyers 200-bar daily history
+- Fyers option chain (NIFTY, 25 strikes each side) and option Greeks
+- Fyers technical indicators
+- NIFTY100 correlation matrix (CorrelationToolkit)
+- 50 NSE equity announcements
+
+"Before" reproduces the previous string building (full precision CSV,
+indent=2 JSON, full matrix). "After" runs the same data through the
+toolkits' current column specs and core.output_format, including the
+per-call token budget.
+
+Usage:
+    python -m scripts.benchmark_tool_output
+    python -m scripts.benchmark_tool_output --max-tokens 2000
+"""
+
+import csv
+import json
+from io import StringIO
+
+import numpy as np
+import typer
+from rich.console import Console
+from rich.table import Table
+
+from broker.fyers.toolkit import FyersToolkit
+from core.output_format import (
+    DEFAULT_MAX_TOKENS,
+    compact_json,
+    enforce_budget,
+    estimate_tokens,
+    format_table,
+    shape_csv,
+)
+from tools.correlation.toolkit import correlation_matrix_view
+
+console = Console()
+
+SEED = 7
+
+
+# ==================== Fixtures ====================
+
+
+def fixture_candles(rng: np.random.Generator, bars: int = 200) -> list:
+    close = 24000 * np.exp(np.cumsum(rng.normal(0, 0.01, bars)))
+    start = 1_700_000_000
+    return [
+        [start + i * 86400, float(c * (1 + rng.normal(0, 0.002))), float(c * 1.006),
+         float(c * 0.994), float(c), int(rng.integers(1e5, 1e7))]
+        for i, c in enumerate(close)
+    ]
+
+
+def fixture_option_chain(rng: np.random.Generator, strikes: int = 25) -> list:
+    atm = 24000
+    rows = []
+    for k in range(-strikes, strikes + 1):
+        strike = atm + 50 * k
+        for opt_type in ("CE", "PE"):
+            ltp = max(0.05, float(rng.normal(150, 60)) - (k if opt_type == "CE" else -k) * 4.7)
+            rows.append({
+                "symbol": f"NSE:NIFTY25JAN{strike}{opt_type}",
+                "strike_price": strike,
+                "option_type": opt_type,
+                "ltp": ltp,
+                "oi": int(rng.integers(1e4, 5e6)),
+                "volume": int(rng.integers(1e3, 1e7)),
+                "iv": float(rng.uniform(9, 25)),
+                "ch": float(rng.normal(0, 12)),
+                "chp": float(rng.normal(0, 8)),
+            })
+    return rows
+
+
+def fixture_greeks(chain: list, rng: np.random.Generator) -> list:
+    return [
+        {
+            "symbol": row["symbol"],
+            "strike": row["strike_price"],
+            "option_type": row["option_type"],
+            "time_to_expiry_days": 3.270833333333,
+            "ltp": row["ltp"],
+            "iv": row["iv"],
+            "delta": float(rng.uniform(-1, 1)),
+            "gamma": float(rng.uniform(0, 0.002)),
+            "theta": float(rng.normal(-8, 3)),
+            "vega": float(rng.uniform(0, 15)),
+            "rho": float(rng.uniform(-3, 3)),
+            "oi": row["oi"],
+            "volume": row["volume"],
+        }
+        for row in chain
+    ]
+
+
+def fixture_indicators(rng: np.random.Generator) -> dict:
+    keys = [
+        "current_price", "prev_close", "sma_20", "sma_50", "ema_12", "ema_26", "macd",
+        "macd_signal", "macd_histogram", "rsi_14", "bb_upper", "bb_middle", "bb_lower",
+        "atr_14", "recent_high", "recent_low",
+    ]
+    data = {k: float(rng.normal(24000, 300)) for k in keys}
+    data["symbol"] = "NSE:NIFTY50-INDEX"
+    return data
+
+
+def fixture_correlation(rng: np.random.Generator, n: int = 100) -> dict:
+    returns = rng.normal(0, 0.01, (100, n)) + rng.normal(0, 0.01, (100, 1))
+    corr = np.corrcoef(returns, rowvar=False)
+    symbols = [f"NSE:STOCK{i:03d}-EQ" for i in range(n)]
+    return {
+        "correlation_matrix": {
+            a: {b: float(corr[i, j]) for j, b in enumerate(symbols)} for i, a in enumerate(symbols)
+        },
+        "symbols": symbols,
+        "data_points": 99,
+        "computed_at": "2025-01-02T08:30:00",
+        "failed_symbols": [],
+        "total_symbols": n,
+        "source": "cache",
+    }
+
+
+def fixture_announcements(rng: np.random.Generator, count: int = 50) -> list:
+    words = "company board meeting outcome results dividend approved allotment intimation regulation".split()
+    return [
+        {
+            "symbol": f"STOCK{i:03d}",
+            "company_name": f"Stock {i:03d} Industries Limited",
+            "subject": "Outcome of Board Meeting",
+            "details": " ".join(rng.choice(words, size=int(rng.integers(20, 80)))),
+            "broadcast_datetime": "2025-01-02 09:15:00",
+            "attachment_url": f"https://nsearchives.nseindia.com/corporate/STOCK{i:03d}_02012025091500_outcome.pdf",
+        }
+        for i in range(count)
+    ]
+
+
+# ==================== Previous formatting ====================
+
+
+def before_history(candles: list) -> str:
+    lines = ["TIMESTAMP,OPEN,HIGH,LOW,CLOSE,VOLUME"]
+    for c in candles:
+        lines.append(f"{c[0]},{c[1]},{c[2]},{c[3]},{c[4]},{c[5]}")
+    return "\n".join(lines)
+
+
+def before_option_chain(chain: list) -> str:
+    lines = ["SYMBOL,STRIKE,TYPE,LTP,OI,VOLUME,IV,CHANGE,CHANGE_PCT"]
+    for o in chain:
+        lines.append(
+            f"{o['symbol']},{o['strike_price']},{o['option_type']},{o['ltp']},"
+            f"{o['oi']},{o['volume']},{o['iv']},{o['ch']},{o['chp']}"
+        )
+    return "\n".join(lines)
+
+
+def before_greeks(greeks: list) -> str:
+    lines = ["SYMBOL,STRIKE,TYPE,EXPIRY_DAYS,LTP,IV,DELTA,GAMMA,THETA,VEGA,RHO,OI,VOLUME"]
+    for o in greeks:
+        lines.append(
+            f"{o['symbol']},{o['strike']},{o['option_type']},{o['time_to_expiry_days']},"
+            f"{o['ltp']},{o['iv']},{o['delta']},{o['gamma']},{o['theta']},{o['vega']},{o['rho']},"
+            f"{o['oi']},{o['volume']}"
+        )
+    return "\n".join(lines)
+
+
+def before_announcements(rows: list) -> str:
+    output = StringIO()
+    fieldnames = ["symbol", "company_name", "subject", "details", "broadcast_datetime", "attachment_url"]
+    writer = csv.DictWriter(output, fieldnames=fieldnames)
+    writer.writeheader()
+    for row in rows:
+        details = row["details"]
+        writer.writerow({**row, "details": details[:200] + "..." if len(details) > 200 else details})
+    return output.getvalue()
+
+
+def main(
+    max_tokens: int = typer.Option(DEFAULT_MAX_TOKENS, help="Per-call token budget"),
+    history_rows: int = typer.Option(100, help="Candles kept before sampling"),
+):
+    """Print before/after output size for each fixture."""
+    rng = np.random.default_rng(SEED)
+    candles = fixture_candles(rng)
+    chain = fixture_option_chain(rng)
+    greeks = fixture_greeks(chain, rng)
+    indicators = fixture_indicators(rng)
+    correlation = fixture_correlation(rng)
+    announcements = fixture_announcements(rng)
+
+    cases = [
+        (
+            "fyers get_historical_data (200 bars)",
+            before_history(candles),
+            shape_csv(
+                format_table(candles, FyersToolkit.HISTORY_COLUMNS),
+                max_rows=history_rows,
+                summary_column="CLOSE",
+            ),
+        ),
+        (
+            "fyers get_option_chain (102 rows)",
+            before_option_chain(chain),
+            format_table(chain, FyersToolkit.OPTION_CHAIN_COLUMNS),
+        ),
+        (
+            "fyers get_option_greeks (102 rows)",
+            before_greeks(greeks),
+            format_table(greeks, FyersToolkit.OPTION_GREEKS_COLUMNS),
+        ),
+        (
+            "fyers get_technical_indicators",
+            json.dumps(indicators, indent=2),
+            compact_json(indicators),
+        ),
+        (
+            "correlation NIFTY100 matrix",
+            json.dumps(correlation, indent=2),
+            correlation_matrix_view(correlation),
+        ),
+        (
+            "nse equity announcements (50)",
+            before_announcements(announcements),
+            format_table(
+                announcements,
+                ["symbol", "company_name", "subject", "details", "broadcast_datetime", "attachment_url"],
+                max_text=200,
+            ),
+        ),
+    ]
+
+    table = Table(title=f"Tool output size (budget {max_tokens} tokens/call)")
+    table.add_column("Fixture", style="cyan")
+    table.add_column("Before (chars)", justify="right")
+    table.add_column("Before (~tokens)", justify="right")
+    table.add_column("After (chars)", justify="right", style="green")
+    table.add_column("After (~tokens)", justify="right", style="green")
+    table.add_column("Reduction", justify="right", style="bold")
+
+    total_before = total_after = 0
+    for name, before, after in cases:
+        after = enforce_budget(after, max_tokens)
+        total_before += len(before)
+        total_after += len(after)
+        table.add_row(
+            name,
+            f"{len(before):,}",
+            f"{estimate_tokens(before):,}",
+            f"{len(after):,}",
+            f"{estimate_tokens(after):,}",
+            f"{1 - len(after) / len(before):.0%}",
+        )
+    table.add_row(
+        "TOTAL", f"{total_before:,}", f"{total_before // 4:,}",
+        f"{total_after:,}", f"{total_after // 4:,}", f"{1 - total_after / total_before:.0%}",
+    )
+    console.print(table)
+
+
+if __name__ == "__main__":
+    typer.run(main)
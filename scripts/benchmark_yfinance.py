@@ -0,0 +1,115 @@
+"""
+Benchmark YFinanceClient history conversion and batched downloads.
+
+Offline (default): builds 10 years of synthetic daily bars for 50 tickers
+and compares the old iterrows -> PriceHistoryEntry conversion with the
+columnar PriceHistoryColumns path (construction, full iteration, and
+to_dataframe).
+
+Live (--live): downloads 10 years of daily data for 50 NSE tickers with
+one batched yf.download vs. one Ticker.history call per ticker.
+
+Usage:
+    python -m scripts.benchmark_yfinance
+    python -m scripts.benchmark_yfinance --live
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+import typer
+from rich.console import Console
+from rich.table import Table
+
+from tools.yahoo_finance import YFinanceClient, PriceHistoryColumns
+from tools.yahoo_finance.models.ticker import PriceHistoryEntry
+
+console = Console()
+
+NIFTY50 = [
+    "RELIANCE", "TCS", "HDFCBANK", "INFY", "ICICIBANK", "HINDUNILVR", "ITC", "SBIN",
+    "BHARTIARTL", "KOTAKBANK", "LT", "AXISBANK", "ASIANPAINT", "MARUTI", "SUNPHARMA",
+    "TITAN", "BAJFINANCE", "ULTRACEMCO", "NESTLEIND", "WIPRO", "HCLTECH", "TECHM",
+    "POWERGRID", "NTPC", "ONGC", "TATAMOTORS", "TATASTEEL", "JSWSTEEL", "ADANIPORTS",
+    "ADANIENT", "COALINDIA", "BAJAJFINSV", "BAJAJ-AUTO", "HEROMOTOCO", "EICHERMOT",
+    "GRASIM", "HINDALCO", "DRREDDY", "CIPLA", "DIVISLAB", "APOLLOHOSP", "BRITANNIA",
+    "TATACONSUM", "INDUSINDBK", "SBILIFE", "HDFCLIFE", "BPCL", "UPL", "M&M", "LTIM",
+]
+
+
+def synthetic_history(days: int, seed: int) -> pd.DataFrame:
+    """Daily OHLCV frame shaped like Ticker.history output."""
+    rng = np.random.default_rng(seed)
+    index = pd.bdate_range(end=pd.Timestamp.today().normalize(), periods=days, tz="Asia/Kolkata")
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.015, days)))
+    return pd.DataFrame({
+        "Open": close * (1 + rng.normal(0, 0.003, days)),
+        "High": close * 1.01,
+        "Low": close * 0.99,
+        "Close": close,
+        "Volume": rng.integers(1e5, 1e7, days),
+        "Dividends": np.zeros(days),
+        "Stock Splits": np.zeros(days),
+    }, index=index)
+
+
+def iterrows_convert(df: pd.DataFrame) -> list:
+    """The previous row-by-row conversion."""
+    entries = []
+    for index, row in df.iterrows():
+        entries.append(PriceHistoryEntry(
+            date=index,
+            open=row["Open"],
+            high=row["High"],
+            low=row["Low"],
+            close=row["Close"],
+            volume=int(row["Volume"]),
+            dividends=row.get("Dividends", 0.0),
+            stock_splits=row.get("Stock Splits", 0.0),
+        ))
+    return entries
+
+
+def timed(func) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main(
+    tickers: int = typer.Option(50, help="Number of tickers"),
+    years: int = typer.Option(10, help="Years of daily data"),
+    live: bool = typer.Option(False, help="Also benchmark live batched vs per-ticker downloads"),
+):
+    """Compare iterrows vs columnar conversion (and optionally live downloads)."""
+    frames = [synthetic_history(years * 252, seed) for seed in range(tickers)]
+    rows = sum(len(f) for f in frames)
+
+    table = Table(title=f"{tickers} tickers x {years}y daily ({rows:,} rows)")
+    table.add_column("Path", style="cyan")
+    table.add_column("Seconds", justify="right", style="green")
+
+    table.add_row("iterrows -> PriceHistoryEntry", f"{timed(lambda: [iterrows_convert(f) for f in frames]):.3f}")
+    columns = []
+    table.add_row("columnar construction", f"{timed(lambda: columns.extend(PriceHistoryColumns.from_dataframe(f) for f in frames)):.4f}")
+    table.add_row("columnar + iterate all rows", f"{timed(lambda: [list(c) for c in columns]):.3f}")
+    table.add_row("columnar -> to_dataframe", f"{timed(lambda: [c.to_dataframe() for c in columns]):.4f}")
+
+    if live:
+        client = YFinanceClient()
+        symbols = [f"{s}.NS" for s in NIFTY50[:tickers]]
+        table.add_row(
+            "live: per-ticker get_historical_data",
+            f"{timed(lambda: [client.get_historical_data(s, period=f'{years}y') for s in symbols]):.2f}",
+        )
+        table.add_row(
+            "live: get_historical_data_batch",
+            f"{timed(lambda: client.get_historical_data_batch(symbols, period=f'{years}y')):.2f}",
+        )
+
+    console.print(table)
+
+
+if __name__ == "__main__":
+    typer.run(main)
@@ -0,0 +1,10 @@
+"""Shared test setup."""
+
+import os
+
+# core.config validates these at import; tests never talk to the real services
+os.environ.setdefault("FYERS_CLIENT_ID", "TEST123456-100")
+os.environ.setdefault("FYERS_SECRET_KEY", "test-secret")
+os.environ.setdefault("GOOGLE_API_KEY", "test-key")
+# Importing workflows sets up logging; keep test runs out of the real .hagrid/hagrid.log
+os.environ.setdefault("LOG_TO_FILE", "false")
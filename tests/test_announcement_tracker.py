@@ -0,0 +1,18 @@
+"""Announcement tracker database."""
+
+import sqlite3
+
+import core.models  # noqa: F401  (registers the app's tables in the shared metadata)
+from tools.nse_india.storage.tracker import AnnouncementTracker
+
+
+def test_tracker_creates_only_its_own_tables(tmp_path):
+    db_path = tmp_path / "nse_announcements.db"
+    AnnouncementTracker(db_path)
+
+    with sqlite3.connect(db_path) as conn:
+        tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        journal_mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+
+    assert tables == {"nse_processed_announcements", "nse_attachment_files"}
+    assert journal_mode == "wal"
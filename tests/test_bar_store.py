@@ -0,0 +1,124 @@
+"""Incremental bar sync: one full fetch, then at most one small request."""
+
+from types import SimpleNamespace
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+import core.bar_store as bar_store
+from core.bar_store import BarSeriesStore
+from tools.nse_india.client import NSEIndiaClient
+
+DAY = 86400
+START = 1_735_776_000  # 2025-01-02 00:00 UTC
+
+
+def _bars(times):
+    return {
+        "s": "ok",
+        "t": list(times),
+        "o": [100.0 + i for i in range(len(times))],
+        "h": [101.0 + i for i in range(len(times))],
+        "l": [99.0 + i for i in range(len(times))],
+        "c": [100.5 + i for i in range(len(times))],
+        "v": [1000] * len(times),
+    }
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [float(START + 30 * DAY)]
+    monkeypatch.setattr(bar_store, "time", SimpleNamespace(time=lambda: now[0]))
+    return now
+
+
+class StubFetcher:
+    """Upstream with one daily bar per day up to the current clock."""
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.calls = []
+
+    def __call__(self, since, count):
+        self.calls.append((since, count))
+        last = int(self.clock[0]) // DAY * DAY
+        first = since if since is not None else last - (count - 1) * DAY
+        return _bars(range(first, last + 1, DAY))
+
+
+def test_second_sync_makes_at_most_one_small_request(tmp_path, clock):
+    store = BarSeriesStore(tmp_path, refresh_after=60)
+    fetch = StubFetcher(clock)
+
+    first = store.sync("moneycontrol", "in;gsx", "1D", fetch, depth=30)
+    assert fetch.calls == [(None, 30)]
+    assert len(first) == 30
+
+    # Within refresh_after: served from the store, no request
+    clock[0] += 30
+    store.sync("moneycontrol", "in;gsx", "1D", fetch, depth=30)
+    assert len(fetch.calls) == 1
+
+    # Next day: one request from the last stored bar, for about two bars
+    clock[0] += DAY
+    last_bar = first.last_time
+    second = store.sync("moneycontrol", "in;gsx", "1D", fetch, depth=30)
+    assert len(fetch.calls) == 2
+    since, count = fetch.calls[1]
+    assert since == last_bar
+    assert count <= 3
+    assert len(second) == 31
+    assert second.last_time == last_bar + DAY
+
+
+def test_stored_series_survives_a_new_store(tmp_path, clock):
+    fetch = StubFetcher(clock)
+    BarSeriesStore(tmp_path).sync("moneycontrol", "in;gsx", "1D", fetch, depth=30)
+
+    clock[0] += 3600
+    BarSeriesStore(tmp_path).sync("moneycontrol", "in;gsx", "1D", fetch, depth=30)
+
+    assert fetch.calls[0] == (None, 30)
+    assert fetch.calls[1][1] == 2
+
+
+def test_failed_incremental_fetch_serves_stored_bars(tmp_path, clock):
+    store = BarSeriesStore(tmp_path, refresh_after=60)
+    stored = store.sync("moneycontrol", "in;gsx", "1D", StubFetcher(clock), depth=30)
+
+    def down(since, count):
+        raise ConnectionError("upstream down")
+
+    clock[0] += DAY
+    assert store.sync("moneycontrol", "in;gsx", "1D", down, depth=30).last_time == stored.last_time
+
+
+def test_gift_nifty_history_second_call_is_one_small_request(tmp_path, clock, monkeypatch):
+    client = NSEIndiaClient(
+        db_path=tmp_path / "announcements.db",
+        attachments_dir=tmp_path / "attachments",
+        bar_store=BarSeriesStore(tmp_path / "bars"),
+    )
+    fetch = StubFetcher(clock)
+    requests = []
+
+    def fetch_url(url, cache_key=None, ttl=None):
+        query = parse_qs(urlparse(url).query)
+        requests.append(query)
+        count = int(query["countback"][0])
+        since = int(query["from"][0])
+        return fetch(since if len(requests) > 1 else None, count)
+
+    monkeypatch.setattr(client, "_fetch_gift_nifty_url", fetch_url)
+
+    first = client.get_gift_nifty_history(resolution="1D", countback=30)
+    assert len(requests) == 1
+    assert requests[0]["countback"] == ["30"]
+    assert len(first["t"]) == 30
+
+    clock[0] += DAY
+    second = client.get_gift_nifty_history(resolution="1D", countback=30)
+    assert len(requests) == 2
+    assert requests[1]["from"] == [str(first["t"][-1])]
+    assert int(requests[1]["countback"][0]) <= 3
+    assert second["t"][-1] == first["t"][-1] + DAY
@@ -0,0 +1,109 @@
+"""Checkpointed steps run inside real agno workflows."""
+
+import asyncio
+import uuid
+from types import SimpleNamespace
+
+import pytest
+from agno.agent import Agent
+from agno.db.sqlite import SqliteDb
+from agno.team import Team
+from agno.workflow import Step, Workflow
+from agno.workflow.types import StepInput, StepOutput
+
+from workflows.checkpoints import StepCheckpointStore, checkpoint_scope, checkpointed_step
+
+
+@pytest.fixture
+def calls():
+    return []
+
+
+@pytest.fixture
+def workflow(tmp_path, calls):
+    def first(step_input: StepInput) -> StepOutput:
+        calls.append("first")
+        return StepOutput(content=f"first:{step_input.input}")
+
+    def second(step_input: StepInput) -> StepOutput:
+        calls.append("second")
+        return StepOutput(content=f"second:{step_input.previous_step_content}")
+
+    return Workflow(
+        name="Checkpoint Test",
+        db=SqliteDb(db_file=str(tmp_path / "workflow.db")),
+        steps=[
+            checkpointed_step(name="First", executor=first, skip_on_resume=True),
+            checkpointed_step(name="Second", executor=second, skip_on_resume=True),
+        ],
+    )
+
+
+@pytest.fixture
+def store(tmp_path):
+    return StepCheckpointStore(str(tmp_path / "checkpoints.db"))
+
+
+def test_steps_are_plain_agno_steps(workflow):
+    # agno resolves steps by exact type; a subclass fails session creation
+    assert all(type(step) is Step for step in workflow.steps)
+
+
+def test_fresh_session_runs_and_records(workflow, store, calls):
+    session_id = uuid.uuid4().hex
+    with checkpoint_scope("Checkpoint Test", session_id=session_id, store=store) as run:
+        result = workflow.run(input="go", session_id=session_id)
+
+    assert result.content == "second:first:go"
+    assert calls == ["first", "second"]
+    assert run.executed_steps == ["First", "Second"]
+
+
+def test_resume_skips_checkpointed_steps(workflow, store, calls):
+    session_id = uuid.uuid4().hex
+    with checkpoint_scope("Checkpoint Test", session_id=session_id, store=store):
+        asyncio.run(workflow.arun(input="go", session_id=session_id))
+
+    calls.clear()
+    with checkpoint_scope("Checkpoint Test", session_id=session_id, resume=True, store=store) as run:
+        result = asyncio.run(workflow.arun(input="go", session_id=session_id))
+
+    assert calls == []
+    assert run.resumed_steps == ["First", "Second"]
+    assert result.content == "second:first:go"
+
+
+def test_changed_input_invalidates_checkpoints(workflow, store, calls):
+    session_id = uuid.uuid4().hex
+    with checkpoint_scope("Checkpoint Test", session_id=session_id, store=store):
+        workflow.run(input="go", session_id=session_id)
+
+    calls.clear()
+    with checkpoint_scope("Checkpoint Test", session_id=session_id, resume=True, store=store) as run:
+        result = workflow.run(input="stop", session_id=session_id)
+
+    assert calls == ["first", "second"]
+    assert run.stale_steps == ["First", "Second"]
+    assert result.content == "second:first:stop"
+
+
+def test_agent_instructions_and_model_are_fingerprinted():
+    agent = Agent(name="Analyst", instructions=["Pick three stocks"])
+    agent.model = SimpleNamespace(id="gemini-2.5-flash")
+    step = checkpointed_step(name="Analyst", agent=agent)
+    team_step = checkpointed_step(name="Desk", team=Team(name="Desk", members=[agent]))
+    step_input = StepInput(input="go")
+
+    def fingerprints():
+        return step.checkpointer.fingerprint(step_input), team_step.checkpointer.fingerprint(step_input)
+
+    before = fingerprints()
+    assert fingerprints() == before
+
+    agent.instructions = ["Pick five stocks"]
+    changed_instructions = fingerprints()
+    agent.model = SimpleNamespace(id="gemini-2.5-pro")
+    changed_model = fingerprints()
+
+    for fingerprint in (0, 1):  # The team changes with its member
+        assert len({before[fingerprint], changed_instructions[fingerprint], changed_model[fingerprint]}) == 3
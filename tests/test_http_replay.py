@@ -0,0 +1,54 @@
+"""HTTP record/replay driven by the environment."""
+
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+import core.http_replay as http_replay
+
+
+@pytest.fixture
+def env_mode(monkeypatch, tmp_path):
+    """Fresh process-wide mode read from the environment; exit hooks collected."""
+    exit_hooks = []
+    monkeypatch.setattr(http_replay, "atexit", SimpleNamespace(register=exit_hooks.append))
+    monkeypatch.setattr(http_replay, "_mode", http_replay._HttpMode())
+    monkeypatch.setattr(http_replay, "_env_checked", False)
+    monkeypatch.setenv("HAGRID_HTTP_CASSETTE", str(tmp_path / "cassette.json"))
+
+    def start(mode):
+        monkeypatch.setenv("HAGRID_HTTP_MODE", mode)
+        monkeypatch.setattr(http_replay, "_env_checked", False)
+        return http_replay.http_mode()
+
+    start.exit_hooks = exit_hooks
+    start.path = tmp_path / "cassette.json"
+    return start
+
+
+def _upstream(request: httpx.Request) -> httpx.Response:
+    return httpx.Response(200, json={"symbol": request.url.params["symbol"], "ltp": 812.5})
+
+
+def test_env_record_then_replay_round_trip(env_mode):
+    assert env_mode("record") == "record"
+    transport = http_replay.default_transport()
+    transport._transport = httpx.MockTransport(_upstream)
+    with httpx.Client(transport=transport) as client:
+        recorded = client.get("https://www.nseindia.com/api/quote-equity?symbol=SBIN").json()
+    assert not env_mode.path.exists()
+
+    for hook in env_mode.exit_hooks:  # Process exit
+        hook()
+    assert env_mode.path.exists()
+
+    assert env_mode("replay") == "replay"
+    with httpx.Client(transport=http_replay.default_transport()) as client:
+        replayed = client.get("https://www.nseindia.com/api/quote-equity?symbol=SBIN").json()
+    assert replayed == recorded == {"symbol": "SBIN", "ltp": 812.5}
+
+
+def test_env_replay_registers_no_save(env_mode):
+    env_mode("replay")
+    assert env_mode.exit_hooks == []
@@ -0,0 +1,55 @@
+"""Queue logging pipeline: Fyers SDK loggers and throttles."""
+
+import logging
+
+import pytest
+
+from broker.fyers.core.logger import get_logger as get_fyers_logger
+from core import logging_setup
+from core.logging_setup import DEFAULT_THROTTLES, ThrottleFilter
+
+
+@pytest.fixture
+def pipeline():
+    logging_setup.setup_logging(log_to_file=False)
+    yield
+    logging_setup.shutdown_logging()
+
+
+def test_fyers_logger_created_after_setup_goes_through_the_queue(pipeline):
+    logger = get_fyers_logger("fyers.websocket.late")
+
+    assert logger.handlers == []
+    assert logger.propagate
+
+
+def test_fyers_logger_created_before_setup_is_adopted():
+    logging_setup.shutdown_logging()
+    early = get_fyers_logger("fyers.websocket.early")
+    assert early.handlers and not early.propagate
+
+    logging_setup.setup_logging(log_to_file=False)
+    try:
+        assert early.handlers == []
+        assert early.propagate
+    finally:
+        logging_setup.shutdown_logging()
+
+
+@pytest.mark.parametrize("name", ["fyers.http_client", "fyers.rate_limiter", "fyers.websocket.data"])
+def test_default_throttles_match_the_fyers_loggers(name):
+    assert ThrottleFilter(DEFAULT_THROTTLES)._rule(name) is not None
+
+
+def test_throttle_drops_and_reports_suppressed():
+    throttle = ThrottleFilter({"fyers.http_client": logging_setup.Throttle(sample_every=3)})
+
+    def record(level=logging.DEBUG):
+        return logging.LogRecord("fyers.http_client", level, __file__, 0, "request", None, None)
+
+    kept = [throttle.filter(record()) for _ in range(3)]
+    warning = record(logging.WARNING)
+
+    assert kept == [True, False, False]
+    assert throttle.filter(warning)
+    assert warning.suppressed == 2
@@ -0,0 +1,127 @@
+"""Market data hub fan-out: coalescing and slow clients."""
+
+import asyncio
+
+from api.market_hub import MarketDataHub
+
+
+class FakeWebSocket:
+    """Client socket; each send takes `delay` seconds (None = never completes)."""
+
+    def __init__(self, delay=0.0, error=None):
+        self.delay = delay
+        self.error = error
+        self.frames = []
+        self.closed_with = None
+
+    async def send_json(self, data):
+        if self.error is not None:
+            raise self.error
+        if self.delay is None:
+            await asyncio.Event().wait()
+        await asyncio.sleep(self.delay)
+        self.frames.append(data)
+
+    async def close(self, code=1000):
+        self.closed_with = code
+
+
+class FakeUpstream:
+    def __init__(self):
+        self.subscribed = set()
+
+    async def connect(self):
+        pass
+
+    async def subscribe(self, symbols):
+        self.subscribed.update(symbols)
+
+    async def unsubscribe(self, symbols):
+        self.subscribed.difference_update(symbols)
+
+    async def close(self):
+        pass
+
+    def is_connected(self):
+        return True
+
+
+class FakeBroker:
+    def __init__(self):
+        self.socket = FakeUpstream()
+
+    def create_data_websocket(self, on_message, on_close):
+        return self.socket
+
+
+def _tick(symbol, ltp):
+    return {"symbol": symbol, "ltp": ltp}
+
+
+def _hub(broker, **kwargs):
+    return MarketDataHub(lambda: broker, health_interval=60, **kwargs)
+
+
+def test_ticks_are_coalesced_to_the_latest_value():
+    async def scenario():
+        hub = _hub(FakeBroker(), min_interval=0.1)
+        socket = FakeWebSocket()
+        await hub.connect(socket, ["NSE:SBIN-EQ", "NSE:TCS-EQ"])
+        try:
+            for i in range(50):
+                hub._publish(_tick("NSE:SBIN-EQ", 800 + i))
+            hub._publish(_tick("NSE:TCS-EQ", 4000))
+            hub._publish(_tick("NSE:INFY-EQ", 1500))  # Not subscribed
+            await asyncio.sleep(0.3)
+        finally:
+            await hub.close()
+        return socket.frames
+
+    frames = asyncio.run(scenario())
+
+    assert len(frames) == 1
+    assert {(d["symbol"], d["ltp"]) for d in frames[0]["data"]} == {("NSE:SBIN-EQ", 849), ("NSE:TCS-EQ", 4000)}
+
+
+def test_slow_client_is_dropped_without_stalling_others():
+    async def scenario():
+        broker = FakeBroker()
+        hub = _hub(broker, min_interval=0.01, send_timeout=0.05)
+        slow, fast = FakeWebSocket(delay=None), FakeWebSocket()
+        await hub.connect(slow, ["NSE:SBIN-EQ", "NSE:IDEA-EQ"])
+        await hub.connect(fast, ["NSE:SBIN-EQ"])
+        try:
+            hub._publish(_tick("NSE:SBIN-EQ", 801))
+            await asyncio.sleep(0.2)
+            hub._publish(_tick("NSE:SBIN-EQ", 802))
+            await asyncio.sleep(0.1)
+            return hub.stats, broker.socket.subscribed, slow, fast
+        finally:
+            await hub.close()
+
+    stats, upstream, slow, fast = asyncio.run(scenario())
+
+    assert stats["clients"] == 1
+    assert stats["dropped_clients"] == 1
+    assert slow.closed_with == 1013
+    assert upstream == {"NSE:SBIN-EQ"}  # The dropped client's only symbol is released
+    assert [frame["data"][0]["ltp"] for frame in fast.frames] == [801, 802]
+
+
+def test_failed_send_unregisters_the_client():
+    async def scenario():
+        hub = _hub(FakeBroker(), min_interval=0.01)
+        client = await hub.connect(FakeWebSocket(error=RuntimeError("socket closed")), ["NSE:SBIN-EQ"])
+        try:
+            hub._publish(_tick("NSE:SBIN-EQ", 801))
+            await asyncio.sleep(0.1)
+            await hub.disconnect(client)  # The endpoint's own cleanup still works
+            return client, hub.stats
+        finally:
+            await hub.close()
+
+    client, stats = asyncio.run(scenario())
+
+    assert client.dead
+    assert stats["clients"] == 0
+    assert stats["upstream_symbols"] == []
@@ -0,0 +1,128 @@
+"""Pre-market snapshot served through the agno tool hook chain."""
+
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+from agno.agent import Agent
+from agno.tools import Toolkit
+from agno.tools.function import FunctionCall
+
+import core.market_snapshot as market_snapshot
+from broker.fyers.toolkit import FyersToolkit
+from core.market_snapshot import MarketSnapshot, SnapshotStore, SnapshotUniverse, bind_arguments
+from core.tool_memo import ToolResultMemo
+
+
+class _NoClient:
+    """Stands in for FyersClient: any live call fails the test."""
+
+    def __getattr__(self, name):
+        raise AssertionError(f"live call {name} made despite a snapshot hit")
+
+
+class OtherToolkit(Toolkit):
+    """A second provider exposing a tool with the same name (like Groww)."""
+
+    def __init__(self):
+        super().__init__(name="other", tools=[self.get_option_chain])
+
+    def get_option_chain(self, symbol: str) -> str:
+        return "LIVE"
+
+
+@pytest.fixture
+def snapshot(tmp_path, monkeypatch):
+    toolkit = FyersToolkit(_NoClient(), cache_enabled=False, cache_persist=False)
+    snap = MarketSnapshot.new(SnapshotUniverse())
+    snap.quotes["NSE:SBIN-EQ"] = {"lp": 812.5, "ch": 4.1, "chp": 0.51, "volume": 1000}
+    snap.quotes_fetched_at = time.time()
+    # Written exactly as prewarm_snapshot does: bound against the method, defaults filled in
+    args = bind_arguments(toolkit.get_option_chain, {"symbol": "NSE:NIFTY50-INDEX"})
+    snap.add_tool_result("get_option_chain", args, "SNAPSHOT CHAIN", toolkit="FyersToolkit")
+
+    store = SnapshotStore(tmp_path)
+    store.save(snap)
+    monkeypatch.setattr(market_snapshot, "_store", store)
+    return toolkit
+
+
+def _call(agent: Agent, toolkit: Toolkit, tool_name: str, arguments: dict) -> str:
+    """Run one tool call the way an agent run does (copied Function, agent hooks)."""
+    function = toolkit.functions[tool_name].model_copy(deep=True)
+    function._agent = agent
+    function.process_entrypoint()
+    function.tool_hooks = agent.tool_hooks
+    call = FunctionCall(function=function, arguments=arguments)
+    result = asyncio.run(call.aexecute())
+    assert result.status == "success", result.error
+    return call.result
+
+
+def _agent(memo: ToolResultMemo, *toolkits: Toolkit) -> Agent:
+    market_snapshot.install_snapshot_source(memo)
+    return Agent(tools=list(toolkits), tool_hooks=[memo.async_hook])
+
+
+def test_quotes_served_from_snapshot(snapshot):
+    memo = ToolResultMemo()
+    agent = _agent(memo, snapshot)
+    with memo.run_scope():
+        result = _call(agent, snapshot, "get_quotes", {"symbols": ["NSE:SBIN-EQ"]})
+        stats = memo.run_stats()
+    assert "NSE:SBIN-EQ,812.5" in result
+    assert stats["source_hits"] == 1
+
+
+def test_parameterized_tool_matches_with_and_without_defaults(snapshot):
+    memo = ToolResultMemo()
+    agent = _agent(memo, snapshot)
+    with memo.run_scope():
+        implicit = _call(agent, snapshot, "get_option_chain", {"symbol": "NSE:NIFTY50-INDEX"})
+    with memo.run_scope():
+        explicit = _call(
+            agent, snapshot, "get_option_chain", {"symbol": "NSE:NIFTY50-INDEX", "strike_count": 5}
+        )
+    assert implicit == explicit == "SNAPSHOT CHAIN"
+
+
+def test_same_tool_name_on_another_toolkit_is_not_served(snapshot):
+    memo = ToolResultMemo()
+    other = OtherToolkit()
+    agent = _agent(memo, other)
+    with memo.run_scope():
+        result = _call(agent, other, "get_option_chain", {"symbol": "NSE:NIFTY50-INDEX"})
+    assert result == "LIVE"
+
+
+def test_pre_open_quotes_not_served_after_the_open(snapshot, monkeypatch):
+    opening = market_snapshot.market_open_ts()
+    snap = market_snapshot.get_snapshot_store().load_latest()
+    snap.quotes_fetched_at = opening - 10 * 60  # 9:05
+
+    clock = SimpleNamespace(time=lambda: opening - 5 * 60, monotonic=time.monotonic)
+    monkeypatch.setattr(market_snapshot, "time", clock)
+    assert snap.quotes_csv(["NSE:SBIN-EQ"]) is not None  # 9:10, still pre-open
+
+    clock.time = lambda: opening + 60
+    assert snap.quotes_csv(["NSE:SBIN-EQ"]) is None  # 9:16, must be live
+
+
+@pytest.mark.parametrize("tool_name", [
+    "fetch_sector_constituents",
+    "get_index_constituents",
+    "get_index_summary",
+    "get_gift_nifty",
+])
+def test_pre_open_prices_not_served_after_the_open(tool_name, monkeypatch):
+    opening = market_snapshot.market_open_ts()
+    clock = SimpleNamespace(time=lambda: opening - 10 * 60, monotonic=time.monotonic)
+    monkeypatch.setattr(market_snapshot, "time", clock)
+    snap = MarketSnapshot.new(SnapshotUniverse())
+    snap.add_tool_result(tool_name, {"index": "NIFTY 50"}, "PRE-OPEN LTP")  # 9:05
+
+    assert snap.tool_result(tool_name, {"index": "NIFTY 50"}) == "PRE-OPEN LTP"
+
+    clock.time = lambda: opening + 60  # 9:16, well within the TTL
+    assert snap.tool_result(tool_name, {"index": "NIFTY 50"}) is None
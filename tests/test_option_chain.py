@@ -0,0 +1,57 @@
+"""Columnar NSE option chain: rows that fail validation are dropped everywhere."""
+
+from tools.nse_india.models.option_chain import OptionChainResponse, OptionChainStrike
+
+
+def _row(strike, ce_oi, pe_oi):
+    return {
+        "expiryDates": "30-Jan-2025",
+        "strikePrice": strike,
+        "CE": {"strikePrice": strike, "underlying": "NIFTY", "openInterest": ce_oi, "lastPrice": 12.5},
+        "PE": {"strikePrice": strike, "underlying": "NIFTY", "openInterest": pe_oi, "lastPrice": 8.0},
+    }
+
+
+def test_invalid_row_is_dropped_from_columns_aggregates_and_data():
+    chain = OptionChainResponse.from_records("", 150, [_row(100, "-", 5), _row(200, 10, 3)])
+
+    assert len(chain) == 1
+    assert chain.columns.strike.tolist() == [200.0]
+    assert chain.total_ce_oi == 10
+    assert chain.total_pe_oi == 3
+    assert [s.strike_price for s in chain.data] == [200.0]
+    assert chain.get_strike_data(100) is None
+    assert chain.atm_strike == 200.0
+
+
+def test_coercible_values_are_kept():
+    # Numeric strings and integral floats validate, so the row stays
+    chain = OptionChainResponse.from_records("", 150, [_row(100, "7", 5.0), _row(200, 10, 3)])
+
+    assert len(chain) == 2
+    assert chain.total_ce_oi == 17
+    assert chain.total_pe_oi == 8
+    assert chain.get_strike_data(100).ce_oi == 7
+
+
+def test_matches_per_row_validation():
+    rows = [
+        _row(100, 1, 2),
+        _row(150, 1.5, 2),  # Fractional OI is not an int
+        {**_row(200, 3, 4), "PE": []},
+        {**_row(250, 5, 6), "expiryDates": None},
+        _row(300, None, 1),
+        _row(350, 7, 8),
+    ]
+    valid = []
+    for row in rows:
+        try:
+            valid.append(OptionChainStrike.model_validate(row))
+        except Exception:
+            continue
+
+    chain = OptionChainResponse.from_records("", 220, rows)
+
+    assert [s.strike_price for s in chain.data] == [s.strike_price for s in valid]
+    assert chain.total_ce_oi == sum(s.ce_oi for s in valid)
+    assert chain.total_pe_oi == sum(s.pe_oi for s in valid)
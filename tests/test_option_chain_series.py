@@ -0,0 +1,134 @@
+"""Intraday option-chain series: strikes coming and going, changes, buildup, PCR."""
+
+from datetime import datetime
+
+import pytest
+
+from tools.nse_india.models.option_chain import OptionChainColumns
+from tools.nse_india.storage.option_chain import (
+    LONG_BUILDUP,
+    LONG_UNWINDING,
+    SHORT_BUILDUP,
+    SHORT_COVERING,
+    OptionChainSeries,
+    OptionChainSeriesStore,
+)
+
+DAY = "2025-01-02"
+
+
+def _ts(hhmm):
+    return datetime.fromisoformat(f"{DAY}T{hhmm}").timestamp()
+
+
+def _side(strike, oi, ltp, iv=15.0, volume=100):
+    return {
+        "strikePrice": strike,
+        "underlying": "NIFTY",
+        "openInterest": oi,
+        "lastPrice": ltp,
+        "impliedVolatility": iv,
+        "totalTradedVolume": volume,
+    }
+
+
+def _chain(*strikes):
+    """Columns from (strike, ce_oi, ce_ltp, pe_oi, pe_ltp) tuples, in any order."""
+    rows = [
+        {"strikePrice": strike, "CE": _side(strike, ce_oi, ce_ltp), "PE": _side(strike, pe_oi, pe_ltp)}
+        for strike, ce_oi, ce_ltp, pe_oi, pe_ltp in strikes
+    ]
+    return OptionChainColumns.from_rows(rows)[0]
+
+
+@pytest.fixture
+def series():
+    s = OptionChainSeries(DAY, "nifty", "30-Jan-2025")
+    s.append(_chain(
+        (23900, 1000, 150.0, 3000, 40.0),
+        (24000, 2000, 90.0, 2000, 80.0),
+        (24100, 3000, 50.0, 1000, 140.0),
+    ), spot=24010, ts=_ts("09:15"))
+    # 24200 is listed mid-day; 23900 drops out of this one snapshot
+    s.append(_chain(
+        (24000, 2500, 95.0, 2100, 75.0),
+        (24200, 400, 20.0, 100, 210.0),
+        (24100, 2600, 55.0, 1000, 135.0),
+    ), spot=24030, ts=_ts("10:00"))
+    s.append(_chain(
+        (23900, 1200, 120.0, 2500, 55.0),
+        (24000, 1800, 70.0, 2600, 95.0),
+        (24100, 3500, 35.0, 900, 150.0),
+        (24200, 900, 15.0, 150, 240.0),
+    ), spot=23980, ts=_ts("11:00"))
+    return s
+
+
+def _by_strike(changes):
+    return {row["strike"]: row for row in changes["strikes"]}
+
+
+def test_strike_listed_mid_day_gets_a_column(series):
+    assert series.strikes.tolist() == [23900, 24000, 24100, 24200]
+    assert series.present.tolist() == [
+        [True, True, True, False],
+        [False, True, True, True],
+        [True, True, True, True],
+    ]
+    # Not compared against the snapshot it was missing from
+    assert 24200 not in _by_strike(series.changes(0, 2))
+    assert _by_strike(series.changes("10:00", "11:00"))[24200]["ce_oi_chg"] == 500
+
+
+def test_missing_strike_is_not_an_oi_drop(series):
+    changes = _by_strike(series.changes(0, 1))
+    top = series.top_changes(0, 1)
+
+    assert sorted(changes) == [24000, 24100]
+    assert all(row["strike"] != 23900 for row in top["ce_shed"] + top["pe_shed"])
+    # Present again later: compared with its last real value, not the gap
+    assert _by_strike(series.changes(0, 2))[23900]["pe_oi_chg"] == -500
+
+
+def test_changes_and_buildup(series):
+    changes = series.changes("09:15", "11:00")
+    rows = _by_strike(changes)
+
+    assert (changes["from"]["time"], changes["to"]["time"]) == ("09:15", "11:00")
+    assert rows[24000]["atm"]  # Spot 23980 at the end
+    assert rows[24100]["ce_oi_chg"] == 500
+    assert rows[24100]["ce_ltp_chg"] == -15.0
+    assert rows[24100]["ce_buildup"] == SHORT_BUILDUP
+    assert rows[24000]["ce_buildup"] == LONG_UNWINDING
+    assert rows[24000]["pe_buildup"] == LONG_BUILDUP
+    assert rows[23900]["pe_buildup"] == SHORT_COVERING
+    assert [r["strike"] for r in series.changes(0, 2, strikes_around_atm=1)["strikes"]] == [23900, 24000, 24100]
+
+
+def test_top_changes(series):
+    top = series.top_changes(0, 2, top=2)
+
+    assert [(r["strike"], r["ce_oi_chg"]) for r in top["ce_added"]] == [(24100, 500), (23900, 200)]
+    assert [(r["strike"], r["ce_oi_chg"]) for r in top["ce_shed"]] == [(24000, -200)]
+    assert [(r["strike"], r["pe_oi_chg"]) for r in top["pe_added"]] == [(24000, 600)]
+    assert [(r["strike"], r["pe_oi_chg"]) for r in top["pe_shed"]] == [(23900, -500), (24100, -100)]
+
+
+def test_pcr_series(series):
+    pcr = series.pcr_series()
+
+    assert [p["time"] for p in pcr] == ["09:15", "10:00", "11:00"]
+    assert [(p["ce_oi"], p["pe_oi"]) for p in pcr] == [(6000, 6000), (5500, 3200), (7400, 6150)]
+    assert [p["pcr_oi"] for p in pcr] == [1.0, 0.582, 0.831]
+    assert pcr[0]["pcr_volume"] == 1.0
+
+
+def test_store_round_trip(series, tmp_path):
+    store = OptionChainSeriesStore(tmp_path)
+    store.save(series)
+
+    loaded = store.load("NIFTY", day=DAY)
+
+    assert loaded.expiry == "2025-01-30"
+    assert loaded.present.tolist() == series.present.tolist()
+    assert loaded.changes(0, 2) == series.changes(0, 2)
@@ -0,0 +1,108 @@
+"""Position rules replayed from recorded tick tapes."""
+
+import pytest
+
+from core.position_rules import PositionRuleEngine, RuleEventType, TickTape, replay_ticks
+
+SYMBOL = "NSE:SBIN-EQ"
+
+
+def _engine(direction="LONG", entry=800.0, stop=790.0, target=830.0, **kwargs):
+    engine = PositionRuleEngine(**kwargs)
+    engine.sync([{
+        "id": 1,
+        "symbol": SYMBOL,
+        "direction": direction,
+        "entry_price": entry,
+        "quantity": 10,
+        "stop_loss": stop,
+        "take_profit": target,
+    }])
+    return engine
+
+
+def _replay(tmp_path, engine, prices):
+    """Record the prices to a tape, then replay the tape through the engine."""
+    tape = TickTape(tmp_path / "ticks.jsonl")
+    for i, price in enumerate(prices):
+        tape.append(SYMBOL, price, 1_700_000_000.0 + i)
+    tape.close()
+    return replay_ticks(engine, TickTape.read(tape.path))
+
+
+def test_stop_loss(tmp_path):
+    events = _replay(tmp_path, _engine(), [801, 798, 795, 789.5, 785])
+
+    assert [e.event for e in events] == [RuleEventType.STOP_LOSS]
+    assert events[0].price == 789.5
+    assert events[0].level == 790
+    assert events[0].unrealized_pnl == -105.0
+    assert events[0].is_exit
+
+
+def test_short_stop_loss(tmp_path):
+    engine = _engine(direction="SHORT", entry=800, stop=810, target=770)
+    events = _replay(tmp_path, engine, [799, 805, 810.5])
+
+    assert [e.event for e in events] == [RuleEventType.STOP_LOSS]
+    assert events[0].unrealized_pnl == -105.0
+
+
+def test_take_profit(tmp_path):
+    # Trail off so only the target can fire on the way up
+    engine = _engine(trail_activation_r=100, material_move_percent=50)
+    events = _replay(tmp_path, engine, [805, 815, 825, 830.5, 835])
+
+    assert [e.event for e in events] == [RuleEventType.TAKE_PROFIT]
+    assert events[0].price == 830.5
+    assert events[0].level == 830
+
+
+def test_trailing_stop(tmp_path):
+    # Risk is 10; the trail arms at 810 (1R) and sits 1% under the high
+    engine = _engine(material_move_percent=50)
+    events = _replay(tmp_path, engine, [805, 812, 820, 815, 811.7, 811.8])
+
+    assert [e.event for e in events] == [RuleEventType.TRAILING_STOP]
+    assert events[0].price == 811.7
+    assert events[0].level == pytest.approx(811.8)
+    assert events[0].unrealized_pnl == 117.0
+
+
+def test_trail_only_ratchets_up(tmp_path):
+    engine = _engine(material_move_percent=50)
+    _replay(tmp_path, engine, [820, 815, 818])
+
+    (position,) = engine.positions()
+    assert position["trail_stop"] == pytest.approx(811.8)
+    assert position["best_price"] == 820
+
+
+def test_material_move_reports_then_rebases(tmp_path):
+    # 1.5% of 800 = 12 points since the last report
+    engine = _engine(stop=700, target=900, trail_activation_r=100)
+    events = _replay(tmp_path, engine, [800, 806, 812, 815, 824, 812])
+
+    assert [e.event for e in events] == [RuleEventType.MATERIAL_MOVE] * 3
+    assert [(e.level, e.price) for e in events] == [(800, 812), (812, 824), (824, 812)]
+    assert not any(e.is_exit for e in events)
+
+
+def test_exit_fires_once_until_levels_change(tmp_path):
+    engine = _engine()
+    assert len(_replay(tmp_path, engine, [789, 788])) == 1
+
+    # The workflow moved the stop instead of exiting: rules re-arm
+    engine.sync([{"id": 1, "symbol": SYMBOL, "direction": "LONG", "entry_price": 800,
+                  "quantity": 10, "stop_loss": 780, "take_profit": 830}])
+    events = replay_ticks(engine, [(SYMBOL, 785, 1.0), (SYMBOL, 779, 2.0)])
+    assert [e.event for e in events] == [RuleEventType.STOP_LOSS]
+    assert events[0].level == 780
+
+
+def test_ticks_for_other_symbols_are_ignored(tmp_path):
+    engine = _engine()
+    events = replay_ticks(engine, [("NSE:TCS-EQ", 1.0, 1.0)])
+
+    assert events == []
+    assert engine.ticks == 1
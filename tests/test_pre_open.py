@@ -0,0 +1,43 @@
+"""Pre-open series store and snapshot rankings."""
+
+from tools.nse_india.models.pre_open import PreOpenResponse
+from tools.nse_india.storage.pre_open import PreOpenFrame, PreOpenSeries, PreOpenSeriesStore
+
+
+def _response(*stocks):
+    return {
+        "data": [
+            {
+                "metadata": {"symbol": symbol, "previousClose": prev, "iep": iep, "pChange": (iep / prev - 1) * 100},
+                "detail": {"preOpenMarket": {"IEP": iep, "totalBuyQuantity": buy, "totalSellQuantity": sell}},
+            }
+            for symbol, prev, iep, buy, sell in stocks
+        ]
+    }
+
+
+def test_days_ignore_in_flight_saves(tmp_path):
+    store = PreOpenSeriesStore(tmp_path)
+    series = PreOpenSeries("2025-01-02")
+    series.append(PreOpenFrame.from_responses({"NIFTY": _response(("SBIN", 800, 808, 10, 5))}, ts=1.0))
+    store.save(series)
+    # A concurrent save in progress, or one that crashed before the rename
+    (tmp_path / "pre_open-2025-01-03.tmp.npz").write_bytes(b"partial")
+
+    assert store.days() == ["2025-01-02"]
+    assert store.latest().day == "2025-01-02"
+
+
+def test_rankings_are_returned_as_copies():
+    response = PreOpenResponse.model_validate(_response(
+        ("SBIN", 800, 808, 10, 5),
+        ("TCS", 4000, 3960, 5, 10),
+    ))
+
+    gainers = response.top_gainers
+    gainers.clear()
+    response.gapping_up.append(None)
+
+    assert [s.symbol for s in response.top_gainers] == ["SBIN", "TCS"]
+    assert [s.symbol for s in response.top_losers] == ["TCS", "SBIN"]
+    assert [s.symbol for s in response.gapping_up] == ["SBIN"]
@@ -0,0 +1,72 @@
+"""Tick monitor lane and watchdog."""
+
+import asyncio
+import threading
+
+import pytest
+
+import scheduler.scheduler as trading_scheduler
+import workflows.tick_monitor as tick_monitor
+from scheduler.worker_pool import JobWorkerPool
+
+
+def test_long_running_job_leaves_priority_lane_free():
+    pool = JobWorkerPool(max_workers=1, priority_workers=1)
+    release = threading.Event()
+
+    async def scenario():
+        session = asyncio.ensure_future(pool.run("tick_monitor", release.wait, long_running=True))
+        await asyncio.sleep(0.05)
+        result = await asyncio.wait_for(pool.run("position_monitoring", lambda: "ran", priority=True), 2)
+        release.set()
+        await session
+        return result
+
+    try:
+        assert asyncio.run(scenario()) == "ran"
+    finally:
+        release.set()
+        pool.shutdown()
+
+
+@pytest.fixture
+def sched(monkeypatch):
+    settings = trading_scheduler.settings
+    monkeypatch.setattr(trading_scheduler.JobMetricsStore, "_save", lambda self: None)
+    monkeypatch.setattr(settings, "TICK_MONITOR_ENABLED", True)
+    # Whole day in session so the watchdog always judges the monitor
+    monkeypatch.setattr(settings, "MONITOR_START_TIME", "00:00")
+    monkeypatch.setattr(settings, "MONITOR_END_TIME", "23:59")
+    s = trading_scheduler.TradingScheduler(max_workers=1)
+    yield s
+    s.pool.shutdown(wait=False)
+
+
+def test_watchdog_is_scheduled_with_the_tick_monitor(sched):
+    job_ids = {job.id for job in sched.scheduler.get_jobs()}
+    assert {"tick_monitor", "tick_monitor_watchdog"} <= job_ids
+
+
+def test_watchdog_restarts_a_dead_monitor_and_runs_fallback(sched, monkeypatch):
+    restarted, fallback = [], []
+    monkeypatch.setattr(tick_monitor, "_heartbeat", {"at": None, "connected": False})
+    monkeypatch.setattr(sched, "run_job_now", restarted.append)
+    monkeypatch.setattr(trading_scheduler, "run_monitoring_job", lambda: fallback.append(1))
+
+    asyncio.run(sched._tick_monitor_watchdog())
+
+    assert restarted == ["tick_monitor"]
+    assert fallback == [1]
+
+
+def test_watchdog_leaves_a_live_monitor_alone(sched, monkeypatch):
+    restarted = []
+    tick_monitor._beat(True)
+    monkeypatch.setattr(sched, "run_job_now", restarted.append)
+    monkeypatch.setattr(trading_scheduler, "run_monitoring_job", lambda: pytest.fail("fallback ran"))
+    try:
+        asyncio.run(sched._tick_monitor_watchdog())
+    finally:
+        tick_monitor._beat(False)
+
+    assert restarted == []
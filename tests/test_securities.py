@@ -0,0 +1,93 @@
+"""Indexed NSE securities master and its daily cache."""
+
+from datetime import date, timedelta
+
+import pytest
+
+from tools.nse_india.models.securities import SecuritiesResponse, Security
+from tools.nse_india.storage.securities import SecuritiesMasterStore
+
+
+def _security(symbol, name, series, isin, listed):
+    return Security.model_validate({
+        "SYMBOL": symbol,
+        "NAME OF COMPANY": name,
+        " SERIES": series,
+        " DATE OF LISTING": listed,
+        " PAID UP VALUE": "10",
+        " MARKET LOT": "1",
+        " ISIN NUMBER": isin,
+        " FACE VALUE": "10",
+    })
+
+
+RECENT = (date.today() - timedelta(days=5)).strftime("%d-%b-%Y")
+
+
+@pytest.fixture
+def response():
+    securities = [
+        _security("SBIN", "State Bank of India", "EQ", "INE062A01020", "01-MAR-1995"),
+        _security("TCS", "Tata Consultancy Services Limited", "EQ", "INE467B01029", "25-AUG-2004"),
+        _security("TATASTEEL", "Tata Steel Limited", "EQ", "INE081A01020", "15-JAN-1998"),
+        _security("IDEA", "Vodafone Idea Limited", "BE", "INE669E01016", "09-MAR-2007"),
+        _security("NEWSME", "New SME Listing Limited", "SM", "INE0ABC01011", RECENT),
+        # A duplicate symbol: the first listing wins, as with the old scan
+        _security("SBIN", "State Bank of India (dup)", "BZ", "INE062A01999", "01-MAR-1995"),
+    ]
+    return SecuritiesResponse(securities=securities, total_count=len(securities))
+
+
+def _scan_by_symbol(response, symbol):
+    return next((s for s in response.securities if s.symbol.upper() == symbol.upper()), None)
+
+
+def _scan_by_isin(response, isin):
+    return next((s for s in response.securities if s.isin.upper() == isin.upper()), None)
+
+
+@pytest.mark.parametrize("symbol", ["SBIN", "sbin", "Tcs", "IDEA", "NEWSME", "MISSING"])
+def test_get_by_symbol_matches_scan(response, symbol):
+    assert response.get_by_symbol(symbol) is _scan_by_symbol(response, symbol)
+
+
+@pytest.mark.parametrize("isin", ["INE062A01020", "ine467b01029", "INE062A01999", "INE000000000"])
+def test_get_by_isin_matches_scan(response, isin):
+    assert response.get_by_isin(isin) is _scan_by_isin(response, isin)
+
+
+@pytest.mark.parametrize("series", ["EQ", "eq", "BE", "BZ", "SM", "ST"])
+def test_get_by_series_matches_scan(response, series):
+    expected = [s for s in response.securities if s.series.upper() == series.upper()]
+    assert response.get_by_series(series) == expected
+
+
+def test_name_search_and_counts_match_scan(response):
+    for query in ("tata", "LIMITED", "bank", "nothing"):
+        expected = [s for s in response.securities if query.lower() in s.company_name.lower()]
+        assert response.search_by_name(query) == expected
+
+    counts = {}
+    for sec in response.securities:
+        counts[sec.series] = counts.get(sec.series, 0) + 1
+    assert response.get_series_counts() == counts
+
+
+def test_returned_lists_do_not_change_the_index(response):
+    response.get_by_series("EQ").clear()
+    assert len(response.get_by_series("EQ")) == 3
+
+
+def test_store_round_trip_keeps_dates(response, tmp_path):
+    store = SecuritiesMasterStore(tmp_path)
+    store.save(response, day="2025-01-02")
+
+    loaded = store.load("2025-01-02")
+
+    assert [s.model_dump() for s in loaded.securities] == [s.model_dump() for s in response.securities]
+    assert all(isinstance(s.listing_date, date) for s in loaded.securities)
+    assert loaded.get_by_symbol("SBIN").listing_date == date(1995, 3, 1)
+    assert [s.symbol for s in loaded.get_recently_listed(30)] == ["NEWSME"]
+    assert [s.symbol for s in loaded.get_listed_in_year(2004)] == ["TCS"]
+    assert loaded.get_by_isin("INE467B01029").symbol == "TCS"
+    assert loaded.get_by_series("BE")[0].years_listed == date.today().year - 2007
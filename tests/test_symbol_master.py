@@ -0,0 +1,130 @@
+"""Symbol master daily snapshots: conditional refresh and in-place diffs."""
+
+import asyncio
+import hashlib
+import json
+from datetime import date, datetime, timedelta
+
+import httpx
+import pytest
+
+import broker.fyers.data.symbol_master as symbol_master
+from broker.fyers.data.symbol_master import ExchangeSegment, SymbolMaster
+
+SEGMENT = ExchangeSegment.NSE_FO
+TODAY = date.today().isoformat()
+YESTERDAY = (date.today() - timedelta(days=1)).isoformat()
+EXPIRY = int(datetime(2025, 1, 30, 15, 30).timestamp())
+
+
+def _contract(ticker, token, strike, option_type, lot=75, close=100.0):
+    return {
+        "fyToken": token,
+        "symTicker": ticker,
+        "exchange": 10,
+        "segment": 11,
+        "underSym": "NIFTY",
+        "expiryDate": str(EXPIRY),
+        "strikePrice": strike,
+        "optType": option_type,
+        "minLotSize": lot,
+        "previousClose": close,
+    }
+
+
+DAY_ONE = {
+    "NSE:NIFTY25JAN24000CE": _contract("NSE:NIFTY25JAN24000CE", "101", 24000, "CE"),
+    "NSE:NIFTY25JAN24000PE": _contract("NSE:NIFTY25JAN24000PE", "102", 24000, "PE"),
+    "NSE:NIFTY25JAN24100CE": _contract("NSE:NIFTY25JAN24100CE", "103", 24100, "CE"),
+}
+
+
+class FakeUpstream:
+    """Serves the symbol master JSON with an ETag and honours If-None-Match."""
+
+    def __init__(self, data, etag="v1"):
+        self.body = json.dumps(data).encode()
+        self.etag = etag
+        self.requests = []
+
+    def serve(self, data, etag):
+        self.body, self.etag = json.dumps(data).encode(), etag
+
+    def __call__(self, request):
+        self.requests.append(request)
+        if request.headers.get("if-none-match") == self.etag:
+            return httpx.Response(304)
+        return httpx.Response(200, content=self.body, headers={"etag": self.etag})
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    fake = FakeUpstream(DAY_ONE)
+    monkeypatch.setattr(symbol_master, "default_transport", lambda is_async=False: httpx.MockTransport(fake))
+    return fake
+
+
+@pytest.fixture
+def yesterday(tmp_path, upstream):
+    """A snapshot downloaded yesterday, with its validators."""
+    sm = SymbolMaster(cache_dir=str(tmp_path))
+    path = sm._get_cache_path(SEGMENT, YESTERDAY)
+    path.write_bytes(upstream.body)
+    meta = {"day": YESTERDAY, "etag": upstream.etag, "last_modified": None}
+    meta["sha256"] = hashlib.sha256(upstream.body).hexdigest()
+    sm._meta_path(SEGMENT).write_text(json.dumps(meta))
+    return path
+
+
+def test_not_modified_on_a_new_day_renames_the_snapshot(tmp_path, upstream, yesterday):
+    sm = SymbolMaster(cache_dir=str(tmp_path))
+
+    diff = asyncio.run(sm.refresh_segment(SEGMENT))
+
+    assert upstream.requests[0].headers["if-none-match"] == "v1"
+    assert diff.not_modified and diff.is_empty
+    assert (diff.from_day, diff.to_day) == (YESTERDAY, TODAY)
+    assert not yesterday.exists()
+    assert sm._snapshot_days(SEGMENT) == [TODAY]
+    assert json.loads(sm._get_cache_path(SEGMENT).read_text()) == DAY_ONE
+    assert sm.last_diff(SEGMENT) == diff
+
+
+def test_diff_updates_loaded_indexes(tmp_path, upstream, yesterday):
+    sm = SymbolMaster(cache_dir=str(tmp_path))
+    assert asyncio.run(sm.load_segment(SEGMENT)) == 3
+
+    day_two = {
+        # Lot size revised
+        "NSE:NIFTY25JAN24000CE": _contract("NSE:NIFTY25JAN24000CE", "101", 24000, "CE", lot=65),
+        # Only the session fields moved
+        "NSE:NIFTY25JAN24000PE": _contract("NSE:NIFTY25JAN24000PE", "102", 24000, "PE", close=87.5),
+        # 24100 CE expired out; 24200 CE listed
+        "NSE:NIFTY25JAN24200CE": _contract("NSE:NIFTY25JAN24200CE", "104", 24200, "CE"),
+    }
+    upstream.serve(day_two, etag="v2")
+    diff = asyncio.run(sm.refresh_segment(SEGMENT))
+
+    assert [c.ticker for c in diff.added] == ["NSE:NIFTY25JAN24200CE"]
+    assert [c.ticker for c in diff.removed] == ["NSE:NIFTY25JAN24100CE"]
+    assert [(c.ticker, c.fields) for c in diff.changed] == [("NSE:NIFTY25JAN24000CE", ["minLotSize"])]
+    assert diff.added[0].strike == 24200 and diff.added[0].expiry == "2025-01-30"
+
+    assert sm.get_symbol("NSE:NIFTY25JAN24100CE") is None
+    assert sm.get_by_fytoken("103") is None
+    assert sm.get_by_fytoken("104").symbol_ticker == "NSE:NIFTY25JAN24200CE"
+    assert sm.get_symbol("NSE:NIFTY25JAN24000CE").min_lot_size == 65
+    assert sm.get_by_fytoken("101") is sm.get_symbol("NSE:NIFTY25JAN24000CE")
+    assert sm.get_symbol("NSE:NIFTY25JAN24000PE").previous_close == 87.5
+    assert sorted(s.symbol_ticker for s in sm._by_underlying["NIFTY"]) == sorted(day_two)
+    assert [c.ticker for c in sm.get_new_contracts("NIFTY")] == ["NSE:NIFTY25JAN24200CE"]
+
+
+def test_volatile_fields_are_not_changes():
+    old = {"NSE:X": _contract("NSE:X", "1", 24000, "CE")}
+    new = {"NSE:X": {**old["NSE:X"], "previousClose": 90.0, "previousOi": 5000, "upperPrice": 180.0,
+                     "lowerPrice": 0.05, "lastUpdate": "2025-01-03"}}
+
+    diff = symbol_master.diff_symbol_data(old, new, SEGMENT, YESTERDAY, TODAY)
+
+    assert diff.is_empty
@@ -0,0 +1,91 @@
+"""Run-scoped tool memo: allowlisted TTLs, hits and misses."""
+
+from types import SimpleNamespace
+
+import pytest
+
+import core.tool_memo as tool_memo_module
+from core.tool_memo import ToolResultMemo
+
+
+@pytest.mark.parametrize("tool_name, ttl", [
+    ("get_quotes", 15),
+    ("get_stock_price", 15),
+    ("get_oi_spurts", 120),
+    ("get_index_constituents", 3600),
+    # Live or account state, and anything not on the allowlist
+    ("get_market_status", 0),
+    ("get_positions", 0),
+    ("place_order", 0),
+    ("get_something_new", 0),
+])
+def test_ttl_lookup(tool_name, ttl):
+    assert ToolResultMemo().ttl_for(tool_name) == ttl
+
+
+def test_ttl_overrides():
+    memo = ToolResultMemo(ttls={"get_quotes": 0, "get_market_status": 5})
+
+    assert memo.ttl_for("get_quotes") == 0
+    assert memo.ttl_for("get_market_status") == 5
+    assert memo.ttl_for("get_option_chain") == 60
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(tool_memo_module, "time", SimpleNamespace(monotonic=lambda: now[0]))
+    return now
+
+
+class Upstream:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, **arguments):
+        self.calls.append(arguments)
+        return f"result {len(self.calls)}"
+
+
+def test_hit_within_ttl_and_miss_after(clock):
+    memo, upstream = ToolResultMemo(), Upstream()
+
+    with memo.run_scope():
+        first = memo.sync_hook("get_quotes", upstream, {"symbols": ["NSE:SBIN-EQ"]})
+        clock[0] += 10
+        second = memo.sync_hook("get_quotes", upstream, {"symbols": [" NSE:SBIN-EQ "]})
+        clock[0] += 10
+        third = memo.sync_hook("get_quotes", upstream, {"symbols": ["NSE:SBIN-EQ"]})
+        stats = memo.run_stats()
+
+    assert (first, second, third) == ("result 1", "result 1", "result 2")
+    assert (stats["calls"], stats["hits"], stats["misses"]) == (3, 1, 2)
+
+
+def test_unlisted_tool_always_runs(clock):
+    memo, upstream = ToolResultMemo(), Upstream()
+
+    with memo.run_scope():
+        results = [memo.sync_hook("get_market_status", upstream, {}) for _ in range(2)]
+
+    assert results == ["result 1", "result 2"]
+
+
+def test_runs_do_not_share_results(clock):
+    memo, upstream = ToolResultMemo(), Upstream()
+
+    with memo.run_scope():
+        memo.sync_hook("get_option_chain", upstream, {"symbol": "NSE:NIFTY50-INDEX"})
+    with memo.run_scope():
+        memo.sync_hook("get_option_chain", upstream, {"symbol": "NSE:NIFTY50-INDEX"})
+
+    assert len(upstream.calls) == 2
+
+
+def test_outside_a_run_is_a_pass_through(clock):
+    memo, upstream = ToolResultMemo(), Upstream()
+
+    memo.sync_hook("get_quotes", upstream, {"symbols": ["NSE:SBIN-EQ"]})
+    memo.sync_hook("get_quotes", upstream, {"symbols": ["NSE:SBIN-EQ"]})
+
+    assert len(upstream.calls) == 2
@@ -0,0 +1,61 @@
+"""Yahoo Finance symbol resolution: explicit suffixes and exchanges win."""
+
+import pytest
+
+import tools.yahoo_finance.toolkit as yahoo_toolkit
+from core.instrument_map import Instrument
+from tools.yahoo_finance import YahooFinanceToolkit
+
+
+class _Map:
+    def __init__(self, *instruments):
+        self._by_symbol = {i.symbol: i for i in instruments}
+
+    def get(self, symbol):
+        return self._by_symbol.get(symbol)
+
+
+@pytest.fixture(autouse=True)
+def instrument_map(monkeypatch):
+    instruments = _Map(
+        Instrument(symbol="ABB", fyers_ticker="NSE:ABB-EQ", yahoo="ABB.NS"),
+        Instrument(symbol="GOLDBEES", fyers_ticker="NSE:GOLDBEES-EQ", yahoo="GOLDBEES.NS"),
+    )
+    monkeypatch.setattr(yahoo_toolkit, "get_instrument_map", lambda: instruments)
+
+
+def test_indian_default_resolves_nse_equities():
+    toolkit = YahooFinanceToolkit()
+
+    assert toolkit._normalize_symbol("ABB") == "ABB.NS"
+    assert toolkit._normalize_symbol("GOLDBEES") == "GOLDBEES.NS"
+    assert toolkit._normalize_symbol("AAPL") == "AAPL"
+
+
+def test_global_default_leaves_bare_tickers():
+    toolkit = YahooFinanceToolkit(default_exchange=None)
+
+    assert toolkit._normalize_symbol("ABB") == "ABB"
+    assert toolkit._normalize_symbol("NSE:ABB") == "ABB.NS"
+
+
+@pytest.mark.parametrize("symbol, expected", [
+    ("NYSE:ABB", "ABB"),
+    ("NASDAQ:AAPL", "AAPL"),
+    ("BSE:ABB", "ABB.BO"),
+    ("NSE:IRCTC", "IRCTC.NS"),
+    ("ABB.NS", "ABB.NS"),
+    ("ABB.BO", "ABB.BO"),
+    ("VOD.L", "VOD.L"),
+    ("^NSEI", "^NSEI"),
+    ("GC=F", "GC=F"),
+])
+def test_explicit_exchange_or_suffix_wins(symbol, expected):
+    assert YahooFinanceToolkit()._normalize_symbol(symbol) == expected
+
+
+def test_exchange_argument_wins_over_default():
+    toolkit = YahooFinanceToolkit()
+
+    assert toolkit._normalize_symbol("ABB", exchange="NYSE") == "ABB"
+    assert toolkit._normalize_symbol("ABB", exchange="BSE") == "ABB.BO"
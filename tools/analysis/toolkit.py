@@ -205,9 +205,11 @@ class TechnicalScannerToolkit(Toolkit):
             self.get_moving_averages,
             self.get_oscillators,
             self.get_pivot_levels,
+            self.scan_symbols,
         ]
 
         instructions = """Use these tools for technical scanning via TradingView:
+- scan_symbols: Scan MANY symbols at once (one request) - use this first for lists
 - scan_technical_setup: Get overall technical recommendation (BUY/SELL/NEUTRAL)
 - get_moving_averages: Get SMA/EMA values (20, 50, 200)
 - get_oscillators: Get RSI, Stochastic, CCI, Williams %R, Momentum
@@ -315,6 +317,42 @@ Momentum: {tech.mom:.2f}"""
         except Exception as e:
             return f"Error fetching oscillators: {str(e)}"
 
+    def scan_symbols(self, symbols: str) -> str:
+        """
+        Scan several symbols in one TradingView request.
+
+        Much cheaper than calling scan_technical_setup per symbol. Results
+        are also cached briefly, so follow-up per-symbol tools are instant.
+
+        Args:
+            symbols: Comma-separated stock symbols (e.g., "RELIANCE,TCS,NSE:INFY")
+
+        Returns:
+            One row per symbol: recommendation, score, RSI, MACD histogram, ADX, close vs SMA200
+        """
+        try:
+            normalized = [self._normalize_symbol(s.strip()) for s in symbols.split(",") if s.strip()]
+            table = self.tv.get_technicals_batch(normalized)
+
+            def fmt(value):
+                return f"{value:.2f}" if isinstance(value, (int, float)) else "NA"
+
+            lines = ["SYMBOL | REC | SCORE | RSI | MACD_HIST | ADX | VS_SMA200%"]
+            for symbol in table.symbols:
+                tech = table.row(symbol)
+                lines.append(
+                    f"{symbol} | {tech.overall_recommendation.value} | {fmt(tech.recommend_all)} | "
+                    f"{fmt(tech.rsi)} | {fmt(tech.macd_histogram)} | {fmt(tech.adx)} | "
+                    f"{fmt(tech.price_vs_sma200)}"
+                )
+            if table.missing:
+                lines.append(f"NO_DATA: {', '.join(table.missing)}")
+
+            return "TECHNICAL_SCAN:\n" + "\n".join(lines)
+
+        except Exception as e:
+            return f"Error scanning symbols: {str(e)}"
+
     def get_pivot_levels(self, symbol: str) -> str:
         """
         Get Classic pivot levels for a symbol.
@@ -32,6 +32,7 @@ Usage:
 from agno.tools import Toolkit
 from tools.nse_india import NSEIndiaClient
 from core.indicators import CorrelationIndicators
+from core.output_format import DEFAULT_MAX_TOKENS, budget_tools, compact_json, round_value
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Optional, List, Dict, Any
@@ -40,6 +41,60 @@ import time
 import pandas as pd
 
 
+def correlation_matrix_view(data: dict, symbols: Optional[List[str]] = None, top_n: int = 15) -> str:
+    """
+    Compact JSON view of a cached/computed correlation matrix.
+
+    With ``symbols``, returns the sub-matrix for those symbols as a symbol
+    list plus rows of values. Without, the full NIFTY100 matrix (~10k
+    values) is summarized as its most / least correlated pairs.
+
+    Args:
+        data: Result of the matrix computation (or its cache file)
+        symbols: Symbols to project the matrix onto
+        top_n: Pairs listed in each direction when summarizing
+
+    Returns:
+        Compact JSON string
+    """
+    if "error" in data:
+        return compact_json(data)
+
+    matrix = data.get("correlation_matrix", {})
+    meta = {
+        k: data.get(k)
+        for k in ("data_points", "computed_at", "total_symbols", "source")
+        if k in data
+    }
+
+    if symbols:
+        selected = [s for s in symbols if s in matrix]
+        return compact_json({
+            **meta,
+            "symbols": selected,
+            "matrix": [[matrix[a].get(b) for b in selected] for a in selected],
+            "missing": [s for s in symbols if s not in matrix],
+        }, default_kind="correlation")
+
+    names = list(matrix)
+    pairs = [
+        (a, b, matrix[a][b])
+        for i, a in enumerate(names)
+        for b in names[i + 1:]
+        if matrix[a].get(b) is not None
+    ]
+    pairs.sort(key=lambda p: p[2], reverse=True)
+    values = [p[2] for p in pairs]
+    return compact_json({
+        **meta,
+        "symbols": len(names),
+        "avg_correlation": round_value(sum(values) / len(values), "correlation") if values else None,
+        "most_correlated": [[a, b, c] for a, b, c in pairs[:top_n]],
+        "least_correlated": [[a, b, c] for a, b, c in pairs[-top_n:][::-1]],
+        "note": "Pass symbols=[...] for a sub-matrix, or use get_top_correlated_pairs for one symbol",
+    }, default_kind="correlation")
+
+
 class CorrelationToolkit(Toolkit):
     """
     Toolkit for correlation analysis with precomputed NIFTY100 correlation matrix.
@@ -63,6 +118,8 @@ class CorrelationToolkit(Toolkit):
         fyers_client,
         nse_client: Optional[NSEIndiaClient] = None,
         cache_ttl_hours: int = 24,
+        max_output_tokens: Optional[int] = DEFAULT_MAX_TOKENS,
+        summary_pairs: int = 15,
         **kwargs
     ):
         """
@@ -72,11 +129,15 @@ class CorrelationToolkit(Toolkit):
             fyers_client: Authenticated FyersClient instance for price data
             nse_client: Optional NSEIndiaClient (created if not provided)
             cache_ttl_hours: Cache TTL in hours (default: 24)
+            max_output_tokens: Hard token budget per tool result (None disables)
+            summary_pairs: Most / least correlated pairs listed when the full
+                matrix is summarized
             **kwargs: Additional arguments for Toolkit base class
         """
         self.fyers = fyers_client
         self.nse = nse_client or NSEIndiaClient()
         self.cache_ttl_hours = cache_ttl_hours
+        self.summary_pairs = summary_pairs
 
         tools = [
             self.get_nifty100_correlation_matrix,
@@ -99,6 +160,8 @@ Correlation values range from -1 (inverse) to +1 (perfect correlation).
 Values > 0.7 indicate strong positive correlation.
 Values < -0.3 can be used for hedging."""
 
+        tools = budget_tools(tools, max_output_tokens)
+
         super().__init__(name="correlation_toolkit", tools=tools, instructions=instructions, **kwargs)
 
         # Ensure cache directory exists
@@ -226,7 +289,11 @@ Values < -0.3 can be used for hedging."""
 
         return result
 
-    async def get_nifty100_correlation_matrix(self) -> str:
+    def _matrix_view(self, data: dict, symbols: Optional[List[str]] = None) -> str:
+        """Compact view of the matrix (sub-matrix or pair summary)."""
+        return correlation_matrix_view(data, symbols, self.summary_pairs)
+
+    async def get_nifty100_correlation_matrix(self, symbols: Optional[List[str]] = None) -> str:
         """
         Get precomputed correlation matrix for NIFTY100 stocks.
 
@@ -236,10 +303,15 @@ Values < -0.3 can be used for hedging."""
         This tool is optimized for quick lookups - the computation is done
         once and cached for 24 hours.
 
+        Args:
+            symbols: Symbols to include (e.g., ["NSE:TCS-EQ", "NSE:INFY-EQ"]).
+                If omitted, the full matrix is summarized as its most and
+                least correlated pairs.
+
         Returns:
             JSON string with:
-            - correlation_matrix: Dict of symbol -> correlation values
-            - symbols: List of symbols included
+            - symbols / matrix: Sub-matrix rows in symbol order (if symbols given)
+            - most_correlated / least_correlated: [symbol1, symbol2, correlation] pairs
             - data_points: Number of trading days used
             - computed_at: When the matrix was computed
             - source: "cache" or "computed"
@@ -248,7 +320,7 @@ Values < -0.3 can be used for hedging."""
             data = self._load_cache()
             if data:
                 data["source"] = "cache"
-                return json.dumps(data, indent=2)
+                return self._matrix_view(data, symbols)
 
         # Compute fresh correlation
         result = await self._compute_correlation_matrix()
@@ -257,7 +329,7 @@ Values < -0.3 can be used for hedging."""
             self._save_cache(result)
             result["source"] = "computed"
 
-        return json.dumps(result, indent=2)
+        return self._matrix_view(result, symbols)
 
     async def get_pair_correlation(self, symbol1: str, symbol2: str) -> str:
         """
@@ -283,14 +355,14 @@ Values < -0.3 can be used for hedging."""
                 matrix = data.get("correlation_matrix", {})
                 if symbol1 in matrix and symbol2 in matrix.get(symbol1, {}):
                     corr = matrix[symbol1][symbol2]
-                    return json.dumps({
+                    return compact_json({
                         "symbol1": symbol1,
                         "symbol2": symbol2,
                         "correlation": round(corr, 4),
                         "strength": "STRONG" if abs(corr) > 0.7 else "MODERATE" if abs(corr) > 0.4 else "WEAK",
                         "direction": "POSITIVE" if corr > 0 else "NEGATIVE",
                         "source": "cache"
-                    }, indent=2)
+                    })
 
         # Compute directly if not in cache
         try:
@@ -298,29 +370,29 @@ Values < -0.3 can be used for hedging."""
             series2 = await self._fetch_historical_prices(symbol2, days=100)
 
             if series1 is None or series2 is None:
-                return json.dumps({"error": "Could not fetch price data for one or both symbols"})
+                return compact_json({"error": "Could not fetch price data for one or both symbols"})
 
             # Align series
             df = pd.DataFrame({symbol1: series1, symbol2: series2}).dropna()
 
             if len(df) < 30:
-                return json.dumps({"error": "Insufficient overlapping data"})
+                return compact_json({"error": "Insufficient overlapping data"})
 
             # Compute correlation on returns
             returns = df.pct_change().dropna()
             corr = returns[symbol1].corr(returns[symbol2])
 
-            return json.dumps({
+            return compact_json({
                 "symbol1": symbol1,
                 "symbol2": symbol2,
                 "correlation": round(corr, 4),
                 "strength": "STRONG" if abs(corr) > 0.7 else "MODERATE" if abs(corr) > 0.4 else "WEAK",
                 "direction": "POSITIVE" if corr > 0 else "NEGATIVE",
                 "source": "computed"
-            }, indent=2)
+            })
 
         except Exception as e:
-            return json.dumps({"error": str(e)})
+            return compact_json({"error": str(e)})
 
     async def get_top_correlated_pairs(self, symbol: str, limit: int = 10) -> str:
         """
@@ -343,12 +415,12 @@ Values < -0.3 can be used for hedging."""
 
         data = self._load_cache()
         if not data or "correlation_matrix" not in data:
-            return json.dumps({"error": "Correlation matrix not available. Try refresh_correlation_matrix first."})
+            return compact_json({"error": "Correlation matrix not available. Try refresh_correlation_matrix first."})
 
         matrix = data["correlation_matrix"]
 
         if symbol not in matrix:
-            return json.dumps({
+            return compact_json({
                 "error": f"Symbol {symbol} not in correlation matrix",
                 "available_symbols": data.get("symbols", [])[:10]
             })
@@ -360,7 +432,7 @@ Values < -0.3 can be used for hedging."""
             reverse=True
         )[:limit]
 
-        return json.dumps({
+        return compact_json({
             "reference_symbol": symbol,
             "top_correlated": [
                 {
@@ -370,7 +442,7 @@ Values < -0.3 can be used for hedging."""
                 }
                 for k, v in sorted_pairs
             ]
-        }, indent=2)
+        })
 
     async def get_least_correlated_pairs(self, symbol: str, limit: int = 10) -> str:
         """
@@ -393,12 +465,12 @@ Values < -0.3 can be used for hedging."""
 
         data = self._load_cache()
         if not data or "correlation_matrix" not in data:
-            return json.dumps({"error": "Correlation matrix not available"})
+            return compact_json({"error": "Correlation matrix not available"})
 
         matrix = data["correlation_matrix"]
 
         if symbol not in matrix:
-            return json.dumps({"error": f"Symbol {symbol} not in correlation matrix"})
+            return compact_json({"error": f"Symbol {symbol} not in correlation matrix"})
 
         correlations = matrix[symbol]
         sorted_pairs = sorted(
@@ -406,7 +478,7 @@ Values < -0.3 can be used for hedging."""
             key=lambda x: x[1]
         )[:limit]
 
-        return json.dumps({
+        return compact_json({
             "reference_symbol": symbol,
             "least_correlated": [
                 {
@@ -416,7 +488,7 @@ Values < -0.3 can be used for hedging."""
                 }
                 for k, v in sorted_pairs
             ]
-        }, indent=2)
+        })
 
     async def get_pairs_trading_metrics(self, symbol1: str, symbol2: str) -> str:
         """
@@ -442,13 +514,13 @@ Values < -0.3 can be used for hedging."""
             series2 = await self._fetch_historical_prices(symbol2, days=100)
 
             if series1 is None or series2 is None:
-                return json.dumps({"error": "Could not fetch price data"})
+                return compact_json({"error": "Could not fetch price data"})
 
             # Align series
             df = pd.DataFrame({symbol1: series1, symbol2: series2}).dropna()
 
             if len(df) < 60:
-                return json.dumps({"error": "Insufficient data (need at least 60 days)"})
+                return compact_json({"error": "Insufficient data (need at least 60 days)"})
 
             prices1 = df[symbol1]
             prices2 = df[symbol2]
@@ -502,10 +574,10 @@ Values < -0.3 can be used for hedging."""
                 "signal_description": signal_desc,
             }
 
-            return json.dumps(metrics, indent=2)
+            return compact_json(metrics)
 
         except Exception as e:
-            return json.dumps({"error": str(e)})
+            return compact_json({"error": str(e)})
 
     async def refresh_correlation_matrix(self) -> str:
         """
@@ -515,7 +587,7 @@ Values < -0.3 can be used for hedging."""
         Note: This operation fetches data for ~100 symbols and may take time.
 
         Returns:
-            JSON with fresh correlation matrix
+            JSON summary of the fresh correlation matrix
         """
         result = await self._compute_correlation_matrix()
 
@@ -523,4 +595,4 @@ Values < -0.3 can be used for hedging."""
             self._save_cache(result)
             result["source"] = "refreshed"
 
-        return json.dumps(result, indent=2)
+        return self._matrix_view(result)
@@ -3,6 +3,8 @@
 import logging
 from typing import Any
 
+from core.instrument_map import InstrumentMap, get_instrument_map, is_symbol_like, normalize_key
+
 from .core.http_client import GrowwHTTPClient
 from .core.exceptions import (
     GrowwNotFoundError,
@@ -43,13 +45,54 @@ class GrowwClient:
         "MIDCPNIFTY": "nifty-midcap-select",
     }
 
-    def __init__(self, timeout: float = 30.0) -> None:
+    def __init__(self, timeout: float = 30.0, instrument_map: InstrumentMap | None = None) -> None:
         """Initialize the client.
 
         Args:
             timeout: Request timeout in seconds
+            instrument_map: Identity map caching search ids by NSE symbol (default: shared map)
         """
         self.http_client = GrowwHTTPClient(timeout=timeout)
+        self._instruments = instrument_map
+
+    @property
+    def instruments(self) -> InstrumentMap:
+        """Cross-provider instrument identity map."""
+        if self._instruments is None:
+            self._instruments = get_instrument_map()
+        return self._instruments
+
+    def resolve_search_id(self, symbol: str) -> str | None:
+        """Get the Groww search id (URL slug) for an NSE symbol.
+
+        Answered from the instrument identity map; on a miss the symbol is
+        searched once and the result whose NSE code matches is written back.
+
+        Args:
+            symbol: NSE symbol (e.g., "RELIANCE")
+
+        Returns:
+            Search id (e.g., "reliance-industries-ltd") or None if not found
+        """
+        key = normalize_key(symbol)
+        ids = self.instruments.lookup(key, "groww")
+        if ids is not None:
+            return ids["groww_search_id"]
+        if self.instruments.is_miss(key, "groww"):
+            return None
+
+        for result in self.search(key):
+            if result["entity_type"] == "Stocks" and (result["nse_scrip_code"] or "").upper() == key:
+                self.instruments.record(key, "groww", groww_search_id=result["search_id"])
+                return result["search_id"]
+        self.instruments.record_miss(key, "groww")
+        return None
+
+    def _to_search_id(self, symbol_or_id: str) -> str:
+        """Search ids are lower-case slugs; upper-case NSE symbols are resolved to one."""
+        if symbol_or_id.isupper() and is_symbol_like(symbol_or_id):
+            return self.resolve_search_id(symbol_or_id) or symbol_or_id
+        return symbol_or_id
 
     def search(self, query: str, size: int = 6) -> list[dict[str, Any]]:
         """Search for stocks and options by name or symbol.
@@ -107,8 +150,9 @@ class GrowwClient:
         """Fetch options chain data with greeks for a symbol.
 
         Args:
-            symbol: Symbol to fetch (e.g., "NIFTY", "BANKNIFTY", "reliance-industries-ltd")
-                   Index symbols are automatically mapped to Groww format.
+            symbol: Symbol to fetch (e.g., "NIFTY", "BANKNIFTY", "reliance-industries-ltd", "RELIANCE")
+                   Index symbols are automatically mapped to Groww format and NSE
+                   stock symbols are resolved to their search id.
             expiry_date: Expiry date in YYYY-MM-DD format (optional, defaults to nearest)
 
         Returns:
@@ -129,8 +173,8 @@ class GrowwClient:
             GrowwNotFoundError: If symbol not found
             GrowwAPIError: If request fails
         """
-        # Map user-friendly symbol to Groww format
-        mapped_symbol = self.INDEX_MAP.get(symbol.upper(), symbol)
+        # Map user-friendly symbol to Groww format (indices, then NSE stock symbols)
+        mapped_symbol = self.INDEX_MAP.get(symbol.upper()) or self._to_search_id(symbol)
 
         url = self.OPTION_CHAIN_URL.format(symbol=mapped_symbol)
         params: dict[str, Any] = {"responseStructure": "LIST"}
@@ -266,7 +310,8 @@ class GrowwClient:
         """Fetch company details and fundamentals.
 
         Args:
-            search_id: Groww search ID (URL slug like "reliance-industries-ltd")
+            search_id: Groww search ID (URL slug like "reliance-industries-ltd"),
+                or an upper-case NSE symbol (resolved via resolve_search_id)
 
         Returns:
             Dict with comprehensive company data including:
@@ -281,7 +326,7 @@ class GrowwClient:
             GrowwNotFoundError: If company not found
             GrowwAPIError: If request fails
         """
-        url = self.COMPANY_URL.format(search_id=search_id)
+        url = self.COMPANY_URL.format(search_id=self._to_search_id(search_id))
         params = {"page": 0, "size": 10}
 
         data = self.http_client.get_json(url, params=params)
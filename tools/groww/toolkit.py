@@ -47,12 +47,13 @@ class GrowwToolkit(Toolkit):
 - Get Indian indices (NIFTY 50, Bank Nifty, sectoral indices)
 
 For options data, supported indices: NIFTY, BANKNIFTY, FINNIFTY, MIDCPNIFTY
-For stocks, use the search_id from search results (e.g., "reliance-industries-ltd")
+For stocks, use the NSE symbol (e.g., "RELIANCE") or the search_id from search results
+(e.g., "reliance-industries-ltd")
 
 Symbol format:
-- For options: Use index name (NIFTY, BANKNIFTY) or search_id for stocks
+- For options: Use index name (NIFTY, BANKNIFTY), or NSE symbol / search_id for stocks
 - For live price: Use NSE scrip code (RELIANCE, TCS, INFY)
-- For company details: Use search_id (reliance-industries-ltd)"""
+- For company details: Use NSE symbol (RELIANCE) or search_id (reliance-industries-ltd)"""
 
         super().__init__(name="groww", tools=tools, instructions=instructions, **kwargs)
 
@@ -116,8 +117,8 @@ Symbol format:
         - Max OI strikes (potential support/resistance)
 
         Args:
-            symbol: Index name (NIFTY, BANKNIFTY, FINNIFTY) or stock search_id
-                   (e.g., "reliance-industries-ltd" from search results)
+            symbol: Index name (NIFTY, BANKNIFTY, FINNIFTY), NSE stock symbol
+                   ("RELIANCE") or stock search_id ("reliance-industries-ltd")
             expiry_date: Expiry date in YYYY-MM-DD format (optional, defaults to nearest)
             strikes_around_atm: Number of strikes to show around ATM (default: 10)
 
@@ -304,7 +305,7 @@ Symbol format:
 
         Args:
             search_id: Groww search ID from search results
-                      (e.g., "reliance-industries-ltd", "tcs")
+                      (e.g., "reliance-industries-ltd", "tcs") or NSE symbol ("RELIANCE")
 
         Returns:
             Markdown formatted company profile with fundamentals
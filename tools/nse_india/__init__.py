@@ -30,6 +30,7 @@ from .models.chart import (
     SymbolSearchResponse,
     SymbolType,
 )
+from .storage.search import AnnouncementSearchIndex, SearchHit
 from .storage.tracker import AnnouncementTracker, ProcessedAnnouncement
 from .toolkit import NSEIndiaToolkit
 
@@ -64,6 +65,8 @@ __all__ = [
     # Storage
     "AnnouncementTracker",
     "ProcessedAnnouncement",
+    "AnnouncementSearchIndex",
+    "SearchHit",
     # Deals (bulk, block, short selling)
     "BlockDeal",
     "BulkDeal",
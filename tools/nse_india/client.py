@@ -1,14 +1,25 @@
 """NSE India API client for fetching corporate announcements and annual reports."""
 
+import asyncio
 import csv
 import datetime
+import hashlib
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date
 from io import StringIO
+from itertools import takewhile
 from pathlib import Path
 from typing import Any
 
+from core.bar_store import BarSeries, BarSeriesStore, get_bar_store
+from core.config import get_settings
+from core.instrument_map import InstrumentMap, get_instrument_map
+
 from .core.cache import CacheConfig, CacheTTL
 from .core.exceptions import NSEIndiaParseError
+from .core.async_http_client import AsyncNSEIndiaHTTPClient
 from .core.http_client import NSEIndiaHTTPClient
 from .models.announcement import (
     Announcement,
@@ -125,7 +136,13 @@ from .models.chart import (
     SymbolSearchResponse,
     SymbolType,
 )
-from .storage.tracker import AnnouncementTracker, ProcessedAnnouncement
+from .storage.option_chain import OptionChainSeriesStore, record_option_chain_snapshot
+from .storage.pre_open import PreOpenSeries, PreOpenSeriesStore, record_pre_open_session
+from .storage.search import AnnouncementSearchIndex, SearchHit
+from .storage.securities import SecuritiesMasterStore
+from .storage.tracker import AnnouncementTracker, AttachmentFile, ProcessedAnnouncement
+
+logger = logging.getLogger(__name__)
 
 
 class NSEIndiaClient:
@@ -139,6 +156,9 @@ class NSEIndiaClient:
     - Real-time data (prices, OI) cached briefly (30s-2min)
     - Semi-static data (financials, shareholding) cached longer (days/weeks)
     - Static data (metadata, annual reports) cached for 30 days
+    - Awaitable ``a*`` variants of the hot methods (option chain, quote,
+      OI spurts, index constituents, historical data) backed by a pooled
+      async client, for use inside async agents and teams
     """
 
     def __init__(
@@ -147,6 +167,9 @@ class NSEIndiaClient:
         db_path: str | Path = "nse_announcements.db",
         attachments_dir: str | Path = "nse_attachments",
         cache_enabled: bool = True,
+        instrument_map: InstrumentMap | None = None,
+        securities_dir: str | Path | None = None,
+        bar_store: BarSeriesStore | None = None,
     ):
         """Initialize the NSE India client.
 
@@ -155,17 +178,60 @@ class NSEIndiaClient:
             db_path: Path to SQLite database for tracking processed announcements
             attachments_dir: Directory to store downloaded attachments
             cache_enabled: Whether to enable response caching (default: True)
+            instrument_map: Identity map caching chart scripcodes (default: shared map)
+            securities_dir: Daily parsed securities master (default: settings.SECURITIES_DIR)
+            bar_store: Local store for GIFT NIFTY candles (default: shared store)
         """
         cache_config = CacheConfig(enabled=cache_enabled)
+        self._timeout = timeout
+        self._cache_config = cache_config
         self._http = NSEIndiaHTTPClient(timeout=timeout, cache_config=cache_config)
+        self._async_http: AsyncNSEIndiaHTTPClient | None = None
         self._tracker = AnnouncementTracker(db_path=db_path)
+        self._search_index: AnnouncementSearchIndex | None = None
         self._attachments_dir = Path(attachments_dir)
+        self._instruments = instrument_map
+        self._securities_dir = securities_dir
+        self._securities_store: SecuritiesMasterStore | None = None
+        self._securities: tuple[str, SecuritiesResponse] | None = None
+        self._securities_lock = threading.Lock()
+        self._bar_store = bar_store
+
+    @property
+    def instruments(self) -> InstrumentMap:
+        """Cross-provider instrument identity map."""
+        if self._instruments is None:
+            self._instruments = get_instrument_map()
+        return self._instruments
+
+    @property
+    def bar_store(self) -> BarSeriesStore:
+        """Local append-only OHLCV series (GIFT NIFTY history)."""
+        if self._bar_store is None:
+            self._bar_store = get_bar_store()
+        return self._bar_store
 
     @property
     def tracker(self) -> AnnouncementTracker:
         """Get the announcement tracker."""
         return self._tracker
 
+    @property
+    def search_index(self) -> AnnouncementSearchIndex:
+        """Full-text index over tracked announcements (in the tracker database)."""
+        if self._search_index is None:
+            self._search_index = AnnouncementSearchIndex(db_path=self._tracker.db_path)
+        return self._search_index
+
+    @property
+    def async_http(self) -> AsyncNSEIndiaHTTPClient:
+        """Lazily created async HTTP client (shares cache config with the sync one)."""
+        if self._async_http is None:
+            self._async_http = AsyncNSEIndiaHTTPClient(
+                timeout=self._timeout, cache_config=self._cache_config
+            )
+        return self._async_http
+
     # === Cache Control Methods ===
 
     @property
@@ -195,8 +261,9 @@ class NSEIndiaClient:
         self._http.disable_cache()
 
     def clear_cache(self) -> None:
-        """Clear all cached responses."""
+        """Clear all cached responses (including the in-memory securities master)."""
         self._http.clear_cache()
+        self._securities = None
 
     def _parse_csv(
         self,
@@ -584,8 +651,12 @@ class NSEIndiaClient:
         """
         if not announcement.has_attachment:
             return None
+        return self._http.download_file(
+            announcement.attachment_url, self._attachment_path(announcement, subdir)
+        )
 
-        # Determine save directory
+    def _attachment_path(self, announcement: Announcement, subdir: str | None = None) -> Path:
+        """Local path for an announcement's attachment."""
         save_dir = self._attachments_dir
         if subdir:
             save_dir = save_dir / subdir
@@ -597,8 +668,99 @@ class NSEIndiaClient:
         if isinstance(announcement, EquityAnnouncement):
             filename = f"{announcement.symbol}_{filename}"
 
-        save_path = save_dir / filename
-        return self._http.download_file(announcement.attachment_url, save_path)
+        return save_dir / filename
+
+    def download_attachments(
+        self,
+        announcements: list[Announcement],
+        subdir: str | None = None,
+        max_workers: int = 4,
+    ) -> dict[str, Path]:
+        """Download the attachments of many announcements concurrently.
+
+        Each distinct URL is fetched once, by at most ``max_workers``
+        threads sharing the pooled HTTP client. URLs downloaded on an
+        earlier run are reused, interrupted downloads resume, and a file
+        whose content (SHA-256) matches one already on disk is deleted in
+        favour of the existing copy. Failed downloads are skipped.
+
+        Args:
+            announcements: Announcements (those without attachments are ignored)
+            subdir: Optional subdirectory within attachments_dir
+            max_workers: Maximum concurrent downloads
+
+        Returns:
+            Dict of announcement unique_id to local attachment path
+        """
+        by_url: dict[str, list[Announcement]] = {}
+        for announcement in announcements:
+            if announcement.has_attachment:
+                by_url.setdefault(announcement.attachment_url, []).append(announcement)
+        if not by_url:
+            return {}
+
+        url_paths: dict[str, Path] = {}
+        for url, known in self._tracker.get_attachments(list(by_url)).items():
+            if Path(known.path).exists():
+                url_paths[url] = Path(known.path)
+
+        pending: dict[str, Path] = {}
+        for url, group in by_url.items():
+            if url in url_paths:
+                continue
+            path = self._attachment_path(group[0], subdir)
+            if path in pending.values():
+                # Same filename under a different URL: never share a .part file
+                suffix = hashlib.sha1(url.encode()).hexdigest()[:8]
+                path = path.with_name(f"{path.stem}_{suffix}{path.suffix}")
+            pending[url] = path
+        downloaded: list[AttachmentFile] = []
+        if pending:
+            with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(pending)))) as pool:
+                futures = {
+                    url: pool.submit(self._download_hashed, url, path)
+                    for url, path in pending.items()
+                }
+                for url, future in futures.items():
+                    try:
+                        downloaded.append(future.result())
+                    except Exception as e:
+                        # Continue processing even if a download fails
+                        logger.warning(f"Attachment download failed for {url}: {e}")
+
+        # Keep one file per distinct content
+        canonical = {
+            digest: known.path
+            for digest, known in self._tracker.get_attachments_by_hash(
+                [f.sha256 for f in downloaded]
+            ).items()
+            if Path(known.path).exists()
+        }
+        for f in downloaded:
+            existing = canonical.setdefault(f.sha256, f.path)
+            if existing != f.path:
+                Path(f.path).unlink(missing_ok=True)
+                f.path = existing
+            url_paths[f.url] = Path(f.path)
+        self._tracker.record_attachments(downloaded)
+
+        return {
+            announcement.unique_id: url_paths[url]
+            for url, group in by_url.items()
+            if url in url_paths
+            for announcement in group
+        }
+
+    def _download_hashed(self, url: str, save_path: Path) -> AttachmentFile:
+        """Download (or resume) one attachment and hash its content."""
+        path = self._http.download_file(url, save_path)
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+        return AttachmentFile(
+            url=url, sha256=digest.hexdigest(), path=str(path), size=path.stat().st_size
+        )
 
     def download_annual_report(
         self,
@@ -634,14 +796,16 @@ class NSEIndiaClient:
         from_date: date | None = None,
         to_date: date | None = None,
         symbol: str | None = None,
+        max_workers: int = 4,
     ) -> list[ProcessedAnnouncement]:
         """Fetch new announcements, optionally download PDFs, and mark as processed.
 
         This is the main method for processing announcements. It:
         1. Fetches all announcements matching the criteria
         2. Filters out already-processed ones
-        3. Optionally downloads PDF attachments
-        4. Marks each announcement as processed in the database
+        3. Optionally downloads PDF attachments (concurrently, see download_attachments)
+        4. Marks the batch as processed in the database in one transaction
+        5. Adds the batch (and attachment text) to the full-text search index
 
         Args:
             index: Type of announcements
@@ -649,6 +813,7 @@ class NSEIndiaClient:
             from_date: Start date for filtering (optional)
             to_date: End date for filtering (optional)
             symbol: Stock symbol to filter by (optional)
+            max_workers: Maximum concurrent attachment downloads
 
         Returns:
             List of ProcessedAnnouncement records
@@ -661,33 +826,60 @@ class NSEIndiaClient:
             symbol=symbol,
         )
 
-        processed: list[ProcessedAnnouncement] = []
+        attachment_paths: dict[str, str] = {}
+        if download_attachments:
+            paths = self.download_attachments(
+                new_announcements, subdir=index.value, max_workers=max_workers
+            )
+            attachment_paths = {uid: str(path) for uid, path in paths.items()}
 
-        for announcement in new_announcements:
-            attachment_path: str | None = None
+        processed = self._tracker.mark_processed_many(
+            new_announcements, index_type=index, attachment_paths=attachment_paths
+        )
+        try:
+            self.search_index.add(processed)
+        except Exception as e:
+            # Indexing is best-effort; the next search_announcements sync catches up
+            logger.warning(f"Could not index announcements: {e}")
+        return processed
 
-            # Download attachment if requested
-            if download_attachments and announcement.has_attachment:
-                try:
-                    path = self.download_attachment(
-                        announcement,
-                        subdir=index.value,
-                    )
-                    if path:
-                        attachment_path = str(path)
-                except Exception:
-                    # Continue processing even if download fails
-                    pass
+    def search_announcements(
+        self,
+        query: str,
+        symbol: str | None = None,
+        from_date: date | None = None,
+        to_date: date | None = None,
+        category: str | None = None,
+        index: AnnouncementIndex | None = None,
+        limit: int = 20,
+    ) -> list[SearchHit]:
+        """Full-text search over processed announcements and their PDF text.
 
-            # Mark as processed
-            record = self._tracker.mark_processed(
-                announcement=announcement,
-                index_type=index,
-                attachment_path=attachment_path,
-            )
-            processed.append(record)
+        Searches the local index only (no network). Tracked announcements
+        not indexed yet are indexed first.
 
-        return processed
+        Args:
+            query: Free-text query (all words must match, "quoted phrases" allowed)
+            symbol: Stock symbol to filter by (optional)
+            from_date: Start date for filtering (optional)
+            to_date: End date for filtering (optional)
+            category: Text the announcement subject must contain (optional)
+            index: Type of announcements to filter by (optional)
+            limit: Maximum number of hits
+
+        Returns:
+            List of SearchHit objects, best match first
+        """
+        self.search_index.sync()
+        return self.search_index.search(
+            query,
+            symbol=symbol,
+            from_date=from_date,
+            to_date=to_date,
+            category=category,
+            index_type=index.value if index else None,
+            limit=limit,
+        )
 
     # Financial Results API methods
     def get_financial_results(
@@ -1456,15 +1648,51 @@ class NSEIndiaClient:
         return sorted(small_caps, key=lambda s: s.total_traded_value, reverse=True)[:limit]
 
     # Securities (Listed Stocks) API methods
+    @property
+    def securities_store(self) -> SecuritiesMasterStore:
+        """Daily on-disk cache of the parsed securities master."""
+        if self._securities_store is None:
+            self._securities_store = SecuritiesMasterStore(
+                self._securities_dir or get_settings().SECURITIES_DIR
+            )
+        return self._securities_store
+
     def get_listed_securities(self) -> SecuritiesResponse:
         """Get list of all securities available for trading on NSE.
 
         Fetches the complete list of equity securities from NSE's CSV file,
         including symbol, company name, series, listing date, ISIN, and face value.
 
+        The parsed master is kept once per day: in memory (so repeated
+        per-symbol lookups reuse the same indexed response) and on disk
+        under ``securities_dir`` (so other processes skip the CSV parse).
+
         Returns:
             SecuritiesResponse containing all listed securities
         """
+        if not self.cache_enabled:
+            return self._fetch_listed_securities()
+
+        today = date.today().isoformat()
+        with self._securities_lock:
+            if self._securities is not None and self._securities[0] == today:
+                return self._securities[1]
+
+            response = self.securities_store.load(today)
+            if response is None:
+                response = self._fetch_listed_securities()
+                if not response.securities:
+                    return response
+                try:
+                    self.securities_store.save(response, today)
+                except OSError as e:
+                    logger.warning(f"Could not store securities master: {e}")
+
+            self._securities = (today, response)
+            return response
+
+    def _fetch_listed_securities(self) -> SecuritiesResponse:
+        """Download and parse EQUITY_L.csv."""
         csv_url = "https://nsearchives.nseindia.com/content/equities/EQUITY_L.csv"
         csv_content = self._http.get_csv(csv_url)
 
@@ -1571,12 +1799,25 @@ class NSEIndiaClient:
         """Close the HTTP client."""
         self._http.close()
 
+    async def aclose(self) -> None:
+        """Close both the sync and async HTTP clients."""
+        self._http.close()
+        if self._async_http is not None:
+            await self._async_http.aclose()
+            self._async_http = None
+
     def __enter__(self) -> "NSEIndiaClient":
         return self
 
     def __exit__(self, *args) -> None:
         self.close()
 
+    async def __aenter__(self) -> "NSEIndiaClient":
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.aclose()
+
     # Quote API methods
     def _get_quote_api(self, function_name: str, **params) -> dict[str, Any]:
         """Call the NSE Quote API with the given function and parameters."""
@@ -1585,6 +1826,13 @@ class NSEIndiaClient:
             "/api/NextApi/apiClient/GetQuoteApi", params=query_params
         )
 
+    async def _aget_quote_api(self, function_name: str, **params) -> dict[str, Any]:
+        """Async version of _get_quote_api."""
+        query_params = {"functionName": function_name, **params}
+        return await self.async_http.get_json(
+            "/api/NextApi/apiClient/GetQuoteApi", params=query_params
+        )
+
     def get_symbol_name(self, symbol: str) -> dict[str, Any]:
         """Get symbol name and company details."""
         return self._get_quote_api("getSymbolName", symbol=symbol.upper())
@@ -1604,6 +1852,17 @@ class NSEIndiaClient:
             series=series,
         )
 
+    async def aget_symbol_data(
+        self, symbol: str, market_type: str = "N", series: str = "EQ"
+    ) -> dict[str, Any]:
+        """Async version of get_symbol_data (live quote)."""
+        return await self._aget_quote_api(
+            "getSymbolData",
+            symbol=symbol.upper(),
+            marketType=market_type,
+            series=series,
+        )
+
     def get_shareholding_pattern(
         self, symbol: str, no_of_records: int = 5
     ) -> dict[str, Any]:
@@ -2042,29 +2301,84 @@ class NSEIndiaClient:
         }
 
         response = self._http.get_json("/api/option-chain-v3", params=params)
+        return self._parse_option_chain(response)
 
+    async def aget_option_chain(
+        self,
+        symbol: str,
+        expiry: str,
+        security_type: str = "Equity",
+    ) -> OptionChainResponse:
+        """Async version of get_option_chain."""
+        params: dict[str, str] = {
+            "type": security_type,
+            "symbol": symbol.upper(),
+            "expiry": expiry,
+        }
+
+        response = await self.async_http.get_json("/api/option-chain-v3", params=params)
+        return self._parse_option_chain(response)
+
+    def _parse_option_chain(self, response: Any) -> OptionChainResponse:
+        """Parse a raw option-chain-v3 response."""
         if not isinstance(response, dict):
             return OptionChainResponse(timestamp="", underlyingValue=0, data=[])
 
-        # Parse the records into OptionChainStrike objects
         records = response.get("records", {})
         timestamp = records.get("timestamp", "")
         underlying_value = records.get("underlyingValue", 0)
         data = records.get("data", [])
 
-        strikes = []
-        for item in data:
-            try:
-                strike = OptionChainStrike.model_validate(item)
-                strikes.append(strike)
-            except Exception:
-                continue
+        # Columns and aggregates are built once; strike models are validated on demand
+        return OptionChainResponse.from_records(timestamp, underlying_value, data)
 
-        return OptionChainResponse(
-            timestamp=timestamp,
-            underlyingValue=underlying_value,
-            data=strikes,
-        )
+    async def arecord_option_chain_snapshot(
+        self,
+        store: OptionChainSeriesStore,
+        underlyings: list[str],
+        expiries: int = 2,
+    ) -> dict[str, int]:
+        """Record one option-chain snapshot per underlying and expiry.
+
+        Resolves the ``expiries`` nearest expiries of each underlying
+        (contract info is cached), then fetches every chain concurrently
+        and uncached, appending to today's series in ``store``.
+
+        Args:
+            store: Destination store (one file per day, underlying and expiry)
+            underlyings: Option underlyings (e.g., ["NIFTY", "BANKNIFTY", "RELIANCE"])
+            expiries: Nearest expiries to record per underlying
+
+        Returns:
+            Snapshot count per recorded "UNDERLYING expiry"
+        """
+        index_underlyings = {"NIFTY", "BANKNIFTY", "FINNIFTY", "MIDCPNIFTY", "NIFTYNXT50"}
+
+        async def nearest_expiries(symbol: str) -> list[str]:
+            response = await self.async_http.get_json(
+                "/api/option-chain-contract-info", params={"symbol": symbol}
+            )
+            if not isinstance(response, dict):
+                return []
+            return OptionContractInfo.model_validate(response).expiry_dates[:expiries]
+
+        async def fetch(symbol: str, expiry: str) -> Any:
+            params = {
+                "type": "Index" if symbol in index_underlyings else "Equity",
+                "symbol": symbol,
+                "expiry": expiry,
+            }
+            return await self.async_http.get_json("/api/option-chain-v3", params=params, skip_cache=True)
+
+        symbols = [u.strip().upper() for u in underlyings if u.strip()]
+        resolved = await asyncio.gather(*(nearest_expiries(u) for u in symbols), return_exceptions=True)
+        targets = []
+        for symbol, result in zip(symbols, resolved):
+            if isinstance(result, BaseException):
+                logger.warning(f"Could not resolve expiries for {symbol}: {result}")
+                continue
+            targets.extend((symbol, expiry) for expiry in result)
+        return await record_option_chain_snapshot(fetch, store, targets)
 
     def get_option_chain_analysis(
         self,
@@ -2210,7 +2524,15 @@ class NSEIndiaClient:
             OISpurtsResponse containing list of OI spurt data
         """
         response = self._http.get_json("/api/live-analysis-oi-spurts-underlyings")
+        return self._parse_oi_spurts(response)
+
+    async def aget_oi_spurts(self) -> OISpurtsResponse:
+        """Async version of get_oi_spurts."""
+        response = await self.async_http.get_json("/api/live-analysis-oi-spurts-underlyings")
+        return self._parse_oi_spurts(response)
 
+    def _parse_oi_spurts(self, response: Any) -> OISpurtsResponse:
+        """Parse a raw OI spurts response."""
         # API returns {"data": [...]} structure
         if isinstance(response, dict):
             data_list = response.get("data", [])
@@ -2850,29 +3172,29 @@ class NSEIndiaClient:
         """
         params = {"key": index}
         response = self._http.get_json("/api/market-data-pre-open", params=params)
+        return self._parse_pre_open(response)
+
+    async def aget_pre_open_data(self, index: str = "NIFTY") -> PreOpenResponse:
+        """Async version of get_pre_open_data."""
+        params = {"key": index}
+        response = await self.async_http.get_json("/api/market-data-pre-open", params=params)
+        return self._parse_pre_open(response)
 
+    def _parse_pre_open(self, response: Any) -> PreOpenResponse:
         if not isinstance(response, dict):
             return PreOpenResponse()
 
-        # Parse top-level counts
-        declines = response.get("declines", 0)
-        advances = response.get("advances", 0)
-        unchanged = response.get("unchanged", 0)
-
-        # Parse stock data
         stocks = []
-        data_list = response.get("data", [])
-        for item in data_list:
+        for item in response.get("data", []):
             try:
-                stock = PreOpenStock.model_validate(item)
-                stocks.append(stock)
+                stocks.append(PreOpenStock.model_validate(item))
             except Exception:
                 continue
 
         return PreOpenResponse(
-            declines=declines,
-            advances=advances,
-            unchanged=unchanged,
+            declines=response.get("declines", 0),
+            advances=response.get("advances", 0),
+            unchanged=response.get("unchanged", 0),
             data=stocks,
         )
 
@@ -2964,18 +3286,10 @@ class NSEIndiaClient:
         """
         response = self.get_pre_open_data(index)
 
-        gap_up = [
-            s for s in response.gapping_up
-            if s.metadata.gap_percentage >= min_gap_pct
-        ]
-        gap_down = [
-            s for s in response.gapping_down
-            if s.metadata.gap_percentage <= -min_gap_pct
-        ]
-
+        # gapping_up/gapping_down are already ordered by gap size, largest first
         return {
-            "gap_up": sorted(gap_up, key=lambda x: x.metadata.gap_percentage, reverse=True),
-            "gap_down": sorted(gap_down, key=lambda x: x.metadata.gap_percentage),
+            "gap_up": list(takewhile(lambda x: x.metadata.gap_percentage >= min_gap_pct, response.gapping_up)),
+            "gap_down": list(takewhile(lambda x: x.metadata.gap_percentage <= -min_gap_pct, response.gapping_down)),
         }
 
     def get_symbol_pre_open_data(self, symbol: str, index: str = "NIFTY") -> PreOpenStock | None:
@@ -2994,12 +3308,16 @@ class NSEIndiaClient:
     def get_pre_open_snapshot(self) -> PreOpenMarketSnapshot:
         """Get pre-open data for all major indices.
 
+        The three feeds are fetched concurrently.
+
         Returns:
             PreOpenMarketSnapshot containing data for NIFTY 50, Bank NIFTY, etc.
         """
-        nifty_50 = self.get_pre_open_data("NIFTY")
-        nifty_bank = self.get_pre_open_data("BANKNIFTY")
-        fo_securities = self.get_pre_open_data("FO")
+        self._http.client  # Establish the session once before fanning out
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            nifty_50, nifty_bank, fo_securities = pool.map(
+                self.get_pre_open_data, ("NIFTY", "BANKNIFTY", "FO")
+            )
 
         return PreOpenMarketSnapshot(
             nifty_50=nifty_50,
@@ -3007,6 +3325,48 @@ class NSEIndiaClient:
             fo_securities=fo_securities,
         )
 
+    async def aget_pre_open_snapshot(self) -> PreOpenMarketSnapshot:
+        """Async version of get_pre_open_snapshot; the three feeds are fetched concurrently."""
+        nifty_50, nifty_bank, fo_securities = await asyncio.gather(
+            self.aget_pre_open_data("NIFTY"),
+            self.aget_pre_open_data("BANKNIFTY"),
+            self.aget_pre_open_data("FO"),
+        )
+
+        return PreOpenMarketSnapshot(
+            nifty_50=nifty_50,
+            nifty_bank=nifty_bank,
+            fo_securities=fo_securities,
+        )
+
+    async def arecord_pre_open_session(
+        self,
+        store: PreOpenSeriesStore,
+        until: datetime.datetime,
+        cadence_s: float = 20.0,
+    ) -> PreOpenSeries:
+        """Record the pre-open session into a columnar series store.
+
+        Polls the NIFTY, BANKNIFTY and FO feeds concurrently (uncached)
+        every ``cadence_s`` seconds until ``until``. The raw responses are
+        read straight into columns; no per-stock models are built.
+
+        Args:
+            store: Destination store (one file per day)
+            until: Stop polling after this time (typically 9:08 IST)
+            cadence_s: Seconds between polls
+
+        Returns:
+            PreOpenSeries for today
+        """
+
+        async def fetch(feed: str) -> Any:
+            return await self.async_http.get_json(
+                "/api/market-data-pre-open", params={"key": feed}, skip_cache=True
+            )
+
+        return await record_pre_open_session(fetch, store, until=until, cadence_s=cadence_s)
+
     def get_pre_open_buy_pressure(
         self, index: str = "NIFTY", min_ratio: float = 1.5
     ) -> list[PreOpenStock]:
@@ -3022,9 +3382,7 @@ class NSEIndiaClient:
             List of stocks sorted by buy/sell ratio (descending)
         """
         response = self.get_pre_open_data(index)
-
-        filtered = [s for s in response.data if s.buy_sell_ratio >= min_ratio]
-        return sorted(filtered, key=lambda x: x.buy_sell_ratio, reverse=True)
+        return list(takewhile(lambda x: x.buy_sell_ratio >= min_ratio, response.stocks_with_buy_pressure))
 
     def get_pre_open_sell_pressure(
         self, index: str = "NIFTY", max_ratio: float = 0.67
@@ -3041,9 +3399,7 @@ class NSEIndiaClient:
             List of stocks sorted by buy/sell ratio (ascending)
         """
         response = self.get_pre_open_data(index)
-
-        filtered = [s for s in response.data if s.buy_sell_ratio <= max_ratio]
-        return sorted(filtered, key=lambda x: x.buy_sell_ratio)
+        return list(takewhile(lambda x: x.buy_sell_ratio <= max_ratio, response.stocks_with_sell_pressure))
 
     # Index Constituents API methods
     def get_index_master(self) -> IndexMaster:
@@ -3079,7 +3435,18 @@ class NSEIndiaClient:
         """
         params = {"index": index_name}
         response = self._http.get_json("/api/equity-stockIndices", params=params)
+        return self._parse_index_constituents(response, index_name)
 
+    async def aget_index_constituents(self, index_name: str) -> IndexConstituentsResponse:
+        """Async version of get_index_constituents."""
+        params = {"index": index_name}
+        response = await self.async_http.get_json("/api/equity-stockIndices", params=params)
+        return self._parse_index_constituents(response, index_name)
+
+    def _parse_index_constituents(
+        self, response: Any, index_name: str
+    ) -> IndexConstituentsResponse:
+        """Parse a raw equity-stockIndices response."""
         if not isinstance(response, dict):
             return IndexConstituentsResponse()
 
@@ -3343,7 +3710,20 @@ class NSEIndiaClient:
         payload = {"symbol": symbol, "segment": segment}
 
         data = self._http.post_json(url, payload, ttl=CacheTTL.DAILY)
+        return self._parse_chart_symbols(data, symbol)
+
+    async def asearch_chart_symbols(
+        self, symbol: str, segment: str = ""
+    ) -> SymbolSearchResponse:
+        """Async version of search_chart_symbols."""
+        url = "https://charting.nseindia.com/v1/exchanges/symbolsDynamic"
+        payload = {"symbol": symbol, "segment": segment}
+
+        data = await self.async_http.post_json(url, payload, ttl=CacheTTL.DAILY)
+        return self._parse_chart_symbols(data, symbol)
 
+    def _parse_chart_symbols(self, data: Any, symbol: str) -> SymbolSearchResponse:
+        """Parse a raw symbolsDynamic response."""
         symbols = []
         if data:
             for item in data:
@@ -3373,7 +3753,19 @@ class NSEIndiaClient:
             ChartSymbol or None if not found
         """
         response = self.search_chart_symbols(symbol)
+        return self._select_chart_symbol(response, symbol, symbol_type)
 
+    async def aget_chart_symbol(
+        self, symbol: str, symbol_type: str = "Equity"
+    ) -> ChartSymbol | None:
+        """Async version of get_chart_symbol."""
+        response = await self.asearch_chart_symbols(symbol)
+        return self._select_chart_symbol(response, symbol, symbol_type)
+
+    def _select_chart_symbol(
+        self, response: SymbolSearchResponse, symbol: str, symbol_type: str
+    ) -> ChartSymbol | None:
+        """Pick the best chart symbol match from a search response."""
         # Try exact match first
         for sym in response.symbols:
             if sym.symbol_type == symbol_type:
@@ -3412,22 +3804,90 @@ class NSEIndiaClient:
         Returns:
             ChartDataResponse with OHLCV candles
         """
-        import time
-
-        # Auto-fetch scripcode if not provided
+        # Resolve the scripcode from the identity map, searching only on a miss
         if scripcode is None:
-            chart_symbol = self.get_chart_symbol(symbol.split("-")[0], symbol_type)
-            if chart_symbol is None:
-                return ChartDataResponse(
-                    symbol=symbol,
-                    symbol_type=symbol_type,
-                    chart_type=chart_type,
-                    interval=interval,
-                    candles=[],
+            resolved = self._cached_chart_symbol(symbol, symbol_type)
+            if resolved is None:
+                chart_symbol = self.get_chart_symbol(symbol.split("-")[0], symbol_type)
+                resolved = self._remember_chart_symbol(symbol, symbol_type, chart_symbol)
+            if resolved is None:
+                return self._parse_chart_candles(
+                    [], symbol, symbol_type, chart_type, interval
                 )
-            scripcode = chart_symbol.scripcode
             # Use the full symbol from the chart response
-            symbol = chart_symbol.symbol
+            symbol, scripcode = resolved
+
+        url, payload, ttl = self._historical_data_request(
+            symbol, scripcode, chart_type, interval, from_timestamp, to_timestamp, symbol_type
+        )
+        data = self._http.post_json(url, payload, ttl=ttl)
+        return self._parse_chart_candles(data, symbol, symbol_type, chart_type, interval)
+
+    async def aget_historical_data(
+        self,
+        symbol: str,
+        scripcode: str | None = None,
+        chart_type: str = "D",
+        interval: int = 1,
+        from_timestamp: int = 0,
+        to_timestamp: int | None = None,
+        symbol_type: str = "Equity",
+    ) -> ChartDataResponse:
+        """Async version of get_historical_data."""
+        if scripcode is None:
+            resolved = self._cached_chart_symbol(symbol, symbol_type)
+            if resolved is None:
+                chart_symbol = await self.aget_chart_symbol(symbol.split("-")[0], symbol_type)
+                resolved = self._remember_chart_symbol(symbol, symbol_type, chart_symbol)
+            if resolved is None:
+                return self._parse_chart_candles(
+                    [], symbol, symbol_type, chart_type, interval
+                )
+            symbol, scripcode = resolved
+
+        url, payload, ttl = self._historical_data_request(
+            symbol, scripcode, chart_type, interval, from_timestamp, to_timestamp, symbol_type
+        )
+        data = await self.async_http.post_json(url, payload, ttl=ttl)
+        return self._parse_chart_candles(data, symbol, symbol_type, chart_type, interval)
+
+    def _cached_chart_symbol(self, symbol: str, symbol_type: str) -> tuple[str, str] | None:
+        """(chart symbol, scripcode) for an equity from the identity map."""
+        if symbol_type != "Equity":
+            return None
+        ids = self.instruments.lookup(symbol.split("-")[0], "nse_chart")
+        if ids is None:
+            return None
+        return ids["nse_chart_symbol"], ids["nse_scripcode"]
+
+    def _remember_chart_symbol(
+        self, symbol: str, symbol_type: str, chart_symbol: ChartSymbol | None
+    ) -> tuple[str, str] | None:
+        """Write an equity's searched scripcode back to the identity map."""
+        if chart_symbol is None:
+            return None
+        base = symbol.split("-")[0].upper()
+        # Only exact equity matches; the search falls back to the first hit otherwise
+        if symbol_type == "Equity" and chart_symbol.base_symbol.upper() == base and chart_symbol.scripcode:
+            self.instruments.record(
+                base, "nse_chart",
+                nse_chart_symbol=chart_symbol.symbol,
+                nse_scripcode=str(chart_symbol.scripcode),
+            )
+        return chart_symbol.symbol, chart_symbol.scripcode
+
+    def _historical_data_request(
+        self,
+        symbol: str,
+        scripcode: str,
+        chart_type: str,
+        interval: int,
+        from_timestamp: int,
+        to_timestamp: int | None,
+        symbol_type: str,
+    ) -> tuple[str, dict[str, Any], CacheTTL]:
+        """Build URL, payload and cache TTL for a symbolHistoricalData request."""
+        import time
 
         if to_timestamp is None:
             to_timestamp = int(time.time())
@@ -3445,9 +3905,17 @@ class NSEIndiaClient:
 
         # Use shorter TTL for intraday data
         ttl = CacheTTL.SHORT if chart_type == "I" else CacheTTL.DAILY
+        return url, payload, ttl
 
-        data = self._http.post_json(url, payload, ttl=ttl)
-
+    def _parse_chart_candles(
+        self,
+        data: Any,
+        symbol: str,
+        symbol_type: str,
+        chart_type: str,
+        interval: int,
+    ) -> ChartDataResponse:
+        """Parse raw symbolHistoricalData candles."""
         candles = []
         if data:
             for item in data:
@@ -4111,6 +4579,8 @@ class NSEIndiaClient:
         """
         import httpx
 
+        from core.http_replay import default_transport
+
         # Check cache if enabled
         if cache_key and self._http._cache_config.enabled:
             cached, found = self._http._cache.get(cache_key, None)
@@ -4122,7 +4592,7 @@ class NSEIndiaClient:
             "Accept": "application/json",
         }
 
-        with httpx.Client(headers=headers, timeout=30.0) as client:
+        with httpx.Client(headers=headers, timeout=30.0, transport=default_transport()) as client:
             response = client.get(url)
             response.raise_for_status()
             result = response.json()
@@ -4133,6 +4603,20 @@ class NSEIndiaClient:
 
         return result
 
+    def _gift_nifty_history_url(self, resolution: str, from_time: int, to_time: int, countback: int) -> str:
+        import urllib.parse
+
+        symbol_encoded = urllib.parse.quote(self.GIFT_NIFTY_SYMBOL, safe="")
+        return (
+            f"{self.MONEYCONTROL_BASE_URL}/globaltechCharts/globalMarket/index/history"
+            f"?symbol={symbol_encoded}"
+            f"&resolution={resolution}"
+            f"&from={from_time}"
+            f"&to={to_time}"
+            f"&countback={countback}"
+            f"&currencyCode=USD"
+        )
+
     def get_gift_nifty_history(
         self,
         resolution: str = "1D",
@@ -4146,6 +4630,11 @@ class NSEIndiaClient:
         GIFT NIFTY trades on SGX (Singapore Exchange) and provides
         price discovery for Indian markets before they open.
 
+        Without a date range, candles are served from the local bar store
+        (``bar_store``): the first call fetches ``countback`` candles, later
+        calls only request candles from the last stored one onwards, and
+        calls within a minute of the last sync make no request at all.
+
         Args:
             resolution: Chart resolution - "1", "5", "15", "30", "60", "240", "1D", "1W", "1M"
             countback: Number of candles to fetch (default: 300)
@@ -4164,58 +4653,41 @@ class NSEIndiaClient:
             >>> df = client.get_gift_nifty_history(resolution="1D", countback=30, as_df=True)
             >>> print(df.tail())
         """
-        import time
-        import urllib.parse
-
-        # Calculate time range
         if from_date and to_date:
             from_time = int(datetime.datetime.combine(from_date, datetime.time.min).timestamp())
             to_time = int(datetime.datetime.combine(to_date, datetime.time.max).timestamp())
+            url = self._gift_nifty_history_url(resolution, from_time, to_time, countback)
+            # Daily data can be cached longer
+            cache_key = f"gift_nifty_history_{resolution}_{from_date}_{to_date}_{countback}"
+            ttl = CacheTTL.DAILY if resolution in ("1D", "1W", "1M") else CacheTTL.VERY_SHORT
+            data = self._fetch_gift_nifty_url(url, cache_key=cache_key, ttl=ttl)
+            series = BarSeries.from_udf("moneycontrol", self.GIFT_NIFTY_SYMBOL, resolution, data)
         else:
-            now = int(time.time())
-            from_time = now - (365 * 24 * 60 * 60)  # 1 year ago
-            to_time = now + (24 * 60 * 60)  # Tomorrow
-
-        symbol_encoded = urllib.parse.quote(self.GIFT_NIFTY_SYMBOL, safe="")
-        url = (
-            f"{self.MONEYCONTROL_BASE_URL}/globaltechCharts/globalMarket/index/history"
-            f"?symbol={symbol_encoded}"
-            f"&resolution={resolution}"
-            f"&from={from_time}"
-            f"&to={to_time}"
-            f"&countback={countback}"
-            f"&currencyCode=USD"
-        )
-
-        # Cache key based on params - daily data can be cached longer
-        cache_key = f"gift_nifty_history_{resolution}_{from_time}_{to_time}_{countback}"
-        ttl = CacheTTL.DAILY if resolution in ("1D", "1W", "1M") else CacheTTL.VERY_SHORT
-
-        data = self._fetch_gift_nifty_url(url, cache_key=cache_key, ttl=ttl)
+            series = self._sync_gift_nifty_history(resolution, countback).tail(countback)
+            data = series.to_udf()
 
         if not as_df:
             return data
 
-        # Convert to DataFrame
         try:
-            import pandas as pd
-
-            if data.get("s") != "ok":
-                return pd.DataFrame()
-
-            df = pd.DataFrame({
-                "datetime": pd.to_datetime(data.get("t", []), unit="s"),
-                "open": data.get("o", []),
-                "high": data.get("h", []),
-                "low": data.get("l", []),
-                "close": data.get("c", []),
-                "volume": data.get("v", []),
-            })
-            df.set_index("datetime", inplace=True)
-            return df
+            return series.to_frame()
         except ImportError:
             raise ImportError("pandas is required for as_df=True. Install with: pip install pandas")
 
+    def _sync_gift_nifty_history(self, resolution: str, countback: int) -> BarSeries:
+        """Bring the stored GIFT NIFTY series up to date (at most one small request)."""
+        import time
+
+        def fetch(since: int | None, count: int) -> dict[str, Any]:
+            now = int(time.time())
+            from_time = since if since is not None else now - (365 * 24 * 60 * 60)  # 1 year ago
+            to_time = now + (24 * 60 * 60)  # Tomorrow
+            return self._fetch_gift_nifty_url(self._gift_nifty_history_url(resolution, from_time, to_time, count))
+
+        if not self.cache_enabled:
+            return BarSeries.from_udf("moneycontrol", self.GIFT_NIFTY_SYMBOL, resolution, fetch(None, countback))
+        return self.bar_store.sync("moneycontrol", self.GIFT_NIFTY_SYMBOL, resolution, fetch, depth=countback)
+
     def get_gift_nifty_intraday(
         self,
         duration: str = "1D",
@@ -20,11 +20,13 @@ from .exceptions import (
     NSEIndiaParseError,
     NSEIndiaRateLimitError,
 )
+from .async_http_client import AsyncNSEIndiaHTTPClient
 from .http_client import NSEIndiaHTTPClient
 
 __all__ = [
     # HTTP Client
     "NSEIndiaHTTPClient",
+    "AsyncNSEIndiaHTTPClient",
     # Cache
     "DEFAULT_CACHE_DIR",
     "CacheConfig",
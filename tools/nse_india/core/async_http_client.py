@@ -0,0 +1,322 @@
+"""Async HTTP client for NSE India API with a shared connection pool and caching."""
+
+import asyncio
+import importlib.util
+from typing import Any
+from urllib.parse import urlsplit
+
+import httpx
+
+from core.http_replay import default_transport
+from core.profiling import span
+
+from .cache import (
+    CacheConfig,
+    CacheTTL,
+    HybridCache,
+    get_cache,
+    get_endpoint_ttl,
+)
+from .exceptions import (
+    NSEIndiaAPIError,
+    NSEIndiaConnectionError,
+    NSEIndiaRateLimitError,
+)
+from .http_client import default_headers, post_cache_key, resolve_json_ttl
+
+# HTTP/2 needs the optional ``h2`` package (``pip install httpx[http2]``)
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# Status codes NSE returns when the session cookies have expired
+SESSION_EXPIRED_STATUS = (401, 403)
+
+
+class AsyncNSEIndiaHTTPClient:
+    """Async HTTP client for NSE India API.
+
+    Async counterpart of ``NSEIndiaHTTPClient`` for use inside agno async
+    agents and teams, so NSE calls never block the event loop.
+
+    Features:
+    - One pooled ``httpx.AsyncClient`` shared by every request, including
+      absolute URLs on other NSE hosts (charting, archives)
+    - HTTP/2 when ``h2`` is installed and the host negotiates it
+    - Session cookies refreshed automatically on 401/403
+    - Same cache (and cache keys) as the sync client, so both share hits
+    """
+
+    BASE_URL = "https://www.nseindia.com"
+
+    def __init__(
+        self,
+        timeout: float = 30.0,
+        cache_config: CacheConfig | None = None,
+        cache: HybridCache | None = None,
+        http2: bool = True,
+        max_connections: int = 20,
+        max_keepalive_connections: int = 10,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ):
+        """Initialize the async HTTP client.
+
+        Args:
+            timeout: Request timeout in seconds
+            cache_config: Cache configuration (defaults to enabled)
+            cache: Optional custom cache instance (uses global hybrid cache if not provided)
+            http2: Negotiate HTTP/2 when the ``h2`` package is available
+            max_connections: Maximum concurrent connections in the pool
+            max_keepalive_connections: Idle connections kept alive in the pool
+            transport: Optional httpx transport (e.g. a replay transport from
+                core.http_replay); defaults to the process-wide record/replay mode
+        """
+        self._client: httpx.AsyncClient | None = None
+        self.timeout = timeout
+        self._transport = transport
+        self.http2 = http2 and HTTP2_AVAILABLE
+        self._limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+        )
+
+        # Serializes session (cookie) initialization across concurrent callers
+        self._session_lock = asyncio.Lock()
+        self._session_ready = False
+
+        # Cache setup
+        self._cache_config = cache_config or CacheConfig(enabled=True)
+        self._cache = cache or get_cache()
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Lazy initialization of the pooled async HTTP client."""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=self.BASE_URL,
+                headers=default_headers(),
+                timeout=self.timeout,
+                follow_redirects=True,
+                http2=self.http2,
+                limits=self._limits,
+                transport=self._transport or default_transport(is_async=True),
+            )
+        return self._client
+
+    async def _ensure_session(self, force: bool = False) -> None:
+        """Visit the main page once to obtain session cookies.
+
+        Args:
+            force: Drop existing cookies and re-initialize the session
+        """
+        if self._session_ready and not force:
+            return
+
+        async with self._session_lock:
+            # Another coroutine may have refreshed while we waited
+            if self._session_ready and not force:
+                return
+            if force:
+                self.client.cookies.clear()
+            try:
+                await self.client.get("/")
+            except httpx.HTTPError:
+                # Continue even if this fails - some endpoints might still work
+                pass
+            self._session_ready = True
+
+    def _handle_response(self, response: httpx.Response) -> httpx.Response:
+        """Handle HTTP response and raise appropriate exceptions."""
+        if response.status_code == 429:
+            retry_after = response.headers.get("Retry-After")
+            raise NSEIndiaRateLimitError(
+                message="Rate limit exceeded by NSE India",
+                retry_after=int(retry_after) if retry_after else None,
+            )
+
+        if response.status_code >= 400:
+            raise NSEIndiaAPIError(
+                message=f"NSE India API error: {response.status_code}",
+                status_code=response.status_code,
+                response_body=response.text[:1000] if response.text else None,
+            )
+
+        return response
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        params: dict | None = None,
+        json_data: dict | None = None,
+    ) -> httpx.Response:
+        """Make a request, refreshing session cookies once on 401/403.
+
+        Args:
+            method: HTTP method
+            url: Endpoint path (relative to BASE_URL) or absolute URL
+            params: Query parameters
+            json_data: JSON body
+
+        Returns:
+            httpx.Response object
+        """
+        await self._ensure_session()
+
+        try:
+            response = await self.client.request(
+                method, url, params=params, json=json_data
+            )
+            if response.status_code in SESSION_EXPIRED_STATUS:
+                await self._ensure_session(force=True)
+                response = await self.client.request(
+                    method, url, params=params, json=json_data
+                )
+            return self._handle_response(response)
+        except httpx.ConnectError as e:
+            raise NSEIndiaConnectionError(f"Failed to connect to NSE India: {e}") from e
+        except httpx.TimeoutException as e:
+            raise NSEIndiaConnectionError(f"Request to NSE India timed out: {e}") from e
+
+    async def get(
+        self,
+        endpoint: str,
+        params: dict | None = None,
+    ) -> httpx.Response:
+        """Make a GET request to NSE India API.
+
+        Args:
+            endpoint: API endpoint path (e.g., "/api/corporate-announcements")
+            params: Query parameters
+
+        Returns:
+            httpx.Response object
+        """
+        return await self.request("GET", endpoint, params=params)
+
+    async def get_csv(
+        self,
+        endpoint: str,
+        params: dict | None = None,
+        skip_cache: bool = False,
+        ttl: CacheTTL | int | None = None,
+    ) -> str:
+        """Fetch CSV data from NSE India API with caching.
+
+        Args:
+            endpoint: API endpoint path
+            params: Query parameters
+            skip_cache: If True, bypass cache
+            ttl: Optional override for cache TTL
+
+        Returns:
+            Raw CSV content as string
+        """
+        with span("http", f"nse:{endpoint}", method="GET", format="csv", cache__hit=False) as s:
+            cache_key_params = params.copy() if params else {}
+            cache_key_params["_format"] = "csv"  # Distinguish from JSON
+
+            if self._cache_config.enabled and not skip_cache:
+                cached_value, found = self._cache.get(endpoint, cache_key_params)
+                if found:
+                    s.set("cache.hit", True)
+                    return cached_value
+
+            response = await self.get(endpoint, params=params)
+            result = response.text
+
+            if self._cache_config.enabled:
+                effective_ttl = ttl if ttl is not None else get_endpoint_ttl(endpoint)
+                self._cache.set(endpoint, cache_key_params, result, effective_ttl)
+
+            return result
+
+    async def get_json(
+        self,
+        endpoint: str,
+        params: dict | None = None,
+        skip_cache: bool = False,
+        ttl: CacheTTL | int | None = None,
+    ) -> dict | list | Any:
+        """Fetch JSON data from NSE India API with caching.
+
+        Args:
+            endpoint: API endpoint path
+            params: Query parameters
+            skip_cache: If True, bypass cache
+            ttl: Optional override for cache TTL
+
+        Returns:
+            Parsed JSON as dict/list
+        """
+        with span("http", f"nse:{endpoint}", method="GET", cache__hit=False) as s:
+            if self._cache_config.enabled and not skip_cache:
+                cached_value, found = self._cache.get(endpoint, params)
+                if found:
+                    s.set("cache.hit", True)
+                    return cached_value
+
+            response = await self.get(endpoint, params=params)
+            result = response.json()
+
+            if self._cache_config.enabled:
+                self._cache.set(endpoint, params, result, resolve_json_ttl(endpoint, params, ttl))
+
+            return result
+
+    async def post_json(
+        self,
+        url: str,
+        payload: dict,
+        skip_cache: bool = False,
+        ttl: CacheTTL | int | None = None,
+    ) -> dict | list | Any:
+        """Make a POST request with JSON payload and caching.
+
+        Args:
+            url: Full URL to POST to
+            payload: JSON payload to send
+            skip_cache: If True, bypass cache
+            ttl: Optional override for cache TTL
+
+        Returns:
+            Parsed JSON response as dict/list
+        """
+        with span("http", f"nse:{urlsplit(url).path}", method="POST", cache__hit=False) as s:
+            cache_key, cache_params = post_cache_key(url, payload)
+
+            if self._cache_config.enabled and not skip_cache:
+                cached_value, found = self._cache.get(cache_key, cache_params)
+                if found:
+                    s.set("cache.hit", True)
+                    return cached_value
+
+            response = await self.request("POST", url, json_data=payload)
+            result = response.json()
+
+            if self._cache_config.enabled:
+                effective_ttl = ttl if ttl is not None else CacheTTL.SHORT
+                self._cache.set(cache_key, cache_params, result, effective_ttl)
+
+            return result
+
+    @property
+    def cache_stats(self) -> dict[str, Any]:
+        """Get cache statistics."""
+        return self._cache.stats
+
+    @property
+    def cache_enabled(self) -> bool:
+        """Check if caching is enabled."""
+        return self._cache_config.enabled
+
+    async def aclose(self) -> None:
+        """Close the pooled HTTP client."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            self._session_ready = False
+
+    async def __aenter__(self) -> "AsyncNSEIndiaHTTPClient":
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.aclose()
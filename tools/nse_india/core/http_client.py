@@ -1,10 +1,17 @@
 """HTTP client for NSE India API with browser-like headers and caching."""
 
+import hashlib
+import json
+import os
 from pathlib import Path
 from typing import Any
+from urllib.parse import urlsplit
 
 import httpx
 
+from core.http_replay import default_transport
+from core.profiling import span
+
 from .cache import (
     CacheConfig,
     CacheTTL,
@@ -20,6 +27,62 @@ from .exceptions import (
 )
 
 
+QUOTE_API_ENDPOINT = "/api/NextApi/apiClient/GetQuoteApi"
+
+
+def default_headers() -> dict[str, str]:
+    """Get browser-like headers required by NSE India."""
+    return {
+        "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+        "Accept": "*/*",
+        "Accept-Language": "en-US,en;q=0.9",
+        "Connection": "keep-alive",
+        "Cache-Control": "no-cache",
+    }
+
+
+def resolve_json_ttl(
+    endpoint: str,
+    params: dict | None,
+    ttl: CacheTTL | int | None = None,
+) -> CacheTTL | int:
+    """Pick the cache TTL for a JSON GET request.
+
+    Args:
+        endpoint: API endpoint path
+        params: Query parameters
+        ttl: Explicit TTL override
+
+    Returns:
+        TTL in seconds
+    """
+    if ttl is not None:
+        return ttl
+    if QUOTE_API_ENDPOINT in endpoint and params:
+        # Quote API - use function-specific TTL
+        return get_quote_api_ttl(params.get("functionName", ""))
+    return get_endpoint_ttl(endpoint)
+
+
+def post_cache_key(url: str, payload: dict) -> tuple[str, dict[str, str]]:
+    """Build a process-independent cache key for a POST request.
+
+    The payload is hashed with SHA-256 rather than ``hash()`` so that
+    file-cache entries remain valid across interpreter restarts.
+
+    Args:
+        url: Full URL being POSTed to
+        payload: JSON payload
+
+    Returns:
+        Tuple of (cache endpoint, cache params)
+    """
+    digest = hashlib.sha256(
+        json.dumps(payload, sort_keys=True, default=str).encode()
+    ).hexdigest()[:32]
+    return f"POST:{url}", {"_payload_hash": digest}
+
+
 class NSEIndiaHTTPClient:
     """HTTP client for NSE India API.
 
@@ -40,6 +103,7 @@ class NSEIndiaHTTPClient:
         timeout: float = 30.0,
         cache_config: CacheConfig | None = None,
         cache: HybridCache | None = None,
+        transport: httpx.BaseTransport | None = None,
     ):
         """Initialize the HTTP client.
 
@@ -47,9 +111,13 @@ class NSEIndiaHTTPClient:
             timeout: Request timeout in seconds
             cache_config: Cache configuration (defaults to enabled)
             cache: Optional custom cache instance (uses global hybrid cache if not provided)
+            transport: Optional httpx transport (e.g. a replay transport from
+                core.http_replay); defaults to the process-wide record/replay mode
         """
         self._client: httpx.Client | None = None
+        self._external_client: httpx.Client | None = None
         self.timeout = timeout
+        self._transport = transport
 
         # Cache setup
         self._cache_config = cache_config or CacheConfig(enabled=True)
@@ -57,13 +125,7 @@ class NSEIndiaHTTPClient:
 
     def _get_default_headers(self) -> dict[str, str]:
         """Get browser-like headers required by NSE India."""
-        return {
-            "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-            "Accept": "*/*",
-            "Accept-Language": "en-US,en;q=0.9",
-            "Connection": "keep-alive",
-            "Cache-Control": "no-cache",
-        }
+        return default_headers()
 
     @property
     def client(self) -> httpx.Client:
@@ -74,11 +136,28 @@ class NSEIndiaHTTPClient:
                 headers=self._get_default_headers(),
                 timeout=self.timeout,
                 follow_redirects=True,
+                transport=self._transport or default_transport(),
             )
             # Visit the main page first to get session cookies
             self._init_session()
         return self._client
 
+    @property
+    def external_client(self) -> httpx.Client:
+        """Pooled client for absolute URLs on other NSE hosts (charting, archives).
+
+        Reused across ``post_json`` and ``download_file`` calls so that
+        connections are kept alive instead of re-handshaking per request.
+        """
+        if self._external_client is None:
+            self._external_client = httpx.Client(
+                headers=self._get_default_headers(),
+                timeout=self.timeout,
+                follow_redirects=True,
+                transport=self._transport or default_transport(),
+            )
+        return self._external_client
+
     def _init_session(self) -> None:
         """Initialize session by visiting the main page to get cookies."""
         try:
@@ -148,25 +227,27 @@ class NSEIndiaHTTPClient:
         Returns:
             Raw CSV content as string
         """
-        cache_key_params = params.copy() if params else {}
-        cache_key_params["_format"] = "csv"  # Distinguish from JSON
+        with span("http", f"nse:{endpoint}", method="GET", format="csv", cache__hit=False) as s:
+            cache_key_params = params.copy() if params else {}
+            cache_key_params["_format"] = "csv"  # Distinguish from JSON
 
-        # Check cache first
-        if self._cache_config.enabled and not skip_cache:
-            cached_value, found = self._cache.get(endpoint, cache_key_params)
-            if found:
-                return cached_value
+            # Check cache first
+            if self._cache_config.enabled and not skip_cache:
+                cached_value, found = self._cache.get(endpoint, cache_key_params)
+                if found:
+                    s.set("cache.hit", True)
+                    return cached_value
 
-        # Fetch from API
-        response = self.get(endpoint, params=params)
-        result = response.text
+            # Fetch from API
+            response = self.get(endpoint, params=params)
+            result = response.text
 
-        # Cache the result
-        if self._cache_config.enabled:
-            effective_ttl = ttl if ttl is not None else get_endpoint_ttl(endpoint)
-            self._cache.set(endpoint, cache_key_params, result, effective_ttl)
+            # Cache the result
+            if self._cache_config.enabled:
+                effective_ttl = ttl if ttl is not None else get_endpoint_ttl(endpoint)
+                self._cache.set(endpoint, cache_key_params, result, effective_ttl)
 
-        return result
+            return result
 
     def get_json(
         self,
@@ -186,31 +267,24 @@ class NSEIndiaHTTPClient:
         Returns:
             Parsed JSON as dict/list
         """
-        # Check cache first
-        if self._cache_config.enabled and not skip_cache:
-            cached_value, found = self._cache.get(endpoint, params)
-            if found:
-                return cached_value
-
-        # Fetch from API
-        response = self.get(endpoint, params=params)
-        result = response.json()
-
-        # Cache the result
-        if self._cache_config.enabled:
-            # Determine TTL
-            if ttl is not None:
-                effective_ttl = ttl
-            elif "/api/NextApi/apiClient/GetQuoteApi" in endpoint and params:
-                # Quote API - use function-specific TTL
-                function_name = params.get("functionName", "")
-                effective_ttl = get_quote_api_ttl(function_name)
-            else:
-                effective_ttl = get_endpoint_ttl(endpoint)
-
-            self._cache.set(endpoint, params, result, effective_ttl)
-
-        return result
+        with span("http", f"nse:{endpoint}", method="GET", cache__hit=False) as s:
+            # Check cache first
+            if self._cache_config.enabled and not skip_cache:
+                cached_value, found = self._cache.get(endpoint, params)
+                if found:
+                    s.set("cache.hit", True)
+                    return cached_value
+
+            # Fetch from API
+            response = self.get(endpoint, params=params)
+            result = response.json()
+
+            # Cache the result
+            if self._cache_config.enabled:
+                effective_ttl = resolve_json_ttl(endpoint, params, ttl)
+                self._cache.set(endpoint, params, result, effective_ttl)
+
+            return result
 
     def post_json(
         self,
@@ -230,78 +304,81 @@ class NSEIndiaHTTPClient:
         Returns:
             Parsed JSON response as dict/list
         """
-        import json
-
-        # Create cache key from URL and payload
-        cache_key = f"POST:{url}"
-        cache_params = {"_payload_hash": hash(json.dumps(payload, sort_keys=True))}
-
-        # Check cache first
-        if self._cache_config.enabled and not skip_cache:
-            cached_value, found = self._cache.get(cache_key, cache_params)
-            if found:
-                return cached_value
-
-        # Make POST request
-        try:
-            # Create a client for external URLs (charting API uses different domain)
-            with httpx.Client(
-                headers={
-                    **self._get_default_headers(),
-                    "Content-Type": "application/json",
-                },
-                timeout=self.timeout,
-                follow_redirects=True,
-            ) as post_client:
-                response = post_client.post(url, json=payload)
+        with span("http", f"nse:{urlsplit(url).path}", method="POST", cache__hit=False) as s:
+            # Create cache key from URL and payload
+            cache_key, cache_params = post_cache_key(url, payload)
+
+            # Check cache first
+            if self._cache_config.enabled and not skip_cache:
+                cached_value, found = self._cache.get(cache_key, cache_params)
+                if found:
+                    s.set("cache.hit", True)
+                    return cached_value
+
+            # Make POST request
+            try:
+                # Charting API uses a different domain - go through the pooled external client
+                response = self.external_client.post(url, json=payload)
                 self._handle_response(response)
                 result = response.json()
 
-        except httpx.ConnectError as e:
-            raise NSEIndiaConnectionError(f"Failed to connect: {e}") from e
-        except httpx.TimeoutException as e:
-            raise NSEIndiaConnectionError(f"Request timed out: {e}") from e
+            except httpx.ConnectError as e:
+                raise NSEIndiaConnectionError(f"Failed to connect: {e}") from e
+            except httpx.TimeoutException as e:
+                raise NSEIndiaConnectionError(f"Request timed out: {e}") from e
 
-        # Cache the result
-        if self._cache_config.enabled:
-            effective_ttl = ttl if ttl is not None else CacheTTL.INTRADAY
-            self._cache.set(cache_key, cache_params, result, effective_ttl)
+            # Cache the result
+            if self._cache_config.enabled:
+                effective_ttl = ttl if ttl is not None else CacheTTL.SHORT
+                self._cache.set(cache_key, cache_params, result, effective_ttl)
 
-        return result
+            return result
 
-    def download_file(self, url: str, save_path: Path) -> Path:
+    def download_file(self, url: str, save_path: Path, chunk_size: int = 64 * 1024) -> Path:
         """Download a file (e.g., PDF attachment) from NSE India.
 
+        The body is streamed to ``<save_path>.part`` in chunks and renamed
+        into place when complete. If an earlier attempt left a partial
+        file, the download resumes from it with a Range request (servers
+        that ignore Range send the whole body, which restarts the file).
+
         Note: File downloads are NOT cached.
 
         Args:
             url: Full URL to download
             save_path: Local path to save the file
+            chunk_size: Bytes written per chunk
 
         Returns:
             Path to the saved file
         """
-        # Create a separate client for external URLs
-        try:
-            with httpx.Client(
-                headers=self._get_default_headers(),
-                timeout=self.timeout,
-                follow_redirects=True,
-            ) as download_client:
-                response = download_client.get(url)
-                self._handle_response(response)
+        save_path.parent.mkdir(parents=True, exist_ok=True)
+        part_path = save_path.with_name(save_path.name + ".part")
+        offset = part_path.stat().st_size if part_path.exists() else 0
+        headers = {"Range": f"bytes={offset}-"} if offset else None
 
-                # Ensure parent directory exists
-                save_path.parent.mkdir(parents=True, exist_ok=True)
-
-                # Write content to file
-                save_path.write_bytes(response.content)
-                return save_path
+        try:
+            with self.external_client.stream("GET", url, headers=headers) as response:
+                # 416 on a resume means the partial file already holds the whole body
+                if not (offset and response.status_code == 416):
+                    if response.status_code >= 400:
+                        response.read()
+                    self._handle_response(response)
+                    mode = "ab" if response.status_code == 206 else "wb"
+                    with open(part_path, mode) as f:
+                        for chunk in response.iter_bytes(chunk_size):
+                            f.write(chunk)
+
+            os.replace(part_path, save_path)
+            return save_path
 
         except httpx.ConnectError as e:
             raise NSEIndiaConnectionError(f"Failed to download file: {e}") from e
         except httpx.TimeoutException as e:
             raise NSEIndiaConnectionError(f"Download timed out: {e}") from e
+        except httpx.TransportError as e:
+            # The partial file is kept so the next attempt resumes from it
+            raise NSEIndiaConnectionError(f"Download interrupted: {e}") from e
 
     def invalidate_cache(self, endpoint: str, params: dict | None = None) -> bool:
         """Invalidate a specific cache entry.
@@ -342,6 +419,9 @@ class NSEIndiaHTTPClient:
         if self._client is not None:
             self._client.close()
             self._client = None
+        if self._external_client is not None:
+            self._external_client.close()
+            self._external_client = None
 
     def __enter__(self) -> "NSEIndiaHTTPClient":
         return self
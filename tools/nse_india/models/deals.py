@@ -4,7 +4,7 @@ from datetime import date, datetime
 from enum import StrEnum
 from typing import Any
 
-from pydantic import BaseModel, ConfigDict, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr, field_validator
 
 
 class DealType(StrEnum):
@@ -233,7 +233,11 @@ class ShortSelling(BaseModel):
 
 
 class LargeDealsSnapshot(BaseModel):
-    """Snapshot of all large deals (bulk, block, short selling) from NSE."""
+    """Snapshot of all large deals (bulk, block, short selling) from NSE.
+
+    Deals are grouped by symbol once at construction, so the per-symbol
+    getters are dict lookups rather than scans of every deal list.
+    """
 
     model_config = ConfigDict(str_strip_whitespace=True)
 
@@ -247,6 +251,19 @@ class LargeDealsSnapshot(BaseModel):
     block_deals_count: int = Field(default=0, description="Total block deals count")
     short_deals_count: int = Field(default=0, description="Total short selling count")
 
+    _bulk_by_symbol: dict[str, list[BulkDeal]] = PrivateAttr(default_factory=dict)
+    _block_by_symbol: dict[str, list[BlockDeal]] = PrivateAttr(default_factory=dict)
+    _short_by_symbol: dict[str, list[ShortSelling]] = PrivateAttr(default_factory=dict)
+
+    def model_post_init(self, __context) -> None:
+        for deals, index in (
+            (self.bulk_deals, self._bulk_by_symbol),
+            (self.block_deals, self._block_by_symbol),
+            (self.short_selling, self._short_by_symbol),
+        ):
+            for d in deals:
+                index.setdefault(d.symbol.upper(), []).append(d)
+
     @field_validator("as_on_date", mode="before")
     @classmethod
     def parse_as_on_date(cls, v: Any) -> date | None:
@@ -274,18 +291,15 @@ class LargeDealsSnapshot(BaseModel):
 
     def get_bulk_deals_by_symbol(self, symbol: str) -> list[BulkDeal]:
         """Get bulk deals for a specific symbol."""
-        symbol_upper = symbol.upper()
-        return [d for d in self.bulk_deals if d.symbol.upper() == symbol_upper]
+        return list(self._bulk_by_symbol.get(symbol.upper(), []))
 
     def get_block_deals_by_symbol(self, symbol: str) -> list[BlockDeal]:
         """Get block deals for a specific symbol."""
-        symbol_upper = symbol.upper()
-        return [d for d in self.block_deals if d.symbol.upper() == symbol_upper]
+        return list(self._block_by_symbol.get(symbol.upper(), []))
 
     def get_short_selling_by_symbol(self, symbol: str) -> list[ShortSelling]:
         """Get short selling data for a specific symbol."""
-        symbol_upper = symbol.upper()
-        return [d for d in self.short_selling if d.symbol.upper() == symbol_upper]
+        return list(self._short_by_symbol.get(symbol.upper(), []))
 
     def get_bulk_deals_by_client(self, client_name: str) -> list[BulkDeal]:
         """Get bulk deals by client name (partial match)."""
@@ -326,11 +340,7 @@ class LargeDealsSnapshot(BaseModel):
 
     def get_unique_symbols(self) -> set[str]:
         """Get all unique symbols with deals."""
-        symbols = set()
-        for d in self.bulk_deals:
-            symbols.add(d.symbol)
-        for d in self.block_deals:
-            symbols.add(d.symbol)
-        for d in self.short_selling:
-            symbols.add(d.symbol)
+        symbols = {d.symbol for d in self.bulk_deals}
+        symbols.update(d.symbol for d in self.block_deals)
+        symbols.update(d.symbol for d in self.short_selling)
         return symbols
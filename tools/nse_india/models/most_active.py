@@ -3,7 +3,7 @@
 from datetime import datetime
 from typing import Any
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, PrivateAttr, field_validator
 
 
 def _parse_float(v: Any) -> float | None:
@@ -179,6 +179,16 @@ class MostActiveResponse(BaseModel):
     equities: list[MostActiveEquity] = Field(default_factory=list)
     timestamp: str | None = None
 
+    _by_symbol: dict[str, MostActiveEquity] = PrivateAttr(default_factory=dict)
+
+    def model_post_init(self, __context) -> None:
+        for equity in self.equities:
+            self._by_symbol.setdefault(equity.symbol.upper(), equity)
+
+    def get_by_symbol(self, symbol: str) -> MostActiveEquity | None:
+        """Get most-active data for a symbol (None if it is not in the list)."""
+        return self._by_symbol.get(symbol.upper())
+
     @property
     def by_value(self) -> list[MostActiveEquity]:
         """Get securities sorted by traded value."""
@@ -1,6 +1,6 @@
 """Data models for OI Spurts (Open Interest changes)."""
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 
 
 class OISpurtData(BaseModel):
@@ -48,6 +48,12 @@ class OISpurtsResponse(BaseModel):
 
     data: list[OISpurtData] = Field(default_factory=list)
 
+    _by_symbol: dict[str, OISpurtData] = PrivateAttr(default_factory=dict)
+
+    def model_post_init(self, __context) -> None:
+        for item in self.data:
+            self._by_symbol.setdefault(item.symbol.upper(), item)
+
     @property
     def oi_gainers(self) -> list[OISpurtData]:
         """Get stocks with OI buildup (increasing OI), sorted by % change."""
@@ -72,8 +78,4 @@ class OISpurtsResponse(BaseModel):
 
     def get_by_symbol(self, symbol: str) -> OISpurtData | None:
         """Get OI spurt data for a specific symbol."""
-        symbol = symbol.upper()
-        for item in self.data:
-            if item.symbol.upper() == symbol:
-                return item
-        return None
+        return self._by_symbol.get(symbol.upper())
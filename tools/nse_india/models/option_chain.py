@@ -1,8 +1,12 @@
 """Data models for NSE India option chain data."""
 
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
 from datetime import datetime
+from itertools import repeat
 
-from pydantic import BaseModel, ConfigDict, Field, computed_field
+import numpy as np
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr, computed_field
 
 
 class OptionContractInfo(BaseModel):
@@ -126,8 +130,211 @@ class OptionChainStrike(BaseModel):
         return self.ce_oi + self.pe_oi
 
 
+def _num(side: dict | None, key: str) -> float:
+    """Numeric field of a raw CE/PE dict (0 for missing or malformed values)."""
+    if not side:
+        return 0.0
+    value = side.get(key)
+    if value is None or value == "-":
+        return 0.0
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _field_kinds(model: type[BaseModel]) -> dict[str, str]:
+    """Raw key (alias and name) -> "int" / "float" / "str" for a model's scalar fields."""
+    kinds = {}
+    for name, field in model.model_fields.items():
+        kind = {int: "int", float: "float"}.get(field.annotation, "str")
+        kinds[name] = kind
+        if field.alias:
+            kinds[field.alias] = kind
+    return kinds
+
+
+_OPTION_FIELD_KINDS = _field_kinds(OptionData)
+
+
+# Value types that always validate, per field kind
+_CLEAN_TYPES = {"int": {int}, "float": {int, float}, "str": {str, type(None)}}
+
+
+def _suspect_rows(rows: list[dict]) -> np.ndarray:
+    """Rows that may fail OptionChainStrike validation.
+
+    A cheap, conservative screen: every row it clears is guaranteed to
+    validate, so only the flagged rows (usually none) pay for a pydantic
+    validation to decide whether they are kept. Each field is checked
+    across all rows at once by the set of its value types.
+    """
+    n = len(rows)
+    suspect = np.zeros(n, dtype=bool)
+    for i, row in enumerate(rows):
+        if type(row.get("expiryDates", "")) is not str or type(row.get("strikePrice", 0)) not in (int, float):
+            suspect[i] = True
+
+    for side in ("CE", "PE"):
+        items = []
+        for i, row in enumerate(rows):
+            d = row.get(side)
+            if d is None:
+                d = {}
+            elif not isinstance(d, dict):
+                suspect[i] = True
+                d = {}
+            items.append(d)
+        for key in set().union(*items) & _OPTION_FIELD_KINDS.keys():
+            kind = _OPTION_FIELD_KINDS[key]
+            clean = _CLEAN_TYPES[kind]
+            # Missing keys take the field default, which always validates
+            values = list(map(dict.get, items, repeat(key), repeat(None if kind == "str" else 0)))
+            if set(map(type, values)) <= clean:
+                continue
+            suspect |= np.fromiter((type(v) not in clean for v in values), dtype=bool, count=n)
+    return suspect
+
+
+@dataclass(frozen=True)
+class OptionChainColumns:
+    """Strike-aligned numpy columns of an option chain, sorted by strike."""
+
+    strike: np.ndarray
+    ce_oi: np.ndarray
+    pe_oi: np.ndarray
+    ce_change_in_oi: np.ndarray
+    pe_change_in_oi: np.ndarray
+    ce_iv: np.ndarray
+    pe_iv: np.ndarray
+    ce_ltp: np.ndarray
+    pe_ltp: np.ndarray
+    ce_volume: np.ndarray
+    pe_volume: np.ndarray
+    has_ce: np.ndarray
+    has_pe: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.strike)
+
+    @classmethod
+    def from_rows(cls, rows: list[dict]) -> tuple["OptionChainColumns", np.ndarray]:
+        """Build strike-sorted columns from raw option-chain-v3 rows.
+
+        Returns:
+            (columns, order) where ``order[i]`` is the index in ``rows`` of
+            the i-th strike in sorted order
+        """
+        n = len(rows)
+        ce = [row.get("CE") or {} for row in rows]
+        pe = [row.get("PE") or {} for row in rows]
+
+        def col(items: list[dict], key: str, dtype=np.float64) -> np.ndarray:
+            values = [d.get(key) or 0 for d in items]
+            try:
+                arr = np.array(values, dtype=np.float64)
+            except (TypeError, ValueError):  # "-" placeholders and other junk
+                arr = np.fromiter((_num(d, key) for d in items), dtype=np.float64, count=n)
+            return arr.astype(dtype, copy=False)
+
+        strike = col(rows, "strikePrice")
+
+        def valid(items: list[dict]) -> np.ndarray:
+            has_underlying = np.array([d.get("underlying") is not None for d in items], dtype=bool)
+            return (strike > 0) & (col(items, "strikePrice") > 0) & has_underlying
+
+        columns = {
+            "strike": strike,
+            "ce_oi": col(ce, "openInterest", np.int64),
+            "pe_oi": col(pe, "openInterest", np.int64),
+            "ce_change_in_oi": col(ce, "changeinOpenInterest", np.int64),
+            "pe_change_in_oi": col(pe, "changeinOpenInterest", np.int64),
+            "ce_iv": col(ce, "impliedVolatility"),
+            "pe_iv": col(pe, "impliedVolatility"),
+            "ce_ltp": col(ce, "lastPrice"),
+            "pe_ltp": col(pe, "lastPrice"),
+            "ce_volume": col(ce, "totalTradedVolume", np.int64),
+            "pe_volume": col(pe, "totalTradedVolume", np.int64),
+            "has_ce": valid(ce),
+            "has_pe": valid(pe),
+        }
+        order = np.argsort(strike, kind="stable")
+        if n and not (order[1:] > order[:-1]).all():
+            columns = {name: arr[order] for name, arr in columns.items()}
+        return cls(**columns), order
+
+
+class _ChainIndex:
+    """Plain-Python state behind an OptionChainResponse (one private attribute).
+
+    Kept outside pydantic so per-lookup access avoids private-attribute
+    indirection.
+    """
+
+    __slots__ = ("columns", "rows", "models", "strikes", "stats")
+
+    def __init__(self, columns: OptionChainColumns, rows: list[dict], models: list, underlying_value: float):
+        self.columns = columns
+        self.rows = rows
+        self.models = models  # OptionChainStrike per row, validated on demand
+        self.strikes: list[float] = columns.strike.tolist()
+        self.stats = self._aggregate(underlying_value)
+
+    def _aggregate(self, underlying_value: float) -> dict:
+        cols = self.columns
+        stats = {
+            "total_ce_oi": int(cols.ce_oi.sum()),
+            "total_pe_oi": int(cols.pe_oi.sum()),
+            "max_ce_oi_strike": (0, 0),
+            "max_pe_oi_strike": (0, 0),
+            "atm_index": None,
+        }
+        for name, oi in (("max_ce_oi_strike", cols.ce_oi), ("max_pe_oi_strike", cols.pe_oi)):
+            if len(oi):
+                i = int(oi.argmax())
+                if oi[i] > 0:
+                    stats[name] = (self.strikes[i], int(oi[i]))
+
+        # ATM: nearest positive strike to spot (lower strike on a tie)
+        strikes = self.strikes
+        first_valid = bisect_right(strikes, 0)
+        if underlying_value != 0 and first_valid < len(strikes):
+            i = min(max(bisect_left(strikes, underlying_value), first_valid), len(strikes) - 1)
+            if i > first_valid and abs(strikes[i - 1] - underlying_value) <= abs(strikes[i] - underlying_value):
+                i -= 1
+            # First row of that strike (duplicates across expiries)
+            stats["atm_index"] = bisect_left(strikes, strikes[i])
+        return stats
+
+    def model(self, i: int) -> "OptionChainStrike | None":
+        strike = self.models[i]
+        if strike is None:
+            try:
+                strike = OptionChainStrike.model_validate(self.rows[i])
+            except Exception:
+                return None
+            self.models[i] = strike
+        return strike
+
+    def models_at(self, indices) -> "list[OptionChainStrike]":
+        out = []
+        for i in indices:
+            strike = self.model(int(i))
+            if strike is not None:
+                out.append(strike)
+        return out
+
+
 class OptionChainResponse(BaseModel):
-    """Response from the option chain API."""
+    """Response from the option chain API.
+
+    The chain is held as raw strike rows plus aligned numpy columns
+    (``columns``), sorted by strike. Aggregates (OI totals, PCR, max OI
+    strikes, ATM) are computed once at construction; strike lookups are
+    binary searches; ``OptionChainStrike`` models are only validated when
+    a strike is actually requested (``data`` validates them all). Rows
+    that would fail validation are dropped as a whole at construction.
+    """
 
     model_config = ConfigDict(
         populate_by_name=True,
@@ -136,109 +343,164 @@ class OptionChainResponse(BaseModel):
 
     timestamp: str = Field(default="")
     underlying_value: float = Field(alias="underlyingValue", default=0)
-    data: list[OptionChainStrike] = Field(default_factory=list)
+
+    _chain: _ChainIndex = PrivateAttr()
+
+    def __init__(self, data: list | None = None, **kwargs):
+        """Create a chain from raw strike dicts or OptionChainStrike models."""
+        super().__init__(**kwargs)
+        if data:
+            self._load(data)
+
+    def model_post_init(self, __context) -> None:
+        self._load([])
+
+    def _load(self, data: list) -> None:
+        rows: list[dict] = []
+        prebuilt: dict[int, OptionChainStrike] = {}
+        for item in data:
+            if isinstance(item, OptionChainStrike):
+                prebuilt[len(rows)] = item
+                rows.append(item.model_dump(by_alias=True))
+            elif isinstance(item, dict):
+                rows.append(item)
+
+        # Rows that fail validation are dropped entirely, so columns,
+        # aggregates and strike models always describe the same strikes
+        suspect = [i for i in np.flatnonzero(_suspect_rows(rows)).tolist() if i not in prebuilt]
+        if suspect:
+            dropped = set()
+            for i in suspect:
+                try:
+                    prebuilt[i] = OptionChainStrike.model_validate(rows[i])
+                except Exception:
+                    dropped.add(i)
+            if dropped:
+                kept = [i for i in range(len(rows)) if i not in dropped]
+                prebuilt = {new: prebuilt[old] for new, old in enumerate(kept) if old in prebuilt}
+                rows = [rows[i] for i in kept]
+
+        columns, order = OptionChainColumns.from_rows(rows)
+        order = order.tolist()
+        self._chain = _ChainIndex(
+            columns,
+            rows=[rows[i] for i in order],
+            models=[prebuilt.get(i) for i in order],
+            underlying_value=self.underlying_value,
+        )
+
+    @classmethod
+    def from_records(cls, timestamp: str, underlying_value: float, rows: list[dict]) -> "OptionChainResponse":
+        """Build from the raw ``records.data`` rows of option-chain-v3."""
+        return cls(timestamp=timestamp, underlyingValue=underlying_value, data=rows)
+
+    # ==================== Columns and lazy strikes ====================
+
+    @property
+    def columns(self) -> OptionChainColumns:
+        """Strike-aligned numpy columns (strike, OI, change in OI, IV, LTP, volume)."""
+        return self._chain.columns
+
+    def __len__(self) -> int:
+        return len(self._chain.rows)
+
+    @computed_field
+    @property
+    def data(self) -> list[OptionChainStrike]:
+        """All strikes as models, sorted by strike (validated on first access)."""
+        chain = self._chain
+        return chain.models_at(range(len(chain.rows)))
+
+    # ==================== Aggregates ====================
 
     @computed_field
     @property
     def total_ce_oi(self) -> int:
         """Total call open interest."""
-        return sum(s.ce_oi for s in self.data)
+        return self._chain.stats["total_ce_oi"]
 
     @computed_field
     @property
     def total_pe_oi(self) -> int:
         """Total put open interest."""
-        return sum(s.pe_oi for s in self.data)
+        return self._chain.stats["total_pe_oi"]
 
     @computed_field
     @property
     def pcr(self) -> float:
         """Put-Call Ratio based on open interest."""
-        if self.total_ce_oi > 0:
-            return self.total_pe_oi / self.total_ce_oi
+        stats = self._chain.stats
+        if stats["total_ce_oi"] > 0:
+            return stats["total_pe_oi"] / stats["total_ce_oi"]
         return 0
 
     @property
     def max_ce_oi_strike(self) -> tuple[float, int]:
         """Get strike with maximum call OI."""
-        max_oi = 0
-        max_strike = 0
-        for s in self.data:
-            if s.ce_oi > max_oi:
-                max_oi = s.ce_oi
-                max_strike = s.strike_price
-        return (max_strike, max_oi)
+        return self._chain.stats["max_ce_oi_strike"]
 
     @property
     def max_pe_oi_strike(self) -> tuple[float, int]:
         """Get strike with maximum put OI."""
-        max_oi = 0
-        max_strike = 0
-        for s in self.data:
-            if s.pe_oi > max_oi:
-                max_oi = s.pe_oi
-                max_strike = s.strike_price
-        return (max_strike, max_oi)
+        return self._chain.stats["max_pe_oi_strike"]
 
     @property
     def atm_strike(self) -> float:
         """Get ATM (at-the-money) strike closest to underlying."""
-        if not self.data or self.underlying_value == 0:
-            return 0
-        valid_strikes = [s.strike_price for s in self.data if s.strike_price > 0]
-        if not valid_strikes:
-            return 0
-        return min(valid_strikes, key=lambda x: abs(x - self.underlying_value))
+        chain = self._chain
+        i = chain.stats["atm_index"]
+        return chain.strikes[i] if i is not None else 0
+
+    # ==================== Lookups ====================
 
     def get_strike_data(self, strike: float) -> OptionChainStrike | None:
         """Get option data for a specific strike."""
-        for s in self.data:
-            if s.strike_price == strike:
-                return s
+        chain = self._chain
+        i = bisect_left(chain.strikes, strike)
+        if i < len(chain.strikes) and chain.strikes[i] == strike:
+            return chain.model(i)
         return None
 
     def get_atm_data(self) -> OptionChainStrike | None:
         """Get ATM strike data."""
-        atm = self.atm_strike
-        if atm > 0:
-            return self.get_strike_data(atm)
-        return None
+        chain = self._chain
+        i = chain.stats["atm_index"]
+        return chain.model(i) if i is not None else None
 
     def get_itm_calls(self) -> list[OptionChainStrike]:
         """Get in-the-money calls (strike < underlying)."""
-        return [s for s in self.data if s.strike_price < self.underlying_value and s.has_ce]
+        chain = self._chain
+        below = bisect_left(chain.strikes, self.underlying_value)
+        return chain.models_at(np.flatnonzero(chain.columns.has_ce[:below]))
 
     def get_otm_calls(self) -> list[OptionChainStrike]:
         """Get out-of-the-money calls (strike > underlying)."""
-        return [s for s in self.data if s.strike_price > self.underlying_value and s.has_ce]
+        chain = self._chain
+        above = bisect_right(chain.strikes, self.underlying_value)
+        return chain.models_at(above + np.flatnonzero(chain.columns.has_ce[above:]))
 
     def get_itm_puts(self) -> list[OptionChainStrike]:
         """Get in-the-money puts (strike > underlying)."""
-        return [s for s in self.data if s.strike_price > self.underlying_value and s.has_pe]
+        chain = self._chain
+        above = bisect_right(chain.strikes, self.underlying_value)
+        return chain.models_at(above + np.flatnonzero(chain.columns.has_pe[above:]))
 
     def get_otm_puts(self) -> list[OptionChainStrike]:
         """Get out-of-the-money puts (strike < underlying)."""
-        return [s for s in self.data if s.strike_price < self.underlying_value and s.has_pe]
+        chain = self._chain
+        below = bisect_left(chain.strikes, self.underlying_value)
+        return chain.models_at(np.flatnonzero(chain.columns.has_pe[:below]))
 
     def get_strikes_near_atm(self, num_strikes: int = 5) -> list[OptionChainStrike]:
         """Get N strikes above and below ATM."""
-        atm = self.atm_strike
-        if atm == 0:
-            return []
-
-        sorted_data = sorted(self.data, key=lambda x: x.strike_price)
-        atm_idx = None
-        for i, s in enumerate(sorted_data):
-            if s.strike_price == atm:
-                atm_idx = i
-                break
-
+        chain = self._chain
+        atm_idx = chain.stats["atm_index"]
         if atm_idx is None:
             return []
 
         start = max(0, atm_idx - num_strikes)
-        end = min(len(sorted_data), atm_idx + num_strikes + 1)
-        return sorted_data[start:end]
+        end = min(len(chain.rows), atm_idx + num_strikes + 1)
+        return chain.models_at(range(start, end))
 
 
 class OptionChainAnalysis(BaseModel):
@@ -1,6 +1,6 @@
 """Data models for NSE India pre-open market data."""
 
-from pydantic import BaseModel, ConfigDict, Field, computed_field
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr, computed_field
 
 
 class PreOpenOrder(BaseModel):
@@ -201,7 +201,12 @@ class PreOpenStock(BaseModel):
 
 
 class PreOpenResponse(BaseModel):
-    """Response from the pre-open market API."""
+    """Response from the pre-open market API.
+
+    Rankings (gainers, losers, gaps, buy/sell pressure) are computed once
+    per snapshot on first access and reused by every ranking property,
+    which returns its own copy; the symbol index is built at construction.
+    """
 
     model_config = ConfigDict(
         populate_by_name=True,
@@ -213,6 +218,29 @@ class PreOpenResponse(BaseModel):
     unchanged: int = Field(default=0, description="Number of unchanged stocks")
     data: list[PreOpenStock] = Field(default_factory=list, description="Pre-open stock data")
 
+    _rankings: dict[str, list[PreOpenStock]] | None = PrivateAttr(default=None)
+    _by_symbol: dict[str, PreOpenStock] = PrivateAttr(default_factory=dict)
+
+    def model_post_init(self, __context) -> None:
+        for stock in self.data:
+            self._by_symbol.setdefault(stock.symbol.upper(), stock)
+
+    def _ranked(self) -> dict[str, list[PreOpenStock]]:
+        """Sort and filter the snapshot once for all ranking properties."""
+        if self._rankings is None:
+            gainers = sorted(self.data, key=lambda x: x.pchange, reverse=True)
+            by_gap = sorted(self.data, key=lambda x: x.metadata.gap_percentage, reverse=True)
+            by_ratio = sorted(self.data, key=lambda x: x.buy_sell_ratio, reverse=True)
+            self._rankings = {
+                "gainers": gainers,
+                "losers": gainers[::-1],
+                "gapping_up": [s for s in by_gap if s.metadata.is_gapping_up],
+                "gapping_down": [s for s in reversed(by_gap) if s.metadata.is_gapping_down],
+                "buy_pressure": [s for s in by_ratio if s.buy_sell_ratio > 1],
+                "sell_pressure": [s for s in reversed(by_ratio) if s.buy_sell_ratio < 1],
+            }
+        return self._rankings
+
     @computed_field
     @property
     def total_stocks(self) -> int:
@@ -245,40 +273,36 @@ class PreOpenResponse(BaseModel):
     @property
     def top_gainers(self) -> list[PreOpenStock]:
         """Get top gainers sorted by percentage change."""
-        return sorted(self.data, key=lambda x: x.pchange, reverse=True)
+        return list(self._ranked()["gainers"])
 
     @property
     def top_losers(self) -> list[PreOpenStock]:
         """Get top losers sorted by percentage change."""
-        return sorted(self.data, key=lambda x: x.pchange)
+        return list(self._ranked()["losers"])
 
     @property
     def stocks_with_buy_pressure(self) -> list[PreOpenStock]:
-        """Get stocks with more buy orders than sell orders."""
-        return [s for s in self.data if s.buy_sell_ratio > 1]
+        """Get stocks with more buy orders than sell orders (highest ratio first)."""
+        return list(self._ranked()["buy_pressure"])
 
     @property
     def stocks_with_sell_pressure(self) -> list[PreOpenStock]:
-        """Get stocks with more sell orders than buy orders."""
-        return [s for s in self.data if s.buy_sell_ratio < 1]
+        """Get stocks with more sell orders than buy orders (lowest ratio first)."""
+        return list(self._ranked()["sell_pressure"])
 
     @property
     def gapping_up(self) -> list[PreOpenStock]:
-        """Get stocks gapping up from previous close."""
-        return [s for s in self.data if s.metadata.is_gapping_up]
+        """Get stocks gapping up from previous close (largest gap first)."""
+        return list(self._ranked()["gapping_up"])
 
     @property
     def gapping_down(self) -> list[PreOpenStock]:
-        """Get stocks gapping down from previous close."""
-        return [s for s in self.data if s.metadata.is_gapping_down]
+        """Get stocks gapping down from previous close (largest gap first)."""
+        return list(self._ranked()["gapping_down"])
 
     def get_by_symbol(self, symbol: str) -> PreOpenStock | None:
         """Get stock data by symbol."""
-        symbol_upper = symbol.upper()
-        for stock in self.data:
-            if stock.symbol == symbol_upper:
-                return stock
-        return None
+        return self._by_symbol.get(symbol.upper())
 
     def filter_by_gap(self, min_gap_pct: float = 1.0) -> list[PreOpenStock]:
         """Filter stocks by minimum gap percentage (absolute value).
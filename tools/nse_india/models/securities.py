@@ -4,7 +4,7 @@ from datetime import date, datetime
 from enum import StrEnum
 from typing import Any
 
-from pydantic import BaseModel, ConfigDict, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr, field_validator
 
 
 class TradingSeries(StrEnum):
@@ -140,7 +140,12 @@ class Security(BaseModel):
 
 
 class SecuritiesResponse(BaseModel):
-    """Response containing all listed securities on NSE."""
+    """Response containing all listed securities on NSE.
+
+    Symbol, ISIN and series indexes are built once at construction, so
+    ``get_by_symbol``/``get_by_isin`` are dict lookups. Treat
+    ``securities`` as read-only after construction.
+    """
 
     model_config = ConfigDict(str_strip_whitespace=True)
 
@@ -150,6 +155,33 @@ class SecuritiesResponse(BaseModel):
     )
     total_count: int = Field(default=0, description="Total number of securities")
 
+    _by_symbol: dict[str, Security] = PrivateAttr(default_factory=dict)
+    _by_isin: dict[str, Security] = PrivateAttr(default_factory=dict)
+    _by_series: dict[str, list[Security]] = PrivateAttr(default_factory=dict)
+    _names: list[str] = PrivateAttr(default_factory=list)
+
+    def model_post_init(self, __context) -> None:
+        for sec in self.securities:
+            self._by_symbol.setdefault(sec.symbol.upper(), sec)
+            self._by_isin.setdefault(sec.isin.upper(), sec)
+            self._by_series.setdefault(sec.series.upper(), []).append(sec)
+        self._names = [sec.company_name.lower() for sec in self.securities]
+
+    @classmethod
+    def from_records(cls, records: list[dict[str, Any]]) -> "SecuritiesResponse":
+        """Rebuild from ``Security.model_dump()`` records without re-validating.
+
+        Used to load the cached daily securities master; the records were
+        validated when the CSV was first parsed.
+        """
+        securities = []
+        for record in records:
+            listing_date = record.get("listing_date")
+            if isinstance(listing_date, str):
+                record = {**record, "listing_date": date.fromisoformat(listing_date)}
+            securities.append(Security.model_construct(**record))
+        return cls(securities=securities, total_count=len(securities))
+
     @property
     def equity_securities(self) -> list[Security]:
         """Get all regular equity securities."""
@@ -167,29 +199,20 @@ class SecuritiesResponse(BaseModel):
 
     def get_by_symbol(self, symbol: str) -> Security | None:
         """Get security by symbol."""
-        symbol_upper = symbol.upper()
-        for sec in self.securities:
-            if sec.symbol.upper() == symbol_upper:
-                return sec
-        return None
+        return self._by_symbol.get(symbol.strip().upper())
 
     def get_by_isin(self, isin: str) -> Security | None:
         """Get security by ISIN."""
-        isin_upper = isin.upper()
-        for sec in self.securities:
-            if sec.isin.upper() == isin_upper:
-                return sec
-        return None
+        return self._by_isin.get(isin.strip().upper())
 
     def search_by_name(self, query: str) -> list[Security]:
         """Search securities by company name (case-insensitive partial match)."""
         query_lower = query.lower()
-        return [s for s in self.securities if query_lower in s.company_name.lower()]
+        return [sec for sec, name in zip(self.securities, self._names) if query_lower in name]
 
     def get_by_series(self, series: str) -> list[Security]:
         """Get all securities of a specific series."""
-        series_upper = series.upper()
-        return [s for s in self.securities if s.series.upper() == series_upper]
+        return list(self._by_series.get(series.upper(), []))
 
     def get_recently_listed(self, days: int = 30) -> list[Security]:
         """Get securities listed within the specified days."""
@@ -214,7 +237,4 @@ class SecuritiesResponse(BaseModel):
 
     def get_series_counts(self) -> dict[str, int]:
         """Get count of securities by series."""
-        counts: dict[str, int] = {}
-        for sec in self.securities:
-            counts[sec.series] = counts.get(sec.series, 0) + 1
-        return counts
+        return {series: len(secs) for series, secs in self._by_series.items()}
@@ -1,8 +1,34 @@
-"""Storage utilities for NSE India announcements."""
+"""Storage utilities for NSE India announcements (tracking and full-text search), index constituents,
+pre-open and option-chain series, and the securities master."""
 
-from .tracker import AnnouncementTracker, ProcessedAnnouncement
+from .constituents import ConstituentDiff, ConstituentSnapshotStore
+from .option_chain import (
+    OptionChainSeries,
+    OptionChainSeriesStore,
+    classify_buildup,
+    record_option_chain_snapshot,
+)
+from .pre_open import PreOpenFrame, PreOpenSeries, PreOpenSeriesStore, record_pre_open_session
+from .search import PDF_TEXT_AVAILABLE, AnnouncementSearchIndex, SearchHit
+from .securities import SecuritiesMasterStore
+from .tracker import AnnouncementTracker, AttachmentFile, ProcessedAnnouncement
 
 __all__ = [
     "AnnouncementTracker",
     "ProcessedAnnouncement",
+    "AttachmentFile",
+    "AnnouncementSearchIndex",
+    "SearchHit",
+    "PDF_TEXT_AVAILABLE",
+    "ConstituentDiff",
+    "ConstituentSnapshotStore",
+    "PreOpenFrame",
+    "PreOpenSeries",
+    "PreOpenSeriesStore",
+    "record_pre_open_session",
+    "OptionChainSeries",
+    "OptionChainSeriesStore",
+    "classify_buildup",
+    "record_option_chain_snapshot",
+    "SecuritiesMasterStore",
 ]
@@ -0,0 +1,315 @@
+"""Versioned daily snapshots of index constituents with concurrent refresh."""
+
+import hashlib
+import json
+import logging
+from collections.abc import Callable, Iterable
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from pathlib import Path
+from threading import Lock
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Fetch function: index name -> list of stock dicts (each with a "symbol" key)
+ConstituentFetcher = Callable[[str], list[dict[str, Any]]]
+
+# Stock fields kept in snapshots; prices and other intraday fields go stale
+# within minutes and are not stored
+MEMBERSHIP_FIELDS = ("symbol", "company_name")
+
+
+def membership(stocks: Iterable[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Reduce stock dicts to their ``MEMBERSHIP_FIELDS`` (stocks without a symbol are dropped)."""
+    return [
+        {key: stock.get(key) for key in MEMBERSHIP_FIELDS}
+        for stock in stocks
+        if stock.get("symbol")
+    ]
+
+
+def _failed(future: Future) -> bool:
+    """Check whether a finished refresh raised or returned no constituents."""
+    return future.exception() is not None or not future.result()
+
+
+@dataclass
+class ConstituentDiff:
+    """Membership changes between two constituent snapshots."""
+
+    from_date: str | None
+    to_date: str
+    added: dict[str, list[str]] = field(default_factory=dict)
+    removed: dict[str, list[str]] = field(default_factory=dict)
+
+    @property
+    def has_changes(self) -> bool:
+        """Check whether any index gained or lost members."""
+        return bool(self.added or self.removed)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary for JSON serialization."""
+        return {
+            "from_date": self.from_date,
+            "to_date": self.to_date,
+            "added": self.added,
+            "removed": self.removed,
+            "has_changes": self.has_changes,
+        }
+
+
+class ConstituentSnapshotStore:
+    """Daily, versioned on-disk snapshots of index membership.
+
+    Index membership only changes a few times a year, so the constituent
+    map is stored once per day as ``{YYYY-MM-DD}.json``. Each snapshot has
+    a ``version`` (hash of the sorted membership) so unchanged days share a
+    version and a diff against the previous snapshot flags rebalances.
+
+    Only membership is stored (``MEMBERSHIP_FIELDS`` of each stock);
+    callers fetch prices live.
+
+    ``prefetch`` refreshes many indices concurrently on a thread pool and
+    returns one future per index, so callers can start consuming each
+    index as soon as it is ready instead of waiting for all of them.
+    """
+
+    def __init__(
+        self,
+        snapshot_dir: str | Path,
+        max_workers: int = 5,
+        retention_days: int = 30,
+    ):
+        """Initialize the snapshot store.
+
+        Args:
+            snapshot_dir: Directory holding the daily snapshot files
+            max_workers: Maximum concurrent index fetches
+            retention_days: Number of daily snapshots to keep on disk
+        """
+        self.snapshot_dir = Path(snapshot_dir)
+        self.snapshot_dir.mkdir(parents=True, exist_ok=True)
+        self.max_workers = max_workers
+        self.retention_days = retention_days
+
+        self._lock = Lock()
+        self._executor: ThreadPoolExecutor | None = None
+        self._futures: dict[str, Future] = {}
+        self._futures_date: str | None = None
+
+    # === Snapshot files ===
+
+    def _snapshot_path(self, day: str) -> Path:
+        return self.snapshot_dir / f"{day}.json"
+
+    def snapshot_dates(self) -> list[str]:
+        """List available snapshot dates (oldest first)."""
+        return sorted(p.stem for p in self.snapshot_dir.glob("*.json"))
+
+    def load(self, day: date | str | None = None) -> dict[str, Any] | None:
+        """Load a snapshot.
+
+        Args:
+            day: Snapshot date (defaults to today)
+
+        Returns:
+            Snapshot dict or None if no snapshot exists for that day
+        """
+        day_str = str(day or date.today())
+        path = self._snapshot_path(day_str)
+        if not path.exists():
+            return None
+        try:
+            return json.loads(path.read_text())
+        except (json.JSONDecodeError, OSError) as e:
+            logger.warning(f"Could not read constituent snapshot {path}: {e}")
+            return None
+
+    def get_index(
+        self, index_name: str, day: date | str | None = None
+    ) -> list[dict[str, Any]] | None:
+        """Get the stored constituents of one index.
+
+        Args:
+            index_name: Index name (e.g., "NIFTY BANK")
+            day: Snapshot date (defaults to today)
+
+        Returns:
+            List of member dicts or None if the index is not in the snapshot
+        """
+        snapshot = self.load(day)
+        if snapshot is None:
+            return None
+        entry = snapshot.get("indices", {}).get(index_name)
+        return membership(entry["stocks"]) if entry else None
+
+    @staticmethod
+    def _compute_version(indices: dict[str, Any]) -> str:
+        membership = {
+            name: sorted(entry.get("symbols", [])) for name, entry in sorted(indices.items())
+        }
+        return hashlib.sha256(json.dumps(membership).encode()).hexdigest()[:12]
+
+    def save_index(
+        self,
+        index_name: str,
+        stocks: list[dict[str, Any]],
+        day: date | str | None = None,
+    ) -> dict[str, Any]:
+        """Write one index into the day's snapshot and bump its version.
+
+        Args:
+            index_name: Index name
+            stocks: Constituent stock dicts (each with a "symbol" key); only
+                ``MEMBERSHIP_FIELDS`` are stored
+            day: Snapshot date (defaults to today)
+
+        Returns:
+            The updated snapshot
+        """
+        day_str = str(day or date.today())
+        members = membership(stocks)
+        with self._lock:
+            snapshot = self.load(day_str) or {"date": day_str, "indices": {}}
+            snapshot["indices"][index_name] = {
+                "symbols": [s["symbol"] for s in members],
+                "stocks": members,
+                "fetched_at": datetime.now().isoformat(),
+            }
+            snapshot["version"] = self._compute_version(snapshot["indices"])
+            snapshot["updated_at"] = datetime.now().isoformat()
+
+            path = self._snapshot_path(day_str)
+            tmp_path = path.with_suffix(".tmp")
+            tmp_path.write_text(json.dumps(snapshot, default=str))
+            tmp_path.replace(path)
+            return snapshot
+
+    def prune(self) -> int:
+        """Delete snapshots beyond the retention window.
+
+        Returns:
+            Number of snapshot files removed
+        """
+        dates = self.snapshot_dates()
+        stale = dates[: max(0, len(dates) - self.retention_days)]
+        for day_str in stale:
+            try:
+                self._snapshot_path(day_str).unlink()
+            except OSError:
+                pass
+        return len(stale)
+
+    def diff(
+        self,
+        day: date | str | None = None,
+        previous: date | str | None = None,
+    ) -> ConstituentDiff:
+        """Compare a snapshot against an earlier one.
+
+        Args:
+            day: Snapshot date to compare (defaults to today)
+            previous: Baseline date (defaults to the latest snapshot before ``day``)
+
+        Returns:
+            ConstituentDiff with added/removed symbols per index
+        """
+        day_str = str(day or date.today())
+        if previous is None:
+            earlier = [d for d in self.snapshot_dates() if d < day_str]
+            previous_str = earlier[-1] if earlier else None
+        else:
+            previous_str = str(previous)
+
+        result = ConstituentDiff(from_date=previous_str, to_date=day_str)
+        current = self.load(day_str)
+        baseline = self.load(previous_str) if previous_str else None
+        if current is None or baseline is None:
+            return result
+
+        base_indices = baseline.get("indices", {})
+        for index_name, entry in current.get("indices", {}).items():
+            if index_name not in base_indices:
+                continue
+            new_symbols = set(entry.get("symbols", []))
+            old_symbols = set(base_indices[index_name].get("symbols", []))
+            added = sorted(new_symbols - old_symbols)
+            removed = sorted(old_symbols - new_symbols)
+            if added:
+                result.added[index_name] = added
+            if removed:
+                result.removed[index_name] = removed
+
+        return result
+
+    # === Concurrent refresh ===
+
+    def prefetch(
+        self,
+        index_names: Iterable[str],
+        fetcher: ConstituentFetcher,
+        force: bool = False,
+    ) -> dict[str, Future]:
+        """Start (or join) a background refresh of several indices.
+
+        Indices already present in today's snapshot resolve immediately
+        from disk unless ``force`` is set. Calling again while a refresh is
+        in flight returns the same futures, so concurrent callers share one
+        fetch per index. A refresh that failed or came back empty is retried
+        on the next call rather than reused for the rest of the day.
+
+        Args:
+            index_names: Indices to refresh
+            fetcher: Function returning the constituent stock dicts of an index
+            force: Refetch even if today's snapshot already has the index
+
+        Returns:
+            Mapping of index name to a Future resolving to its member list
+        """
+        today = date.today().isoformat()
+        snapshot = None if force else self.load(today)
+        stored = snapshot.get("indices", {}) if snapshot else {}
+
+        with self._lock:
+            if self._futures_date != today:
+                self._futures = {}
+                self._futures_date = today
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="constituents"
+                )
+
+            futures: dict[str, Future] = {}
+            for index_name in index_names:
+                existing = self._futures.get(index_name)
+                if existing is not None and not (existing.done() and (force or _failed(existing))):
+                    futures[index_name] = existing
+                    continue
+
+                if index_name in stored:
+                    future: Future = Future()
+                    future.set_result(membership(stored[index_name]["stocks"]))
+                else:
+                    future = self._executor.submit(self._refresh_index, index_name, fetcher, today)
+                self._futures[index_name] = future
+                futures[index_name] = future
+
+        return futures
+
+    def _refresh_index(
+        self, index_name: str, fetcher: ConstituentFetcher, day: str
+    ) -> list[dict[str, Any]]:
+        members = membership(fetcher(index_name))
+        if members:
+            self.save_index(index_name, members, day)
+        return members
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the background refresh pool."""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=wait)
+                self._executor = None
+            self._futures = {}
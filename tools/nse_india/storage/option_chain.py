@@ -0,0 +1,413 @@
+"""Columnar intraday option-chain snapshots for OI / IV change analytics."""
+
+import asyncio
+import logging
+import os
+from collections.abc import Awaitable, Callable, Iterable
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from ..models.option_chain import OptionChainColumns
+
+logger = logging.getLogger(__name__)
+
+# Buildup labels (option price change x open interest change)
+LONG_BUILDUP = "Long Buildup"
+SHORT_BUILDUP = "Short Buildup"
+SHORT_COVERING = "Short Covering"
+LONG_UNWINDING = "Long Unwinding"
+NO_CHANGE = "-"
+
+
+def classify_buildup(price_change: np.ndarray, oi_change: np.ndarray) -> list[str]:
+    """Label each contract by its price and OI change.
+
+    Price up + OI up is a long buildup, price down + OI up a short
+    buildup, price up + OI down short covering and price down + OI down
+    long unwinding. Anything with a flat price or OI is left unlabelled.
+    """
+    price_change = np.nan_to_num(np.asarray(price_change, dtype=np.float64))
+    oi_change = np.asarray(oi_change)
+    labels = np.full(len(oi_change), NO_CHANGE, dtype=object)
+    labels[(price_change > 0) & (oi_change > 0)] = LONG_BUILDUP
+    labels[(price_change < 0) & (oi_change > 0)] = SHORT_BUILDUP
+    labels[(price_change > 0) & (oi_change < 0)] = SHORT_COVERING
+    labels[(price_change < 0) & (oi_change < 0)] = LONG_UNWINDING
+    return labels.tolist()
+
+
+def expiry_key(expiry: str) -> str:
+    """Normalize an NSE expiry ("27-Jan-2026") to ISO ("2026-01-27")."""
+    try:
+        return datetime.strptime(expiry.strip(), "%d-%b-%Y").date().isoformat()
+    except ValueError:
+        return expiry.strip()
+
+
+class OptionChainSeries:
+    """One underlying/expiry over one day: (snapshot x strike) matrices.
+
+    Strikes are columns in first-seen order (``strikes``); ``present``
+    marks which strikes each snapshot listed. Open interest and volume
+    are int64, IV and LTP float32 with NaN where a side was not quoted.
+    """
+
+    INT_COLUMNS = ("ce_oi", "pe_oi", "ce_volume", "pe_volume")
+    FLOAT_COLUMNS = ("ce_iv", "pe_iv", "ce_ltp", "pe_ltp")
+
+    def __init__(self, day: str, underlying: str, expiry: str):
+        self.day = day
+        self.underlying = underlying.upper()
+        self.expiry = expiry_key(expiry)
+        self.ts = np.zeros(0, dtype=np.float64)
+        self.spot = np.zeros(0, dtype=np.float64)
+        self.strikes = np.zeros(0, dtype=np.float64)
+        self._index: dict[float, int] = {}
+        self.present = np.zeros((0, 0), dtype=bool)
+        for name in self.INT_COLUMNS:
+            setattr(self, name, np.zeros((0, 0), dtype=np.int64))
+        for name in self.FLOAT_COLUMNS:
+            setattr(self, name, np.zeros((0, 0), dtype=np.float32))
+
+    def __len__(self) -> int:
+        return len(self.ts)
+
+    # ==================== Building ====================
+
+    def _grow_strikes(self, strikes: np.ndarray) -> None:
+        new = [s for s in strikes.tolist() if s not in self._index]
+        if not new:
+            return
+        for s in new:
+            self._index[s] = len(self._index)
+        self.strikes = np.concatenate([self.strikes, np.array(new, dtype=np.float64)])
+        pad = ((0, 0), (0, len(new)))
+        self.present = np.pad(self.present, pad)
+        for name in self.INT_COLUMNS:
+            setattr(self, name, np.pad(getattr(self, name), pad))
+        for name in self.FLOAT_COLUMNS:
+            setattr(self, name, np.pad(getattr(self, name), pad, constant_values=np.nan))
+
+    def append(self, columns: OptionChainColumns, spot: float, ts: float | None = None) -> None:
+        """Add one chain snapshot.
+
+        Args:
+            columns: Strike-aligned columns of the chain
+            spot: Underlying value at the snapshot
+            ts: Snapshot time (epoch seconds, default now)
+        """
+        strikes, first = np.unique(columns.strike, return_index=True)
+        keep = strikes > 0
+        strikes, first = strikes[keep], first[keep]
+        self._grow_strikes(strikes)
+        n = len(self.strikes)
+        cols = np.fromiter((self._index[s] for s in strikes.tolist()), dtype=np.int64, count=len(strikes))
+
+        present = np.zeros(n, dtype=bool)
+        present[cols] = True
+        self.present = np.vstack([self.present, present])
+        for name in self.INT_COLUMNS:
+            row = np.zeros(n, dtype=np.int64)
+            row[cols] = getattr(columns, name)[first]
+            setattr(self, name, np.vstack([getattr(self, name), row]))
+        for name in self.FLOAT_COLUMNS:
+            side = columns.has_ce if name.startswith("ce_") else columns.has_pe
+            values = getattr(columns, name)[first]
+            row = np.full(n, np.nan, dtype=np.float32)
+            row[cols] = np.where(side[first] & (values > 0), values, np.nan)
+            setattr(self, name, np.vstack([getattr(self, name), row]))
+
+        self.ts = np.append(self.ts, ts if ts is not None else datetime.now().timestamp())
+        self.spot = np.append(self.spot, float(spot or 0))
+
+    # ==================== Persistence ====================
+
+    def to_arrays(self) -> dict[str, np.ndarray]:
+        arrays = {
+            "meta": np.array([self.day, self.underlying, self.expiry], dtype=np.str_),
+            "ts": self.ts,
+            "spot": self.spot,
+            "strikes": self.strikes,
+            "present": self.present,
+        }
+        for name in self.INT_COLUMNS + self.FLOAT_COLUMNS:
+            arrays[name] = getattr(self, name)
+        return arrays
+
+    @classmethod
+    def from_arrays(cls, arrays: Any) -> "OptionChainSeries":
+        day, underlying, expiry = (str(v) for v in arrays["meta"])
+        series = cls(day, underlying, expiry)
+        for name in ("ts", "spot", "strikes", "present") + cls.INT_COLUMNS + cls.FLOAT_COLUMNS:
+            setattr(series, name, np.asarray(arrays[name]))
+        series._index = {s: i for i, s in enumerate(series.strikes.tolist())}
+        return series
+
+    # ==================== Queries ====================
+
+    def row_at(self, at: int | float | str | None = None) -> int:
+        """Resolve a snapshot reference to a row.
+
+        Args:
+            at: None for the latest snapshot, a row index (negative counts
+                from the end), an epoch timestamp, or "HH:MM" for the last
+                snapshot at or before that time of day
+
+        Returns:
+            Row index (the first snapshot if ``at`` precedes the recording)
+        """
+        if not len(self):
+            raise ValueError("series has no snapshots")
+        if at is None:
+            return len(self) - 1
+        if isinstance(at, str):
+            hour, minute = (int(x) for x in at.split(":"))
+            at = datetime.fromisoformat(self.day).replace(hour=hour, minute=minute).timestamp()
+        elif isinstance(at, (int, np.integer)) and abs(at) <= len(self):
+            return int(at) % len(self) if at < 0 else min(int(at), len(self) - 1)
+        return max(int(np.searchsorted(self.ts, float(at), side="right")) - 1, 0)
+
+    def time_of(self, row: int) -> str:
+        return datetime.fromtimestamp(self.ts[row]).strftime("%H:%M")
+
+    def _atm_col(self, row: int) -> int | None:
+        listed = np.flatnonzero(self.present[row])
+        if not len(listed) or self.spot[row] <= 0:
+            return None
+        return int(listed[np.abs(self.strikes[listed] - self.spot[row]).argmin()])
+
+    def pcr_series(self) -> list[dict[str, Any]]:
+        """Put-call ratio of OI and volume, spot and OI totals for every snapshot."""
+        ce_oi, pe_oi = self.ce_oi.sum(axis=1), self.pe_oi.sum(axis=1)
+        ce_vol, pe_vol = self.ce_volume.sum(axis=1), self.pe_volume.sum(axis=1)
+        out = []
+        for i in range(len(self)):
+            out.append({
+                "time": self.time_of(i),
+                "spot": round(float(self.spot[i]), 2),
+                "ce_oi": int(ce_oi[i]),
+                "pe_oi": int(pe_oi[i]),
+                "pcr_oi": round(float(pe_oi[i] / ce_oi[i]), 3) if ce_oi[i] else None,
+                "pcr_volume": round(float(pe_vol[i] / ce_vol[i]), 3) if ce_vol[i] else None,
+            })
+        return out
+
+    def changes(
+        self,
+        start: int | float | str | None = 0,
+        end: int | float | str | None = None,
+        strikes_around_atm: int | None = None,
+    ) -> dict[str, Any]:
+        """OI, IV and price changes per strike between two snapshots, with buildup labels.
+
+        Args:
+            start: First snapshot (see row_at; default the first of the day)
+            end: Second snapshot (see row_at; default the latest)
+            strikes_around_atm: Only this many strikes either side of the
+                ATM strike at ``end`` (None for all strikes)
+
+        Returns:
+            Dict with the two snapshot times, spot and OI totals at each,
+            and a strike-sorted ``strikes`` list of per-strike changes
+        """
+        a, b = self.row_at(start), self.row_at(end)
+        both = self.present[a] & self.present[b]
+        cols = np.flatnonzero(both)
+        cols = cols[np.argsort(self.strikes[cols], kind="stable")]
+        atm = self._atm_col(b)
+        if strikes_around_atm is not None and atm is not None and len(cols):
+            centre = int(np.searchsorted(self.strikes[cols], self.strikes[atm]))
+            cols = cols[max(centre - strikes_around_atm, 0):centre + strikes_around_atm + 1]
+
+        def delta(name: str) -> np.ndarray:
+            matrix = getattr(self, name)
+            return matrix[b, cols].astype(np.float64) - matrix[a, cols].astype(np.float64)
+
+        ce_oi_chg, pe_oi_chg = delta("ce_oi"), delta("pe_oi")
+        ce_ltp_chg, pe_ltp_chg = delta("ce_ltp"), delta("pe_ltp")
+        ce_iv_chg, pe_iv_chg = delta("ce_iv"), delta("pe_iv")
+        ce_labels = classify_buildup(ce_ltp_chg, ce_oi_chg)
+        pe_labels = classify_buildup(pe_ltp_chg, pe_oi_chg)
+
+        def num(value: float, digits: int = 2) -> float | None:
+            return None if np.isnan(value) else round(float(value), digits)
+
+        rows = []
+        for k, j in enumerate(cols.tolist()):
+            rows.append({
+                "strike": float(self.strikes[j]),
+                "atm": j == atm,
+                "ce_oi": int(self.ce_oi[b, j]),
+                "ce_oi_chg": int(ce_oi_chg[k]),
+                "ce_iv_chg": num(ce_iv_chg[k]),
+                "ce_ltp_chg": num(ce_ltp_chg[k]),
+                "ce_buildup": ce_labels[k],
+                "pe_oi": int(self.pe_oi[b, j]),
+                "pe_oi_chg": int(pe_oi_chg[k]),
+                "pe_iv_chg": num(pe_iv_chg[k]),
+                "pe_ltp_chg": num(pe_ltp_chg[k]),
+                "pe_buildup": pe_labels[k],
+            })
+
+        totals = {}
+        for label, row in (("from", a), ("to", b)):
+            ce, pe = int(self.ce_oi[row].sum()), int(self.pe_oi[row].sum())
+            totals[label] = {
+                "time": self.time_of(row),
+                "spot": round(float(self.spot[row]), 2),
+                "ce_oi": ce,
+                "pe_oi": pe,
+                "pcr_oi": round(pe / ce, 3) if ce else None,
+            }
+        return {
+            "underlying": self.underlying,
+            "expiry": self.expiry,
+            "from": totals["from"],
+            "to": totals["to"],
+            "strikes": rows,
+        }
+
+    def top_changes(
+        self,
+        start: int | float | str | None = 0,
+        end: int | float | str | None = None,
+        top: int = 5,
+    ) -> dict[str, list[dict[str, Any]]]:
+        """Strikes with the largest OI additions and reductions on each side."""
+        rows = self.changes(start, end)["strikes"]
+        out: dict[str, list[dict[str, Any]]] = {}
+        for side in ("ce", "pe"):
+            key = f"{side}_oi_chg"
+            ranked = sorted(rows, key=lambda r: r[key], reverse=True)
+            out[f"{side}_added"] = [r for r in ranked if r[key] > 0][:top]
+            out[f"{side}_shed"] = [r for r in reversed(ranked) if r[key] < 0][:top]
+        return out
+
+
+class OptionChainSeriesStore:
+    """One compressed ``.npz`` per day, underlying and expiry."""
+
+    def __init__(self, store_dir: str | Path, retention_days: int = 20):
+        """Initialize the store.
+
+        Args:
+            store_dir: Directory holding ``{day}_{UNDERLYING}_{expiry}.npz`` files
+            retention_days: Number of recorded days kept on disk
+        """
+        self.store_dir = Path(store_dir)
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+        self.retention_days = retention_days
+
+    def _path(self, day: str, underlying: str, expiry: str) -> Path:
+        return self.store_dir / f"{day}_{underlying.upper()}_{expiry_key(expiry)}.npz"
+
+    def keys(self, day: date | str | None = None) -> list[tuple[str, str, str]]:
+        """Recorded (day, underlying, expiry) keys, oldest first, optionally for one day."""
+        keys = []
+        for p in self.store_dir.glob("*.npz"):
+            parts = p.stem.split("_")
+            if len(parts) == 3 and not p.stem.endswith(".tmp"):
+                keys.append(tuple(parts))
+        if day is not None:
+            keys = [k for k in keys if k[0] == str(day)]
+        return sorted(keys)
+
+    def days(self) -> list[str]:
+        """Recorded days, oldest first."""
+        return sorted({k[0] for k in self.keys()})
+
+    def load(
+        self,
+        underlying: str,
+        expiry: str | None = None,
+        day: date | str | None = None,
+    ) -> OptionChainSeries | None:
+        """Load a recorded series.
+
+        Args:
+            underlying: Underlying symbol (e.g., "NIFTY")
+            expiry: Expiry ("27-Jan-2026" or ISO); default the nearest recorded one
+            day: Recording day (default today)
+
+        Returns:
+            OptionChainSeries or None if nothing was recorded
+        """
+        day = str(day or date.today().isoformat())
+        if expiry is None:
+            expiries = [k[2] for k in self.keys(day) if k[1] == underlying.upper()]
+            if not expiries:
+                return None
+            expiry = min(expiries)
+        path = self._path(day, underlying, expiry)
+        if not path.exists():
+            return None
+        with np.load(path, allow_pickle=False) as arrays:
+            return OptionChainSeries.from_arrays(arrays)
+
+    def save(self, series: OptionChainSeries) -> Path:
+        """Write a series atomically."""
+        path = self._path(series.day, series.underlying, series.expiry)
+        tmp = path.with_name(path.stem + ".tmp.npz")
+        np.savez_compressed(tmp, **series.to_arrays())
+        os.replace(tmp, path)
+        return path
+
+    def prune(self) -> int:
+        """Delete days beyond the retention window; returns the number of files removed."""
+        days = self.days()
+        stale = set(days[:-self.retention_days]) if self.retention_days else set()
+        removed = 0
+        for key in self.keys():
+            if key[0] in stale:
+                self._path(*key).unlink(missing_ok=True)
+                removed += 1
+        return removed
+
+
+# Async fetch function: (underlying, expiry) -> raw /api/option-chain-v3 response
+OptionChainFetcher = Callable[[str, str], Awaitable[Any]]
+
+
+async def record_option_chain_snapshot(
+    fetch: OptionChainFetcher,
+    store: OptionChainSeriesStore,
+    targets: Iterable[tuple[str, str]],
+    ts: float | None = None,
+) -> dict[str, int]:
+    """Fetch every (underlying, expiry) chain concurrently and append one snapshot to each series.
+
+    Raw responses are read straight into columns (no per-strike models).
+
+    Args:
+        fetch: Returns the raw option-chain-v3 response (uncached)
+        store: Destination store
+        targets: (underlying, expiry) pairs to record
+        ts: Snapshot time shared by all targets (default now)
+
+    Returns:
+        Snapshot count per recorded "UNDERLYING expiry"; failed targets are omitted
+    """
+    targets = list(targets)
+    ts = ts if ts is not None else datetime.now().timestamp()
+    day = datetime.fromtimestamp(ts).date().isoformat()
+    results = await asyncio.gather(*(fetch(u, e) for u, e in targets), return_exceptions=True)
+
+    recorded: dict[str, int] = {}
+    for (underlying, expiry), result in zip(targets, results):
+        if isinstance(result, BaseException):
+            logger.warning(f"Option chain fetch failed for {underlying} {expiry}: {result}")
+            continue
+        records = result.get("records", {}) if isinstance(result, dict) else {}
+        rows = records.get("data") or []
+        if not rows:
+            logger.warning(f"Empty option chain for {underlying} {expiry}")
+            continue
+        columns, _ = OptionChainColumns.from_rows(rows)
+        series = store.load(underlying, expiry, day) or OptionChainSeries(day, underlying, expiry)
+        series.append(columns, records.get("underlyingValue") or 0, ts=ts)
+        store.save(series)
+        recorded[f"{series.underlying} {series.expiry}"] = len(series)
+    return recorded
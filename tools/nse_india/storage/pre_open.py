@@ -0,0 +1,434 @@
+"""Columnar time-series store for the 9:00-9:08 pre-open session."""
+
+import asyncio
+import logging
+import os
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import dataclass
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Pre-open feeds recorded by default, with their membership bit
+PRE_OPEN_FEEDS: dict[str, int] = {"NIFTY": 1, "BANKNIFTY": 2, "FO": 4}
+
+
+@dataclass
+class PreOpenFrame:
+    """One poll of the pre-open feeds, as aligned per-symbol columns."""
+
+    ts: float
+    symbols: list[str]
+    feeds: np.ndarray  # uint8 feed bitmask per symbol
+    prev_close: np.ndarray
+    iep: np.ndarray
+    final_qty: np.ndarray
+    buy_qty: np.ndarray
+    sell_qty: np.ndarray
+
+    @classmethod
+    def from_responses(cls, responses: dict[str, Any], ts: float | None = None) -> "PreOpenFrame":
+        """Build a frame from raw ``/api/market-data-pre-open`` responses keyed by feed.
+
+        Reads the raw JSON directly (no model validation). A symbol present
+        in several feeds is stored once with the union of its feed bits.
+        """
+        index: dict[str, int] = {}
+        feeds: list[int] = []
+        values: list[tuple[float, float, int, int, int]] = []
+        for feed, response in responses.items():
+            bit = PRE_OPEN_FEEDS.get(feed, 0)
+            if not isinstance(response, dict):
+                continue
+            for item in response.get("data", []):
+                meta = item.get("metadata") or {}
+                symbol = meta.get("symbol")
+                if not symbol:
+                    continue
+                i = index.get(symbol)
+                if i is not None:
+                    feeds[i] |= bit
+                    continue
+                market = (item.get("detail") or {}).get("preOpenMarket") or {}
+                index[symbol] = len(values)
+                feeds.append(bit)
+                values.append((
+                    _float(meta.get("previousClose")),
+                    _float(meta.get("iep")) or _float(market.get("IEP")),
+                    int(_float(meta.get("finalQuantity")) or _float(market.get("finalQuantity"))),
+                    int(_float(market.get("totalBuyQuantity"))),
+                    int(_float(market.get("totalSellQuantity"))),
+                ))
+        cols = np.array(values, dtype=np.float64).reshape(-1, 5)
+        return cls(
+            ts=ts if ts is not None else datetime.now().timestamp(),
+            symbols=list(index),
+            feeds=np.array(feeds, dtype=np.uint8),
+            prev_close=cols[:, 0],
+            iep=cols[:, 1],
+            final_qty=cols[:, 2].astype(np.int64),
+            buy_qty=cols[:, 3].astype(np.int64),
+            sell_qty=cols[:, 4].astype(np.int64),
+        )
+
+
+def _float(value: Any) -> float:
+    try:
+        return float(value) if value not in (None, "", "-") else 0.0
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _imbalance(buy: np.ndarray, sell: np.ndarray) -> np.ndarray:
+    """(buy - sell) / (buy + sell), in [-1, 1]; NaN when there is no book."""
+    total = (buy + sell).astype(np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(total > 0, (buy - sell) / total, np.nan)
+
+
+class PreOpenSeries:
+    """One day's pre-open session: (snapshot x symbol) matrices.
+
+    Per-snapshot rankings by gap and by order imbalance are computed once
+    when a snapshot is appended and stored with the series, so queries
+    only index into them.
+    """
+
+    # Matrix columns; int columns use 0 and float columns NaN for "not seen"
+    FLOAT_COLUMNS = ("iep", "imbalance")
+    INT_COLUMNS = ("final_qty", "buy_qty", "sell_qty")
+
+    def __init__(self, day: str):
+        self.day = day
+        self.ts = np.zeros(0, dtype=np.float64)
+        self.symbols: list[str] = []
+        self._index: dict[str, int] = {}
+        self.feeds = np.zeros(0, dtype=np.uint8)
+        self.prev_close = np.zeros(0, dtype=np.float64)
+        self.iep = np.zeros((0, 0), dtype=np.float32)
+        self.imbalance = np.zeros((0, 0), dtype=np.float32)
+        self.final_qty = np.zeros((0, 0), dtype=np.int64)
+        self.buy_qty = np.zeros((0, 0), dtype=np.int64)
+        self.sell_qty = np.zeros((0, 0), dtype=np.int64)
+        self.gap_rank = np.zeros((0, 0), dtype=np.int32)
+        self.imbalance_rank = np.zeros((0, 0), dtype=np.int32)
+
+    def __len__(self) -> int:
+        return len(self.ts)
+
+    # ==================== Building ====================
+
+    def _grow_symbols(self, symbols: list[str]) -> None:
+        new = [s for s in symbols if s not in self._index]
+        if not new:
+            return
+        for s in new:
+            self._index[s] = len(self.symbols)
+            self.symbols.append(s)
+        extra = len(new)
+        self.feeds = np.concatenate([self.feeds, np.zeros(extra, dtype=np.uint8)])
+        self.prev_close = np.concatenate([self.prev_close, np.zeros(extra)])
+        for name in self.FLOAT_COLUMNS:
+            setattr(self, name, np.pad(getattr(self, name), ((0, 0), (0, extra)), constant_values=np.nan))
+        for name in self.INT_COLUMNS:
+            setattr(self, name, np.pad(getattr(self, name), ((0, 0), (0, extra))))
+        for name in ("gap_rank", "imbalance_rank"):
+            # Ranks are positions into symbols; -1 pads rows recorded before the symbol appeared
+            setattr(self, name, np.pad(getattr(self, name), ((0, 0), (0, extra)), constant_values=-1))
+
+    def append(self, frame: PreOpenFrame) -> None:
+        """Add one poll and precompute its rankings."""
+        self._grow_symbols(frame.symbols)
+        n = len(self.symbols)
+        cols = np.fromiter((self._index[s] for s in frame.symbols), dtype=np.int64, count=len(frame.symbols))
+
+        self.feeds[cols] |= frame.feeds
+        known = frame.prev_close > 0
+        self.prev_close[cols[known]] = frame.prev_close[known]
+
+        iep = np.full(n, np.nan, dtype=np.float32)
+        iep[cols] = np.where(frame.iep > 0, frame.iep, np.nan)
+        final_qty, buy_qty, sell_qty = (np.zeros(n, dtype=np.int64) for _ in range(3))
+        final_qty[cols], buy_qty[cols], sell_qty[cols] = frame.final_qty, frame.buy_qty, frame.sell_qty
+        imbalance = np.full(n, np.nan, dtype=np.float32)
+        imbalance[cols] = _imbalance(frame.buy_qty, frame.sell_qty)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            gap = np.where(self.prev_close > 0, (iep / self.prev_close - 1) * 100, np.nan)
+
+        self.ts = np.append(self.ts, frame.ts)
+        self.iep = np.vstack([self.iep, iep])
+        self.imbalance = np.vstack([self.imbalance, imbalance])
+        self.final_qty = np.vstack([self.final_qty, final_qty])
+        self.buy_qty = np.vstack([self.buy_qty, buy_qty])
+        self.sell_qty = np.vstack([self.sell_qty, sell_qty])
+        self.gap_rank = np.vstack([self.gap_rank, _rank_desc(gap)])
+        self.imbalance_rank = np.vstack([self.imbalance_rank, _rank_desc(imbalance)])
+
+    # ==================== Persistence ====================
+
+    def to_arrays(self) -> dict[str, np.ndarray]:
+        arrays = {
+            "ts": self.ts,
+            "symbols": np.array(self.symbols, dtype=np.str_),
+            "feeds": self.feeds,
+            "prev_close": self.prev_close,
+            "gap_rank": self.gap_rank,
+            "imbalance_rank": self.imbalance_rank,
+        }
+        for name in self.FLOAT_COLUMNS + self.INT_COLUMNS:
+            arrays[name] = getattr(self, name)
+        return arrays
+
+    @classmethod
+    def from_arrays(cls, day: str, arrays: Any) -> "PreOpenSeries":
+        series = cls(day)
+        series.symbols = [str(s) for s in arrays["symbols"]]
+        series._index = {s: i for i, s in enumerate(series.symbols)}
+        for name in ("ts", "feeds", "prev_close", "gap_rank", "imbalance_rank") + cls.FLOAT_COLUMNS + cls.INT_COLUMNS:
+            setattr(series, name, np.asarray(arrays[name]))
+        return series
+
+    # ==================== Queries ====================
+
+    def _col(self, symbol: str) -> int | None:
+        return self._index.get(symbol.upper())
+
+    def _select(self, feed: str | None) -> np.ndarray:
+        """Column mask for a feed (all symbols when None)."""
+        if feed is None:
+            return np.ones(len(self.symbols), dtype=bool)
+        return (self.feeds & PRE_OPEN_FEEDS.get(feed.upper(), 0)) > 0
+
+    def symbol_trend(self, symbol: str) -> dict[str, Any] | None:
+        """IEP drift and order-imbalance trend of one symbol over the session."""
+        j = self._col(symbol)
+        if j is None or not len(self):
+            return None
+        iep = self.iep[:, j]
+        seen = ~np.isnan(iep)
+        if not seen.any():
+            return None
+        first, last = round(float(iep[seen][0]), 2), round(float(iep[seen][-1]), 2)
+        prev_close = float(self.prev_close[j])
+        imb = self.imbalance[:, j]
+        imb_seen = ~np.isnan(imb)
+        return {
+            "symbol": self.symbols[j],
+            "snapshots": int(seen.sum()),
+            "prev_close": prev_close,
+            "first_iep": first,
+            "last_iep": last,
+            "iep_drift_pct": round((last / first - 1) * 100, 3) if first else 0.0,
+            "gap_pct": round((last / prev_close - 1) * 100, 3) if prev_close else 0.0,
+            "first_imbalance": round(float(imb[imb_seen][0]), 3) if imb_seen.any() else None,
+            "last_imbalance": round(float(imb[imb_seen][-1]), 3) if imb_seen.any() else None,
+            "imbalance_slope_per_min": _slope_per_min(self.ts[imb_seen], imb[imb_seen]),
+            "final_qty": int(self.final_qty[np.flatnonzero(seen)[-1], j]),
+            "iep_series": [round(float(v), 2) for v in iep[seen]],
+        }
+
+    def drift(self, feed: str | None = None) -> tuple[np.ndarray, np.ndarray]:
+        """(column indices, IEP drift %) between each symbol's first and last IEP."""
+        mask = self._select(feed)
+        iep = self.iep[:, mask]
+        seen = ~np.isnan(iep)
+        has = seen.any(axis=0)
+        first_i = seen.argmax(axis=0)
+        last_i = len(self) - 1 - seen[::-1].argmax(axis=0)
+        cols = np.flatnonzero(mask)[has]
+        first = iep[first_i[has], np.flatnonzero(has)]
+        last = iep[last_i[has], np.flatnonzero(has)]
+        return cols, (last / first - 1) * 100
+
+    def _last_seen(self) -> np.ndarray:
+        """Row of each symbol's latest IEP (-1 if never quoted)."""
+        seen = ~np.isnan(self.iep)
+        last = len(self) - 1 - seen[::-1].argmax(axis=0)
+        return np.where(seen.any(axis=0), last, -1)
+
+    def leaders(self, top: int = 10, feed: str | None = None) -> dict[str, list[dict[str, Any]]]:
+        """Top symbols by gap and order imbalance, and by IEP drift over the session.
+
+        Gap and imbalance use each symbol's latest quote. When the last
+        poll covered every symbol, the rankings stored with it are used
+        as-is; otherwise they are recomputed from the latest quotes. Only
+        the symbols on each side (e.g. positive gaps for ``gap_up``) are
+        listed.
+        """
+        if not len(self):
+            return {}
+        mask = self._select(feed)
+        last = self._last_seen()
+        cols = np.arange(len(self.symbols))
+        row_of = np.maximum(last, 0)
+        iep = np.where(last >= 0, self.iep[row_of, cols], np.nan)
+        imbalance = np.where(last >= 0, self.imbalance[row_of, cols], np.nan)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            gap = np.where(self.prev_close > 0, (iep / self.prev_close - 1) * 100, np.nan)
+
+        if np.all(last[last >= 0] == len(self) - 1):
+            gap_rank, imbalance_rank = self.gap_rank[-1], self.imbalance_rank[-1]
+        else:
+            gap_rank, imbalance_rank = _rank_desc(gap), _rank_desc(imbalance)
+
+        def side(rank_row: np.ndarray, values: np.ndarray, sign: int) -> list[int]:
+            ranked = rank_row[rank_row >= 0]
+            ranked = ranked[mask[ranked] & (sign * values[ranked] > 0)]
+            return (ranked if sign > 0 else ranked[::-1])[:top].tolist()
+
+        def row(j: int, **extra: Any) -> dict[str, Any]:
+            return {
+                "symbol": self.symbols[j],
+                "iep": None if np.isnan(iep[j]) else round(float(iep[j]), 2),
+                "gap_pct": None if np.isnan(gap[j]) else round(float(gap[j]), 2),
+                "imbalance": None if np.isnan(imbalance[j]) else round(float(imbalance[j]), 3),
+                **extra,
+            }
+
+        drift_cols, drift = self.drift(feed)
+        order = np.argsort(-drift, kind="stable")
+        up = [k for k in order if drift[k] > 0][:top]
+        down = [k for k in order[::-1] if drift[k] < 0][:top]
+
+        return {
+            "gap_up": [row(j) for j in side(gap_rank, gap, 1)],
+            "gap_down": [row(j) for j in side(gap_rank, gap, -1)],
+            "buy_imbalance": [row(j) for j in side(imbalance_rank, imbalance, 1)],
+            "sell_imbalance": [row(j) for j in side(imbalance_rank, imbalance, -1)],
+            "drift_up": [row(int(drift_cols[k]), drift_pct=round(float(drift[k]), 3)) for k in up],
+            "drift_down": [row(int(drift_cols[k]), drift_pct=round(float(drift[k]), 3)) for k in down],
+        }
+
+
+def _rank_desc(values: np.ndarray) -> np.ndarray:
+    """Column indices sorted by value, descending, NaNs last."""
+    keyed = np.where(np.isnan(values), -np.inf, values)
+    return np.argsort(-keyed, kind="stable").astype(np.int32)
+
+
+def _slope_per_min(ts: np.ndarray, values: np.ndarray) -> float | None:
+    if len(values) < 2 or ts[-1] == ts[0]:
+        return None
+    minutes = (ts - ts[0]) / 60
+    return round(float(np.polyfit(minutes, values.astype(np.float64), 1)[0]), 4)
+
+
+class PreOpenSeriesStore:
+    """One compressed ``.npz`` file of pre-open series per trading day."""
+
+    def __init__(self, store_dir: str | Path, retention_days: int = 30):
+        """Initialize the store.
+
+        Args:
+            store_dir: Directory holding ``pre_open-{YYYY-MM-DD}.npz`` files
+            retention_days: Number of daily files kept on disk
+        """
+        self.store_dir = Path(store_dir)
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+        self.retention_days = retention_days
+
+    def _path(self, day: str) -> Path:
+        return self.store_dir / f"pre_open-{day}.npz"
+
+    def days(self) -> list[str]:
+        """Recorded days, oldest first."""
+        return sorted(
+            p.stem.removeprefix("pre_open-")
+            for p in self.store_dir.glob("pre_open-*.npz")
+            if not p.stem.endswith(".tmp")  # An in-flight or crashed save
+        )
+
+    def load(self, day: date | str | None = None) -> PreOpenSeries | None:
+        """Load a day's series (default: today)."""
+        day = str(day or date.today().isoformat())
+        path = self._path(day)
+        if not path.exists():
+            return None
+        with np.load(path, allow_pickle=False) as arrays:
+            return PreOpenSeries.from_arrays(day, arrays)
+
+    def latest(self) -> PreOpenSeries | None:
+        days = self.days()
+        return self.load(days[-1]) if days else None
+
+    def save(self, series: PreOpenSeries) -> Path:
+        """Write a series atomically."""
+        path = self._path(series.day)
+        tmp = path.with_name(path.stem + ".tmp.npz")
+        np.savez_compressed(tmp, **series.to_arrays())
+        os.replace(tmp, path)
+        return path
+
+    def prune(self) -> int:
+        """Delete files beyond the retention window; returns the number removed."""
+        days = self.days()
+        removed = 0
+        for day in days[:-self.retention_days] if self.retention_days else []:
+            self._path(day).unlink(missing_ok=True)
+            removed += 1
+        return removed
+
+
+# Async fetch function: feed key -> raw /api/market-data-pre-open response
+PreOpenFetcher = Callable[[str], Awaitable[Any]]
+
+
+async def record_pre_open_session(
+    fetch: PreOpenFetcher,
+    store: PreOpenSeriesStore,
+    until: datetime,
+    cadence_s: float = 30.0,
+    feeds: Iterable[str] = tuple(PRE_OPEN_FEEDS),
+) -> PreOpenSeries:
+    """Poll the pre-open feeds at a fixed cadence and append each poll to today's series.
+
+    Feeds are fetched concurrently per poll. Polls are scheduled on a
+    fixed grid from the first one, so a slow response shortens the next
+    wait instead of shifting every later snapshot. The series is saved
+    after every poll so it can be queried while the session is running.
+
+    Args:
+        fetch: Returns the raw pre-open response for a feed key (uncached)
+        store: Destination store
+        until: Stop polling after this time
+        cadence_s: Seconds between polls
+        feeds: Feed keys to poll
+
+    Returns:
+        The day's series
+    """
+    feeds = list(feeds)
+    day = date.today().isoformat()
+    series = store.load(day) or PreOpenSeries(day)
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    polls = 0
+
+    while True:
+        ts = datetime.now().timestamp()
+        results = await asyncio.gather(*(fetch(feed) for feed in feeds), return_exceptions=True)
+        responses = {}
+        for feed, result in zip(feeds, results):
+            if isinstance(result, BaseException):
+                logger.warning(f"Pre-open fetch failed for {feed}: {result}")
+            else:
+                responses[feed] = result
+        frame = PreOpenFrame.from_responses(responses, ts=ts)
+        if frame.symbols:
+            series.append(frame)
+            store.save(series)
+        polls += 1
+
+        next_at = started + polls * cadence_s
+        if datetime.now().timestamp() + (next_at - loop.time()) > until.timestamp():
+            break
+        await asyncio.sleep(max(0.0, next_at - loop.time()))
+
+    store.prune()
+    logger.info(f"Recorded {len(series)} pre-open snapshots of {len(series.symbols)} symbols for {day}")
+    return series
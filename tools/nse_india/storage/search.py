@@ -0,0 +1,364 @@
+"""SQLite FTS5 full-text index over tracked announcements and their PDF attachments."""
+
+import importlib.util
+import logging
+import re
+import sqlite3
+import threading
+from dataclasses import asdict, dataclass
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any
+
+from .tracker import ProcessedAnnouncement
+
+logger = logging.getLogger(__name__)
+
+# PDF text extraction needs the optional ``pypdf`` package (``pip install pypdf``);
+# without it only the subject, details and company name are indexed.
+PDF_TEXT_AVAILABLE = importlib.util.find_spec("pypdf") is not None
+
+# Attachment text kept per document (first pages carry the substance of a filing)
+MAX_ATTACHMENT_PAGES = 20
+MAX_ATTACHMENT_CHARS = 100_000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS nse_announcement_docs (
+    id INTEGER PRIMARY KEY,
+    unique_id TEXT NOT NULL UNIQUE,
+    index_type TEXT NOT NULL,
+    symbol TEXT,
+    company_name TEXT NOT NULL,
+    category TEXT NOT NULL,
+    broadcast_date TEXT NOT NULL,
+    broadcast_datetime TEXT NOT NULL,
+    attachment_url TEXT,
+    attachment_path TEXT,
+    has_attachment_text INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS ix_nse_docs_symbol_date ON nse_announcement_docs (symbol, broadcast_date);
+CREATE INDEX IF NOT EXISTS ix_nse_docs_date ON nse_announcement_docs (broadcast_date);
+CREATE VIRTUAL TABLE IF NOT EXISTS nse_announcement_fts USING fts5(
+    subject, details, company_name, attachment_text,
+    tokenize = 'porter unicode61'
+);
+"""
+
+# bm25 column weights: subject, details, company_name, attachment_text
+_BM25_WEIGHTS = (4.0, 2.0, 3.0, 1.0)
+
+
+@dataclass
+class SearchHit:
+    """One ranked announcement returned by a full-text query."""
+
+    unique_id: str
+    symbol: str | None
+    company_name: str
+    category: str
+    broadcast_datetime: str
+    snippet: str
+    score: float
+    attachment_url: str | None = None
+    attachment_path: str | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary for JSON serialization."""
+        return asdict(self)
+
+
+def extract_pdf_text(path: str | Path) -> str:
+    """Extract plain text from the first pages of a PDF.
+
+    Args:
+        path: Local PDF path
+
+    Returns:
+        Extracted text, or "" if pypdf is missing or the file is unreadable
+    """
+    if not PDF_TEXT_AVAILABLE:
+        return ""
+    from pypdf import PdfReader
+
+    try:
+        reader = PdfReader(str(path))
+        parts: list[str] = []
+        size = 0
+        for page in reader.pages[:MAX_ATTACHMENT_PAGES]:
+            text = page.extract_text() or ""
+            parts.append(text)
+            size += len(text)
+            if size >= MAX_ATTACHMENT_CHARS:
+                break
+        return " ".join(" ".join(parts).split())[:MAX_ATTACHMENT_CHARS]
+    except Exception as e:
+        logger.debug(f"Could not extract text from {path}: {e}")
+        return ""
+
+
+def to_match_query(query: str) -> str:
+    """Turn free text into an FTS5 query: every word must match, as a prefix.
+
+    Quoted phrases are kept as phrases. Users and agents type plain words,
+    so FTS5 operators and punctuation are not passed through.
+    """
+    terms: list[str] = []
+    for phrase, word in re.findall(r'"([^"]+)"|(\w+)', query):
+        if phrase:
+            words = re.findall(r"\w+", phrase)
+            if words:
+                terms.append('"' + " ".join(words) + '"')
+        elif word:
+            terms.append(f'"{word}"*')
+    return " ".join(terms)
+
+
+class AnnouncementSearchIndex:
+    """Full-text index of tracked announcements with symbol, date and category filters.
+
+    Lives in the tracker's SQLite database: ``nse_announcement_docs`` holds
+    filterable metadata and ``nse_announcement_fts`` (FTS5, same rowid) the
+    subject, details, company name and attachment text. ``add`` indexes
+    new tracker records as they are processed; ``sync`` backfills every
+    tracked announcement not yet indexed. Queries are ranked by BM25.
+    """
+
+    def __init__(self, db_path: str | Path = "nse_announcements.db"):
+        """Initialize the index, creating its tables if needed.
+
+        Args:
+            db_path: Path to the announcement tracker's SQLite database
+        """
+        self.db_path = Path(db_path)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    # === Indexing ===
+
+    def add(self, records: list[ProcessedAnnouncement]) -> int:
+        """Index processed announcements (already indexed ones are skipped).
+
+        Args:
+            records: Tracker records, e.g. from process_announcements
+
+        Returns:
+            Number of announcements newly indexed
+        """
+        rows = [
+            {
+                "unique_id": r.unique_id,
+                "index_type": r.index_type,
+                "symbol": r.symbol,
+                "company_name": r.company_name,
+                "subject": r.subject,
+                "details": r.details,
+                "broadcast_datetime": r.broadcast_datetime,
+                "attachment_url": r.attachment_url,
+                "attachment_path": r.attachment_path,
+            }
+            for r in records
+        ]
+        return self._add_rows(rows)
+
+    def sync(self) -> int:
+        """Index every tracked announcement that is not in the index yet.
+
+        Returns:
+            Number of announcements newly indexed
+        """
+        try:
+            with self._lock:
+                cursor = self._conn.execute(
+                    """
+                    SELECT p.unique_id, p.index_type, p.symbol, p.company_name, p.subject,
+                           p.details, p.broadcast_datetime, p.attachment_url, p.attachment_path
+                    FROM nse_processed_announcements p
+                    WHERE NOT EXISTS (
+                        SELECT 1 FROM nse_announcement_docs d WHERE d.unique_id = p.unique_id
+                    )
+                    """
+                )
+                rows = [dict(row) for row in cursor.fetchall()]
+        except sqlite3.OperationalError:
+            # Tracker table not created yet
+            return 0
+        return self._add_rows(rows)
+
+    def _add_rows(self, rows: list[dict[str, Any]]) -> int:
+        # Extract attachment text outside the write lock (PDF parsing is the slow part)
+        with self._lock:
+            known = self._known_ids([r["unique_id"] for r in rows])
+        rows = [r for r in rows if r["unique_id"] not in known]
+        if not rows:
+            return 0
+
+        texts = {}
+        for r in rows:
+            path = r.get("attachment_path")
+            if path and str(path).lower().endswith(".pdf") and Path(path).exists():
+                texts[r["unique_id"]] = extract_pdf_text(path)
+
+        added = 0
+        with self._lock, self._conn:
+            for r in rows:
+                broadcast = r["broadcast_datetime"]
+                if isinstance(broadcast, str):
+                    broadcast = datetime.fromisoformat(broadcast)
+                attachment_text = texts.get(r["unique_id"], "")
+                cursor = self._conn.execute(
+                    """
+                    INSERT OR IGNORE INTO nse_announcement_docs (
+                        unique_id, index_type, symbol, company_name, category,
+                        broadcast_date, broadcast_datetime, attachment_url,
+                        attachment_path, has_attachment_text
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    (
+                        r["unique_id"],
+                        r["index_type"],
+                        (r["symbol"] or "").upper() or None,
+                        r["company_name"],
+                        r["subject"],
+                        broadcast.date().isoformat(),
+                        broadcast.isoformat(sep=" ", timespec="seconds"),
+                        r["attachment_url"],
+                        r["attachment_path"],
+                        int(bool(attachment_text)),
+                    ),
+                )
+                if not cursor.rowcount:
+                    continue
+                self._conn.execute(
+                    "INSERT INTO nse_announcement_fts (rowid, subject, details, company_name, attachment_text)"
+                    " VALUES (?, ?, ?, ?, ?)",
+                    (cursor.lastrowid, r["subject"], r["details"] or "", r["company_name"], attachment_text),
+                )
+                added += 1
+        return added
+
+    def _known_ids(self, unique_ids: list[str]) -> set[str]:
+        known: set[str] = set()
+        for i in range(0, len(unique_ids), 500):
+            chunk = unique_ids[i:i + 500]
+            placeholders = ",".join("?" * len(chunk))
+            cursor = self._conn.execute(
+                f"SELECT unique_id FROM nse_announcement_docs WHERE unique_id IN ({placeholders})",
+                chunk,
+            )
+            known.update(row[0] for row in cursor)
+        return known
+
+    # === Queries ===
+
+    def search(
+        self,
+        query: str,
+        symbol: str | None = None,
+        from_date: date | str | None = None,
+        to_date: date | str | None = None,
+        category: str | None = None,
+        index_type: str | None = None,
+        limit: int = 20,
+    ) -> list[SearchHit]:
+        """Search announcements, best matches first.
+
+        Args:
+            query: Free-text query; every word must match (prefix match),
+                "quoted phrases" match as phrases
+            symbol: Only this stock symbol
+            from_date: Only announcements broadcast on/after this date
+            to_date: Only announcements broadcast on/before this date
+            category: Only announcements whose subject contains this text
+                (e.g. "Outcome of Board Meeting", "Acquisition")
+            index_type: Only this announcement index ("equities", "debt", "sme", ...)
+            limit: Maximum number of hits
+
+        Returns:
+            Ranked SearchHit list with highlighted snippets
+        """
+        match = to_match_query(query)
+        if not match:
+            return []
+
+        where = ["nse_announcement_fts MATCH ?"]
+        params: list[Any] = [match]
+        if symbol:
+            where.append("d.symbol = ?")
+            params.append(symbol.upper())
+        if from_date:
+            where.append("d.broadcast_date >= ?")
+            params.append(str(from_date))
+        if to_date:
+            where.append("d.broadcast_date <= ?")
+            params.append(str(to_date))
+        if category:
+            where.append("d.category LIKE ?")
+            params.append(f"%{category}%")
+        if index_type:
+            where.append("d.index_type = ?")
+            params.append(index_type.lower())
+        params.append(limit)
+
+        weights = ", ".join(str(w) for w in _BM25_WEIGHTS)
+        sql = f"""
+            SELECT d.unique_id, d.symbol, d.company_name, d.category, d.broadcast_datetime,
+                   d.attachment_url, d.attachment_path,
+                   snippet(nse_announcement_fts, -1, '[', ']', '…', 16) AS snippet,
+                   bm25(nse_announcement_fts, {weights}) AS score
+            FROM nse_announcement_fts
+            JOIN nse_announcement_docs d ON d.id = nse_announcement_fts.rowid
+            WHERE {" AND ".join(where)}
+            ORDER BY score
+            LIMIT ?
+        """
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [
+            SearchHit(
+                unique_id=row["unique_id"],
+                symbol=row["symbol"],
+                company_name=row["company_name"],
+                category=row["category"],
+                broadcast_datetime=row["broadcast_datetime"],
+                snippet=row["snippet"],
+                score=round(-row["score"], 3),
+                attachment_url=row["attachment_url"],
+                attachment_path=row["attachment_path"],
+            )
+            for row in rows
+        ]
+
+    @property
+    def stats(self) -> dict[str, Any]:
+        """Indexed document count, how many include attachment text, and date range."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(has_attachment_text), 0),"
+                " MIN(broadcast_date), MAX(broadcast_date) FROM nse_announcement_docs"
+            ).fetchone()
+        return {
+            "documents": row[0],
+            "with_attachment_text": row[1],
+            "from_date": row[2],
+            "to_date": row[3],
+            "pdf_text_available": PDF_TEXT_AVAILABLE,
+        }
+
+    def rebuild(self) -> int:
+        """Drop the index and re-index every tracked announcement.
+
+        Returns:
+            Number of announcements indexed
+        """
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM nse_announcement_fts")
+            self._conn.execute("DELETE FROM nse_announcement_docs")
+        return self.sync()
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._conn.close()
@@ -0,0 +1,97 @@
+"""Daily on-disk cache of the parsed NSE securities master (EQUITY_L.csv)."""
+
+import gzip
+import json
+import logging
+import os
+from datetime import date
+from pathlib import Path
+
+from ..models.securities import SecuritiesResponse, Security
+
+logger = logging.getLogger(__name__)
+
+# Column order of the stored rows (Security field names)
+SECURITY_FIELDS: tuple[str, ...] = tuple(Security.model_fields)
+
+
+class SecuritiesMasterStore:
+    """Parsed securities master, stored once per day as compact columnar JSON.
+
+    ``EQUITY_L.csv`` changes at most once a day, but parsing and validating
+    its ~2,000 rows costs far more than reading them back. Each day's parse
+    is written as ``{YYYY-MM-DD}.json.gz`` holding a field list plus one
+    value row per security, and loaded without re-validation.
+    """
+
+    def __init__(self, store_dir: str | Path, retention_days: int = 7):
+        """Initialize the store.
+
+        Args:
+            store_dir: Directory holding the daily files
+            retention_days: Number of daily files to keep on disk
+        """
+        self.store_dir = Path(store_dir)
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+        self.retention_days = retention_days
+
+    def _path(self, day: str) -> Path:
+        return self.store_dir / f"{day}.json.gz"
+
+    def days(self) -> list[str]:
+        """List stored days (oldest first)."""
+        return sorted(p.name.removesuffix(".json.gz") for p in self.store_dir.glob("*.json.gz"))
+
+    def load(self, day: date | str | None = None) -> SecuritiesResponse | None:
+        """Load one day's securities master.
+
+        Args:
+            day: Day to load (defaults to today)
+
+        Returns:
+            SecuritiesResponse, or None if that day was not stored
+        """
+        path = self._path(str(day or date.today()))
+        if not path.exists():
+            return None
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                payload = json.load(f)
+            fields = payload["fields"]
+            records = [dict(zip(fields, row)) for row in payload["rows"]]
+            return SecuritiesResponse.from_records(records)
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Could not read securities master {path}: {e}")
+            return None
+
+    def save(self, response: SecuritiesResponse, day: date | str | None = None) -> Path:
+        """Store a parsed securities master and prune old days.
+
+        Args:
+            response: Parsed securities
+            day: Day the master belongs to (defaults to today)
+
+        Returns:
+            Path of the written file
+        """
+        day_str = str(day or date.today())
+        rows = []
+        for sec in response.securities:
+            record = sec.model_dump(mode="json")
+            rows.append([record[name] for name in SECURITY_FIELDS])
+        payload = {"day": day_str, "fields": list(SECURITY_FIELDS), "rows": rows}
+
+        path = self._path(day_str)
+        tmp = path.with_name(path.name + ".tmp")
+        with gzip.open(tmp, "wt", encoding="utf-8") as f:
+            json.dump(payload, f, separators=(",", ":"))
+        os.replace(tmp, path)
+        self.prune()
+        return path
+
+    def prune(self) -> int:
+        """Delete days beyond the retention window. Returns files removed."""
+        stale = self.days()[:-self.retention_days] if self.retention_days > 0 else []
+        for day in stale:
+            self._path(day).unlink(missing_ok=True)
+        return len(stale)
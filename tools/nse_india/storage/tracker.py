@@ -3,6 +3,7 @@
 from datetime import datetime
 from pathlib import Path
 
+from sqlalchemy import event
 from sqlmodel import Field, Session, SQLModel, create_engine, select
 
 from ..models.announcement import Announcement, DebtAnnouncement, EquityAnnouncement
@@ -49,10 +50,41 @@ class ProcessedAnnouncement(SQLModel, table=True):
         )
 
 
+class AttachmentFile(SQLModel, table=True):
+    """Database model for downloaded attachment files.
+
+    Keyed by URL so a re-run reuses finished downloads, and indexed by
+    content hash so identical PDFs filed under different URLs are kept on
+    disk once.
+    """
+
+    __tablename__ = "nse_attachment_files"
+
+    url: str = Field(primary_key=True)
+    sha256: str = Field(index=True)
+    path: str
+    size: int
+    downloaded_at: datetime = Field(default_factory=datetime.now)
+
+
+def _enable_wal(engine):
+    """Put every SQLite connection of the tracker engine in WAL mode."""
+
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.close()
+
+    return engine
+
+
 class AnnouncementTracker:
     """Track processed announcements to avoid reprocessing.
 
-    Uses SQLite database to persist the state of processed announcements.
+    Uses SQLite database (in WAL mode) to persist the state of processed
+    announcements and downloaded attachment files.
     """
 
     def __init__(self, db_path: str | Path = "nse_announcements.db"):
@@ -62,8 +94,12 @@ class AnnouncementTracker:
             db_path: Path to SQLite database file
         """
         self.db_path = Path(db_path)
-        self._engine = create_engine(f"sqlite:///{self.db_path}", echo=False)
-        SQLModel.metadata.create_all(self._engine)
+        self._engine = _enable_wal(create_engine(f"sqlite:///{self.db_path}", echo=False))
+        # Only the tracker's tables: the shared metadata may hold other packages' models
+        SQLModel.metadata.create_all(
+            self._engine,
+            tables=[ProcessedAnnouncement.__table__, AttachmentFile.__table__],
+        )
 
     def is_processed(self, unique_id: str) -> bool:
         """Check if an announcement has already been processed.
@@ -109,6 +145,89 @@ class AnnouncementTracker:
             session.refresh(processed)
             return processed
 
+    def mark_processed_many(
+        self,
+        announcements: list[Announcement],
+        index_type: AnnouncementIndex,
+        attachment_paths: dict[str, str] | None = None,
+    ) -> list[ProcessedAnnouncement]:
+        """Mark a batch of announcements as processed in one transaction.
+
+        Args:
+            announcements: Announcements to mark (duplicates by unique_id are stored once)
+            index_type: Type of announcement index
+            attachment_paths: Local attachment path per announcement unique_id
+
+        Returns:
+            The stored ProcessedAnnouncement records
+        """
+        attachment_paths = attachment_paths or {}
+        records: dict[str, ProcessedAnnouncement] = {}
+        for announcement in announcements:
+            if announcement.unique_id not in records:
+                records[announcement.unique_id] = ProcessedAnnouncement.from_announcement(
+                    announcement=announcement,
+                    index_type=index_type,
+                    attachment_path=attachment_paths.get(announcement.unique_id),
+                )
+        if not records:
+            return []
+
+        with Session(self._engine, expire_on_commit=False) as session:
+            session.add_all(records.values())
+            session.commit()
+            return list(records.values())
+
+    def get_attachments(self, urls: list[str]) -> dict[str, AttachmentFile]:
+        """Get downloaded attachment files by URL.
+
+        Args:
+            urls: Attachment URLs
+
+        Returns:
+            Dict of URL to AttachmentFile for the URLs already downloaded
+        """
+        if not urls:
+            return {}
+        with Session(self._engine) as session:
+            statement = select(AttachmentFile).where(AttachmentFile.url.in_(urls))
+            return {f.url: f for f in session.exec(statement).all()}
+
+    def get_attachments_by_hash(self, hashes: list[str]) -> dict[str, AttachmentFile]:
+        """Get downloaded attachment files by content hash.
+
+        Args:
+            hashes: SHA-256 hex digests
+
+        Returns:
+            Dict of digest to the first AttachmentFile stored with that content
+        """
+        if not hashes:
+            return {}
+        with Session(self._engine) as session:
+            statement = (
+                select(AttachmentFile)
+                .where(AttachmentFile.sha256.in_(hashes))
+                .order_by(AttachmentFile.downloaded_at)
+            )
+            found: dict[str, AttachmentFile] = {}
+            for f in session.exec(statement).all():
+                found.setdefault(f.sha256, f)
+            return found
+
+    def record_attachments(self, files: list[AttachmentFile]) -> None:
+        """Store downloaded attachment files in one transaction.
+
+        Args:
+            files: Attachment files (existing URLs are updated)
+        """
+        if not files:
+            return
+        with Session(self._engine) as session:
+            for f in files:
+                session.merge(f)
+            session.commit()
+
     def get_unprocessed(
         self,
         announcements: list[Announcement],
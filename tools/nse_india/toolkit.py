@@ -1,13 +1,13 @@
 """Agno Toolkit for NSE India corporate announcements - for agent integration."""
 
-import csv
 from datetime import date, datetime
-from io import StringIO
 from pathlib import Path
 from typing import Any
 
 from agno.tools import Toolkit
 
+from core.output_format import DEFAULT_MAX_TOKENS, budget_tools, format_table, sample_rows
+
 from .client import NSEIndiaClient
 from .models.announcement import (
     Announcement,
@@ -27,6 +27,11 @@ from .models.most_active import (
 )
 from .models.oi_spurts import OISpurtData, OISpurtsResponse
 from .models.shareholding import DetailedShareholdingPattern
+from .storage.option_chain import OptionChainSeriesStore
+from .storage.pre_open import PreOpenSeriesStore
+
+# Put-call ratios are plain ratios, not OI counts (the "_oi" suffix would round them to integers)
+_PCR_KINDS = {"pcr_oi": "correlation", "pcr_volume": "correlation"}
 
 
 class NSEIndiaToolkit(Toolkit):
@@ -40,6 +45,9 @@ class NSEIndiaToolkit(Toolkit):
         self,
         db_path: str | Path = "nse_announcements.db",
         attachments_dir: str | Path = "./nse_attachments",
+        max_output_tokens: int | None = DEFAULT_MAX_TOKENS,
+        pre_open_dir: str | Path | None = None,
+        option_chain_dir: str | Path | None = None,
         **kwargs,
     ):
         """Initialize the NSE India toolkit.
@@ -47,17 +55,26 @@ class NSEIndiaToolkit(Toolkit):
         Args:
             db_path: Path to SQLite database for tracking
             attachments_dir: Directory for downloaded attachments
+            max_output_tokens: Hard token budget per tool result (None disables)
+            pre_open_dir: Recorded pre-open series (default: settings.PRE_OPEN_DIR)
+            option_chain_dir: Recorded option-chain series (default: settings.OPTION_CHAIN_DIR)
         """
         self.client = NSEIndiaClient(
             db_path=db_path,
             attachments_dir=attachments_dir,
         )
+        self.max_output_tokens = max_output_tokens
+        self._pre_open_dir = pre_open_dir
+        self._pre_open_store: PreOpenSeriesStore | None = None
+        self._option_chain_dir = option_chain_dir
+        self._option_chain_store: OptionChainSeriesStore | None = None
 
         tools = [
             self.get_equity_announcements,
             self.get_debt_announcements,
             self.get_symbol_announcements,
             self.get_new_announcements,
+            self.search_announcements,
             self.get_annual_reports,
             self.get_shareholding_patterns,
             self.get_detailed_shareholding,
@@ -74,10 +91,13 @@ class NSEIndiaToolkit(Toolkit):
             # New enhanced tools
             self.scan_oi_spurts,
             self.fetch_sector_constituents,
+            self.get_pre_open_trend,
+            self.get_option_chain_changes,
         ]
 
         instructions = """Use these tools to fetch data from NSE India:
 - Corporate announcements (equity, debt, symbol-specific)
+- Full-text search over already-processed announcements and their PDFs
 - Annual reports and shareholding patterns
 - Financial results comparison across quarters
 - Open Interest (OI) spurts and market activity
@@ -93,6 +113,14 @@ class NSEIndiaToolkit(Toolkit):
   * Short Covering (bullish), Long Unwinding (bearish)
 - `fetch_sector_constituents(sector)` - Get all stocks in a sector by name:
   * Examples: "banking", "it", "pharma", "auto", "metal", "fmcg"
+- `search_announcements(query, symbol, days, category)` - Ranked snippets from the
+  local announcement index (subjects, details and PDF text); no live fetch, so
+  prefer it over re-reading announcement lists when looking for a topic
+- `get_pre_open_trend(symbols)` - IEP drift and order-imbalance trend over the
+  9:00-9:08 pre-open session (recorded locally, no live fetch)
+- `get_option_chain_changes(symbol, since)` - OI / IV change per strike, buildup
+  labels and the PCR trend since the open, from option-chain snapshots recorded
+  every few minutes (NIFTY, BANKNIFTY by default; no live fetch)
 
 Available indices: NIFTY 50, NIFTY NEXT 50, NIFTY 100, NIFTY 200, NIFTY 500,
 NIFTY BANK, NIFTY IT, NIFTY PHARMA, NIFTY AUTO, NIFTY FMCG, NIFTY METAL,
@@ -100,6 +128,8 @@ NIFTY REALTY, NIFTY ENERGY, NIFTY INFRA, NIFTY PSE, NIFTY PSU BANK, etc.
 
 Note: Symbol should be in uppercase (e.g., "RELIANCE", "TCS", "INFY")."""
 
+        tools = budget_tools(tools, max_output_tokens)
+
         super().__init__(name="nse_india", tools=tools, instructions=instructions, **kwargs)
 
     def _format_announcements_as_csv(self, announcements: list[Announcement]) -> str:
@@ -114,8 +144,6 @@ Note: Symbol should be in uppercase (e.g., "RELIANCE", "TCS", "INFY")."""
         if not announcements:
             return "No announcements found."
 
-        output = StringIO()
-
         # Determine columns based on announcement type
         first = announcements[0]
         if isinstance(first, EquityAnnouncement):
@@ -136,14 +164,12 @@ Note: Symbol should be in uppercase (e.g., "RELIANCE", "TCS", "INFY")."""
                 "attachment_url",
             ]
 
-        writer = csv.DictWriter(output, fieldnames=fieldnames)
-        writer.writeheader()
-
+        rows = []
         for ann in announcements:
             row = {
                 "company_name": ann.company_name,
                 "subject": ann.subject,
-                "details": ann.details[:200] + "..." if len(ann.details) > 200 else ann.details,
+                "details": ann.details,
                 "broadcast_datetime": (
                     ann.broadcast_datetime.strftime("%Y-%m-%d %H:%M:%S")
                     if ann.broadcast_datetime
@@ -155,9 +181,9 @@ Note: Symbol should be in uppercase (e.g., "RELIANCE", "TCS", "INFY")."""
             if isinstance(ann, EquityAnnouncement):
                 row["symbol"] = ann.symbol
 
-            writer.writerow(row)
+            rows.append(row)
 
-        return output.getvalue()
+        return format_table(rows, fieldnames, max_text=200)
 
     def _format_reports_as_csv(self, reports: list[AnnualReport], symbol: str) -> str:
         """Format annual reports as CSV for LLM readability.
@@ -172,7 +198,6 @@ Note: Symbol should be in uppercase (e.g., "RELIANCE", "TCS", "INFY")."""
         if not reports:
             return f"No annual reports found for {symbol}."
 
-        output = StringIO()
         fieldnames = [
             "company_name",
             "financial_year",
@@ -181,11 +206,9 @@ Note: Symbol should be in uppercase (e.g., "RELIANCE", "TCS", "INFY")."""
             "file_type",
         ]
 
-        writer = csv.DictWriter(output, fieldnames=fieldnames)
-        writer.writeheader()
-
+        rows = []
         for report in reports:
-            writer.writerow({
+            rows.append({
                 "company_name": report.company_name,
                 "financial_year": report.financial_year,
                 "broadcast_datetime": (
@@ -197,7 +220,7 @@ Note: Symbol should be in uppercase (e.g., "RELIANCE", "TCS", "INFY")."""
                 "file_type": "ZIP" if report.is_zip else "PDF",
             })
 
-        return output.getvalue()
+        return format_table(rows, fieldnames)
 
     def _parse_date(self, date_str: str | None) -> date | None:
         """Parse date string in DD-MM-YYYY format.
@@ -305,6 +328,50 @@ Note: Symbol should be in uppercase (e.g., "RELIANCE", "TCS", "INFY")."""
         new_announcements = self.client.get_new_announcements(idx)
         return self._format_announcements_as_csv(new_announcements[:limit])
 
+    def search_announcements(
+        self,
+        query: str,
+        symbol: str | None = None,
+        days: int | None = 30,
+        category: str | None = None,
+        limit: int = 15,
+    ) -> str:
+        """Search processed corporate announcements and their PDF text.
+
+        Use this tool to find filings about a topic (e.g. "order win",
+        "acquisition", "dividend", "resignation") without fetching and
+        reading announcement lists. Searches the local index only.
+
+        Args:
+            query: Words to search for; all must match. Use "quotes" for a phrase.
+            symbol: Limit to one stock symbol (e.g., "RELIANCE")
+            days: Only announcements from the last N days (None for all)
+            category: Text the announcement subject must contain
+                (e.g., "Board Meeting", "Financial Result", "Acquisition")
+            limit: Maximum number of results (default 15)
+
+        Returns:
+            CSV of matches, best first: symbol, company_name, category,
+            broadcast_datetime, snippet (matches in [brackets]), attachment_url
+        """
+        from_date = date.fromordinal(date.today().toordinal() - days) if days else None
+        hits = self.client.search_announcements(
+            query, symbol=symbol, from_date=from_date, category=category, limit=limit
+        )
+        if not hits:
+            stats = self.client.search_index.stats
+            return (
+                f"No indexed announcements match '{query}'. "
+                f"Index holds {stats['documents']} announcements"
+                + (f" from {stats['from_date']} to {stats['to_date']}." if stats["documents"] else ".")
+            )
+        rows = [h.to_dict() for h in hits]
+        return format_table(
+            rows,
+            ["symbol", "company_name", "category", "broadcast_datetime", "snippet", "attachment_url"],
+            max_text=300,
+        )
+
     def get_annual_reports(self, symbol: str) -> str:
         """Get annual reports for a company.
 
@@ -1989,6 +2056,175 @@ Note: Symbol should be in uppercase (e.g., "RELIANCE", "TCS", "INFY")."""
         "smallcap": "NIFTY SMALLCAP 100",
     }
 
+    def get_pre_open_trend(self, symbols: str = "", top: int = 10, feed: str = "") -> str:
+        """Get how the pre-open session evolved: IEP drift and order-imbalance trend.
+
+        Reads the 9:00-9:08 pre-open series recorded by the scheduler
+        (NIFTY, BANKNIFTY and F&O feeds polled every few seconds), so the
+        whole session is available from one local query instead of a
+        single live snapshot.
+
+        - **IEP drift**: change in the Indicative Equilibrium Price from the
+          first to the last snapshot. A gap that keeps widening is stronger
+          than one that fades into the open.
+        - **Imbalance**: (buy qty - sell qty) / (buy qty + sell qty), from -1
+          (all sellers) to +1 (all buyers), and its slope per minute.
+
+        Args:
+            symbols: Comma-separated symbols (e.g. "RELIANCE,TCS"). Empty
+                returns session leaders instead.
+            top: Leaders per category when no symbols are given
+            feed: Limit leaders to one feed: "NIFTY", "BANKNIFTY" or "FO"
+
+        Returns:
+            CSV per-symbol trends, or leader tables by gap, imbalance and drift
+        """
+        try:
+            if self._pre_open_store is None:
+                if self._pre_open_dir is None:
+                    from core.config import get_settings
+
+                    self._pre_open_dir = get_settings().PRE_OPEN_DIR
+                self._pre_open_store = PreOpenSeriesStore(self._pre_open_dir)
+
+            series = self._pre_open_store.load() or self._pre_open_store.latest()
+            if series is None or not len(series):
+                return "No pre-open session has been recorded yet. It is recorded from 9:00 to 9:08 AM IST."
+
+            start = datetime.fromtimestamp(series.ts[0]).strftime("%H:%M:%S")
+            end = datetime.fromtimestamp(series.ts[-1]).strftime("%H:%M:%S")
+            lines = [f"# Pre-Open Session {series.day} ({len(series)} snapshots, {start}-{end})", ""]
+
+            wanted = [s.strip().upper() for s in symbols.split(",") if s.strip()]
+            if wanted:
+                trends = [series.symbol_trend(s) for s in wanted]
+                missing = [s for s, t in zip(wanted, trends) if t is None]
+                rows = [t for t in trends if t is not None]
+                if rows:
+                    for t in rows:
+                        t["iep_series"] = " ".join(f"{v:g}" for v in t["iep_series"])
+                    lines.append(format_table(rows, [
+                        "symbol", "prev_close", "first_iep", "last_iep", "iep_drift_pct", "gap_pct",
+                        "first_imbalance", "last_imbalance", "imbalance_slope_per_min", "final_qty",
+                        "iep_series",
+                    ]))
+                if missing:
+                    lines.append("")
+                    lines.append(f"Not in the recorded feeds: {', '.join(missing)}")
+                return "\n".join(lines)
+
+            leaders = series.leaders(top=top, feed=feed or None)
+            titles = {
+                "gap_up": "Gap Up", "gap_down": "Gap Down",
+                "buy_imbalance": "Buy Imbalance", "sell_imbalance": "Sell Imbalance",
+                "drift_up": "IEP Drifting Up", "drift_down": "IEP Drifting Down",
+            }
+            for key, title in titles.items():
+                rows = leaders.get(key) or []
+                if not rows:
+                    continue
+                columns = ["symbol", "iep", "gap_pct", "imbalance"]
+                if "drift_pct" in rows[0]:
+                    columns.append("drift_pct")
+                lines.append(f"## {title}")
+                lines.append(format_table(rows, columns))
+                lines.append("")
+            return "\n".join(lines)
+        except Exception as e:
+            return f"Error reading pre-open series: {str(e)}"
+
+    def get_option_chain_changes(
+        self,
+        symbol: str = "NIFTY",
+        expiry: str = "",
+        since: str = "",
+        until: str = "",
+        strikes_around_atm: int = 8,
+    ) -> str:
+        """Get how an option chain built up intraday: OI and IV change per strike, buildup and PCR trend.
+
+        Reads option-chain snapshots recorded by the scheduler every few
+        minutes during market hours, so changes between any two times of
+        the day are answered locally (NSE's own change-in-OI field only
+        compares with the previous day).
+
+        Buildup per contract (option price change x OI change):
+        Long Buildup (price up, OI up), Short Buildup (price down, OI up),
+        Short Covering (price up, OI down), Long Unwinding (price down, OI down).
+
+        Args:
+            symbol: Underlying (e.g. "NIFTY", "BANKNIFTY")
+            expiry: Expiry ("27-Jan-2026" or "2026-01-27"); empty for the nearest recorded
+            since: Start time "HH:MM" (empty for the first snapshot of the day)
+            until: End time "HH:MM" (empty for the latest snapshot)
+            strikes_around_atm: Strikes listed either side of ATM
+
+        Returns:
+            Markdown with OI totals and PCR at both times, per-strike changes
+            around ATM, strikes with the largest OI added/shed, and the PCR series
+        """
+        try:
+            if self._option_chain_store is None:
+                if self._option_chain_dir is None:
+                    from core.config import get_settings
+
+                    self._option_chain_dir = get_settings().OPTION_CHAIN_DIR
+                self._option_chain_store = OptionChainSeriesStore(self._option_chain_dir)
+
+            store = self._option_chain_store
+            symbol = symbol.strip().upper()
+            series = store.load(symbol, expiry or None)
+            if series is None:
+                # Fall back to the most recent recorded day
+                days = [k[0] for k in store.keys() if k[1] == symbol]
+                if days:
+                    series = store.load(symbol, expiry or None, day=days[-1])
+            if series is None or not len(series):
+                recorded = sorted({k[1] for k in store.keys()})
+                return (
+                    f"No option-chain snapshots recorded for {symbol}"
+                    + (f" {expiry}" if expiry else "")
+                    + (f". Recorded underlyings: {', '.join(recorded)}" if recorded else ". Recording runs 9:15 AM - 3:30 PM.")
+                )
+
+            changes = series.changes(since or 0, until or None, strikes_around_atm=strikes_around_atm)
+            start, end = changes["from"], changes["to"]
+            lines = [
+                f"# {series.underlying} {series.expiry} Option Chain Changes {series.day} "
+                f"({start['time']} -> {end['time']}, {len(series)} snapshots)",
+                "",
+                format_table([start, end], ["time", "spot", "ce_oi", "pe_oi", "pcr_oi"], kinds=_PCR_KINDS),
+                "",
+                "## Strikes around ATM (* = ATM)",
+            ]
+            rows = [{**r, "strike": f"{r['strike']:g}{'*' if r['atm'] else ''}"} for r in changes["strikes"]]
+            lines.append(format_table(rows, [
+                "strike", "ce_oi", "ce_oi_chg", "ce_iv_chg", "ce_buildup",
+                "pe_oi", "pe_oi_chg", "pe_iv_chg", "pe_buildup",
+            ]))
+
+            top = series.top_changes(since or 0, until or None, top=3)
+            titles = {
+                "ce_added": "Call OI Added (resistance)", "pe_added": "Put OI Added (support)",
+                "ce_shed": "Call OI Shed", "pe_shed": "Put OI Shed",
+            }
+            for key, title in titles.items():
+                if top[key]:
+                    side = key[:2]
+                    lines.append("")
+                    lines.append(f"## {title}")
+                    lines.append(format_table(top[key], [
+                        "strike", f"{side}_oi", f"{side}_oi_chg", f"{side}_ltp_chg", f"{side}_buildup",
+                    ]))
+
+            pcr, _ = sample_rows(series.pcr_series(), max_rows=12, recent=4)
+            lines.append("")
+            lines.append("## PCR Trend")
+            lines.append(format_table(pcr, ["time", "spot", "pcr_oi", "pcr_volume"], kinds=_PCR_KINDS))
+            return "\n".join(lines)
+        except Exception as e:
+            return f"Error reading option-chain series: {str(e)}"
+
     def scan_oi_spurts(self) -> str:
         """Scan OI spurts and categorize as bullish/bearish signals.
 
@@ -1,8 +1,13 @@
 """Screener.in API Client."""
 
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 from typing import Any
 
+from core.instrument_map import InstrumentMap, get_instrument_map, is_symbol_like, normalize_key
+
+from .core.cache import DEFAULT_CACHE_DIR
 from .core.http_client import ScreenerHTTPClient
 from .core.exceptions import ScreenerValidationError, ScreenerNotFoundError
 from .models.search import CompanySearchResult, CompanySearchResponse
@@ -45,14 +50,35 @@ class ScreenerClient:
     def __init__(
         self,
         timeout: float = 30.0,
+        cache_enabled: bool = True,
+        cache_dir: Path | str = DEFAULT_CACHE_DIR,
+        cache_fresh_seconds: float = 900.0,
+        instrument_map: InstrumentMap | None = None,
     ) -> None:
         """
         Initialize the Screener client.
 
         Args:
             timeout: Request timeout in seconds
-        """
-        self._http = ScreenerHTTPClient(timeout=timeout)
+            cache_enabled: Cache parsed company pages on disk (revalidated via ETag/Last-Modified)
+            cache_dir: Directory for the page cache
+            cache_fresh_seconds: Seconds a cached page is used without revalidation
+            instrument_map: Identity map caching company ids by NSE symbol (default: shared map)
+        """
+        self._http = ScreenerHTTPClient(
+            timeout=timeout,
+            cache_enabled=cache_enabled,
+            cache_dir=cache_dir,
+            cache_fresh_seconds=cache_fresh_seconds,
+        )
+        self._instruments = instrument_map
+
+    @property
+    def instruments(self) -> InstrumentMap:
+        """Cross-provider instrument identity map."""
+        if self._instruments is None:
+            self._instruments = get_instrument_map()
+        return self._instruments
 
     # ==========================================================================
     # Search API
@@ -96,6 +122,10 @@ class ScreenerClient:
         """
         Search and return the first matching company.
 
+        Queries that look like an NSE symbol are answered from the
+        instrument identity map once the symbol has been searched; the
+        first search result is written back when its symbol matches.
+
         Args:
             query: Search term
 
@@ -107,8 +137,26 @@ class ScreenerClient:
             >>> if company:
             ...     print(f"ID: {company.id}, Symbol: {company.symbol}")
         """
-        response = self.search(query)
-        return response.first
+        key = normalize_key(query) if is_symbol_like(query) else None
+        if key is not None:
+            ids = self.instruments.lookup(key, "screener")
+            if ids is not None:
+                return CompanySearchResult(
+                    id=ids["screener_id"], name=ids["screener_name"] or key, url=ids["screener_url"]
+                )
+            if self.instruments.is_miss(key, "screener"):
+                return None
+
+        company = self.search(query).first
+        if key is not None:
+            if company is None:
+                self.instruments.record_miss(key, "screener")
+            elif company.id and (company.symbol or "").upper() == key:
+                self.instruments.record(
+                    key, "screener",
+                    screener_id=company.id, screener_url=company.url, screener_name=company.name,
+                )
+        return company
 
     # ==========================================================================
     # Chart API
@@ -378,7 +426,7 @@ class ScreenerClient:
         """
         Get all chart data for a company.
 
-        Fetches price, valuation, and margin charts in one call.
+        Fetches price, valuation, margin and market cap charts concurrently.
         Returns None for charts that fail to fetch.
 
         Args:
@@ -394,32 +442,25 @@ class ScreenerClient:
             >>> if charts['price']:
             ...     print(f"Price: ₹{charts['price'].price.latest_value}")
         """
+        fetches = {
+            "price": lambda: self.get_price_chart(company_id, days, consolidated),
+            "valuation": lambda: self.get_valuation_chart(company_id, 10000, consolidated),
+            "margin": lambda: self.get_margin_chart(company_id, 10000, consolidated),
+            "market_cap": lambda: self.get_market_cap_chart(company_id, 10000, consolidated),
+        }
+
+        # The four chart endpoints are independent - fetch them concurrently
+        with ThreadPoolExecutor(max_workers=len(fetches)) as executor:
+            futures = {name: executor.submit(fetch) for name, fetch in fetches.items()}
+
         charts = {}
-        
-        try:
-            charts["price"] = self.get_price_chart(company_id, days, consolidated)
-        except Exception as e:
-            logger.warning(f"Failed to fetch price chart: {e}")
-            charts["price"] = None
-            
-        try:
-            charts["valuation"] = self.get_valuation_chart(company_id, 10000, consolidated)
-        except Exception as e:
-            logger.warning(f"Failed to fetch valuation chart: {e}")
-            charts["valuation"] = None
-            
-        try:
-            charts["margin"] = self.get_margin_chart(company_id, 10000, consolidated)
-        except Exception as e:
-            logger.warning(f"Failed to fetch margin chart: {e}")
-            charts["margin"] = None
-            
-        try:
-            charts["market_cap"] = self.get_market_cap_chart(company_id, 10000, consolidated)
-        except Exception as e:
-            logger.warning(f"Failed to fetch market cap chart: {e}")
-            charts["market_cap"] = None
-            
+        for name, future in futures.items():
+            try:
+                charts[name] = future.result()
+            except Exception as e:
+                logger.warning(f"Failed to fetch {name.replace('_', ' ')} chart: {e}")
+                charts[name] = None
+
         return charts
 
     def get_company_summary(
@@ -8,6 +8,7 @@ from .exceptions import (
     ScreenerValidationError,
     ScreenerNotFoundError,
 )
+from .cache import CachedPage, PageCache
 from .http_client import ScreenerHTTPClient
 
 __all__ = [
@@ -18,4 +19,6 @@ __all__ = [
     "ScreenerValidationError",
     "ScreenerNotFoundError",
     "ScreenerHTTPClient",
+    "CachedPage",
+    "PageCache",
 ]
\ No newline at end of file
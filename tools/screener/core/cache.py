@@ -0,0 +1,120 @@
+"""Disk cache of parsed Screener pages with HTTP revalidation metadata."""
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = Path(".cache/screener")
+
+
+@dataclass
+class CachedPage:
+    """A cleaned markdown page plus the validators needed to revalidate it."""
+
+    path: str
+    markdown: str
+    etag: str | None = None
+    last_modified: str | None = None
+    fetched_at: float = 0.0
+    validated_at: float = 0.0
+
+    def conditional_headers(self) -> dict[str, str]:
+        """Headers for a conditional GET against the origin."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class PageCache:
+    """
+    Disk-backed cache of cleaned page markdown.
+
+    Entries are keyed by page path (which encodes the consolidated /
+    standalone view) and the markdown conversion options. A page validated
+    within ``fresh_seconds`` is served without any request; older pages are
+    revalidated with ETag / Last-Modified so an unchanged page costs a 304
+    and no re-parsing.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path | str = DEFAULT_CACHE_DIR,
+        fresh_seconds: float = 900.0,
+    ) -> None:
+        """
+        Initialize the page cache.
+
+        Args:
+            cache_dir: Directory to store cached pages
+            fresh_seconds: Seconds a page is served without revalidation
+        """
+        self.cache_dir = Path(cache_dir)
+        self.fresh_seconds = fresh_seconds
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+        except OSError as e:
+            logger.warning(f"Could not create cache directory {self.cache_dir}: {e}")
+
+    @staticmethod
+    def make_key(path: str, options: tuple) -> str:
+        """Build a cache key from the page path and conversion options."""
+        raw = json.dumps([path, list(options)])
+        return hashlib.sha256(raw.encode()).hexdigest()[:32]
+
+    def _file(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def get(self, key: str) -> CachedPage | None:
+        """Load a cached page (fresh or stale)."""
+        file = self._file(key)
+        if not file.exists():
+            return None
+        try:
+            return CachedPage(**json.loads(file.read_text()))
+        except (json.JSONDecodeError, OSError, TypeError) as e:
+            logger.debug(f"Dropping unreadable screener cache entry {file}: {e}")
+            return None
+
+    def is_fresh(self, page: CachedPage) -> bool:
+        """Check whether a page can be served without revalidation."""
+        return time.time() - page.validated_at < self.fresh_seconds
+
+    def set(self, key: str, page: CachedPage) -> None:
+        """Write a page atomically."""
+        file = self._file(key)
+        with self._lock:
+            try:
+                tmp = file.with_suffix(".tmp")
+                tmp.write_text(json.dumps(asdict(page)))
+                tmp.replace(file)
+            except OSError as e:
+                logger.warning(f"Could not write screener cache entry {file}: {e}")
+
+    def clear(self) -> int:
+        """Delete all cached pages. Returns the number removed."""
+        removed = 0
+        for file in self.cache_dir.glob("*.json"):
+            try:
+                file.unlink()
+                removed += 1
+            except OSError:
+                pass
+        return removed
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """Hit / revalidation (304) / miss counts."""
+        return {"hits": self.hits, "revalidated": self.revalidated, "misses": self.misses}
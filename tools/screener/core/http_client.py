@@ -1,12 +1,15 @@
 """HTTP client for Screener API and web scraping."""
 
 import logging
+import time
+from pathlib import Path
 from typing import Any
 from urllib.parse import urlencode
 
 import httpx
 from markdownify import markdownify as md
 
+from .cache import DEFAULT_CACHE_DIR, CachedPage, PageCache
 from .exceptions import (
     ScreenerAPIError,
     ScreenerConnectionError,
@@ -27,15 +30,24 @@ class ScreenerHTTPClient:
     def __init__(
         self,
         timeout: float = DEFAULT_TIMEOUT,
+        cache_enabled: bool = True,
+        cache_dir: Path | str = DEFAULT_CACHE_DIR,
+        cache_fresh_seconds: float = 900.0,
     ) -> None:
         """
         Initialize the Screener HTTP client.
 
         Args:
             timeout: Request timeout in seconds
+            cache_enabled: Cache parsed markdown pages on disk
+            cache_dir: Directory for the page cache
+            cache_fresh_seconds: Seconds a cached page is used without revalidation
         """
         self.timeout = timeout
         self._client: httpx.Client | None = None
+        self.page_cache = (
+            PageCache(cache_dir, fresh_seconds=cache_fresh_seconds) if cache_enabled else None
+        )
 
     @property
     def client(self) -> httpx.Client:
@@ -143,28 +155,25 @@ class ScreenerHTTPClient:
                 f"Request to Screener API timed out: {e}"
             ) from e
 
-    def get_html(
+    def _fetch_page(
         self,
         path: str,
-    ) -> str:
+        headers: dict[str, str] | None = None,
+    ) -> httpx.Response:
         """
-        Make a GET request to fetch HTML page.
+        GET a page and raise on errors (a 304 is returned as-is).
 
         Args:
             path: Page path (e.g., "/company/RELIANCE/")
+            headers: Extra request headers (conditional GET validators)
 
         Returns:
-            Raw HTML content
-
-        Raises:
-            ScreenerConnectionError: If connection fails
-            ScreenerNotFoundError: If page not found
-            ScreenerAPIError: If request fails
+            httpx.Response with status 200 or 304
         """
         try:
             url = f"{self.BASE_URL}{path}"
             logger.debug(f"GET HTML {url}")
-            response = self.client.get(url)
+            response = self.client.get(url, headers=headers)
 
             if response.status_code == 404:
                 raise ScreenerNotFoundError(
@@ -185,7 +194,7 @@ class ScreenerHTTPClient:
                     response_body=response.text[:500],
                 )
 
-            return response.text
+            return response
 
         except httpx.ConnectError as e:
             raise ScreenerConnectionError(
@@ -196,6 +205,26 @@ class ScreenerHTTPClient:
                 f"Request to Screener.in timed out: {e}"
             ) from e
 
+    def get_html(
+        self,
+        path: str,
+    ) -> str:
+        """
+        Make a GET request to fetch HTML page.
+
+        Args:
+            path: Page path (e.g., "/company/RELIANCE/")
+
+        Returns:
+            Raw HTML content
+
+        Raises:
+            ScreenerConnectionError: If connection fails
+            ScreenerNotFoundError: If page not found
+            ScreenerAPIError: If request fails
+        """
+        return self._fetch_page(path).text
+
     def get_markdown(
         self,
         path: str,
@@ -206,6 +235,10 @@ class ScreenerHTTPClient:
         """
         Fetch HTML page and convert to markdown.
 
+        With the page cache enabled, a recently validated page is returned
+        without a request; otherwise the page is revalidated with a
+        conditional GET and only re-parsed when it actually changed.
+
         Args:
             path: Page path (e.g., "/company/RELIANCE/")
             strip_scripts: Remove <script> tags
@@ -219,15 +252,44 @@ class ScreenerHTTPClient:
             ScreenerConnectionError: If connection fails
             ScreenerNotFoundError: If page not found
         """
-        html = self.get_html(path)
-        
-        # Convert HTML to markdown
-        markdown = md(
-            html,
-            heading_style=heading_style,
-            strip=["script", "style", "nav", "footer", "header", "aside"] if strip_scripts else None,
-        )
-        
+        strip = ["script", "style", "nav", "footer", "header", "aside"] if strip_scripts else None
+
+        if self.page_cache is None:
+            return self._to_markdown(self.get_html(path), heading_style, strip)
+
+        cache = self.page_cache
+        key = cache.make_key(path, (strip_scripts, strip_styles, heading_style))
+        cached = cache.get(key)
+        if cached is not None and cache.is_fresh(cached):
+            cache.hits += 1
+            return cached.markdown
+
+        response = self._fetch_page(path, cached.conditional_headers() if cached else None)
+        now = time.time()
+
+        if response.status_code == 304 and cached is not None:
+            cache.revalidated += 1
+            cached.validated_at = now
+            cache.set(key, cached)
+            return cached.markdown
+
+        cache.misses += 1
+        markdown = self._to_markdown(response.text, heading_style, strip)
+        cache.set(key, CachedPage(
+            path=path,
+            markdown=markdown,
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+            fetched_at=now,
+            validated_at=now,
+        ))
+        return markdown
+
+    @staticmethod
+    def _to_markdown(html: str, heading_style: str, strip: list[str] | None) -> str:
+        """Convert HTML to markdown and collapse repeated blank lines."""
+        markdown = md(html, heading_style=heading_style, strip=strip)
+
         # Clean up excessive whitespace
         lines = markdown.split("\n")
         cleaned_lines = []
@@ -49,6 +49,7 @@ from .models.news import (
 from .models.scanner import (
     Recommendation,
     TechnicalIndicators,
+    TechnicalsTable,
     TECHNICALS_FIELDS,
 )
 
@@ -73,6 +74,7 @@ __all__ = [
     # Scanner models
     "Recommendation",
     "TechnicalIndicators",
+    "TechnicalsTable",
     "TECHNICALS_FIELDS",
 ]
 
@@ -1,16 +1,26 @@
 """TradingView API Client."""
 
 import logging
+import threading
+import time
 from typing import Any
 
+from core.instrument_map import InstrumentMap, get_instrument_map, is_symbol_like, normalize_key
+
 from .core.http_client import TradingViewHTTPClient
 from .core.exceptions import TradingViewValidationError, TradingViewNotFoundError
 from .models.symbol import Symbol, SymbolSearchResponse
 from .models.news import NewsResponse, NewsItem
-from .models.scanner import TechnicalIndicators, TECHNICALS_FIELDS
+from .models.scanner import TechnicalIndicators, TechnicalsTable, TECHNICALS_FIELDS
 
 logger = logging.getLogger(__name__)
 
+# Scanner market for each exchange prefix (multi-symbol scans are per market)
+SCANNER_MARKETS = {
+    "NSE": "india",
+    "BSE": "india",
+}
+
 
 class TradingViewClient:
     """
@@ -40,17 +50,38 @@ class TradingViewClient:
         >>> print(f"Recommendation: {technicals.overall_recommendation}")
     """
 
+    # Search result fields kept in the instrument map for NSE stocks
+    _CACHED_SYMBOL_FIELDS = {
+        "symbol", "description", "type", "exchange", "isin", "currency_code",
+        "country", "logoid", "source_logoid", "source_id", "provider_id",
+        "typespecs", "is_primary_listing",
+    }
+
     def __init__(
         self,
         timeout: float = 30.0,
+        technicals_ttl: float = 60.0,
+        batch_size: int = 200,
+        instrument_map: InstrumentMap | None = None,
     ) -> None:
         """
         Initialize the TradingView client.
 
         Args:
             timeout: Request timeout in seconds
+            technicals_ttl: Seconds a symbol's technicals are reused by
+                derived views (recommendation, MAs, pivots). 0 disables the memo.
+            batch_size: Maximum symbols per multi-symbol scanner request
+            instrument_map: Identity map caching NSE search results (default: shared map)
         """
         self._http = TradingViewHTTPClient(timeout=timeout)
+        self.technicals_ttl = technicals_ttl
+        self.batch_size = batch_size
+        self._instruments = instrument_map
+
+        # symbol -> (expires_at, raw field values) for the default field set
+        self._technicals_memo: dict[str, tuple[float, dict[str, Any]]] = {}
+        self._memo_lock = threading.Lock()
 
     # ==========================================================================
     # Symbol Search API
@@ -124,6 +155,9 @@ class TradingViewClient:
         """
         Search and return the first matching stock.
 
+        NSE symbols (``exchange="NSE"``) are answered from the instrument
+        identity map after the first search for them.
+
         Args:
             text: Search text
             exchange: Optional exchange filter
@@ -135,8 +169,33 @@ class TradingViewClient:
             >>> stock = client.search_stock("INFY", exchange="NSE")
             >>> print(f"ISIN: {stock.isin}")
         """
+        key = None
+        if exchange and exchange.upper() == "NSE" and is_symbol_like(text):
+            key = normalize_key(text)
+            ids = self.instruments.lookup(key, "tradingview")
+            if ids is not None:
+                return Symbol.model_validate(ids["tradingview"])
+            if self.instruments.is_miss(key, "tradingview"):
+                return None
+
         response = self.search_symbol(text, exchange=exchange)
-        return response.first_stock
+        stock = response.first_stock
+        if key is not None:
+            if stock is None:
+                self.instruments.record_miss(key, "tradingview")
+            elif stock.exchange.upper() == "NSE" and stock.symbol.upper() == key:
+                self.instruments.record(
+                    key, "tradingview", isin=stock.isin,
+                    tradingview=stock.model_dump(include=self._CACHED_SYMBOL_FIELDS, exclude_none=True),
+                )
+        return stock
+
+    @property
+    def instruments(self) -> InstrumentMap:
+        """Cross-provider instrument identity map."""
+        if self._instruments is None:
+            self._instruments = get_instrument_map()
+        return self._instruments
 
     # ==========================================================================
     # News API
@@ -250,7 +309,11 @@ class TradingViewClient:
                 "symbol must include exchange (e.g., 'NSE:RELIANCE')"
             )
 
-        if fields is None:
+        memoize = fields is None
+        if memoize:
+            cached = self._memo_get(symbol)
+            if cached is not None:
+                return TechnicalIndicators.from_api_response(cached)
             fields = TECHNICALS_FIELDS
 
         params = {
@@ -261,8 +324,105 @@ class TradingViewClient:
         }
 
         data = self._http.scanner("/symbol", params=params)
+        if memoize and isinstance(data, dict):
+            self._memo_set(symbol, data)
         return TechnicalIndicators.from_api_response(data)
 
+    def get_technicals_batch(
+        self,
+        symbols: list[str],
+        fields: list[str] | None = None,
+    ) -> TechnicalsTable:
+        """
+        Get technical indicators for many symbols in one scanner request.
+
+        Symbols still fresh in the per-symbol memo are not refetched; the
+        rest are requested together (chunked by ``batch_size``) and stored
+        back in the memo, so follow-up single-symbol calls are free.
+
+        Args:
+            symbols: Full symbols with exchange (e.g., ["NSE:RELIANCE", "NSE:TCS"])
+            fields: List of fields to fetch (default: all standard fields)
+
+        Returns:
+            TechnicalsTable with one column per field
+
+        Example:
+            >>> table = client.get_technicals_batch(["NSE:RELIANCE", "NSE:TCS"])
+            >>> dict(zip(table.symbols, table.column("RSI")))
+            >>> table.row("NSE:TCS").overall_recommendation
+        """
+        if not symbols:
+            raise TradingViewValidationError("symbols cannot be empty")
+
+        bad = [s for s in symbols if ":" not in s]
+        if bad:
+            raise TradingViewValidationError(
+                f"symbols must include exchange (e.g., 'NSE:RELIANCE'): {bad[:5]}"
+            )
+
+        memoize = fields is None
+        if memoize:
+            fields = TECHNICALS_FIELDS
+
+        symbols = list(dict.fromkeys(symbols))
+        rows: dict[str, dict[str, Any]] = {}
+        to_fetch: list[str] = []
+        for symbol in symbols:
+            cached = self._memo_get(symbol) if memoize else None
+            if cached is not None:
+                rows[symbol] = cached
+            else:
+                to_fetch.append(symbol)
+
+        # One scan per market, chunked
+        by_market: dict[str, list[str]] = {}
+        for symbol in to_fetch:
+            market = SCANNER_MARKETS.get(symbol.split(":", 1)[0].upper(), "global")
+            by_market.setdefault(market, []).append(symbol)
+
+        for market, market_symbols in by_market.items():
+            for i in range(0, len(market_symbols), self.batch_size):
+                chunk = market_symbols[i:i + self.batch_size]
+                data = self._http.scanner_scan(market, {
+                    "symbols": {"tickers": chunk, "query": {"types": []}},
+                    "columns": fields,
+                })
+                for item in data.get("data", []) if isinstance(data, dict) else []:
+                    values = dict(zip(fields, item.get("d", [])))
+                    rows[item.get("s")] = values
+                    if memoize:
+                        self._memo_set(item.get("s"), values)
+
+        ordered = {s: rows[s] for s in symbols if s in rows}
+        missing = [s for s in symbols if s not in rows]
+        return TechnicalsTable.from_rows(ordered, list(fields), missing=missing)
+
+    def _memo_get(self, symbol: str) -> dict[str, Any] | None:
+        """Get memoized technicals for a symbol if still fresh."""
+        if self.technicals_ttl <= 0:
+            return None
+        with self._memo_lock:
+            entry = self._technicals_memo.get(symbol)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                del self._technicals_memo[symbol]
+                return None
+            return entry[1]
+
+    def _memo_set(self, symbol: str, data: dict[str, Any]) -> None:
+        """Memoize technicals for a symbol."""
+        if self.technicals_ttl <= 0:
+            return
+        with self._memo_lock:
+            self._technicals_memo[symbol] = (time.monotonic() + self.technicals_ttl, data)
+
+    def clear_technicals_memo(self) -> None:
+        """Drop all memoized technicals."""
+        with self._memo_lock:
+            self._technicals_memo.clear()
+
     def get_recommendation(self, symbol: str) -> str:
         """
         Get overall technical recommendation for a symbol.
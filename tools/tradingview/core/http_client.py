@@ -142,6 +142,42 @@ class TradingViewHTTPClient:
                 f"Request to TradingView API timed out: {e}"
             ) from e
 
+    def post(
+        self,
+        base_url: str,
+        endpoint: str,
+        json_data: dict[str, Any],
+    ) -> dict[str, Any] | list[Any]:
+        """
+        Make a POST request with a JSON body.
+
+        Args:
+            base_url: Base URL for the API
+            endpoint: API endpoint (without base URL)
+            json_data: JSON body
+
+        Returns:
+            Parsed JSON response
+
+        Raises:
+            TradingViewConnectionError: If connection fails
+            TradingViewAPIError: If API returns an error
+        """
+        try:
+            url = f"{base_url}{endpoint}"
+            logger.debug(f"POST {url}")
+            response = self.client.post(url, json=json_data)
+            return self._handle_response(response)
+
+        except httpx.ConnectError as e:
+            raise TradingViewConnectionError(
+                f"Failed to connect to TradingView API: {e}"
+            ) from e
+        except httpx.TimeoutException as e:
+            raise TradingViewConnectionError(
+                f"Request to TradingView API timed out: {e}"
+            ) from e
+
     # Convenience methods for each TradingView service
     
     def symbol_search(
@@ -168,6 +204,14 @@ class TradingViewHTTPClient:
         """Make a request to the scanner API."""
         return self.get(self.SCANNER_URL, endpoint, params)
 
+    def scanner_scan(
+        self,
+        market: str,
+        json_data: dict[str, Any],
+    ) -> dict[str, Any] | list[Any]:
+        """Make a multi-symbol scan request to the scanner API."""
+        return self.post(self.SCANNER_URL, f"/{market}/scan", json_data)
+
     def get_logo_url(self, logoid: str, extension: str = "svg") -> str:
         """
         Get the URL for a symbol's logo.
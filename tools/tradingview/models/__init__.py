@@ -17,6 +17,7 @@ from .news import (
 from .scanner import (
     Recommendation,
     TechnicalIndicators,
+    TechnicalsTable,
     TECHNICALS_FIELDS,
 )
 
@@ -36,5 +37,6 @@ __all__ = [
     # Scanner models
     "Recommendation",
     "TechnicalIndicators",
+    "TechnicalsTable",
     "TECHNICALS_FIELDS",
 ]
\ No newline at end of file
@@ -322,4 +322,56 @@ TECHNICALS_FIELDS = [
     "Pivot.M.Woodie.Middle",
     "Pivot.M.Woodie.S1", "Pivot.M.Woodie.S2", "Pivot.M.Woodie.S3",
     "Pivot.M.Demark.R1", "Pivot.M.Demark.Middle", "Pivot.M.Demark.S1",
-]
\ No newline at end of file
+]
+
+class TechnicalsTable(BaseModel):
+    """
+    Columnar technicals for many symbols from one scanner request.
+
+    Values are stored per field (column) rather than per symbol, so a
+    screen over one indicator across the whole list is a single list
+    lookup. Use ``row`` to get the usual TechnicalIndicators for a symbol.
+    """
+
+    symbols: list[str] = Field(default_factory=list, description="Symbols in row order")
+    fields: list[str] = Field(default_factory=list, description="Scanner field names")
+    columns: dict[str, list[Any]] = Field(default_factory=dict, description="Field -> values per row")
+    missing: list[str] = Field(default_factory=list, description="Requested symbols with no data")
+
+    @classmethod
+    def from_rows(
+        cls,
+        rows: dict[str, dict[str, Any]],
+        fields: list[str],
+        missing: list[str] | None = None,
+    ) -> "TechnicalsTable":
+        """Build from a mapping of symbol -> {field: value}."""
+        symbols = list(rows)
+        columns = {f: [rows[s].get(f) for s in symbols] for f in fields}
+        return cls(symbols=symbols, fields=fields, columns=columns, missing=missing or [])
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def column(self, field: str) -> list[Any]:
+        """Get all values of one field, aligned with ``symbols``."""
+        return self.columns.get(field, [None] * len(self.symbols))
+
+    def row_dict(self, symbol: str) -> dict[str, Any] | None:
+        """Get raw field values for one symbol."""
+        try:
+            i = self.symbols.index(symbol)
+        except ValueError:
+            return None
+        return {f: self.columns[f][i] for f in self.fields}
+
+    def row(self, symbol: str) -> TechnicalIndicators | None:
+        """Get TechnicalIndicators for one symbol."""
+        data = self.row_dict(symbol)
+        return TechnicalIndicators.from_api_response(data) if data is not None else None
+
+    def to_dataframe(self):
+        """Convert to a pandas DataFrame indexed by symbol."""
+        import pandas as pd
+
+        return pd.DataFrame(self.columns, index=pd.Index(self.symbols, name="symbol"))
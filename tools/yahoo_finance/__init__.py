@@ -26,7 +26,7 @@ from .models.ticker import (
     TickerFastInfo, TickerDividends, TickerSplits,
     TickerActions, TickerCapitalGains, TickerShares,
     TickerSECFilings, TickerISIN, FundsData,
-    TickerHistoryMetadata,
+    TickerHistoryMetadata, PriceHistoryColumns, ActionColumns,
 )
 from .models.market import (
     GlobalIndex, MarketStatus, CalendarsData,
@@ -58,6 +58,8 @@ __all__ = [
     "TickerISIN",
     "TickerHistoryMetadata",
     "FundsData",
+    "PriceHistoryColumns",
+    "ActionColumns",
 
     # Market models
     "GlobalIndex",
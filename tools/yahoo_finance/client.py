@@ -3,14 +3,17 @@
 import logging
 from typing import Any, List, Optional, Union
 from datetime import datetime, timedelta
+import numpy as np
 import pandas as pd
 
 import yfinance as yf
+
+from core.bar_store import BarSeries, BarSeriesStore, get_bar_store
 from .models.ticker import (
-    TickerInfo, TickerHistory, TickerFinancials, PriceHistoryEntry,
+    TickerInfo, TickerHistory, TickerFinancials, PriceHistoryColumns,
     TickerHolders, TickerAnalysis, TickerCalendar, TickerOptions,
     TickerSustainability, TickerDividends, DividendEntry,
-    TickerSplits, SplitEntry, TickerActions, ActionEntry,
+    TickerSplits, SplitEntry, TickerActions, ActionColumns,
     TickerCapitalGains, CapitalGainEntry, TickerShares, SharesEntry,
     TickerFastInfo, TickerHistoryMetadata, TickerSECFilings, SECFiling,
     TickerISIN, FundsData
@@ -23,6 +26,26 @@ from .models.market import (
 
 logger = logging.getLogger(__name__)
 
+# (symbol, name, country) of the indexes on the global board
+GLOBAL_INDEXES = [
+    ("^GSPC", "S&P 500", "USA"),
+    ("^DJI", "Dow Jones Industrial Average", "USA"),
+    ("^IXIC", "NASDAQ Composite", "USA"),
+    ("^FTSE", "FTSE 100", "UK"),
+    ("^GDAXI", "DAX PERFORMANCE-INDEX", "Germany"),
+    ("^FCHI", "CAC 40", "France"),
+    ("^N225", "Nikkei 225", "Japan"),
+    ("^HSI", "HANG SENG INDEX", "Hong Kong"),
+    ("000001.SS", "SSE Composite Index", "China"),
+    ("^BSESN", "S&P BSE SENSEX", "India"),
+    ("^NSEI", "NIFTY 50", "India"),
+    ("^AXJO", "S&P/ASX 200", "Australia"),
+    ("^BVSP", "IBOVESPA", "Brazil"),
+]
+
+# Daily bars kept per global index (about one year of sessions)
+GLOBAL_INDEX_DEPTH = 260
+
 
 class YFinanceClient:
     """
@@ -40,9 +63,21 @@ class YFinanceClient:
     Note: Live/WebSocket APIs are not supported.
     """
 
-    def __init__(self) -> None:
-        """Initialize the YFinance client."""
-        pass
+    def __init__(self, bar_store: Optional[BarSeriesStore] = None) -> None:
+        """
+        Initialize the YFinance client.
+
+        Args:
+            bar_store: Local store for global index daily bars (default: shared store)
+        """
+        self._bar_store = bar_store
+
+    @property
+    def bar_store(self) -> BarSeriesStore:
+        """Local append-only OHLCV series (global indexes)."""
+        if self._bar_store is None:
+            self._bar_store = get_bar_store()
+        return self._bar_store
 
     def _df_to_list_of_dicts(self, df: pd.DataFrame, transpose: bool = True) -> List[dict]:
         """Helper to convert DataFrame to list of dicts."""
@@ -214,29 +249,96 @@ class YFinanceClient:
                 repair=repair
             )
 
-            history_entries = []
-            for index, row in hist_df.iterrows():
-                entry = PriceHistoryEntry(
-                    date=index,
-                    open=row["Open"],
-                    high=row["High"],
-                    low=row["Low"],
-                    close=row["Close"],
-                    volume=int(row["Volume"]),
-                    dividends=row.get("Dividends", 0.0),
-                    stock_splits=row.get("Stock Splits", 0.0)
-                )
-                history_entries.append(entry)
-
             return TickerHistory(
                 symbol=symbol,
                 period=period,
                 interval=interval,
-                history=history_entries
+                history=PriceHistoryColumns.from_dataframe(hist_df)
             )
         except Exception as e:
             logger.error(f"Error fetching history for {symbol}: {e}")
-            return TickerHistory(symbol=symbol, period=period, interval=interval, history=[])
+            return TickerHistory(symbol=symbol, period=period, interval=interval)
+
+    def get_historical_data_batch(
+        self,
+        symbols: List[str],
+        period: str = "1mo",
+        interval: str = "1d",
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        prepost: bool = False,
+        auto_adjust: bool = True,
+        repair: bool = False,
+        threads: bool = True,
+    ) -> dict[str, TickerHistory]:
+        """
+        Get historical market data for many tickers with one batched download.
+
+        Uses a single ``yf.download`` call (yfinance fetches tickers in
+        parallel internally) instead of one ``Ticker.history`` per symbol,
+        and slices each ticker's columns out of the combined frame.
+
+        Args:
+            symbols: List of ticker symbols
+            period: Data period (1d, 5d, 1mo, 3mo, 6mo, 1y, 2y, 5y, 10y, ytd, max)
+            interval: Data interval (1m, 2m, 5m, 15m, 30m, 60m, 90m, 1h, 1d, 5d, 1wk, 1mo, 3mo)
+            start: Start date string (YYYY-MM-DD)
+            end: End date string (YYYY-MM-DD)
+            prepost: Include pre and post market data
+            auto_adjust: Adjust all OHLC automatically
+            repair: Detect and repair price errors
+            threads: Use multiple threads for downloading
+
+        Returns:
+            Dict of symbol to TickerHistory (empty history for failed tickers)
+        """
+        symbols = list(dict.fromkeys(symbols))
+        results = {
+            s: TickerHistory(symbol=s, period=period, interval=interval) for s in symbols
+        }
+        if not symbols:
+            return results
+
+        try:
+            df = yf.download(
+                symbols,
+                period=period,
+                interval=interval,
+                start=start,
+                end=end,
+                prepost=prepost,
+                actions=True,
+                group_by="ticker",
+                auto_adjust=auto_adjust,
+                repair=repair,
+                threads=threads,
+                progress=False,
+            )
+        except Exception as e:
+            logger.error(f"Error downloading history for {symbols}: {e}")
+            return results
+
+        if df is None or df.empty:
+            return results
+
+        for symbol in symbols:
+            if isinstance(df.columns, pd.MultiIndex):
+                if symbol not in df.columns.get_level_values(0):
+                    continue
+                ticker_df = df[symbol]
+            else:
+                ticker_df = df
+            # Tickers with a shorter history have NaN rows in the combined frame
+            if "Close" in ticker_df.columns:
+                ticker_df = ticker_df.dropna(subset=["Close"])
+            results[symbol] = TickerHistory(
+                symbol=symbol,
+                period=period,
+                interval=interval,
+                history=PriceHistoryColumns.from_dataframe(ticker_df),
+            )
+
+        return results
 
     def get_history_metadata(self, symbol: str) -> TickerHistoryMetadata:
         """
@@ -321,16 +423,7 @@ class YFinanceClient:
             ticker = yf.Ticker(symbol)
             actions = ticker.get_actions()
 
-            entries = []
-            if actions is not None and not actions.empty:
-                for date, row in actions.iterrows():
-                    entries.append(ActionEntry(
-                        date=date,
-                        dividends=float(row.get('Dividends', 0)),
-                        stock_splits=float(row.get('Stock Splits', 0))
-                    ))
-
-            return TickerActions(symbol=symbol, actions=entries)
+            return TickerActions(symbol=symbol, actions=ActionColumns.from_dataframe(actions))
         except Exception as e:
             logger.error(f"Error fetching actions for {symbol}: {e}")
             return TickerActions(symbol=symbol)
@@ -1144,68 +1237,123 @@ class YFinanceClient:
 
     # ==================== GLOBAL INDEXES ====================
 
+    def _sync_global_indexes(self, symbols: List[str]) -> dict:
+        """
+        Bring the stored daily bars of global indexes up to date.
+
+        Stale series are refreshed with one batched yf.download: a year of
+        bars for series never stored, otherwise only from the oldest last
+        stored session onwards.
+
+        Returns:
+            Dict of symbol -> BarSeries
+        """
+        store = self.bar_store
+        now = datetime.now().timestamp()
+        stored = {s: store.load("yahoo", s, "1d") for s in symbols}
+        plans = {s: store.plan(stored[s], "1d", GLOBAL_INDEX_DEPTH, now=now) for s in symbols}
+        stale = [s for s, plan in plans.items() if plan is not None]
+        if not stale:
+            return stored
+
+        full = any(plans[s][0] is None for s in stale)
+        kwargs: dict = {"period": "1y"} if full else {
+            "start": datetime.fromtimestamp(min(plans[s][0] for s in stale)).strftime("%Y-%m-%d")
+        }
+        try:
+            data = yf.download(
+                stale, interval="1d", group_by="ticker", auto_adjust=False,
+                progress=False, threads=True, **kwargs,
+            )
+        except Exception as e:
+            logger.error(f"Error downloading global index bars: {e}")
+            return stored
+
+        for symbol in stale:
+            try:
+                frame = data[symbol] if isinstance(data.columns, pd.MultiIndex) else data
+                bars = self._frame_to_bars(symbol, frame)
+            except KeyError:
+                bars = BarSeries("yahoo", symbol, "1d")
+            depth = GLOBAL_INDEX_DEPTH if full else 0
+            stored[symbol] = store.update("yahoo", symbol, "1d", bars, depth=depth, now=now)
+        return stored
+
+    @staticmethod
+    def _frame_to_bars(symbol: str, frame: pd.DataFrame) -> BarSeries:
+        """Daily OHLCV DataFrame (yfinance columns) -> BarSeries keyed by session date."""
+        frame = frame.dropna(subset=["Close"])
+        index = pd.DatetimeIndex(frame.index)
+        if index.tz is not None:
+            index = index.tz_localize(None)
+        return BarSeries(
+            "yahoo", symbol, "1d",
+            t=index.values.astype("datetime64[s]").astype(np.int64),
+            open=frame["Open"].to_numpy(dtype=np.float64),
+            high=frame["High"].to_numpy(dtype=np.float64),
+            low=frame["Low"].to_numpy(dtype=np.float64),
+            close=frame["Close"].to_numpy(dtype=np.float64),
+            volume=frame["Volume"].to_numpy(dtype=np.float64),
+        )
+
     def get_global_indexes(self) -> List[GlobalIndex]:
         """
         Get information about major global indexes.
 
+        Prices come from locally stored daily bars, synced incrementally
+        (one batched download for the stale indexes, none within a minute
+        of the last sync).
+
         Returns:
             List of GlobalIndex objects
         """
-        indexes_to_fetch = [
-            ("^GSPC", "S&P 500", "USA"),
-            ("^DJI", "Dow Jones Industrial Average", "USA"),
-            ("^IXIC", "NASDAQ Composite", "USA"),
-            ("^FTSE", "FTSE 100", "UK"),
-            ("^GDAXI", "DAX PERFORMANCE-INDEX", "Germany"),
-            ("^FCHI", "CAC 40", "France"),
-            ("^N225", "Nikkei 225", "Japan"),
-            ("^HSI", "HANG SENG INDEX", "Hong Kong"),
-            ("000001.SS", "SSE Composite Index", "China"),
-            ("^BSESN", "S&P BSE SENSEX", "India"),
-            ("^NSEI", "NIFTY 50", "India"),
-            ("^AXJO", "S&P/ASX 200", "Australia"),
-            ("^BVSP", "IBOVESPA", "Brazil"),
-        ]
+        series = self._sync_global_indexes([symbol for symbol, _, _ in GLOBAL_INDEXES])
 
         results = []
-        for symbol, name, country in indexes_to_fetch:
-            try:
-                ticker = yf.Ticker(symbol)
-                if hasattr(ticker, "fast_info"):
-                    fast_info = ticker.fast_info
-                    last_price = fast_info.last_price
-                    prev_close = fast_info.previous_close
-                else:
-                    hist = ticker.history(period="1d")
-                    if not hist.empty:
-                        last_price = hist["Close"].iloc[-1]
-                        prev_close = hist["Open"].iloc[0]
-                    else:
-                        last_price = None
-                        prev_close = None
-
-                change = None
-                change_percent = None
-
-                if last_price and prev_close:
-                    change = last_price - prev_close
-                    change_percent = (change / prev_close) * 100
-
-                results.append(GlobalIndex(
-                    symbol=symbol,
-                    name=name,
-                    country=country,
-                    last_price=last_price,
-                    change=change,
-                    change_percent=change_percent,
-                    market_state="Unknown"
-                ))
-            except Exception as e:
-                logger.error(f"Error fetching data for {symbol}: {e}")
+        for symbol, name, country in GLOBAL_INDEXES:
+            bars = series.get(symbol)
+            if bars is None or not len(bars):
                 results.append(GlobalIndex(symbol=symbol, name=name, country=country))
+                continue
+
+            last_price = float(bars.close[-1])
+            prev_close = float(bars.close[-2]) if len(bars) > 1 else None
+
+            change = None
+            change_percent = None
+
+            if last_price and prev_close:
+                change = last_price - prev_close
+                change_percent = (change / prev_close) * 100
+
+            results.append(GlobalIndex(
+                symbol=symbol,
+                name=name,
+                country=country,
+                last_price=last_price,
+                change=change,
+                change_percent=change_percent,
+                market_state="Unknown"
+            ))
 
         return results
 
+    def get_global_index_history(self, symbol: str, days: int = 60) -> pd.DataFrame:
+        """
+        Get daily OHLCV history of a global index from the local bar store.
+
+        Args:
+            symbol: Index symbol (e.g. "^GSPC", "^N225")
+            days: Number of most recent sessions
+
+        Returns:
+            DataFrame indexed by datetime with open/high/low/close/volume columns
+        """
+        bars = self._sync_global_indexes([symbol]).get(symbol)
+        if bars is None:
+            return pd.DataFrame()
+        return bars.tail(days).to_frame()
+
     # ==================== MARKDOWN REPORT ====================
 
     def get_ticker_markdown(self, symbol: str) -> str:
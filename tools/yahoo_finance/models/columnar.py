@@ -0,0 +1,121 @@
+"""
+Columnar containers for yfinance DataFrame results.
+
+yfinance returns history and actions as DataFrames. Converting them to
+pydantic entries with ``iterrows`` builds a Series per row and dominates
+multi-year or intraday pulls. These containers keep the DataFrame's
+numpy columns as-is and only build a pydantic entry when a row is
+accessed, while still behaving like the ``List[...Entry]`` they replace
+(len, truthiness, indexing, slicing, iteration).
+"""
+
+from collections.abc import Sequence
+from typing import Any, ClassVar, Dict, Iterator, List, Type
+
+import numpy as np
+import pandas as pd
+from pydantic import BaseModel
+
+
+def _as_int(column: np.ndarray) -> np.ndarray:
+    """Integer copy of a column; NaN (e.g. index volume, partial bars) becomes 0."""
+    if column.dtype.kind == "f":
+        column = np.where(np.isnan(column), 0, column)
+    return column.astype(np.int64)
+
+
+class ColumnarRows(Sequence):
+    """
+    Read-only sequence of pydantic entries backed by numpy columns.
+
+    Subclasses set ``entry_model`` and ``column_map`` (entry field ->
+    DataFrame column). The DataFrame index becomes the entry ``date``.
+    """
+
+    entry_model: ClassVar[Type[BaseModel]]
+    column_map: ClassVar[Dict[str, str]]
+    int_fields: ClassVar[tuple] = ()
+
+    def __init__(self, index: pd.Index, values: Dict[str, np.ndarray]) -> None:
+        self.index = index
+        self.values = values
+
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame | None) -> "ColumnarRows":
+        """Wrap a yfinance DataFrame without copying its columns."""
+        if df is None or df.empty:
+            return cls.empty()
+        n = len(df)
+        values = {}
+        for field, column in cls.column_map.items():
+            if column in df.columns:
+                values[field] = df[column].to_numpy()
+            else:
+                values[field] = np.zeros(n)
+        return cls(df.index, values)
+
+    @classmethod
+    def from_entries(cls, entries: List[Any]) -> "ColumnarRows":
+        """Build from entry models or dicts (for callers constructing by hand)."""
+        if not entries:
+            return cls.empty()
+        rows = [e.model_dump() if isinstance(e, BaseModel) else dict(e) for e in entries]
+        index = pd.DatetimeIndex([r["date"] for r in rows])
+        values = {f: np.array([r.get(f, 0.0) for r in rows]) for f in cls.column_map}
+        return cls(index, values)
+
+    @classmethod
+    def empty(cls) -> "ColumnarRows":
+        return cls(pd.DatetimeIndex([]), {f: np.zeros(0) for f in cls.column_map})
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def _entry(self, i: int) -> BaseModel:
+        data = {"date": self.index[i]}
+        for field, column in self.values.items():
+            value = column[i]
+            if field in self.int_fields:
+                data[field] = 0 if value != value else int(value)  # NaN -> 0
+            else:
+                data[field] = float(value)
+        return self.entry_model.model_construct(**data)
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            # numpy / Index slicing returns views - no copy
+            return type(self)(self.index[item], {f: v[item] for f, v in self.values.items()})
+        n = len(self)
+        if item < 0:
+            item += n
+        if not 0 <= item < n:
+            raise IndexError("row index out of range")
+        return self._entry(item)
+
+    def __iter__(self) -> Iterator[BaseModel]:
+        for i in range(len(self)):
+            yield self._entry(i)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(rows={len(self)}, columns={list(self.values)})"
+
+    def column(self, field: str) -> np.ndarray:
+        """Get one column as a numpy array."""
+        return self.values[field]
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """DataFrame over the same arrays (no copy), indexed by date."""
+        return pd.DataFrame(self.values, index=self.index, copy=False)
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        """Plain dicts per row (used for JSON serialization)."""
+        fields = list(self.values)
+        columns = [
+            _as_int(self.values[f]).tolist() if f in self.int_fields else self.values[f].tolist()
+            for f in fields
+        ]
+        dates = list(self.index)
+        return [
+            {"date": d, **dict(zip(fields, row))}
+            for d, row in zip(dates, zip(*columns))
+        ]
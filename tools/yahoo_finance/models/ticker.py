@@ -1,6 +1,9 @@
 from typing import Any, Dict, List, Optional, Union
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, field_serializer, field_validator
 from datetime import datetime
+import pandas as pd
+
+from .columnar import ColumnarRows
 
 
 class TickerInfo(BaseModel):
@@ -26,14 +29,51 @@ class PriceHistoryEntry(BaseModel):
     stock_splits: Optional[float] = 0.0
 
 
+class PriceHistoryColumns(ColumnarRows):
+    """Columnar price history; rows materialize as PriceHistoryEntry on access."""
+    entry_model = PriceHistoryEntry
+    column_map = {
+        "open": "Open",
+        "high": "High",
+        "low": "Low",
+        "close": "Close",
+        "volume": "Volume",
+        "dividends": "Dividends",
+        "stock_splits": "Stock Splits",
+    }
+    int_fields = ("volume",)
+
+
 class TickerHistory(BaseModel):
     """
     Model for Ticker History.
+
+    ``history`` is columnar (numpy arrays) but behaves like a list of
+    PriceHistoryEntry; use ``to_dataframe()`` for vectorized analysis.
     """
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
     symbol: str
     period: str
     interval: str
-    history: List[PriceHistoryEntry]
+    history: PriceHistoryColumns = Field(default_factory=PriceHistoryColumns.empty)
+
+    @field_validator("history", mode="before")
+    @classmethod
+    def _coerce_history(cls, value: Any) -> PriceHistoryColumns:
+        if isinstance(value, PriceHistoryColumns):
+            return value
+        if isinstance(value, pd.DataFrame):
+            return PriceHistoryColumns.from_dataframe(value)
+        return PriceHistoryColumns.from_entries(value or [])
+
+    @field_serializer("history")
+    def _serialize_history(self, history: PriceHistoryColumns) -> List[Dict[str, Any]]:
+        return history.to_records()
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """Price history as a DataFrame indexed by date (no copy)."""
+        return self.history.to_dataframe()
 
 
 class TickerFinancials(BaseModel):
@@ -139,10 +179,38 @@ class ActionEntry(BaseModel):
     stock_splits: float = 0.0
 
 
+class ActionColumns(ColumnarRows):
+    """Columnar corporate actions; rows materialize as ActionEntry on access."""
+    entry_model = ActionEntry
+    column_map = {
+        "dividends": "Dividends",
+        "stock_splits": "Stock Splits",
+    }
+
+
 class TickerActions(BaseModel):
     """Model for Ticker Corporate Actions (dividends + splits)."""
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
     symbol: str
-    actions: List[ActionEntry] = Field(default_factory=list)
+    actions: ActionColumns = Field(default_factory=ActionColumns.empty)
+
+    @field_validator("actions", mode="before")
+    @classmethod
+    def _coerce_actions(cls, value: Any) -> ActionColumns:
+        if isinstance(value, ActionColumns):
+            return value
+        if isinstance(value, pd.DataFrame):
+            return ActionColumns.from_dataframe(value)
+        return ActionColumns.from_entries(value or [])
+
+    @field_serializer("actions")
+    def _serialize_actions(self, actions: ActionColumns) -> List[Dict[str, Any]]:
+        return actions.to_records()
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """Actions as a DataFrame indexed by date (no copy)."""
+        return self.actions.to_dataframe()
 
 
 class CapitalGainEntry(BaseModel):
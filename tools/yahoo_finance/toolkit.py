@@ -2,6 +2,9 @@
 
 from typing import Optional
 from agno.tools import Toolkit
+
+from core.instrument_map import get_instrument_map
+
 from .client import YFinanceClient
 
 
@@ -50,9 +53,16 @@ class YahooFinanceToolkit(Toolkit):
         'STARCEMENT', 'INDIACEM', 'PRISMJOHN', 'ORIENTCEM',
     }
 
-    def __init__(self, **kwargs):
-        """Initialize the Yahoo Finance toolkit."""
+    def __init__(self, default_exchange: Optional[str] = "NSE", **kwargs):
+        """Initialize the Yahoo Finance toolkit.
+
+        Args:
+            default_exchange: Exchange a bare symbol is resolved on. "NSE"
+                appends .NS to known NSE equities; None leaves bare symbols
+                as-is (for agents asking about global listings).
+        """
         self.client = YFinanceClient()
+        self.default_exchange = default_exchange.upper() if default_exchange else None
 
         tools = [
             # Ticker data
@@ -101,20 +111,27 @@ class YahooFinanceToolkit(Toolkit):
 - ETF/Mutual fund holdings and allocations
 
 For Indian stocks, append ".NS" (NSE) or ".BO" (BSE) to the symbol.
-Examples: "RELIANCE.NS", "TCS.NS", "INFY.BO"."""
+Examples: "RELIANCE.NS", "TCS.NS", "INFY.BO".
+An exchange prefix always wins: "NYSE:ABB" is the US listing, "NSE:ABB" the Indian one."""
 
         super().__init__(name="yahoo_finance", tools=tools, instructions=instructions, **kwargs)
 
-    def _normalize_symbol(self, symbol: str) -> str:
+    def _normalize_symbol(self, symbol: str, exchange: Optional[str] = None) -> str:
         """
-        Auto-append .NS suffix for Indian stock symbols if needed.
+        Resolve a symbol to its Yahoo Finance ticker.
 
-        - If symbol already has .NS or .BO suffix, return as-is
-        - If symbol is in known NSE list, append .NS
-        - Otherwise return as-is (global stocks)
+        - An explicit Yahoo suffix or form (".NS", ".BO", ".L", "^NSEI",
+          "GC=F") is returned as-is
+        - An exchange prefix ("NSE:ABB", "NYSE:ABB") or ``exchange`` wins:
+          NSE appends .NS, BSE appends .BO, any other exchange keeps the
+          bare ticker
+        - Otherwise the toolkit's default exchange applies: with "NSE", an
+          NSE equity in the instrument identity map (or the known NSE list)
+          gets .NS; with no default, the symbol is returned as-is
 
         Args:
             symbol: Stock ticker symbol
+            exchange: Listing exchange, overriding the toolkit default
 
         Returns:
             Normalized symbol with appropriate suffix
@@ -122,14 +139,30 @@ Examples: "RELIANCE.NS", "TCS.NS", "INFY.BO"."""
         if not symbol:
             return symbol
 
-        # Already has suffix
-        if symbol.endswith('.NS') or symbol.endswith('.BO'):
+        prefix, sep, rest = symbol.partition(':')
+        if sep and rest:
+            exchange, symbol = prefix, rest
+
+        # Already a Yahoo ticker with a market suffix, an index or a future
+        if '.' in symbol or symbol.startswith('^') or '=' in symbol:
             return symbol
 
-        # Check if it's a known Indian symbol
+        exchange = exchange.upper() if exchange else None
+        if exchange is None:
+            exchange = self.default_exchange
+            implicit = True
+        else:
+            implicit = False
+
         upper_symbol = symbol.upper()
-        if upper_symbol in self.KNOWN_NSE_SYMBOLS:
-            return f"{symbol}.NS"
+        if exchange == 'NSE':
+            instrument = get_instrument_map().get(upper_symbol)
+            if instrument is not None and instrument.yahoo and instrument.fyers_ticker:
+                return instrument.yahoo
+            if upper_symbol in self.KNOWN_NSE_SYMBOLS or not implicit:
+                return f"{upper_symbol}.NS"
+        elif exchange == 'BSE':
+            return f"{upper_symbol}.BO"
 
         return symbol
 
@@ -17,6 +17,10 @@ logger = setup_logging(
     log_file=settings.LOG_FILE,
     agno_debug=settings.AGNO_DEBUG,
     agno_debug_level=settings.AGNO_DEBUG_LEVEL,
+    json_file=settings.LOG_JSON,
+    max_bytes=settings.LOG_MAX_BYTES,
+    backup_count=settings.LOG_BACKUP_COUNT,
+    rotate_when=settings.LOG_ROTATE_WHEN or None,
 )
 
 # Shared database for all workflows
@@ -0,0 +1,490 @@
+"""
+Step checkpoints for resumable workflow runs.
+
+When a department team or the CIO step fails or times out, rerunning the
+whole workflow repeats the regime check and every earlier LLM / tool call.
+This module persists each step's output, keyed by (run id, step name), in
+the workflow SQLite database and lets a later run resume from the first
+step that has not completed.
+
+- Each checkpoint stores a fingerprint of the step's deterministic inputs
+  (workflow input, previous step content, step definition - including
+  the agent/team instructions and model, recursively for team members).
+  A checkpoint
+  is reused only if the fingerprint still matches, so stale outputs are
+  invalidated automatically - e.g. a new prompt or model, or a regime
+  that changed upstream.
+- Fingerprints chain: a re-executed step with different output changes
+  the fingerprint of every step after it.
+- Function steps that write session state run again on resume by default
+  (they are cheap and rebuild session_data); agent and team steps are
+  skipped when their checkpoint is valid.
+
+Steps stay plain agno ``Step`` instances (agno looks steps up by exact
+type); checkpointed_step() wraps their execute methods. Outside a
+checkpoint scope they behave exactly as before.
+Non-streaming executions are also timed as "step" profiling spans
+(core/profiling.py).
+
+Usage:
+    steps=[checkpointed_step(name="Regime Check", agent=regime_agent), ...]
+
+    with checkpoint_scope("Intraday Trading Cycle", session_id=today, resume=True) as run:
+        await workflow.arun(input=prompt, session_id=today)
+        print(run.resumed_steps)
+"""
+
+import contextvars
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+
+from pydantic import BaseModel
+
+from agno.workflow import Step
+from agno.workflow.types import StepInput, StepOutput
+
+from core.config import get_settings
+from core.profiling import span
+from workflows import logger
+
+settings = get_settings()
+
+# Bump to invalidate every stored checkpoint (e.g. after changing step semantics)
+CHECKPOINT_VERSION = 1
+
+
+@dataclass
+class CheckpointRun:
+    """State of one checkpointed workflow run."""
+
+    run_id: str
+    workflow: str
+    session_id: Optional[str]
+    resume: bool
+    store: "StepCheckpointStore"
+    resumed_steps: List[str] = field(default_factory=list)
+    executed_steps: List[str] = field(default_factory=list)
+    stale_steps: List[str] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "run_id": self.run_id,
+            "resume": self.resume,
+            "resumed_steps": self.resumed_steps,
+            "executed_steps": self.executed_steps,
+            "stale_steps": self.stale_steps,
+        }
+
+
+_current_run: contextvars.ContextVar[Optional[CheckpointRun]] = contextvars.ContextVar(
+    "step_checkpoint_run", default=None
+)
+
+
+class StepCheckpointStore:
+    """Step outputs stored in a table of the workflow SQLite database."""
+
+    TABLE = "workflow_step_checkpoints"
+
+    def __init__(self, db_file: Optional[str] = None):
+        """
+        Initialize the store.
+
+        Args:
+            db_file: SQLite file (defaults to the shared workflow database)
+        """
+        self.db_file = db_file or settings.WORKFLOW_DB_FILE
+        self._lock = threading.Lock()
+        self._initialized = False
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_file, timeout=30)
+        if not self._initialized:
+            conn.execute(
+                f"""
+                CREATE TABLE IF NOT EXISTS {self.TABLE} (
+                    run_id TEXT NOT NULL,
+                    step_name TEXT NOT NULL,
+                    workflow TEXT NOT NULL,
+                    session_id TEXT,
+                    fingerprint TEXT NOT NULL,
+                    content TEXT,
+                    content_type TEXT NOT NULL,
+                    duration_s REAL,
+                    created_at TEXT NOT NULL,
+                    PRIMARY KEY (run_id, step_name)
+                )
+                """
+            )
+            conn.execute(
+                f"CREATE INDEX IF NOT EXISTS idx_{self.TABLE}_session "
+                f"ON {self.TABLE} (workflow, session_id, created_at)"
+            )
+            conn.commit()
+            self._initialized = True
+        return conn
+
+    @contextmanager
+    def _conn(self) -> Iterator[sqlite3.Connection]:
+        with self._lock:
+            conn = self._connect()
+            try:
+                with conn:
+                    yield conn
+            finally:
+                conn.close()
+
+    def get(self, run_id: str, step_name: str) -> Optional[Dict[str, Any]]:
+        """Stored checkpoint for a step, or None."""
+        with self._conn() as conn:
+            conn.row_factory = sqlite3.Row
+            row = conn.execute(
+                f"SELECT * FROM {self.TABLE} WHERE run_id = ? AND step_name = ?",
+                (run_id, step_name),
+            ).fetchone()
+        return dict(row) if row else None
+
+    def save(
+        self,
+        run: CheckpointRun,
+        step_name: str,
+        fingerprint: str,
+        content: Any,
+        duration_s: float,
+    ) -> None:
+        """Insert or replace a step's checkpoint."""
+        text, content_type = encode_content(content)
+        with self._conn() as conn:
+            conn.execute(
+                f"""
+                INSERT OR REPLACE INTO {self.TABLE}
+                (run_id, step_name, workflow, session_id, fingerprint, content, content_type, duration_s, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    run.run_id, step_name, run.workflow, run.session_id, fingerprint,
+                    text, content_type, duration_s, datetime.now().isoformat(),
+                ),
+            )
+
+    def latest_run(self, workflow: str, session_id: Optional[str] = None) -> Optional[str]:
+        """Run id of the most recent checkpointed run of a workflow."""
+        query = f"SELECT run_id FROM {self.TABLE} WHERE workflow = ?"
+        params: Tuple[Any, ...] = (workflow,)
+        if session_id is not None:
+            query += " AND session_id = ?"
+            params += (session_id,)
+        query += " ORDER BY created_at DESC LIMIT 1"
+        with self._conn() as conn:
+            row = conn.execute(query, params).fetchone()
+        return row[0] if row else None
+
+    def list_steps(self, run_id: str) -> List[Dict[str, Any]]:
+        """Checkpointed steps of a run (without content), oldest first."""
+        with self._conn() as conn:
+            conn.row_factory = sqlite3.Row
+            rows = conn.execute(
+                f"SELECT step_name, fingerprint, content_type, duration_s, created_at "
+                f"FROM {self.TABLE} WHERE run_id = ? ORDER BY created_at",
+                (run_id,),
+            ).fetchall()
+        return [dict(r) for r in rows]
+
+    def clear(self, run_id: str) -> int:
+        """Delete a run's checkpoints. Returns rows removed."""
+        with self._conn() as conn:
+            return conn.execute(f"DELETE FROM {self.TABLE} WHERE run_id = ?", (run_id,)).rowcount
+
+
+# Shared store in the workflow database
+checkpoint_store = StepCheckpointStore()
+
+
+# ==================== Encoding ====================
+
+
+def encode_content(content: Any) -> Tuple[Optional[str], str]:
+    """Serialize step content to (text, content_type)."""
+    if content is None:
+        return None, "none"
+    if isinstance(content, str):
+        return content, "text"
+    if isinstance(content, BaseModel):
+        return content.model_dump_json(), "json"
+    return json.dumps(content, default=str), "json"
+
+
+def decode_content(text: Optional[str], content_type: str) -> Any:
+    """Inverse of encode_content (models come back as dicts)."""
+    if content_type == "none" or text is None:
+        return None
+    if content_type == "json":
+        return json.loads(text)
+    return text
+
+
+def _fingerprint_value(value: Any) -> str:
+    if isinstance(value, BaseModel):
+        return value.model_dump_json()
+    if isinstance(value, str):
+        return value
+    return json.dumps(value, sort_keys=True, default=str)
+
+
+def _member_identity(kind: str, member: Any) -> str:
+    """Name, instructions and model of an agent or team (members included)."""
+    instructions = getattr(member, "instructions", None)
+    if callable(instructions):
+        instructions = getattr(instructions, "__qualname__", repr(instructions))
+    model = getattr(member, "model", None)
+    parts = [
+        f"{kind}:{getattr(member, 'name', None) or type(member).__name__}",
+        _fingerprint_value(instructions),
+        f"model:{getattr(model, 'id', None) or ''}",
+    ]
+    for child in getattr(member, "members", None) or []:
+        parts.append(_member_identity("team" if getattr(child, "members", None) else "agent", child))
+    return "\x1e".join(parts)
+
+
+# ==================== Scope ====================
+
+
+@contextmanager
+def checkpoint_scope(
+    workflow: str,
+    session_id: Optional[str] = None,
+    resume: bool = False,
+    run_id: Optional[str] = None,
+    store: Optional[StepCheckpointStore] = None,
+) -> Iterator[CheckpointRun]:
+    """
+    Checkpoint the steps of a workflow run made inside this block.
+
+    Args:
+        workflow: Workflow name (groups runs for resume lookup)
+        session_id: Workflow session id (e.g. the trading date)
+        resume: Reuse valid checkpoints of an earlier run
+        run_id: Run to resume or record; with resume=True and no run_id the
+            latest run of this workflow/session is resumed
+        store: Checkpoint store (defaults to the workflow database)
+
+    Yields:
+        CheckpointRun with the run id and resumed / executed steps
+    """
+    store = store or checkpoint_store
+    if resume and run_id is None:
+        run_id = store.latest_run(workflow, session_id)
+        if run_id is None:
+            logger.info(f"No checkpoints to resume for {workflow} ({session_id}) - starting fresh")
+    run = CheckpointRun(
+        run_id=run_id or uuid.uuid4().hex[:12],
+        workflow=workflow,
+        session_id=session_id,
+        resume=resume,
+        store=store,
+    )
+    token = _current_run.set(run)
+    try:
+        yield run
+    finally:
+        _current_run.reset(token)
+        if run.resumed_steps:
+            logger.info(f"Checkpoint run {run.run_id}: resumed {run.resumed_steps}, executed {run.executed_steps}")
+
+
+def current_checkpoint_run() -> Optional[CheckpointRun]:
+    return _current_run.get()
+
+
+# ==================== Step ====================
+
+
+class StepCheckpointer:
+    """
+    Checkpointing attached to one plain agno ``Step``.
+
+    agno resolves steps by exact type (``STEP_TYPE_MAPPING[type(step)]``),
+    so a ``Step`` subclass breaks session creation. Instead the step's
+    execute methods are wrapped on the instance: outside a checkpoint
+    scope they run unchanged; inside one, a valid checkpoint (same run,
+    same fingerprint) is returned instead of running the step when
+    resuming, and every successful execution is stored.
+    """
+
+    def __init__(self, step: Step, skip_on_resume: Optional[bool] = None):
+        """
+        Attach to a step.
+
+        Args:
+            step: The step to checkpoint (modified in place)
+            skip_on_resume: Reuse the checkpoint instead of running the step.
+                Defaults to True for agent/team steps and False for function
+                steps (which usually write session state and are cheap).
+        """
+        if skip_on_resume is None:
+            skip_on_resume = getattr(step, "agent", None) is not None or getattr(step, "team", None) is not None
+        self.step = step
+        self.skip_on_resume = skip_on_resume
+
+        self._execute = step.execute
+        self._aexecute = step.aexecute
+        self._execute_stream = step.execute_stream
+        self._aexecute_stream = step.aexecute_stream
+        step.execute = self.execute
+        step.aexecute = self.aexecute
+        step.execute_stream = self.execute_stream
+        step.aexecute_stream = self.aexecute_stream
+        step.checkpointer = self
+
+    @property
+    def name(self) -> Optional[str]:
+        return self.step.name
+
+    # ==================== Checkpoint logic ====================
+
+    def _executor_identity(self) -> str:
+        agent = getattr(self.step, "agent", None)
+        team = getattr(self.step, "team", None)
+        executor = getattr(self.step, "active_executor", None) or getattr(self.step, "executor", None)
+        if agent is not None:
+            return _member_identity("agent", agent)
+        if team is not None:
+            return _member_identity("team", team)
+        if executor is not None:
+            return f"function:{getattr(executor, '__qualname__', repr(executor))}"
+        return "unknown"
+
+    def fingerprint(self, step_input: StepInput) -> str:
+        """Hash of the step's deterministic inputs."""
+        parts = [
+            str(CHECKPOINT_VERSION),
+            self.name or "",
+            self._executor_identity(),
+            _fingerprint_value(getattr(step_input, "input", None)),
+            _fingerprint_value(getattr(step_input, "previous_step_content", None)),
+        ]
+        return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+    def _restore(self, run: Optional[CheckpointRun], step_input: StepInput) -> Tuple[Optional[StepOutput], Optional[str]]:
+        """Checkpointed output if it can be reused, plus the current fingerprint."""
+        if run is None or not self.name:
+            return None, None
+        fingerprint = self.fingerprint(step_input)
+        if not (run.resume and self.skip_on_resume):
+            return None, fingerprint
+        try:
+            row = run.store.get(run.run_id, self.name)
+        except sqlite3.Error as e:
+            logger.warning(f"Checkpoint lookup failed for {self.name}: {e}")
+            return None, fingerprint
+        if row is None:
+            return None, fingerprint
+        if row["fingerprint"] != fingerprint:
+            run.stale_steps.append(self.name)
+            logger.info(f"Checkpoint for '{self.name}' is stale (inputs changed) - re-running")
+            return None, fingerprint
+        run.resumed_steps.append(self.name)
+        logger.info(f"Resuming '{self.name}' from checkpoint (run {run.run_id})")
+        return StepOutput(step_name=self.name, content=decode_content(row["content"], row["content_type"])), fingerprint
+
+    def _record(self, run: Optional[CheckpointRun], fingerprint: Optional[str], output: Any, started: float) -> None:
+        if run is None or fingerprint is None or not isinstance(output, StepOutput):
+            return
+        if getattr(output, "success", True) is False or getattr(output, "error", None):
+            return
+        run.executed_steps.append(self.name)
+        try:
+            run.store.save(run, self.name, fingerprint, output.content, time.monotonic() - started)
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            logger.warning(f"Could not checkpoint step '{self.name}': {e}")
+
+    # ==================== Execution ====================
+
+    def execute(self, step_input: StepInput, *args: Any, **kwargs: Any) -> StepOutput:
+        run = _current_run.get()
+        with span("step", self.name or "step") as s:
+            restored, fingerprint = self._restore(run, step_input)
+            s.set("resumed", restored is not None)
+            if restored is not None:
+                return restored
+            started = time.monotonic()
+            output = self._execute(step_input, *args, **kwargs)
+            self._record(run, fingerprint, output, started)
+            return output
+
+    async def aexecute(self, step_input: StepInput, *args: Any, **kwargs: Any) -> StepOutput:
+        run = _current_run.get()
+        with span("step", self.name or "step") as s:
+            restored, fingerprint = self._restore(run, step_input)
+            s.set("resumed", restored is not None)
+            if restored is not None:
+                return restored
+            started = time.monotonic()
+            output = await self._aexecute(step_input, *args, **kwargs)
+            self._record(run, fingerprint, output, started)
+            return output
+
+    def execute_stream(self, step_input: StepInput, *args: Any, **kwargs: Any) -> Iterator[Any]:
+        run = _current_run.get()
+        restored, fingerprint = self._restore(run, step_input)
+        if restored is not None:
+            yield restored
+            return
+        started = time.monotonic()
+        final = None
+        for event in self._execute_stream(step_input, *args, **kwargs):
+            if isinstance(event, StepOutput):
+                final = event
+            yield event
+        self._record(run, fingerprint, final, started)
+
+    async def aexecute_stream(self, step_input: StepInput, *args: Any, **kwargs: Any) -> AsyncIterator[Any]:
+        run = _current_run.get()
+        restored, fingerprint = self._restore(run, step_input)
+        if restored is not None:
+            yield restored
+            return
+        started = time.monotonic()
+        final = None
+        async for event in self._aexecute_stream(step_input, *args, **kwargs):
+            if isinstance(event, StepOutput):
+                final = event
+            yield event
+        self._record(run, fingerprint, final, started)
+
+
+def checkpointed_step(*args: Any, skip_on_resume: Optional[bool] = None, **kwargs: Any) -> Step:
+    """
+    A plain ``Step`` whose output is checkpointed per run.
+
+    Args:
+        skip_on_resume: See StepCheckpointer
+        *args, **kwargs: Passed to ``Step``
+
+    Returns:
+        The step (its ``checkpointer`` attribute holds the StepCheckpointer)
+    """
+    return StepCheckpointer(Step(*args, **kwargs), skip_on_resume=skip_on_resume).step
+
+
+__all__ = [
+    "CHECKPOINT_VERSION",
+    "CheckpointRun",
+    "StepCheckpointStore",
+    "StepCheckpointer",
+    "checkpointed_step",
+    "checkpoint_store",
+    "checkpoint_scope",
+    "current_checkpoint_run",
+    "encode_content",
+    "decode_content",
+]
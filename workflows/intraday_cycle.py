@@ -21,6 +21,8 @@ Session Management:
 - Uses date-based session_id (e.g., "2025-01-19")
 - Stores picks, regime, department_reports in session_state
 - Access past runs via workflow history (last 5 trading days)
+- Step outputs are checkpointed; run_intraday_analysis(resume=True) reruns
+  only the steps that did not complete (see workflows/checkpoints.py)
 """
 
 import json
@@ -28,11 +30,12 @@ import re
 from datetime import date, datetime
 from pathlib import Path
 
-from agno.workflow import Workflow, Step
+from agno.workflow import Workflow
 from agno.team import Team
 from agno.workflow.types import StepInput, StepOutput
 
 from workflows import workflow_db, agent_db, logger
+from workflows.checkpoints import checkpointed_step, checkpoint_scope
 
 # Regime Agent (runs first)
 from agents.departments.regime.agent import regime_agent
@@ -61,6 +64,9 @@ from agents.managers.cio import chief_investment_officer
 from agents.meta.risk.agent import risk_agent
 
 from core.config import get_settings
+from core.market_snapshot import install_snapshot_source, snapshot_status
+from core.profiling import profile_run
+from core.tool_memo import install_tool_memo, tool_memo
 
 settings = get_settings()
 
@@ -229,6 +235,8 @@ def save_output_to_file(step_input: StepInput) -> StepOutput:
         "regime": session_data.get("regime"),
         "picks": session_data.get("picks", []),
         "risk_validated": session_data.get("risk_validated", False),
+        "tool_memo": tool_memo.run_stats(),
+        "snapshot": snapshot_status(),
         "content": content,
     }
     with open(json_filepath, "w", encoding="utf-8") as f:
@@ -447,6 +455,12 @@ The CIO's final output goes to Risk Management for validation.""",
 )
 
 
+# Departments call many of the same tools - memoize them per run
+install_tool_memo([regime_agent, research_council, risk_agent])
+# Tools read the pre-market snapshot (8:45 job) first while it is fresh
+install_snapshot_source(tool_memo)
+
+
 # ==============================================================================
 # WORKFLOW DEFINITION
 # ==============================================================================
@@ -470,19 +484,19 @@ intraday_workflow = Workflow(
 
     steps=[
         # Step 1: Determine Market Regime
-        Step(
+        checkpointed_step(
             name="Regime Check",
             agent=regime_agent,
             description="Determine current market regime (TRENDING_UP, TRENDING_DOWN, RANGING, HIGH_VOL, LOW_VOL)"
         ),
         # Step 2: Store regime in session state
-        Step(
+        checkpointed_step(
             name="Store Regime",
             executor=store_regime_in_state,
             description="Store regime result in session state for other workflows"
         ),
         # Step 3: Research Council Analysis (Hierarchical Multi-Agent)
-        Step(
+        checkpointed_step(
             name="Research Council Analysis",
             team=research_council,
             description="""Hierarchical multi-agent analysis:
@@ -491,19 +505,19 @@ intraday_workflow = Workflow(
             - CIO reviews all department reports and selects 10-15 trades"""
         ),
         # Step 4: Risk Management
-        Step(
+        checkpointed_step(
             name="Risk Management",
             agent=risk_agent,
             description="Validate CIO picks: position sizing, portfolio constraints, risk limits"
         ),
         # Step 5: Store final picks
-        Step(
+        checkpointed_step(
             name="Store Picks",
             executor=store_picks_in_state,
             description="Store risk-validated picks in session state for executor workflow"
         ),
         # Step 6: Save output to file
-        Step(
+        checkpointed_step(
             name="Save Output",
             executor=save_output_to_file,
             description="Save analysis results to dated file in .hagrid/outputs/"
@@ -516,12 +530,20 @@ intraday_workflow = Workflow(
 # RUN FUNCTION
 # ==============================================================================
 
-async def run_intraday_analysis(input_text: str = None) -> dict:
+async def run_intraday_analysis(
+    input_text: str = None,
+    resume: bool = False,
+    run_id: str = None,
+) -> dict:
     """
     Run the intraday analysis workflow.
 
     Args:
         input_text: Optional custom input. If None, uses comprehensive prompt.
+        resume: Skip agent/team steps whose checkpoint from an earlier run
+            today is still valid (same inputs). Use after a failed or
+            timed-out run to avoid repeating the regime and department work.
+        run_id: Checkpoint run to resume (defaults to today's latest run)
 
     Returns:
         dict with workflow result, session info, and output file paths
@@ -537,10 +559,27 @@ async def run_intraday_analysis(input_text: str = None) -> dict:
 
     logger.info(f"Starting intraday analysis workflow for {today}")
 
-    result = await intraday_workflow.arun(
-        input=input_text,
-        session_id=today
-    )
+    snapshot = snapshot_status()
+    if snapshot["version"]:
+        logger.info(
+            f"Pre-market snapshot {snapshot['version']}: age {snapshot['age_s']:.0f}s, "
+            f"{snapshot['quotes']} quotes, {snapshot['tool_results']} tool results, "
+            f"fresh={snapshot['fresh']}"
+        )
+    else:
+        logger.info("No pre-market snapshot for today - tools start cold")
+
+    with checkpoint_scope(
+        intraday_workflow.name, session_id=today, resume=resume, run_id=run_id
+    ) as checkpoint_run:
+        with profile_run(
+            intraday_workflow.name, session_id=today, run_id=checkpoint_run.run_id
+        ) as profiled_run, tool_memo.run_scope(checkpoint_run.run_id):
+            result = await intraday_workflow.arun(
+                input=input_text,
+                session_id=today
+            )
+            memo_stats = tool_memo.run_stats()
 
     result_content = result.content if result else ""
 
@@ -566,6 +605,10 @@ async def run_intraday_analysis(input_text: str = None) -> dict:
         "picks": intraday_workflow.session_state.get("picks", []),
         "regime": intraday_workflow.session_state.get("regime"),
         "department_reports": intraday_workflow.session_state.get("department_reports", {}),
+        "tool_memo": memo_stats,
+        "snapshot": snapshot,
+        "checkpoints": checkpoint_run.to_dict(),
+        "profile": profiled_run.profile,
     }
 
 
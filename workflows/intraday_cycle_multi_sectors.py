@@ -7,24 +7,31 @@ This workflow orchestrates a comprehensive sector-by-sector analysis:
 
 1. Regime Check - Determine market conditions
 2. OI Spurts Scan - Identify stocks with unusual OI activity
-3. Fetch Sector Constituents - Dynamically get stocks for each sector
-4. Parallel Sector Analysis - 10 sector teams analyze in parallel
-5. Cross-Sector Aggregation - Select final 15 stocks across sectors
-6. Risk Management - Validate and size positions
+3. Parallel Sector Analysis - 10 sector pipelines run in parallel, each
+   starting its team as soon as that sector's constituents are ready
+4. Cross-Sector Aggregation - Select final 15 stocks across sectors
+5. Risk Management - Validate and size positions
 
 Key Features:
 - Dynamic stock fetching via NSE India API (no hardcoded lists)
+- Constituents prefetched concurrently in the background into a versioned
+  daily membership snapshot, with a diff that flags index membership
+  changes; prices are always fetched live
 - OI spurts integration for derivatives-based signals
 - Max 3 stocks per sector for diversification
 - Multi-factor scoring with OI bonus
 """
 
+import asyncio
 import json
 import re
+import threading
+import time
+from concurrent.futures import Future
 from datetime import date, datetime
 from textwrap import dedent
 
-from agno.workflow import Workflow, Step
+from agno.workflow import Parallel, Step, Steps, Workflow
 from agno.team import Team
 from agno.agent import Agent
 from agno.workflow.types import StepInput, StepOutput
@@ -47,6 +54,10 @@ from agents.meta.aggregator.cross_sector_aggregator import cross_sector_aggregat
 from agents.meta.risk.agent import risk_agent
 
 from core.config import get_settings
+from core.market_snapshot import install_snapshot_source, snapshot_status
+from core.profiling import profile_run
+from core.tool_memo import install_tool_memo, tool_memo
+from tools.nse_india.storage.constituents import ConstituentSnapshotStore
 
 settings = get_settings()
 
@@ -180,80 +191,199 @@ def scan_oi_spurts(step_input: StepInput) -> StepOutput:
         return StepOutput(content=f"OI Spurts scan unavailable: {str(e)}")
 
 
-def fetch_sector_constituents(step_input: StepInput) -> StepOutput:
-    """Fetch all sector index constituents dynamically using NSE India API."""
-    from tools.nse_india import NSEIndiaToolkit
+# ==============================================================================
+# SECTOR CONSTITUENT PREFETCH
+# ==============================================================================
 
-    nse = NSEIndiaToolkit()
-    sector_stocks = {}
-    total_stocks = 0
-
-    for sector_id, config in SECTOR_CONFIG.items():
-        try:
-            response = nse.client.get_index_constituents(config["index_name"])
-
-            if response and response.data:
-                stocks = []
-                for constituent in response.data:
-                    # Skip the index itself
-                    if constituent.priority == 1:
-                        continue
-
-                    stock_data = {
-                        "symbol": constituent.symbol,
-                        "company_name": constituent.meta.company_name if constituent.meta else "",
-                        "last_price": constituent.last_price,
-                        "change_pct": constituent.pchange,
-                        "volume": constituent.total_traded_volume,
-                        "near_52w_high": constituent.near_wkh,
-                        "near_52w_low": constituent.near_wkl,
-                        "yearly_return": constituent.per_change_365d,
-                    }
-                    stocks.append(stock_data)
-
-                sector_stocks[sector_id] = {
-                    "index_name": config["index_name"],
-                    "sector_name": config["name"],
-                    "max_picks": config["max_picks"],
-                    "stocks": stocks,
-                    "count": len(stocks),
-                    "top_gainers": sorted(stocks, key=lambda x: x["change_pct"] or 0, reverse=True)[:5],
-                    "top_losers": sorted(stocks, key=lambda x: x["change_pct"] or 0)[:5],
-                }
-                total_stocks += len(stocks)
-                logger.info(f"Fetched {len(stocks)} stocks for {config['name']}")
-            else:
-                sector_stocks[sector_id] = {
-                    "index_name": config["index_name"],
-                    "sector_name": config["name"],
-                    "max_picks": config["max_picks"],
-                    "stocks": [],
-                    "count": 0,
-                }
-                logger.warning(f"No constituents found for {config['name']}")
-
-        except Exception as e:
-            logger.error(f"Failed to fetch {config['name']}: {e}")
-            sector_stocks[sector_id] = {
-                "index_name": config["index_name"],
-                "sector_name": config["name"],
-                "max_picks": config["max_picks"],
-                "stocks": [],
-                "count": 0,
-                "error": str(e),
-            }
+# Index membership changes only a few times a year - keep one snapshot per day
+_constituent_store: ConstituentSnapshotStore | None = None
+_constituent_store_lock = threading.Lock()
 
-    if step_input.workflow_session:
-        step_input.workflow_session.session_data["sector_stocks"] = sector_stocks
+# Seconds a live constituent price fetch is reused (the prefetch's own fetch
+# usually serves the first sector brief)
+LIVE_PRICES_MAX_AGE_S = 60.0
 
-    summary = "\n".join([
-        f"- {config['name']}: {sector_stocks[sid]['count']} stocks"
-        for sid, config in SECTOR_CONFIG.items()
-    ])
+_nse_client = None
+_live_prices: dict[str, tuple[float, list[dict]]] = {}
 
-    return StepOutput(
-        content=f"Sector Constituents Fetched:\n{summary}\n\nTotal: {total_stocks} stocks across {len(SECTOR_CONFIG)} sectors"
+
+def get_constituent_store() -> ConstituentSnapshotStore:
+    """Shared daily constituent snapshot store (created on first use)."""
+    global _constituent_store
+    if _constituent_store is None:
+        with _constituent_store_lock:
+            if _constituent_store is None:
+                _constituent_store = ConstituentSnapshotStore(settings.DATA_DIR / "constituents")
+    return _constituent_store
+
+
+def _get_nse_client():
+    """Shared NSE client for constituent fetches (created on first use)."""
+    global _nse_client
+    if _nse_client is None:
+        from tools.nse_india import NSEIndiaClient
+
+        _nse_client = NSEIndiaClient()
+    return _nse_client
+
+
+def _fetch_index_stocks(index_name: str) -> list[dict]:
+    """Fetch one index's constituents as plain stock dicts."""
+    response = _get_nse_client().get_index_constituents(index_name)
+    if not response or not response.data:
+        return []
+
+    stocks = []
+    for constituent in response.data:
+        # Skip the index itself
+        if constituent.priority == 1:
+            continue
+
+        stocks.append({
+            "symbol": constituent.symbol,
+            "company_name": constituent.meta.company_name if constituent.meta else "",
+            "last_price": constituent.last_price,
+            "change_pct": constituent.pchange,
+            "volume": constituent.total_traded_volume,
+            "near_52w_high": constituent.near_wkh,
+            "near_52w_low": constituent.near_wkl,
+            "yearly_return": constituent.per_change_365d,
+        })
+    _live_prices[index_name] = (time.monotonic(), stocks)
+    return stocks
+
+
+def _live_index_stocks(index_name: str) -> list[dict]:
+    """Constituents with current prices (reuses a fetch from the last minute)."""
+    cached = _live_prices.get(index_name)
+    if cached and time.monotonic() - cached[0] < LIVE_PRICES_MAX_AGE_S:
+        return cached[1]
+    return _fetch_index_stocks(index_name)
+
+
+def start_constituent_prefetch(force: bool = False) -> dict[str, Future]:
+    """Start (or join) the concurrent background refresh of all sector indices.
+
+    Safe to call repeatedly: in-flight refreshes are shared, and indices
+    already in today's snapshot resolve immediately from disk.
+
+    Args:
+        force: Refetch even if today's snapshot already has the index
+
+    Returns:
+        Mapping of index name to a Future resolving to its member list
+    """
+    index_names = [config["index_name"] for config in SECTOR_CONFIG.values()]
+    return get_constituent_store().prefetch(index_names, _fetch_index_stocks, force=force)
+
+
+def _build_sector_entry(config: dict, stocks: list[dict], error: str | None = None) -> dict:
+    """Build the session-state entry for one sector."""
+    entry = {
+        "index_name": config["index_name"],
+        "sector_name": config["name"],
+        "max_picks": config["max_picks"],
+        "stocks": stocks,
+        "count": len(stocks),
+    }
+    priced = [s for s in stocks if s.get("change_pct") is not None]
+    if priced:
+        entry["top_gainers"] = sorted(priced, key=lambda x: x["change_pct"], reverse=True)[:5]
+        entry["top_losers"] = sorted(priced, key=lambda x: x["change_pct"])[:5]
+    if error:
+        entry["error"] = error
+    return entry
+
+
+async def _await_sector_entry(sector_id: str) -> dict:
+    """Wait for one sector's constituents, then price them live, without blocking the event loop."""
+    config = SECTOR_CONFIG[sector_id]
+    future = start_constituent_prefetch()[config["index_name"]]
+    try:
+        members = await asyncio.wrap_future(future)
+    except Exception as e:
+        logger.error(f"Failed to fetch {config['name']}: {e}")
+        return _build_sector_entry(config, [], error=str(e))
+
+    if not members:
+        logger.warning(f"No constituents found for {config['name']}")
+        return _build_sector_entry(config, [])
+
+    # The snapshot holds membership only; prices come from a live fetch
+    try:
+        live = await asyncio.to_thread(_live_index_stocks, config["index_name"])
+    except Exception as e:
+        logger.warning(f"Live prices unavailable for {config['name']}: {e}")
+        live = []
+    prices = {s["symbol"]: s for s in live}
+    stocks = [{**prices.get(m["symbol"], {}), **m} for m in members]
+    logger.info(f"Fetched {len(stocks)} stocks for {config['name']} ({len(prices)} priced)")
+    return _build_sector_entry(config, stocks)
+
+
+def _format_sector_brief(entry: dict, session_data: dict) -> str:
+    """Format the input handed to a sector team once its constituents are ready."""
+    symbols = [s["symbol"] for s in entry["stocks"]]
+    oi_spurts = session_data.get("oi_spurts", {})
+    bullish = [s["symbol"] for s in oi_spurts.get("bullish", []) if s["symbol"] in symbols]
+    bearish = [s["symbol"] for s in oi_spurts.get("bearish", []) if s["symbol"] in symbols]
+
+    lines = [
+        f"# {entry['sector_name']} Sector Analysis ({entry['index_name']})",
+        f"Maximum picks: {entry['max_picks']}",
+        "",
+        "## Market Regime",
+        str(session_data.get("regime") or "Not yet determined"),
+        "",
+        f"## Constituents ({entry['count']})",
+        ", ".join(symbols) if symbols else "None available - use your tools to fetch them.",
+    ]
+    if entry.get("top_gainers"):
+        lines.append("")
+        lines.append("Top gainers: " + ", ".join(
+            f"{s['symbol']} ({(s['change_pct'] or 0):+.2f}%)" for s in entry["top_gainers"]
+        ))
+        lines.append("Top losers: " + ", ".join(
+            f"{s['symbol']} ({(s['change_pct'] or 0):+.2f}%)" for s in entry["top_losers"]
+        ))
+    lines.append("")
+    lines.append("## OI Spurts In Sector")
+    lines.append(f"Bullish OI: {', '.join(bullish) if bullish else 'None'}")
+    lines.append(f"Bearish OI: {', '.join(bearish) if bearish else 'None'}")
+    lines.append("")
+    lines.append(
+        f"Analyze these stocks and provide your top {entry['max_picks']} LONG picks "
+        f"(and optionally 1 SHORT) in the required output format."
     )
+    return "\n".join(lines)
+
+
+def make_sector_constituents_step(sector_id: str):
+    """Create the step executor that waits for one sector's constituents."""
+
+    async def fetch_constituents(step_input: StepInput) -> StepOutput:
+        entry = await _await_sector_entry(sector_id)
+        session_data = step_input.workflow_session.session_data if step_input.workflow_session else {}
+        if step_input.workflow_session:
+            session_data.setdefault("sector_stocks", {})[sector_id] = entry
+        return StepOutput(content=_format_sector_brief(entry, session_data))
+
+    fetch_constituents.__name__ = f"fetch_{sector_id}_constituents"
+    return fetch_constituents
+
+
+def record_constituent_changes(session_data: dict) -> dict:
+    """Diff today's constituent snapshot against the previous one and log changes."""
+    diff = get_constituent_store().diff()
+    if diff.has_changes:
+        for index_name, symbols in diff.added.items():
+            logger.warning(f"{index_name} membership change: added {', '.join(symbols)}")
+        for index_name, symbols in diff.removed.items():
+            logger.warning(f"{index_name} membership change: removed {', '.join(symbols)}")
+    snapshot = get_constituent_store().load() or {}
+    changes = {**diff.to_dict(), "version": snapshot.get("version")}
+    session_data["constituent_changes"] = changes
+    return changes
 
 
 def store_regime_in_state(step_input: StepInput) -> StepOutput:
@@ -269,6 +399,7 @@ def store_sector_reports(step_input: StepInput) -> StepOutput:
     sector_reports = step_input.previous_step_content
     if step_input.workflow_session:
         step_input.workflow_session.session_data["sector_reports"] = sector_reports
+        record_constituent_changes(step_input.workflow_session.session_data)
     return StepOutput(content=sector_reports)
 
 
@@ -309,8 +440,11 @@ def save_multi_sector_output(step_input: StepInput) -> StepOutput:
         "regime": session_data.get("regime"),
         "oi_spurts": session_data.get("oi_spurts"),
         "sector_reports": session_data.get("sector_reports"),
+        "constituent_changes": session_data.get("constituent_changes"),
         "final_picks": session_data.get("final_picks"),
         "risk_validated": session_data.get("risk_validated", False),
+        "tool_memo": tool_memo.run_stats(),
+        "snapshot": snapshot_status(),
     }
     with open(json_filepath, "w", encoding="utf-8") as f:
         json.dump(output_data, f, indent=2, default=str)
@@ -450,50 +584,40 @@ sector_teams = {
 
 
 # ==============================================================================
-# PARALLEL SECTOR ANALYSIS TEAM (TEAM OF TEAMS)
+# PARALLEL SECTOR PIPELINES
 # ==============================================================================
 
-parallel_sector_analysis_team = Team(
-    name="Parallel Sector Analysis Council",
-    model="google:gemini-3-pro-preview",
-    members=[
-        sector_teams["banking"],
-        sector_teams["it"],
-        sector_teams["financial_services"],
-        sector_teams["pharma"],
-        sector_teams["auto"],
-        sector_teams["fmcg"],
-        sector_teams["metals"],
-        sector_teams["energy"],
-        sector_teams["realty"],
-        sector_teams["infrastructure"],
-    ],
-    description="""Parallel Sector Analysis Council at Hagrid Trading LLC.
-
-10 sector teams analyzing their respective universes SIMULTANEOUSLY:
-- Banking (NIFTY BANK) - Max 3 picks
-- IT (NIFTY IT) - Max 2 picks
-- Financial Services (NIFTY FINANCIAL SERVICES) - Max 2 picks
-- Pharma (NIFTY PHARMA) - Max 2 picks
-- Auto (NIFTY AUTO) - Max 2 picks
-- FMCG (NIFTY FMCG) - Max 2 picks
-- Metals (NIFTY METAL) - Max 2 picks
-- Energy (NIFTY ENERGY) - Max 2 picks
-- Realty (NIFTY REALTY) - Max 2 picks
-- Infrastructure (NIFTY INFRA) - Max 2 picks
-
-Each team produces top picks with multi-factor analysis.
-All teams work in PARALLEL for efficiency.
-Stock lists are fetched dynamically from NSE India API.
-OI spurts data is available for bonus scoring.""",
-
-    db=agent_db,
-    delegate_task_to_all_members=True,  # Critical: enables parallel execution
-    share_member_interactions=True,
-    session_state={
-        "sectors_analyzed": [],
-        "total_picks": [],
-    },
+# One pipeline per sector: wait for that sector's constituents, then run its
+# team immediately. Sectors whose constituents arrive first start first instead
+# of every team waiting for the slowest index fetch.
+sector_pipelines = {
+    sector_id: Steps(
+        name=f"{config['name']} Pipeline",
+        description=f"Fetch {config['index_name']} constituents, then run the {config['name']} team",
+        steps=[
+            Step(
+                name=f"Fetch {config['name']} Constituents",
+                executor=make_sector_constituents_step(sector_id),
+                description=f"Wait for {config['index_name']} constituents from the daily snapshot",
+            ),
+            Step(
+                name=f"{config['name']} Analysis",
+                team=sector_teams[sector_id],
+                description=f"Top {config['max_picks']} picks for {config['name']}",
+            ),
+        ],
+    )
+    for sector_id, config in SECTOR_CONFIG.items()
+}
+
+parallel_sector_analysis = Parallel(
+    *sector_pipelines.values(),
+    name="Parallel Sector Analysis",
+    description="""Run ALL 10 sector pipelines in parallel:
+    - Each team starts as soon as its sector's constituents are ready
+    - Each team outputs top 2-3 picks
+    - Total ~20-25 candidates generated
+    - OI spurts bonus applied to qualifying stocks""",
 )
 
 
@@ -588,6 +712,12 @@ def get_multi_sector_prompt(regime: str, oi_spurts: dict, sector_stocks: dict) -
     )
 
 
+# Share identical tool calls (OI spurts, indices, quotes) across sector teams
+install_tool_memo([regime_agent, *sector_teams.values(), cross_sector_aggregator, risk_agent])
+# Tools read the pre-market snapshot (8:45 job) first while it is fresh
+install_snapshot_source(tool_memo)
+
+
 # ==============================================================================
 # WORKFLOW DEFINITION
 # ==============================================================================
@@ -601,6 +731,7 @@ multi_sector_workflow = Workflow(
         "oi_spurts": {},
         "sector_stocks": {},
         "sector_reports": {},
+        "constituent_changes": {},
         "final_picks": [],
         "risk_validated": False,
     },
@@ -630,32 +761,17 @@ multi_sector_workflow = Workflow(
             description="Scan for stocks with unusual OI activity using NSE India API"
         ),
 
-        # Step 4: Fetch Sector Constituents
-        Step(
-            name="Fetch Sector Constituents",
-            executor=fetch_sector_constituents,
-            description="Dynamically fetch stocks for each sector from NSE India API"
-        ),
-
-        # Step 5: Parallel Sector Analysis (ALL 10 SECTORS AT ONCE)
-        Step(
-            name="Parallel Sector Analysis",
-            team=parallel_sector_analysis_team,
-            description="""Run ALL 10 sector teams in parallel:
-            - Each team analyzes their sector's stocks
-            - Each team outputs top 2-3 picks
-            - Total ~20-25 candidates generated
-            - OI spurts bonus applied to qualifying stocks"""
-        ),
+        # Step 4: Parallel Sector Analysis (constituent fetch + team per sector)
+        parallel_sector_analysis,
 
-        # Step 6: Store sector reports
+        # Step 5: Store sector reports
         Step(
             name="Store Sector Reports",
             executor=store_sector_reports,
             description="Store all sector team outputs in session state"
         ),
 
-        # Step 7: Cross-Sector Aggregation
+        # Step 6: Cross-Sector Aggregation
         Step(
             name="Cross-Sector Aggregation",
             agent=cross_sector_aggregator,
@@ -666,21 +782,21 @@ multi_sector_workflow = Workflow(
             - Rank by conviction and score"""
         ),
 
-        # Step 8: Store final picks
+        # Step 7: Store final picks
         Step(
             name="Store Final Picks",
             executor=store_final_picks,
             description="Store aggregator's final 15 picks"
         ),
 
-        # Step 9: Risk Management
+        # Step 8: Risk Management
         Step(
             name="Risk Management",
             agent=risk_agent,
             description="Validate picks: position sizing, portfolio constraints, risk limits"
         ),
 
-        # Step 10: Save output
+        # Step 9: Save output
         Step(
             name="Save Output",
             executor=save_multi_sector_output,
@@ -699,12 +815,12 @@ async def run_multi_sector_analysis(input_text: str = None) -> dict:
     Run the multi-sector intraday analysis workflow.
 
     This workflow:
-    1. Checks market regime
+    1. Checks market regime (constituent prefetch runs in the background)
     2. Scans for OI spurts
-    3. Fetches sector constituents dynamically
-    4. Runs 10 sector teams in parallel
-    5. Aggregates to final 15 picks
-    6. Validates risk parameters
+    3. Runs 10 sector pipelines in parallel, each starting as soon as its
+       constituents are ready
+    4. Aggregates to final 15 picks
+    5. Validates risk parameters
 
     Args:
         input_text: Optional custom input. If None, uses default prompt with context.
@@ -717,14 +833,33 @@ async def run_multi_sector_analysis(input_text: str = None) -> dict:
 
     today = date.today().isoformat()
 
+    # Kick off the constituent refresh so it overlaps the regime/OI steps
+    start_constituent_prefetch()
+    get_constituent_store().prune()
+
     logger.info(f"Starting multi-sector analysis for {today}")
+
+    snapshot = snapshot_status()
+    if snapshot["version"]:
+        logger.info(
+            f"Pre-market snapshot {snapshot['version']}: age {snapshot['age_s']:.0f}s, "
+            f"{snapshot['quotes']} quotes, {snapshot['tool_results']} tool results, "
+            f"fresh={snapshot['fresh']}"
+        )
+    else:
+        logger.info("No pre-market snapshot for today - tools start cold")
     logger.info("Running 10 sector teams in parallel...")
 
     # Run workflow - the prompt will be constructed inside with context
-    result = await multi_sector_workflow.arun(
-        input=input_text or "Begin multi-sector intraday analysis. Analyze all 10 sectors and provide final 15 stock picks.",
-        session_id=f"multi_sector_{today}"
-    )
+    with (
+        profile_run(multi_sector_workflow.name, session_id=f"multi_sector_{today}") as profiled_run,
+        tool_memo.run_scope(profiled_run.run_id),
+    ):
+        result = await multi_sector_workflow.arun(
+            input=input_text or "Begin multi-sector intraday analysis. Analyze all 10 sectors and provide final 15 stock picks.",
+            session_id=f"multi_sector_{today}"
+        )
+        memo_stats = tool_memo.run_stats()
 
     result_content = result.content if result else ""
 
@@ -750,6 +885,10 @@ async def run_multi_sector_analysis(input_text: str = None) -> dict:
         "regime": multi_sector_workflow.session_state.get("regime"),
         "oi_spurts": multi_sector_workflow.session_state.get("oi_spurts", {}),
         "sector_reports": multi_sector_workflow.session_state.get("sector_reports", {}),
+        "constituent_changes": multi_sector_workflow.session_state.get("constituent_changes", {}),
+        "tool_memo": memo_stats,
+        "snapshot": snapshot,
+        "profile": profiled_run.profile,
     }
 
 
@@ -765,7 +904,8 @@ __all__ = [
     "multi_sector_workflow",
 
     # Teams
-    "parallel_sector_analysis_team",
+    "parallel_sector_analysis",
+    "sector_pipelines",
     "sector_teams",
 
     # Agents
@@ -779,5 +919,7 @@ __all__ = [
 
     # Step functions
     "scan_oi_spurts",
-    "fetch_sector_constituents",
+    "make_sector_constituents_step",
+    "start_constituent_prefetch",
+    "get_constituent_store",
 ]
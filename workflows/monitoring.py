@@ -8,10 +8,13 @@ This workflow monitors open positions throughout the trading day:
 4. Execute adjustments (trailing stops, exits)
 5. Update Trade table with results
 
-Runs every 20 minutes during market hours (9:30 AM - 3:20 PM).
+Triggered by the tick-driven position monitor (workflows/tick_monitor.py)
+on stop/target/trailing events or material moves; with the tick monitor
+disabled it runs every 20 minutes during market hours (9:30 AM - 3:20 PM).
 """
 
 from datetime import date
+from typing import Any, Dict, List, Optional
 
 from agno.workflow import Workflow, Step
 from agno.workflow.types import StepInput, StepOutput
@@ -25,23 +28,18 @@ from core.config import get_settings
 settings = get_settings()
 
 
-def load_open_positions(step_input: StepInput) -> StepOutput:
-    """
-    Load open trades from Trade table and broker.
-
-    Also fetches latest news summary from news_workflow if available.
-    """
-    today = date.today().isoformat()
+def load_open_trades(day: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Open trades for a day (default today) as plain dicts."""
+    day = day or date.today().isoformat()
 
-    # Load open trades from database
     with Session(engine) as db:
         statement = select(Trade).where(
-            Trade.date == today,
+            Trade.date == day,
             Trade.status == "OPEN"
         )
         trades = db.exec(statement).all()
 
-    open_trades = [
+    return [
         {
             "id": t.id,
             "symbol": t.symbol,
@@ -57,6 +55,18 @@ def load_open_positions(step_input: StepInput) -> StepOutput:
         for t in trades
     ]
 
+
+def load_open_positions(step_input: StepInput) -> StepOutput:
+    """
+    Load open trades from Trade table and broker.
+
+    Also fetches latest news summary from news_workflow if available.
+    """
+    today = date.today().isoformat()
+
+    # Load open trades from database
+    open_trades = load_open_trades(today)
+
     session_data = step_input.workflow_session.session_data if step_input.workflow_session else {}
 
     # Store in session state
@@ -188,18 +198,40 @@ monitoring_workflow = Workflow(
 )
 
 
-async def run_monitoring(input_text: str = None) -> dict:
+def describe_rule_events(events: List[Dict[str, Any]]) -> str:
+    """Workflow input for a tick-monitor trigger."""
+    lines = []
+    for e in events:
+        lines.append(
+            f"- Trade {e['trade_id']} {e['symbol']}: {e['event']} at {e['price']} "
+            f"(level {e['level']}, unrealized P&L ₹{e['unrealized_pnl']:.0f})"
+        )
+    return (
+        "The tick monitor flagged these open positions:\n"
+        + "\n".join(lines)
+        + "\n\nExit positions whose STOP_LOSS, TRAILING_STOP or TAKE_PROFIT fired. "
+        "For MATERIAL_MOVE positions decide whether to trail the stop or exit. "
+        "Never go negative on daily P&L."
+    )
+
+
+async def run_monitoring(input_text: str = None, events: Optional[List[Dict[str, Any]]] = None) -> dict:
     """
     Run the monitoring workflow.
 
     Args:
         input_text: Optional custom input.
+        events: Rule events (RuleEvent.to_dict()) from the tick monitor;
+            used to build the input when input_text is not given.
 
     Returns:
         dict with monitoring result
     """
     today = date.today().isoformat()
 
+    if input_text is None and events:
+        input_text = describe_rule_events(events)
+
     if input_text is None:
         input_text = (
             f"Monitor all open positions for {today}. "
@@ -219,7 +251,8 @@ async def run_monitoring(input_text: str = None) -> dict:
         "result": result.content if result else None,
         "open_trades": monitoring_workflow.session_state.get("open_trades", []),
         "adjustments": monitoring_workflow.session_state.get("adjustments", []),
+        "events": events or [],
     }
 
 
-__all__ = ["monitoring_workflow", "run_monitoring"]
+__all__ = ["monitoring_workflow", "run_monitoring", "load_open_trades"]
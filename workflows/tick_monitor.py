@@ -0,0 +1,282 @@
+"""
+Tick-Driven Position Monitor
+
+Always-on replacement for the 20-minute monitoring cron:
+1. Subscribe the symbols of today's open trades to the Fyers data websocket
+2. Check stop-loss, target and trailing-stop rules on every tick (O(1) per
+   position, see core/position_rules.py)
+3. Run the monitoring workflow only when a rule fires or a position makes
+   a material move - exits immediately, material moves with a cooldown
+4. Re-read open trades periodically (and after every workflow run) so new
+   fills are subscribed and closed trades dropped
+5. Publish a heartbeat on every refresh; a websocket that stays down past
+   MONITOR_DISCONNECT_LIMIT_S ends the run with an error. The scheduler's
+   watchdog (scheduler/scheduler.py) restarts a dead monitor and runs the
+   cron monitoring workflow in the meantime.
+
+Ticks are recorded to .hagrid/ticks/ so a day's rule decisions can be
+replayed offline with core.position_rules.replay_ticks.
+"""
+
+import asyncio
+import logging
+import time
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional
+
+from broker.fyers.websocket.models import WebSocketConfig
+from core.config import get_settings
+from core.instrument_map import get_instrument_map
+from core.position_rules import PositionRuleEngine, RuleEvent, TickTape
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+
+def to_fyers_symbol(symbol: str) -> str:
+    """Trade symbols may be stored bare ("SBIN"); the websocket wants "NSE:SBIN-EQ"."""
+    if ":" in symbol:
+        return symbol
+    instrument = get_instrument_map().get(symbol)
+    if instrument is not None and instrument.fyers_ticker:
+        return instrument.fyers_ticker  # Right series for BE / trade-to-trade stocks
+    return f"NSE:{symbol}-EQ"
+
+
+def _today_at(hhmm: str) -> datetime:
+    hour, minute = (int(x) for x in hhmm.split(":"))
+    return datetime.now().replace(hour=hour, minute=minute, second=0, microsecond=0)
+
+
+# Liveness of the running monitor, read by the scheduler watchdog
+_heartbeat: Dict[str, Any] = {"at": None, "connected": False}
+
+
+def _beat(connected: bool) -> None:
+    _heartbeat["at"] = time.monotonic()
+    _heartbeat["connected"] = connected
+
+
+def monitor_alive(max_age_s: Optional[float] = None) -> bool:
+    """
+    Whether a monitor run is live: it refreshed recently and its socket is up.
+
+    Args:
+        max_age_s: Max seconds since the last heartbeat (default 3 refreshes)
+    """
+    max_age_s = 3 * settings.MONITOR_REFRESH_S if max_age_s is None else max_age_s
+    at = _heartbeat["at"]
+    return at is not None and _heartbeat["connected"] and time.monotonic() - at <= max_age_s
+
+
+class PositionMonitor:
+    """
+    Websocket tick loop around a PositionRuleEngine.
+
+    Websocket callbacks arrive on the socket's thread and are handed to
+    the event loop with call_soon_threadsafe, so rule state is only ever
+    touched from one thread.
+    """
+
+    def __init__(
+        self,
+        fyers_client=None,
+        engine: Optional[PositionRuleEngine] = None,
+        cooldown_s: Optional[float] = None,
+        refresh_s: Optional[float] = None,
+        record_ticks: Optional[bool] = None,
+    ):
+        """
+        Initialize the monitor.
+
+        Args:
+            fyers_client: Authenticated FyersClient (default: shared client)
+            engine: Rule engine (default: built from settings)
+            cooldown_s: Min seconds between material-move workflow runs
+            refresh_s: Seconds between open-trade refreshes
+            record_ticks: Record ticks to a daily tape
+        """
+        self.fyers = fyers_client
+        self.engine = engine or PositionRuleEngine(
+            trail_percent=settings.MONITOR_TRAIL_PERCENT,
+            trail_activation_r=settings.MONITOR_TRAIL_ACTIVATION_R,
+            material_move_percent=settings.MONITOR_MATERIAL_MOVE_PERCENT,
+        )
+        self.cooldown_s = settings.MONITOR_TRIGGER_COOLDOWN_S if cooldown_s is None else cooldown_s
+        self.refresh_s = settings.MONITOR_REFRESH_S if refresh_s is None else refresh_s
+        self.disconnect_limit_s = settings.MONITOR_DISCONNECT_LIMIT_S
+        record = settings.MONITOR_RECORD_TICKS if record_ticks is None else record_ticks
+        self.tape = TickTape(settings.TICK_DIR / f"ticks-{date.today().isoformat()}.jsonl") if record else None
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._ws = None
+        self._pending: List[RuleEvent] = []
+        self._trigger_task: Optional[asyncio.Task] = None
+        self._delayed: Optional[asyncio.TimerHandle] = None
+        self._last_trigger = 0.0
+        self.events: List[Dict[str, Any]] = []
+        self.runs: List[Dict[str, Any]] = []
+
+    # ==================== Ticks ====================
+
+    def _on_message(self, data) -> None:
+        """Websocket callback (socket thread)."""
+        ltp = getattr(data, "ltp", None)
+        if ltp is None or self._loop is None:
+            return
+        ts = getattr(data, "last_traded_time", None) or time.time()
+        self._loop.call_soon_threadsafe(self.handle_tick, data.symbol, float(ltp), float(ts))
+
+    def handle_tick(self, symbol: str, price: float, ts: float) -> List[RuleEvent]:
+        """Evaluate one tick and schedule the workflow if a rule fired."""
+        if self.tape is not None:
+            self.tape.append(symbol, price, ts)
+        events = self.engine.on_tick(symbol, price, ts)
+        if events:
+            for event in events:
+                logger.info(f"Rule fired: {event.symbol} {event.event.value} at {event.price} (level {event.level})")
+                self.events.append(event.to_dict())
+            self._pending.extend(events)
+            self._schedule_trigger()
+        return events
+
+    # ==================== Workflow triggers ====================
+
+    def _schedule_trigger(self) -> None:
+        """Run the workflow now for exits, or after the cooldown for material moves."""
+        if self._trigger_task is not None and not self._trigger_task.done():
+            return  # The running trigger picks up pending events when it finishes
+        if any(e.is_exit for e in self._pending):
+            wait = 0.0
+        else:
+            wait = self._last_trigger + self.cooldown_s - time.monotonic()
+        if wait <= 0:
+            if self._delayed is not None:
+                self._delayed.cancel()
+                self._delayed = None
+            self._trigger_task = asyncio.ensure_future(self._run_triggers())
+        elif self._delayed is None:
+            self._delayed = self._loop.call_later(wait, self._fire_delayed)
+
+    def _fire_delayed(self) -> None:
+        self._delayed = None
+        if self._pending:
+            self._schedule_trigger()
+
+    async def _run_triggers(self) -> None:
+        from workflows.monitoring import run_monitoring
+
+        while self._pending:
+            events, self._pending = self._pending, []
+            self._last_trigger = time.monotonic()
+            started = time.perf_counter()
+            try:
+                result = await run_monitoring(events=[e.to_dict() for e in events])
+                self.runs.append({
+                    "at": datetime.now().isoformat(timespec="seconds"),
+                    "events": len(events),
+                    "adjustments": len(result.get("adjustments", [])),
+                    "duration_s": round(time.perf_counter() - started, 2),
+                })
+            except Exception as e:
+                logger.error(f"Monitoring workflow failed: {e}")
+                self.runs.append({"at": datetime.now().isoformat(timespec="seconds"), "events": len(events), "error": str(e)})
+            # Pick up exits and stop edits made by the workflow
+            await self.refresh()
+            if self._pending and not any(e.is_exit for e in self._pending):
+                break  # Material moves wait for the cooldown
+        if self._pending:
+            self._trigger_task = None
+            self._schedule_trigger()
+
+    # ==================== Trades and subscriptions ====================
+
+    async def refresh(self) -> None:
+        """Reconcile rule state with open trades and (un)subscribe symbols."""
+        from workflows.monitoring import load_open_trades
+
+        trades = await asyncio.to_thread(load_open_trades)
+        for t in trades:
+            t["symbol"] = to_fyers_symbol(t["symbol"])
+        added, removed = self.engine.sync(trades)
+        if self._ws is None:
+            return
+        try:
+            if added:
+                await self._ws.subscribe(sorted(added))
+            if removed:
+                await self._ws.unsubscribe(sorted(removed))
+        except Exception as e:
+            logger.warning(f"Subscription update failed: {e}")
+        if added or removed:
+            logger.info(f"Monitoring {len(self.engine)} positions on {len(self.engine.symbols)} symbols "
+                        f"(+{len(added)} / -{len(removed)})")
+
+    async def run(self, until: Optional[datetime] = None) -> Dict[str, Any]:
+        """
+        Monitor until ``until`` (default MONITOR_END_TIME today).
+
+        Returns:
+            Summary of ticks, rule events and workflow runs
+        """
+        until = until or _today_at(settings.MONITOR_END_TIME)
+        self._loop = asyncio.get_running_loop()
+        if self.fyers is None:
+            from core.fyers_client import ensure_authenticated
+
+            self.fyers = await ensure_authenticated()
+
+        self._ws = self.fyers.create_data_websocket(
+            on_message=self._on_message,
+            config=WebSocketConfig(lite_mode=True),
+        )
+        await self._ws.connect()
+        disconnected_at: Optional[float] = None
+        try:
+            await self.refresh()
+            _beat(True)
+            while datetime.now() < until:
+                remaining = (until - datetime.now()).total_seconds()
+                await asyncio.sleep(max(0.0, min(self.refresh_s, remaining)))
+                await self.refresh()
+                if self.tape is not None:
+                    self.tape.flush()
+
+                connected = self._ws.is_connected
+                _beat(connected)
+                if connected:
+                    disconnected_at = None
+                elif disconnected_at is None:
+                    disconnected_at = time.monotonic()
+                    logger.warning("Tick websocket disconnected - waiting for it to reconnect")
+                elif time.monotonic() - disconnected_at >= self.disconnect_limit_s:
+                    raise RuntimeError(f"Tick websocket down for {self.disconnect_limit_s:.0f}s")
+        finally:
+            _beat(False)
+            if self._delayed is not None:
+                self._delayed.cancel()
+            if self._trigger_task is not None:
+                await asyncio.gather(self._trigger_task, return_exceptions=True)
+            await self._ws.close()
+            if self.tape is not None:
+                self.tape.close()
+
+        return self.summary()
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "date": date.today().isoformat(),
+            "ticks": self.engine.ticks,
+            "positions": self.engine.positions(),
+            "events": self.events,
+            "workflow_runs": self.runs,
+            "tick_tape": str(self.tape.path) if self.tape is not None else None,
+        }
+
+
+async def run_position_monitor(until: Optional[datetime] = None) -> Dict[str, Any]:
+    """Run the tick-driven monitor for the rest of the session."""
+    return await PositionMonitor().run(until=until)
+
+
+__all__ = ["PositionMonitor", "run_position_monitor", "monitor_alive", "to_fyers_symbol"]